@@ -3,7 +3,7 @@
 from typed_tables.instance import InstanceRef
 from typed_tables.schema import Schema
 from typed_tables.storage import StorageManager
-from typed_tables.table import Table
+from typed_tables.table import GrowthPolicy, Table
 from typed_tables.types import (
     AliasTypeDefinition,
     ArrayTypeDefinition,
@@ -31,6 +31,7 @@ __all__ = [
     "InstanceRef",
     # Storage
     "Table",
+    "GrowthPolicy",
     "StorageManager",
     # Type definitions
     "TypeDefinition",
@@ -2,11 +2,21 @@
 
 from __future__ import annotations
 
+import hashlib
+import struct
+from collections import OrderedDict
+from itertools import chain
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Iterator
 
 from typed_tables.table import Table
-from typed_tables.types import ArrayTypeDefinition
+from typed_tables.types import (
+    ArrayTypeDefinition,
+    BigIntTypeDefinition,
+    CompositeTypeDefinition,
+    FieldDefinition,
+    TypeDefinition,
+)
 
 if TYPE_CHECKING:
     pass
@@ -18,8 +28,27 @@ class ArrayTable:
     An array table stores elements in an element table. The (start_index, length)
     pair is stored inline in the composite record that owns the array, not in a
     separate header table.
+
+    An array that cannot grow where it is is moved (copy-on-write) to a block
+    with room to spare: its length rounded up to a power of two, at least
+    MIN_CAPACITY. Later appends fill that slack in place. The block it moved
+    out of is released, and once the update that moved it has been written
+    (see reuse_released) new arrays of this table are stored in it.
+
+    The table also counts its dead elements — slack, released blocks and
+    anything else no array refers to — so the space ``compact`` would
+    reclaim is known without walking the records. The count, the slack and
+    the free blocks are kept in a sidecar file (see BLOCKS_SUFFIX).
     """
 
+    # Smallest block reserved for an array moved by copy-on-write
+    MIN_CAPACITY = 4
+
+    # Sidecar file holding the block state: <QQQQ covered, dead, slack, free>,
+    # then (end, limit) per slack entry and (start_index, size) per free block
+    BLOCKS_SUFFIX = ".blocks"
+    _BLOCKS_HEADER = struct.Struct("<QQQQ")
+
     def __init__(
         self,
         array_type: ArrayTypeDefinition,
@@ -33,12 +62,31 @@ class ArrayTable:
         """
         self.array_type = array_type
         self.element_table = element_table
+        # Room reserved after an array: index past its last element → end of its block
+        self._slack: dict[int, int] = {}
+        # Reusable blocks by size class (size.bit_length()): [(start_index, size), ...]
+        self._free: dict[int, list[tuple[int, int]]] = {}
+        # Elements no array refers to; None when unknown (see set_dead_count)
+        self._dead: int | None = 0
+        # Changes made while updating one record, settled by reuse_released()/discard_released():
+        # blocks moved out of as (start_index, size, live elements), elements cut off
+        # arrays (dead once the record is written) and elements written for it (dead if not)
+        self._released: list[tuple[int, int, int]] = []
+        self._cut = 0
+        self._written = 0
+        self._blocks_dirty = False  # in-memory state differs from the sidecar
+        if element_table.file_path.exists():
+            self._load_blocks()
 
     @property
     def count(self) -> int:
         """Return the number of elements stored."""
         return self.element_table.count
 
+    def tables(self) -> Iterator[Table]:
+        """Iterate over the tables backing this array table."""
+        yield self.element_table
+
     def insert(self, elements: list[Any]) -> tuple[int, int]:
         """Insert an array and return (start_index, length).
 
@@ -51,12 +99,7 @@ class ArrayTable:
         if not elements:
             return (0, 0)
 
-        start_index = self.element_table.count
-        for element in elements:
-            self.element_table.insert(element)
-        length = len(elements)
-
-        return (start_index, length)
+        return self._store(self.element_table.pack_many(elements), reserve=False)
 
     def get(self, start_index: int, length: int) -> list[Any]:
         """Get an array by its start_index and length.
@@ -71,39 +114,50 @@ class ArrayTable:
         if length == 0:
             return []
 
-        return [self.element_table.get(start_index + i) for i in range(length)]
+        return self.element_table.get_range(start_index, length)
+
+    def get_bytes(self, start_index: int, length: int) -> bytes:
+        """Get an array of uint8 elements (bigint and fraction bytes) as one bytes slice."""
+        if length == 0:
+            return b""
+        return bytes(self.element_table.get_raw_range(start_index, length))
+
+    def get_string(self, start_index: int, length: int) -> str:
+        """Get an array of characters as a string."""
+        return "".join(self.get(start_index, length))
+
+    def element_count(self, start_index: int, length: int) -> int:
+        """Return the number of elements in the array at (start_index, length)."""
+        return length
 
     def append(self, start_index: int, length: int, new_elements: list[Any]) -> tuple[int, int]:
         """Append elements. Returns new (start_index, length).
 
-        Tail fast path: if array is at end of element table, extend in place.
-        Otherwise: copy-on-write (read existing + new, write all to end).
+        Fast path: the elements are written in place when the array is
+        followed by its own slack or ends the element table.
+        Otherwise: copy-on-write into a block with room to grow.
         """
         if not new_elements:
             return (start_index, length)
 
-        if start_index + length == self.element_table.count:
-            # Tail fast path — just extend
-            for elem in new_elements:
-                self.element_table.insert(elem)
-            return (start_index, length + len(new_elements))
-
-        # Copy-on-write
-        existing = self.get(start_index, length)
-        return self.insert(existing + new_elements)
+        data = self.element_table.pack_many(new_elements)
+        extended = self._extend(start_index, length, data)
+        if extended is not None:
+            return extended
+        return self._move(start_index, length, self._raw(start_index, length) + data)
 
     def prepend(self, start_index: int, length: int, new_elements: list[Any]) -> tuple[int, int]:
-        """Prepend elements. Copy-on-write: new_elements + existing → write to end."""
+        """Prepend elements. Copy-on-write: new_elements + existing → a new growable block."""
         if not new_elements:
             return (start_index, length)
-        existing = self.get(start_index, length)
-        return self.insert(new_elements + existing)
+        data = self.element_table.pack_many(new_elements)
+        return self._move(start_index, length, data + self._raw(start_index, length))
 
     def delete(self, start_index: int, length: int, indices_to_delete: set[int]) -> tuple[int, int]:
         """Delete elements at given indices. Returns new (start_index, length).
 
         Fast paths:
-        - All deleted from end → just decrement length
+        - All deleted from end → decrement length; the freed tail becomes slack
         - All deleted from start → bump start_index
         - General → copy-on-write with only surviving elements
         """
@@ -112,38 +166,825 @@ class ArrayTable:
 
         new_length = length - len(indices_to_delete)
         if new_length == 0:
+            self.release(start_index, length)
             return (0, 0)
 
         sorted_indices = sorted(indices_to_delete)
 
         # Fast path: all deleted from end
         if sorted_indices == list(range(length - len(indices_to_delete), length)):
-            return (start_index, new_length)
+            return self._truncate(start_index, length, new_length)
 
         # Fast path: all deleted from start
         if sorted_indices == list(range(len(indices_to_delete))):
+            self._release(start_index, start_index + len(indices_to_delete), len(indices_to_delete))
             return (start_index + len(indices_to_delete), new_length)
 
         # General case: copy-on-write
         existing = self.get(start_index, length)
         surviving = [elem for i, elem in enumerate(existing) if i not in indices_to_delete]
-        return self.insert(surviving)
+        return self._move(start_index, length, self.element_table.pack_many(surviving))
+
+    def replace(self, start_index: int, length: int, elements: list[Any]) -> tuple[int, int]:
+        """Give an array new contents. Copy-on-write: returns the new (start_index, length)."""
+        return self._move(start_index, length, self._encode(elements))
 
-    def update_in_place(self, start_index: int, length: int, elements: list[Any]) -> None:
-        """Overwrite elements at existing positions. Length must match original."""
+    def update_in_place(
+        self, start_index: int, length: int, elements: list[Any],
+    ) -> tuple[int, int]:
+        """Overwrite elements at existing positions. Returns the (unchanged) (start_index, length).
+
+        The number of elements must match the original.
+        """
         assert len(elements) == length
         for i, element in enumerate(elements):
             self.element_table.update(start_index + i, element)
+        return (start_index, length)
+
+    # --- Block allocation ---
+
+    def _encode(self, elements: list[Any]) -> bytes:
+        return self.element_table.pack_many(elements)
+
+    def _raw(self, start_index: int, length: int) -> bytes:
+        """Copy the encoded elements of an array out of the element table."""
+        if length == 0:
+            return b""
+        return bytes(self.element_table.get_raw_range(start_index, length))
+
+    def _store(self, data: bytes, reserve: bool) -> tuple[int, int]:
+        """Write encoded elements to a free block or the end of the table.
+
+        Returns (start_index, length) of the stored elements.
+
+        With ``reserve``, the block holds the length rounded up to a power
+        of two (at least MIN_CAPACITY) and the rest of it is the array's slack.
+        """
+        table = self.element_table
+        record_size = table.type_def.size_bytes
+        length = len(data) // record_size
+        if length == 0:
+            return (0, 0)
+        capacity = max(self.MIN_CAPACITY, 1 << (length - 1).bit_length()) if reserve else length
+        block = self._take_free(length, capacity)
+        if block is not None:
+            start_index, size = block
+            table.write_raw(start_index, data)
+            self._add_dead(-length)
+        else:
+            self._changed()  # the sidecar covers the table's element count
+            start_index = table.insert_raw(data + bytes((capacity - length) * record_size))
+            size = capacity
+            self._add_dead(capacity - length)
+        if size > length:
+            self._set_slack(start_index + length, start_index + size)
+        return (start_index, length)
+
+    def _take_free(self, length: int, capacity: int) -> tuple[int, int] | None:
+        """Take a free block of at least ``length`` elements, returning (start_index, size).
+
+        A block with more than MIN_CAPACITY spare past ``capacity`` is split
+        and its remainder stays free.
+        """
+        if not self._free:
+            return None
+        for size_class in range(length.bit_length(), max(self._free) + 1):
+            blocks = self._free.get(size_class)
+            if not blocks:
+                continue
+            # Only blocks of the smallest class can be shorter than length
+            for i in range(len(blocks) - 1, -1, -1):
+                start_index, size = blocks[i]
+                if size >= length:
+                    self._changed()
+                    blocks[i] = blocks[-1]
+                    blocks.pop()
+                    if size - capacity > self.MIN_CAPACITY:
+                        self._add_free(start_index + capacity, size - capacity)
+                        size = capacity
+                    return (start_index, size)
+        return None
+
+    def _add_free(self, start_index: int, size: int) -> None:
+        self._changed()
+        self._free.setdefault(size.bit_length(), []).append((start_index, size))
+
+    def _set_slack(self, end: int, limit: int) -> None:
+        self._changed()
+        self._slack[end] = limit
+
+    def _pop_slack(self, end: int) -> int:
+        """Remove the slack after an array ending at ``end``; return the end of its block."""
+        if end not in self._slack:
+            return end
+        self._changed()
+        return self._slack.pop(end)
+
+    def _extend(self, start_index: int, length: int, data: bytes) -> tuple[int, int] | None:
+        """Write encoded elements right after an array if there is room.
+
+        Returns the new ref, or None if the elements do not fit.
+        """
+        table = self.element_table
+        record_size = table.type_def.size_bytes
+        end = start_index + length
+        limit = self._slack.get(end, end)
+        added = len(data) // record_size
+        if end + added > limit and limit != table.count:
+            return None
+        self._pop_slack(end)
+        filled = min(limit - end, added)
+        if filled:
+            table.write_raw(end, data[: filled * record_size])
+            self._add_dead(-filled)
+        if added > filled:
+            self._changed()
+            table.insert_raw(data[filled * record_size :])
+        if end + added < limit:
+            self._set_slack(end + added, limit)
+        self._written += added
+        return (start_index, length + added)
+
+    def _truncate(self, start_index: int, length: int, new_length: int) -> tuple[int, int]:
+        """Shorten an array in place; the elements cut off become its slack."""
+        end = start_index + length
+        self._set_slack(start_index + new_length, self._pop_slack(end))
+        self._cut += length - new_length
+        return (start_index, new_length)
+
+    def _move(self, start_index: int, length: int, data: bytes) -> tuple[int, int]:
+        """Store an array's new contents in a block with room to grow, releasing its old block."""
+        end = start_index + length
+        self._release(start_index, self._pop_slack(end), length)
+        moved = self._store(data, reserve=True)
+        self._written += moved[1]
+        return moved
+
+    def _release(self, start_index: int, end: int, live: int) -> None:
+        if end > start_index:
+            self._released.append((start_index, end - start_index, live))
+
+    def release(self, start_index: int, length: int) -> None:
+        """Release the array at (start_index, length).
+
+        Called when its record is deleted or the field replaced.
+
+        Like the blocks of moved arrays, its block becomes reusable (and
+        counts as dead) only with reuse_released().
+        """
+        end = start_index + length
+        self._release(start_index, self._pop_slack(end), length)
+
+    def reuse_released(self) -> None:
+        """Make the blocks released since the last call reusable.
+
+        Call once the records holding the moved arrays' new references are
+        written: until then, the old references may still be the live ones.
+        """
+        for start_index, size, live in self._released:
+            self._add_free(start_index, size)
+            self._add_dead(live)
+        self._add_dead(self._cut)
+        self._released.clear()
+        self._cut = self._written = 0
+
+    def discard_released(self) -> None:
+        """Forget the blocks released since the last reuse_released(), e.g. after a failed update.
+
+        They stay unused until the next ``compact``; the elements written
+        for the update are counted as dead instead.
+        """
+        self._add_dead(self._written)
+        self._released.clear()
+        self._cut = self._written = 0
+
+    def reset_blocks(self, dead_count: int | None = None) -> None:
+        """Forget all slack and free blocks, e.g. after a rollback restored older references.
+
+        ``dead_count`` replaces the dead element count (None: unknown).
+        """
+        self._changed()
+        self._slack.clear()
+        self._free.clear()
+        self._released.clear()
+        self._cut = self._written = 0
+        self._dead = dead_count
+
+    # --- Dead elements ---
+
+    @property
+    def dead_count(self) -> int | None:
+        """Return the number of elements no array refers to, or None if unknown.
+
+        The count is unknown for tables written before it was kept (or
+        after a crash) until set_dead_count() is given a fresh count.
+        """
+        return self._dead
+
+    def set_dead_count(self, dead_count: int) -> None:
+        """Set the dead element count, e.g. from a walk of every live reference."""
+        self._changed()
+        self._dead = dead_count
+
+    def _add_dead(self, n: int) -> None:
+        if n and self._dead is not None:
+            self._changed()
+            self._dead += n
+
+    # --- Block sidecar ---
+
+    @property
+    def blocks_path(self) -> Path:
+        """Return the path of the block state sidecar file."""
+        return self.element_table.file_path.with_suffix(self.BLOCKS_SUFFIX)
+
+    def _load_blocks(self) -> None:
+        """Read the sidecar.
+
+        Without a valid one the dead count is unknown and no block is reusable.
+        """
+        self._dead = None
+        path = self.blocks_path
+        if not path.exists():
+            return
+        data = path.read_bytes()
+        if len(data) < self._BLOCKS_HEADER.size:
+            return
+        covered, dead, n_slack, n_free = self._BLOCKS_HEADER.unpack_from(data)
+        expected = self._BLOCKS_HEADER.size + 16 * (n_slack + n_free)
+        if covered != self.element_table.count or len(data) != expected:
+            return  # written for other contents of the table
+        values = struct.unpack_from(f"<{2 * (n_slack + n_free)}Q", data, self._BLOCKS_HEADER.size)
+        pairs = list(zip(values[::2], values[1::2]))
+        self._slack = dict(pairs[:n_slack])
+        for start_index, size in pairs[n_slack:]:
+            self._free.setdefault(size.bit_length(), []).append((start_index, size))
+        self._dead = dead
+
+    def _changed(self) -> None:
+        """Remove the sidecar before the block state first changes, as the tombstone sidecar does.
+
+        A crash before the next save_blocks() then leaves no sidecar rather
+        than a stale one that could hand out a block an array uses.
+        """
+        if not self._blocks_dirty:
+            if not self.element_table.read_only:
+                self.blocks_path.unlink(missing_ok=True)
+            self._blocks_dirty = True
+
+    def save_blocks(self) -> None:
+        """Write the sidecar if the block state changed.
+
+        Call after the tables holding references into this one are flushed.
+        """
+        if not self._blocks_dirty or self._dead is None or self.element_table.read_only:
+            return
+        free = [block for blocks in self._free.values() for block in blocks]
+        values = [v for pair in list(self._slack.items()) + free for v in pair]
+        header = self._BLOCKS_HEADER.pack(
+            self.element_table.count, self._dead, len(self._slack), len(free),
+        )
+        self.blocks_path.write_bytes(header + struct.pack(f"<{len(values)}Q", *values))
+        self._blocks_dirty = False
 
     def close(self) -> None:
         """Close underlying tables."""
         self.element_table.close()
+        self.save_blocks()
+
+
+def _encode_string(elements: str | list[str]) -> bytes:
+    text = elements if isinstance(elements, str) else "".join(elements)
+    return text.encode("utf-8", "surrogatepass")
+
+
+class StringTable(ArrayTable):
+    """Manages storage for string types: UTF-8 bytes in one heap table.
+
+    The heap is a table of uint8 records, so each string is one contiguous
+    run of its UTF-8 bytes and the (start_index, length) pair stored inline
+    in the owning record is a byte offset and byte length. A string is
+    written with a single copy and read with a single slice and decode.
+
+    Element lists taken and returned by the ArrayTable methods are lists of
+    characters (a str is accepted too); lengths are always byte lengths.
+    """
+
+    def insert(self, elements: str | list[str]) -> tuple[int, int]:
+        """Insert a string and return (byte_offset, byte_length)."""
+        return self._store(_encode_string(elements), reserve=False)
+
+    def _encode(self, elements: str | list[str]) -> bytes:
+        return _encode_string(elements)
+
+    def get_string(self, start_index: int, length: int) -> str:
+        """Get the string stored at (byte_offset, byte_length)."""
+        if length == 0:
+            return ""
+        return str(self.element_table.get_raw_range(start_index, length), "utf-8", "surrogatepass")
+
+    def get(self, start_index: int, length: int) -> list[str]:
+        """Get a string as a list of characters."""
+        return list(self.get_string(start_index, length))
+
+    def element_count(self, start_index: int, length: int) -> int:
+        """Return the number of characters in the string."""
+        return len(self.get_string(start_index, length))
+
+    def append(
+        self, start_index: int, length: int, new_elements: str | list[str],
+    ) -> tuple[int, int]:
+        """Append characters. Extends in place into the string's slack or at the end of the heap."""
+        data = _encode_string(new_elements)
+        if not data:
+            return (start_index, length)
+        extended = self._extend(start_index, length, data)
+        if extended is not None:
+            return extended
+        return self._move(start_index, length, self._raw(start_index, length) + data)
+
+    def prepend(
+        self, start_index: int, length: int, new_elements: str | list[str],
+    ) -> tuple[int, int]:
+        """Prepend characters. Copy-on-write."""
+        data = _encode_string(new_elements)
+        if not data:
+            return (start_index, length)
+        return self._move(start_index, length, data + self._raw(start_index, length))
+
+    def delete(self, start_index: int, length: int, indices_to_delete: set[int]) -> tuple[int, int]:
+        """Delete the characters at the given indices. Returns the new (byte_offset, byte_length).
+
+        Deleting from the end or the start only narrows the range.
+        """
+        if not indices_to_delete:
+            return (start_index, length)
+        chars = self.get(start_index, length)
+        kept = len(chars) - len(indices_to_delete)
+        if kept == 0:
+            self.release(start_index, length)
+            return (0, 0)
+        if min(indices_to_delete) >= kept:
+            return self._truncate(start_index, length, len(_encode_string(chars[:kept])))
+        if max(indices_to_delete) < len(indices_to_delete):
+            removed = len(_encode_string(chars[: len(indices_to_delete)]))
+            self._release(start_index, start_index + removed, removed)
+            return (start_index + removed, length - removed)
+        kept_chars = [c for i, c in enumerate(chars) if i not in indices_to_delete]
+        return self._move(start_index, length, _encode_string(kept_chars))
+
+    def update_in_place(
+        self, start_index: int, length: int, elements: str | list[str],
+    ) -> tuple[int, int]:
+        """Overwrite a string with one of the same number of characters.
+
+        The new string is written in place if its UTF-8 encoding has the
+        same byte length, and moved copy-on-write otherwise.
+        Returns the new (byte_offset, byte_length).
+        """
+        data = _encode_string(elements)
+        if len(data) != length:
+            return self._move(start_index, length, data)
+        if data:
+            self.element_table.write_raw(start_index, data)
+        return (start_index, length)
+
+
+def _intern_hash(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+# An unused slot of an interned string index: no stored string has length 0
+_EMPTY_INTERN_ENTRY = {"hash": 0, "start": 0, "length": 0}
+
+
+class InternedStringTable(StringTable):
+    """Manages storage for interned strings: each distinct value is stored once.
+
+    Alongside the heap, an index table holds an open-addressed hash table of
+    (hash, start_index, length) records, one per distinct string, so
+    inserting a value that is already stored returns the existing reference
+    instead of a new copy. Equal strings therefore always have equal
+    references, and a reference is never rewritten in place: every mutation
+    inserts (or finds) the new value. Nothing is ever moved, so no block
+    gets slack or is released for reuse.
+
+    Lookups probe the index on disk: a value hashes to slot
+    ``hash % slots`` and is searched for in the following MAX_PROBE slots,
+    stopping at the first empty one (length 0). When a value finds no empty
+    slot the index doubles and every entry is placed again. Recently
+    decoded strings are kept in an LRU of DECODED_CACHE_SIZE references.
+    """
+
+    # Suffix of the index table's name: "<heap>.intern.bin"
+    INDEX_SUFFIX = ".intern"
+
+    # Slots of a new index; the slot count is always a power of two
+    INITIAL_SLOTS = 64
+
+    # Slots searched for a value before the index doubles
+    MAX_PROBE = 32
+
+    # Decoded strings kept, most recently used last
+    DECODED_CACHE_SIZE = 4096
+
+    def __init__(
+        self,
+        string_type: ArrayTypeDefinition,
+        element_table: Table,
+        index_table: Table,
+    ) -> None:
+        super().__init__(string_type, element_table)
+        self.index_table = index_table
+        self._decoded: OrderedDict[int, str] = OrderedDict()  # start_index → string
+        self._decoded_end = 0  # heap end of the cached strings
+
+    def tables(self) -> Iterator[Table]:
+        """Iterate over the heap and its index."""
+        yield self.element_table
+        yield self.index_table
+
+    def _check_rollback(self) -> None:
+        # A rolled-back transaction shrinks the heap; its offsets may be reused
+        if self.element_table.count < self._decoded_end:
+            self._decoded.clear()
+            self._decoded_end = 0
+
+    def _probe(self, data: bytes, key: int) -> tuple[tuple[int, int] | None, int | None]:
+        """Search the index for ``data``.
+
+        Returns (reference, None) when it is stored, otherwise (None, slot)
+        with the empty slot it would take, or (None, None) when its probe
+        sequence is full and the index must grow.
+        """
+        index = self.index_table
+        slots = index.count
+        for step in range(min(self.MAX_PROBE, slots)):
+            entry = index.get((key + step) & (slots - 1))
+            if not entry["length"]:
+                return None, (key + step) & (slots - 1)
+            if entry["hash"] == key and entry["length"] == len(data):
+                ref = (entry["start"], entry["length"])
+                if self.element_table.get_raw_range(*ref) == data:
+                    return ref, None
+        return None, None
+
+    def _layout(self, entries: list[dict[str, int]], slots: int) -> list[dict[str, int]] | None:
+        """Place entries in an index of ``slots`` slots, or None if one finds no slot."""
+        layout = [_EMPTY_INTERN_ENTRY] * slots
+        for entry in entries:
+            for step in range(min(self.MAX_PROBE, slots)):
+                slot = (entry["hash"] + step) & (slots - 1)
+                if not layout[slot]["length"]:
+                    layout[slot] = entry
+                    break
+            else:
+                return None
+        return layout
+
+    def _grow(self, new_entry: dict[str, int]) -> None:
+        """Double the index until every entry, ``new_entry`` included, has a slot."""
+        index = self.index_table
+        old_slots = index.count
+        entries = []
+        if old_slots:
+            entries = [entry for entry in index.get_range(0, old_slots) if entry["length"]]
+        entries.append(new_entry)
+        slots = max(old_slots * 2, self.INITIAL_SLOTS)
+        while (layout := self._layout(entries, slots)) is None:
+            slots *= 2
+        data = index.pack_many(layout)
+        split = len(data) // slots * old_slots
+        if old_slots:
+            index.write_raw(0, data[:split])
+        index.insert_raw(data[split:])
+
+    def lookup(self, value: str) -> tuple[int, int] | None:
+        """Return the reference of ``value`` if it is stored, else None."""
+        data = _encode_string(value)
+        if not data:
+            return (0, 0)
+        return self._probe(data, _intern_hash(data))[0]
+
+    def insert(self, elements: str | list[str]) -> tuple[int, int]:
+        """Return the reference of a string, storing it first if it is new."""
+        data = _encode_string(elements)
+        if not data:
+            return (0, 0)
+        self._check_rollback()
+        key = _intern_hash(data)
+        ref, slot = self._probe(data, key)
+        if ref is None:
+            self._changed()
+            ref = (self.element_table.insert_raw(data), len(data))
+            entry = {"hash": key, "start": ref[0], "length": ref[1]}
+            if slot is None:
+                self._grow(entry)
+            else:
+                self.index_table.update(slot, entry)
+        return ref
+
+    def value_count(self) -> int:
+        """Return the number of distinct values stored, counting the index's used slots."""
+        index = self.index_table
+        if not index.count:
+            return 0
+        return sum(1 for entry in index.get_range(0, index.count) if entry["length"])
+
+    def get_string(self, start_index: int, length: int) -> str:
+        """Get the string stored at (byte_offset, byte_length), decoding it once while cached."""
+        if length == 0:
+            return ""
+        self._check_rollback()
+        cache = self._decoded
+        value = cache.get(start_index)
+        if value is None:
+            value = super().get_string(start_index, length)
+            cache[start_index] = value
+            self._decoded_end = max(self._decoded_end, start_index + length)
+            if len(cache) > self.DECODED_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(start_index)
+        return value
+
+    def append(
+        self, start_index: int, length: int, new_elements: str | list[str],
+    ) -> tuple[int, int]:
+        """Append characters. Returns the reference of the longer string."""
+        if not new_elements:
+            return (start_index, length)
+        suffix = new_elements if isinstance(new_elements, str) else "".join(new_elements)
+        return self.insert(self.get_string(start_index, length) + suffix)
+
+    def prepend(
+        self, start_index: int, length: int, new_elements: str | list[str],
+    ) -> tuple[int, int]:
+        """Prepend characters. Returns the reference of the longer string."""
+        if not new_elements:
+            return (start_index, length)
+        prefix = new_elements if isinstance(new_elements, str) else "".join(new_elements)
+        return self.insert(prefix + self.get_string(start_index, length))
+
+    def delete(self, start_index: int, length: int, indices_to_delete: set[int]) -> tuple[int, int]:
+        """Delete the characters at the given indices. Returns the reference of the result."""
+        if not indices_to_delete:
+            return (start_index, length)
+        chars = self.get(start_index, length)
+        return self.insert([c for i, c in enumerate(chars) if i not in indices_to_delete])
+
+    def update_in_place(
+        self, start_index: int, length: int, elements: str | list[str],
+    ) -> tuple[int, int]:
+        """Replace a string. Shared values are never overwritten; returns the new reference."""
+        return self.insert(elements)
+
+    def replace(self, start_index: int, length: int, elements: str | list[str]) -> tuple[int, int]:
+        """Return the reference of a new value; the old one may still be shared."""
+        return self.insert(elements)
+
+    def release(self, start_index: int, length: int) -> None:
+        """Do nothing: other records may hold the same reference."""
+
+    def close(self) -> None:
+        """Close the heap and its index."""
+        self.element_table.close()
+        self.index_table.close()
+
+
+# The elements of every byte value, lowest bit first
+_BYTE_BITS = [tuple(bool(byte >> bit & 1) for bit in range(8)) for byte in range(256)]
+
+
+def _pack_bits(elements: list[Any]) -> bytes:
+    """Pack flags 8 to a byte, lowest bit first, followed by a set sentinel bit."""
+    if not elements:
+        return b""
+    digits = "".join("1" if element else "0" for element in reversed(elements))
+    return int("1" + digits, 2).to_bytes(len(elements) // 8 + 1, "little")
+
+
+class BitTable(ArrayTable):
+    """Manages storage for arrays and sets of ``bit`` or ``boolean``: 8 flags per byte.
+
+    Like a string heap, the element table holds uint8 records and the
+    (start_index, length) pair stored inline is a byte offset and byte
+    length. Flag i of an array is bit i % 8 of its byte i // 8; the bit
+    after the last flag is set, so an array of n flags takes n // 8 + 1
+    bytes and its length in flags is found from its last byte. Vacuum,
+    compact and the dead element counts work on bytes unchanged.
+
+    Element lists taken and returned by the ArrayTable methods are lists of
+    bools; positions count flags. popcount(), any() and all() work on the
+    packed bytes without decoding them.
+    """
+
+    def insert(self, elements: list[Any]) -> tuple[int, int]:
+        """Insert an array of flags and return (byte_offset, byte_length)."""
+        return self._store(_pack_bits(elements), reserve=False)
+
+    def _encode(self, elements: list[Any]) -> bytes:
+        return _pack_bits(elements)
+
+    def get(self, start_index: int, length: int) -> list[bool]:
+        """Get an array of flags, decoded a byte at a time."""
+        if length == 0:
+            return []
+        data = self._raw(start_index, length)
+        flags = list(chain.from_iterable(map(_BYTE_BITS.__getitem__, data)))
+        del flags[self._flag_count(data[-1], length):]
+        return flags
+
+    def get_numpy(self, start_index: int, length: int) -> Any:
+        """Get an array of flags as a NumPy bool array.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        from typed_tables.numpy_support import require_numpy
+
+        np = require_numpy()
+        if length == 0:
+            return np.zeros(0, dtype=bool)
+        data = np.frombuffer(self._raw(start_index, length), dtype=np.uint8)
+        count = self._flag_count(int(data[-1]), length)
+        return np.unpackbits(data, count=count, bitorder="little").astype(bool)
+
+    @staticmethod
+    def _flag_count(last_byte: int, length: int) -> int:
+        return (length - 1) * 8 + last_byte.bit_length() - 1
+
+    def element_count(self, start_index: int, length: int) -> int:
+        """Return the number of flags in the array."""
+        if length == 0:
+            return 0
+        return self._flag_count(self.element_table.get(start_index + length - 1), length)
+
+    def popcount(self, start_index: int, length: int) -> int:
+        """Return the number of set flags in the array."""
+        if length == 0:
+            return 0
+        return int.from_bytes(self._raw(start_index, length), "little").bit_count() - 1
+
+    def any(self, start_index: int, length: int) -> bool:
+        """Return whether any flag of the array is set."""
+        return self.popcount(start_index, length) > 0
+
+    def all(self, start_index: int, length: int) -> bool:
+        """Return whether every flag of the array is set (True for an empty array)."""
+        return self.popcount(start_index, length) == self.element_count(start_index, length)
+
+    def append(self, start_index: int, length: int, new_elements: list[Any]) -> tuple[int, int]:
+        """Append flags. Extends in place into the array's slack or at the end of the table.
+
+        Only the array's last byte, which holds its sentinel, is rewritten;
+        the bytes before it are never touched.
+        """
+        if not new_elements:
+            return (start_index, length)
+        if length == 0:
+            return self._move(start_index, length, _pack_bits(new_elements))
+        last = start_index + length - 1
+        last_byte = self.element_table.get(last)
+        kept = last_byte.bit_length() - 1  # flags already in the last byte
+        tail = _pack_bits(list(_BYTE_BITS[last_byte][:kept]) + list(new_elements))
+        end = start_index + length
+        limit = self._slack.get(end, end)
+        if end + len(tail) - 1 > limit and limit != self.element_table.count:
+            return self._move(start_index, length, self._raw(start_index, length - 1) + tail)
+        if len(tail) > 1:
+            self._extend(start_index, length, tail[1:])
+        self.element_table.write_raw(last, tail[:1])
+        return (start_index, length + len(tail) - 1)
+
+    def prepend(self, start_index: int, length: int, new_elements: list[Any]) -> tuple[int, int]:
+        """Prepend flags. Copy-on-write."""
+        if not new_elements:
+            return (start_index, length)
+        flags = list(new_elements) + self.get(start_index, length)
+        return self._move(start_index, length, _pack_bits(flags))
+
+    def delete(self, start_index: int, length: int, indices_to_delete: set[int]) -> tuple[int, int]:
+        """Delete the flags at the given indices. Returns the new (byte_offset, byte_length).
+
+        Deleting from the end rewrites the new last byte in place and leaves
+        the bytes after it as slack; anything else is copy-on-write.
+        """
+        if not indices_to_delete:
+            return (start_index, length)
+        flags = self.get(start_index, length)
+        kept = len(flags) - len(indices_to_delete)
+        if kept == 0:
+            self.release(start_index, length)
+            return (0, 0)
+        if min(indices_to_delete) >= kept:
+            data = _pack_bits(flags[:kept])
+            self.element_table.write_raw(start_index + len(data) - 1, data[-1:])
+            return self._truncate(start_index, length, len(data))
+        kept_flags = [f for i, f in enumerate(flags) if i not in indices_to_delete]
+        return self._move(start_index, length, _pack_bits(kept_flags))
+
+    def update_in_place(
+        self, start_index: int, length: int, elements: list[Any],
+    ) -> tuple[int, int]:
+        """Overwrite the flags of an array with as many new ones.
+
+        Returns the (unchanged) reference.
+        """
+        data = _pack_bits(elements)
+        assert len(data) == length
+        if data:
+            self.element_table.write_raw(start_index, data)
+        return (start_index, length)
+
+
+class BigIntTable(ArrayTable):
+    """Manages storage for ``bigint`` and ``biguint`` values.
+
+    A value that fits in the (start_index, length) pair less one bit is
+    stored in the pair itself: the top bit of the length word is set as a
+    tag and the remaining bits hold the value, two's complement for bigint
+    (63 bits, or 127 with wide references). Larger values are stored in
+    the element table — a heap of uint8 records — as little-endian bytes,
+    two's complement for bigint, and read back with one slice. A heap
+    length never has its top bit set, so both kinds of pair can be told
+    apart without the metadata.
+
+    Databases created before inline values keep every value in the heap
+    (``inline`` False); their pairs still decode through get_int().
+    """
+
+    def __init__(
+        self, array_type: ArrayTypeDefinition, element_table: Table, inline: bool = True,
+    ) -> None:
+        super().__init__(array_type, element_table)
+        self.signed = isinstance(array_type, BigIntTypeDefinition)
+        self.inline = inline
+        self._word_bits = 8 * array_type.index_size
+        self._tag = 1 << (self._word_bits - 1)
+        # Values inline in a pair: 2 * word bits less the tag bit
+        self._inline_bits = 2 * self._word_bits - 1
+
+    def is_inline(self, length: int) -> bool:
+        """Return whether a pair with this length word holds its value inline."""
+        return bool(length & self._tag)
+
+    def insert_int(self, value: int) -> tuple[int, int]:
+        """Store a value and return the pair for its record field."""
+        if self.inline:
+            if self.signed:
+                fits = -(1 << (self._inline_bits - 1)) <= value < 1 << (self._inline_bits - 1)
+            else:
+                fits = 0 <= value < 1 << self._inline_bits
+            if fits:
+                payload = value & ((1 << self._inline_bits) - 1)
+                low = payload & ((1 << self._word_bits) - 1)
+                return (low, self._tag | payload >> self._word_bits)
+        return self._store(self._int_bytes(value), reserve=False)
+
+    def _int_bytes(self, value: int) -> bytes:
+        """Return the little-endian bytes a value is stored as in the heap."""
+        if self.signed:
+            return value.to_bytes((value.bit_length() + 8) // 8, "little", signed=True)
+        return value.to_bytes(max((value.bit_length() + 7) // 8, 1), "little")
+
+    def get_int(self, start_index: int, length: int) -> int:
+        """Get the value of a pair, inline or from the heap."""
+        if length & self._tag:
+            value = start_index | (length ^ self._tag) << self._word_bits
+            if self.signed and value >> (self._inline_bits - 1):
+                value -= 1 << self._inline_bits
+            return value
+        if length == 0:
+            return 0
+        return int.from_bytes(self.get_bytes(start_index, length), "little", signed=self.signed)
+
+    def get(self, start_index: int, length: int) -> list[Any]:
+        """Get the bytes of a value as a list of uint8.
+
+        An inline value is returned as if it were in the heap.
+        """
+        return list(self.get_bytes(start_index, length))
+
+    def get_bytes(self, start_index: int, length: int) -> bytes:
+        """Get the bytes of a value, an inline value as if it were in the heap."""
+        if length & self._tag:
+            return self._int_bytes(self.get_int(start_index, length))
+        return super().get_bytes(start_index, length)
+
+    def element_count(self, start_index: int, length: int) -> int:
+        return 0 if length & self._tag else length
+
+    def release(self, start_index: int, length: int) -> None:
+        if not length & self._tag:
+            super().release(start_index, length)
 
 
 def create_array_table(
     array_type: ArrayTypeDefinition,
     data_dir: Path,
     table_name: str | None = None,
+    read_only: bool = False,
 ) -> ArrayTable:
     """Create an ArrayTable with its element table.
 
@@ -153,6 +994,7 @@ def create_array_table(
         table_name: Optional name for the table files. If not provided,
             uses the array_type's name. This allows aliases to have
             their own named tables.
+        read_only: Open the element table read-only.
 
     Returns:
         An ArrayTable instance.
@@ -165,6 +1007,116 @@ def create_array_table(
     element_table = Table(
         element_type,
         data_dir / f"{table_name}.bin",
+        read_only=read_only,
     )
 
     return ArrayTable(array_type, element_table)
+
+
+def create_string_table(
+    string_type: ArrayTypeDefinition,
+    byte_type: TypeDefinition,
+    data_dir: Path,
+    table_name: str | None = None,
+    read_only: bool = False,
+) -> StringTable:
+    """Create a StringTable with its heap of ``byte_type`` (uint8) records.
+
+    Args:
+        string_type: The string type definition.
+        byte_type: The uint8 type definition of the heap records.
+        data_dir: Directory to store table files.
+        table_name: Optional name for the heap file (default: the type's name).
+        read_only: Open the heap read-only.
+    """
+    if table_name is None:
+        table_name = string_type.name
+    heap = Table(byte_type, data_dir / f"{table_name}.bin", read_only=read_only)
+    return StringTable(string_type, heap)
+
+
+def create_bit_table(
+    array_type: ArrayTypeDefinition,
+    byte_type: TypeDefinition,
+    data_dir: Path,
+    table_name: str | None = None,
+    read_only: bool = False,
+) -> BitTable:
+    """Create a BitTable with its table of ``byte_type`` (uint8) records.
+
+    Args:
+        array_type: The bit or boolean array (or set) type definition.
+        byte_type: The uint8 type definition of the packed bytes.
+        data_dir: Directory to store table files.
+        table_name: Optional name for the table file (default: the type's name).
+        read_only: Open the table read-only.
+    """
+    if table_name is None:
+        table_name = array_type.name
+    packed = Table(byte_type, data_dir / f"{table_name}.bin", read_only=read_only)
+    return BitTable(array_type, packed)
+
+
+def create_bigint_table(
+    bigint_type: ArrayTypeDefinition,
+    data_dir: Path,
+    table_name: str | None = None,
+    read_only: bool = False,
+    inline: bool = True,
+) -> BigIntTable:
+    """Create a BigIntTable with its heap of uint8 records.
+
+    Args:
+        bigint_type: The bigint or biguint type definition.
+        data_dir: Directory to store table files.
+        table_name: Optional name for the heap file (default: the type's name).
+        read_only: Open the heap read-only.
+        inline: Store values that fit in the pair inline (False for older databases).
+    """
+    if table_name is None:
+        table_name = bigint_type.name
+    heap = Table(
+        bigint_type.element_type.resolve_base_type(), data_dir / f"{table_name}.bin",
+        read_only=read_only,
+    )
+    return BigIntTable(bigint_type, heap, inline)
+
+
+def create_interned_string_table(
+    string_type: ArrayTypeDefinition,
+    byte_type: TypeDefinition,
+    hash_type: TypeDefinition,
+    index_type: TypeDefinition,
+    data_dir: Path,
+    table_name: str | None = None,
+    read_only: bool = False,
+) -> InternedStringTable:
+    """Create an InternedStringTable with its heap and its index.
+
+    The index lives in ``<table_name>.intern.bin``; its records are the
+    slots of a hash table, each (hash: ``hash_type``, start: ``index_type``,
+    length: ``index_type``).
+
+    Args:
+        string_type: The interned string type definition.
+        byte_type: The uint8 type definition of the heap records.
+        hash_type: The uint64 type definition of the index hashes.
+        index_type: The type of heap offsets and lengths (uint32, or uint64 with wide references).
+        data_dir: Directory to store table files.
+        table_name: Optional name for the heap file (default: the type's name).
+        read_only: Open both tables read-only.
+    """
+    if table_name is None:
+        table_name = string_type.name
+    heap = Table(byte_type, data_dir / f"{table_name}.bin", read_only=read_only)
+    entry_type = CompositeTypeDefinition(
+        name=f"{table_name}{InternedStringTable.INDEX_SUFFIX}",
+        fields=[
+            FieldDefinition(name="hash", type_def=hash_type),
+            FieldDefinition(name="start", type_def=index_type),
+            FieldDefinition(name="length", type_def=index_type),
+        ],
+        wide_references=string_type.wide_references,
+    )
+    index = Table(entry_type, data_dir / f"{entry_type.name}.bin", read_only=read_only)
+    return InternedStringTable(string_type, heap, index)
@@ -0,0 +1,288 @@
+"""Page checksums for table files.
+
+A database with checksums enabled keeps a sidecar next to every table file
+holding a CRC32 of each 4 KB page of the file's live bytes (the header and
+every record up to the header count). Writes mark the pages they touch,
+and tables recompute and save those pages' checksums at the end of each
+statement (and on every flush), so a page whose bytes no longer match its
+checksum was damaged outside of the table: a torn write after a host
+crash, a bad disk block, or an edit by another program.
+
+Checking whole pages keeps verification at sequential-I/O speed: a table
+file is read in large chunks and each page is checksummed once.
+
+Sidecar layout::
+
+    page_size:u32  record_size:u32  covered:u64  crc32:u32 * ceil(covered / page_size)
+
+``covered`` is the number of file bytes the checksums cover; the last page
+may be partial.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+CHECKSUM_SUFFIX = ".crc"
+CHECKSUM_PAGE_SIZE = 4096
+
+_HEADER = struct.Struct("<IIQ")  # page_size, record_size, covered
+
+# Pages read per chunk when verifying a whole file
+_VERIFY_CHUNK_PAGES = 256
+
+
+class ChecksumError(Exception):
+    """Raised when a page of a table file does not match its checksum."""
+
+    def __init__(self, path: Path, page: int, record_size: int) -> None:
+        self.path = path
+        self.page = page
+        first, last = page_records(page, record_size)
+        where = f"records {first}-{last}" if first <= last else "header"
+        super().__init__(f"Checksum mismatch in {path.name}, page {page} ({where})")
+
+
+def checksum_path(table_path: Path) -> Path:
+    """Return the checksum sidecar path of a table file."""
+    return table_path.with_suffix(CHECKSUM_SUFFIX)
+
+
+def page_records(page: int, record_size: int) -> tuple[int, int]:
+    """Return the first and last index of the records overlapping a page.
+
+    The range is empty (first > last) for a page holding only the header.
+    """
+    start = max(page * CHECKSUM_PAGE_SIZE, 8)
+    end = (page + 1) * CHECKSUM_PAGE_SIZE
+    return (start - 8) // record_size, (end - 9) // record_size
+
+
+def _page_count(covered: int) -> int:
+    return -(-covered // CHECKSUM_PAGE_SIZE)
+
+
+def _read_sidecar(path: Path) -> tuple[int, int, list[int]] | None:
+    """Return (record_size, covered, checksums) from a sidecar, or None if unusable."""
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    if len(data) < _HEADER.size:
+        return None
+    page_size, record_size, covered = _HEADER.unpack_from(data, 0)
+    pages = _page_count(covered)
+    if page_size != CHECKSUM_PAGE_SIZE or len(data) != _HEADER.size + 4 * pages:
+        return None
+    return record_size, covered, list(struct.unpack_from(f"<{pages}I", data, _HEADER.size))
+
+
+class PageChecksums:
+    """The page checksums of one table file, kept in step with its mapping.
+
+    Writes mark the pages they touch stale; update() recomputes those pages
+    from the mapping and save() writes the changed entries to the sidecar.
+    """
+
+    def __init__(self, table_path: Path, record_size: int, read_only: bool = False) -> None:
+        self.path = checksum_path(table_path)
+        self.record_size = record_size
+        self.read_only = read_only
+        self.checksums: list[int] = []
+        self.covered = 0
+        self._stale: set[int] = set()  # pages written since the last update()
+        self._changed: set[int] = set()  # entries updated since the last save()
+        self._header_changed = False
+        self._unsynced = False
+        self._fd: int | None = None
+
+    def load(self) -> bool:
+        """Read the sidecar. Returns False if it is missing or unusable."""
+        saved = _read_sidecar(self.path)
+        if saved is None or saved[0] != self.record_size:
+            return False
+        _, self.covered, self.checksums = saved
+        self._stale.clear()
+        return True
+
+    def rebuild(self, buffer: Any, live_bytes: int) -> None:
+        """Checksum every live page of ``buffer`` and rewrite the sidecar."""
+        self.checksums = []
+        self.covered = 0
+        self._stale = set(range(_page_count(live_bytes)))
+        self.update(buffer, live_bytes)
+        self.save()
+
+    def mark(self, offset: int, length: int) -> None:
+        """Mark the pages overlapping [offset, offset + length) as stale."""
+        if length > 0:
+            first = offset // CHECKSUM_PAGE_SIZE
+            self._stale.update(range(first, (offset + length - 1) // CHECKSUM_PAGE_SIZE + 1))
+
+    def update(self, buffer: Any, live_bytes: int) -> None:
+        """Recompute the stale pages from ``buffer``, which holds ``live_bytes`` live bytes."""
+        if live_bytes != self.covered:
+            # The page holding the old (or new) end changes coverage
+            if min(live_bytes, self.covered) > 0:
+                self.mark(min(live_bytes, self.covered) - 1, 1)
+            self.covered = live_bytes
+            self._header_changed = True
+        pages = _page_count(live_bytes)
+        checksums = self.checksums
+        if len(checksums) > pages:
+            del checksums[pages:]
+        elif len(checksums) < pages:
+            self._stale.update(range(len(checksums), pages))
+            checksums.extend([0] * (pages - len(checksums)))
+        for page in self._stale:
+            if page < pages:
+                start = page * CHECKSUM_PAGE_SIZE
+                end = min(start + CHECKSUM_PAGE_SIZE, live_bytes)
+                checksums[page] = zlib.crc32(buffer[start:end])
+                self._changed.add(page)
+        self._stale.clear()
+
+    def save(self, fsync: bool = False) -> None:
+        """Write the changed entries to the sidecar, fsyncing it if requested."""
+        if self.read_only:
+            return
+        if self._changed or self._header_changed:
+            if self._fd is None:
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            pages = len(self.checksums)
+            changed = [page for page in self._changed if page < pages]
+            if changed:
+                # Writes usually touch neighbouring pages: write one span
+                first, last = min(changed), max(changed)
+                span = self.checksums[first : last + 1]
+                os.pwrite(self._fd, struct.pack(f"<{len(span)}I", *span), _HEADER.size + 4 * first)
+            header = _HEADER.pack(CHECKSUM_PAGE_SIZE, self.record_size, self.covered)
+            os.pwrite(self._fd, header, 0)
+            os.ftruncate(self._fd, _HEADER.size + 4 * pages)
+            self._changed.clear()
+            self._header_changed = False
+            self._unsynced = True
+        if fsync and self._unsynced:
+            os.fsync(self._fd)  # type: ignore[arg-type]
+            self._unsynced = False
+
+    def check(self, buffer: Any, offset: int, length: int) -> None:
+        """Verify the pages overlapping [offset, offset + length) of ``buffer``.
+
+        Raises:
+            ChecksumError: If a page does not match its checksum.
+        """
+        end = min(offset + length, self.covered)
+        if offset >= end:
+            return
+        for page in range(offset // CHECKSUM_PAGE_SIZE, (end - 1) // CHECKSUM_PAGE_SIZE + 1):
+            if page in self._stale:
+                continue
+            start = page * CHECKSUM_PAGE_SIZE
+            data = buffer[start : min(start + CHECKSUM_PAGE_SIZE, self.covered)]
+            if zlib.crc32(data) != self.checksums[page]:
+                raise ChecksumError(self.path.with_suffix(".bin"), page, self.record_size)
+
+    def close(self) -> None:
+        """Save pending entries durably and close the sidecar."""
+        self.save(fsync=True)
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def remove(self) -> None:
+        """Close and delete the sidecar."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self._changed.clear()
+        self._header_changed = False
+        self._unsynced = False
+        self.path.unlink(missing_ok=True)
+
+
+def rebuild_checksum_file(table_path: Path) -> None:
+    """Recompute the sidecar of a table file changed outside of its Table.
+
+    Used after WAL recovery. A sidecar that cannot be read is removed, so it
+    is rebuilt when the table is next opened.
+    """
+    sidecar = checksum_path(table_path)
+    saved = _read_sidecar(sidecar)
+    if saved is None or not table_path.exists():
+        sidecar.unlink(missing_ok=True)
+        return
+    record_size = saved[0]
+    data = table_path.read_bytes()
+    (count,) = struct.unpack_from("<Q", data, 0)
+    live_bytes = min(len(data), 8 + count * record_size)
+    checksums = PageChecksums(table_path, record_size)
+    checksums.rebuild(memoryview(data), live_bytes)
+    checksums.close()
+
+
+@dataclass
+class FileVerification:
+    """The result of verifying one table file against its sidecar."""
+
+    path: Path
+    pages: int = 0
+    bad_pages: list[int] = field(default_factory=list)
+    record_size: int = 0
+    missing: bool = False  # no usable sidecar
+
+
+@dataclass
+class VerifyReport:
+    """Summary of a database verification."""
+
+    files: list[FileVerification] = field(default_factory=list)
+
+    @property
+    def pages(self) -> int:
+        return sum(f.pages for f in self.files)
+
+    @property
+    def problems(self) -> list[FileVerification]:
+        """Return the files with bad pages or no checksums."""
+        return [f for f in self.files if f.bad_pages or f.missing]
+
+
+def verify_file(table_path: Path) -> FileVerification:
+    """Checksum every covered page of a table file and compare with its sidecar.
+
+    Pages past the end of a truncated file are reported bad.
+    """
+    result = FileVerification(table_path)
+    saved = _read_sidecar(checksum_path(table_path))
+    if saved is None:
+        result.missing = True
+        return result
+    result.record_size, covered, checksums = saved
+    result.pages = len(checksums)
+    chunk = CHECKSUM_PAGE_SIZE * _VERIFY_CHUNK_PAGES
+    with open(table_path, "rb") as f:
+        for first in range(0, len(checksums), _VERIFY_CHUNK_PAGES):
+            data = memoryview(f.read(min(chunk, covered - first * CHECKSUM_PAGE_SIZE)))
+            for page in range(first, min(first + _VERIFY_CHUNK_PAGES, len(checksums))):
+                start = (page - first) * CHECKSUM_PAGE_SIZE
+                expected = min(CHECKSUM_PAGE_SIZE, covered - page * CHECKSUM_PAGE_SIZE)
+                piece = data[start : start + CHECKSUM_PAGE_SIZE]
+                if len(piece) != expected or zlib.crc32(piece) != checksums[page]:
+                    result.bad_pages.append(page)
+    return result
+
+
+def verify_files(paths: Iterable[Path], workers: int | None = None) -> VerifyReport:
+    """Verify table files in parallel, one file per worker thread at a time."""
+    paths = list(paths)
+    if not paths:
+        return VerifyReport()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return VerifyReport(list(pool.map(verify_file, paths)))
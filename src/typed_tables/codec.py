@@ -0,0 +1,356 @@
+"""Precompiled record codecs for table storage.
+
+A codec is compiled once per table from its type definition. It holds a single
+``struct.Struct`` covering the whole record plus a per-field plan describing how
+to turn the unpacked slots into Python values (and back), so reading or writing a
+record costs one ``unpack_from``/``pack`` call instead of a walk over the type tree.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import Any, Callable
+
+from typed_tables.types import (
+    ArrayTypeDefinition,
+    CompositeTypeDefinition,
+    DictionaryTypeDefinition,
+    EnumTypeDefinition,
+    EnumValue,
+    FractionTypeDefinition,
+    InterfaceTypeDefinition,
+    NULL_REF,
+    NULL_REF_32,
+    PrimitiveType,
+    PrimitiveTypeDefinition,
+    TypeDefinition,
+)
+
+
+# struct format codes for primitives stored in a single slot
+PRIMITIVE_FORMATS: dict[PrimitiveType, str] = {
+    PrimitiveType.BIT: "?",
+    PrimitiveType.CHARACTER: "I",  # Unicode code point
+    PrimitiveType.UINT8: "B",
+    PrimitiveType.INT8: "b",
+    PrimitiveType.UINT16: "H",
+    PrimitiveType.INT16: "h",
+    PrimitiveType.UINT32: "I",
+    PrimitiveType.INT32: "i",
+    PrimitiveType.UINT64: "Q",
+    PrimitiveType.INT64: "q",
+    PrimitiveType.FLOAT16: "e",
+    PrimitiveType.FLOAT32: "f",
+    PrimitiveType.FLOAT64: "d",
+}
+
+_DISCRIMINANT_FORMATS = {1: "B", 2: "H", 4: "I"}
+
+
+def index_format(type_def: TypeDefinition) -> str:
+    """Return the struct format code of one table index stored for ``type_def``.
+
+    Indexes are uint32, or uint64 in a registry with wide references.
+    """
+    return "Q" if type_def.wide_references else "I"
+
+
+_MASK_64 = (1 << 64) - 1
+
+
+def _encode_character(value: Any) -> int:
+    if isinstance(value, str):
+        return ord(value[0]) if value else 0
+    return value
+
+
+def _decode_character(code_point: int) -> str:
+    return chr(code_point) if code_point else "\x00"
+
+
+def _encode_int128(value: Any) -> tuple[int, int]:
+    if isinstance(value, str):
+        # Parse UUID-like strings
+        value = int(value.replace("-", ""), 16)
+    return (value & _MASK_64, (value >> 64) & _MASK_64)
+
+
+def _decode_int128(parts: tuple[int, int]) -> int:
+    low, high = parts
+    return (high << 64) | low
+
+
+class FieldCodec:
+    """Slot layout and converters for one value within a record.
+
+    Attributes:
+        fmt: struct format codes for the value (without byte-order prefix).
+        width: Number of struct slots the value occupies.
+        encode: Converts a Python value into slot value(s), or None for identity.
+            When ``width > 1`` the result must be a tuple of ``width`` items.
+        decode: Converts slot value(s) back into a Python value, or None for
+            identity. When ``width > 1`` it receives a tuple of slots.
+    """
+
+    __slots__ = ("fmt", "width", "encode", "decode", "zeros")
+
+    def __init__(
+        self,
+        fmt: str,
+        encode: Callable[[Any], Any] | None = None,
+        decode: Callable[[Any], Any] | None = None,
+    ) -> None:
+        self.fmt = fmt
+        self.encode = encode
+        self.decode = decode
+        # Slot values that pack to all-zero bytes (used for null fields)
+        self.zeros: tuple[Any, ...] = struct.unpack("<" + fmt, bytes(struct.calcsize("<" + fmt)))
+        self.width = len(self.zeros)
+
+
+def _primitive_field_codec(primitive: PrimitiveType) -> FieldCodec:
+    if primitive == PrimitiveType.CHARACTER:
+        return FieldCodec("I", _encode_character, _decode_character)
+    if primitive in (PrimitiveType.UINT128, PrimitiveType.INT128):
+        return FieldCodec("QQ", _encode_int128, _decode_int128)
+    return FieldCodec(PRIMITIVE_FORMATS[primitive])
+
+
+def _enum_field_codec(enum_def: EnumTypeDefinition) -> FieldCodec:
+    disc_fmt = _DISCRIMINANT_FORMATS[enum_def.discriminant_size]
+    if enum_def.has_associated_values:
+        # Swift-style: (discriminant, variant_table_index)
+        if enum_def.wide_references:
+            return FieldCodec(disc_fmt + "Q")
+        # Bare variants hold NULL_REF, stored in the uint32 as NULL_REF_32
+
+        def decode_ref(slots: tuple[int, int]) -> tuple[int, int]:
+            return (slots[0], NULL_REF) if slots[1] == NULL_REF_32 else slots
+
+        def encode_ref(value: tuple[int, int]) -> tuple[int, int]:
+            return (value[0], NULL_REF_32) if value[1] == NULL_REF else value
+
+        return FieldCodec(disc_fmt + "I", encode_ref, decode_ref)
+
+    # C-style: discriminant only, decoded straight to EnumValue
+    names = {v.discriminant: v.name for v in enum_def.variants}
+
+    def decode(disc: int) -> EnumValue:
+        return EnumValue(variant_name=names.get(disc, "?"), discriminant=disc)
+
+    def encode(value: EnumValue) -> int:
+        return value.discriminant
+
+    return FieldCodec(disc_fmt, encode, decode)
+
+
+def field_codec(type_def: TypeDefinition) -> FieldCodec | None:
+    """Build the codec for a value of ``type_def`` stored inline in a record.
+
+    Returns None if the type cannot be stored inline.
+    """
+    base = type_def.resolve_base_type()
+    if isinstance(base, EnumTypeDefinition):
+        return _enum_field_codec(base)
+    if isinstance(base, FractionTypeDefinition):
+        # (num_start, num_len, den_start, den_len)
+        return FieldCodec(index_format(base) * 4)
+    if isinstance(base, InterfaceTypeDefinition):
+        # Tagged reference: (type_id, index)
+        return FieldCodec("H" + index_format(base))
+    if isinstance(base, (DictionaryTypeDefinition, ArrayTypeDefinition)):
+        # (start_index, length)
+        return FieldCodec(index_format(base) * 2)
+    if isinstance(base, CompositeTypeDefinition):
+        return FieldCodec(index_format(base))
+    if isinstance(base, PrimitiveTypeDefinition):
+        return _primitive_field_codec(base.primitive)
+    return None
+
+
+class RecordCodec:
+    """Compiled serializer for the records of one table.
+
+    Composite records are laid out as ``[null_bitmap] [field0] [field1] ...``
+    and decode to a dict of field values (None for null fields). All other
+    table types hold a single value per record.
+    """
+
+    def __init__(self, type_def: TypeDefinition) -> None:
+        self.type_def = type_def
+        self.is_composite = isinstance(type_def, CompositeTypeDefinition)
+        self.supported = True
+
+        if isinstance(type_def, CompositeTypeDefinition):
+            self._compile_composite(type_def)
+        else:
+            if isinstance(type_def, ArrayTypeDefinition):
+                # Array tables hold (start_index, length) headers
+                codec: FieldCodec | None = FieldCodec(index_format(type_def) * 2)
+            else:
+                base = type_def.resolve_base_type()
+                if isinstance(base, (PrimitiveTypeDefinition, EnumTypeDefinition)):
+                    codec = field_codec(base)
+                else:
+                    codec = None
+            if codec is None:
+                self.supported = False
+                codec = FieldCodec("")
+            self._value = codec
+            self.struct = struct.Struct("<" + codec.fmt)
+
+        self.size = self.struct.size
+
+    def _compile_composite(self, type_def: CompositeTypeDefinition) -> None:
+        bitmap_size = type_def.null_bitmap_size
+        fmt = [f"{bitmap_size}s"] if bitmap_size else []
+        pos = 1 if bitmap_size else 0
+        plan: list[tuple[str, int, int, int, int, FieldCodec]] = []
+        for i, f in enumerate(type_def.fields):
+            codec = field_codec(f.type_def)
+            if codec is None:
+                self.supported = False
+                codec = FieldCodec(f"{f.type_def.reference_size}x")
+            plan.append((f.name, i >> 3, 1 << (i & 7), pos, codec.width, codec))
+            fmt.append(codec.fmt)
+            pos += codec.width
+        self._bitmap_size = bitmap_size
+        self._plan = plan
+        self.struct = struct.Struct("<" + "".join(fmt))
+
+    def _check_supported(self) -> None:
+        if not self.supported:
+            raise TypeError(f"Cannot serialize type: {self.type_def.name}")
+
+    # --- Encoding ---
+
+    def pack(self, value: Any) -> bytes:
+        """Serialize a value into a record."""
+        self._check_supported()
+        if not self.is_composite:
+            codec = self._value
+            if codec.encode is not None:
+                value = codec.encode(value)
+            if codec.width == 1:
+                return self.struct.pack(value)
+            return self.struct.pack(*value)
+
+        if isinstance(value, (list, tuple)):
+            value = {entry[0]: value[i] for i, entry in enumerate(self._plan)}
+        elif not isinstance(value, dict):
+            raise TypeError(f"Expected dict or tuple for composite type, got {type(value)}")
+
+        bitmap = bytearray(self._bitmap_size)
+        slots: list[Any] = [bitmap] if self._bitmap_size else []
+        for name, bit_byte, bit_mask, _pos, width, codec in self._plan:
+            field_value = value.get(name)
+            if field_value is None:
+                bitmap[bit_byte] |= bit_mask
+                slots.extend(codec.zeros)
+                continue
+            if codec.encode is not None:
+                field_value = codec.encode(field_value)
+            if width == 1:
+                slots.append(field_value)
+            else:
+                slots.extend(field_value)
+        if self._bitmap_size:
+            slots[0] = bytes(bitmap)
+        return self.struct.pack(*slots)
+
+    # --- Decoding ---
+
+    def unpack(self, data: Any) -> Any:
+        """Deserialize a whole record buffer."""
+        return self.unpack_from(data, 0)
+
+    def unpack_from(self, buffer: Any, offset: int = 0) -> Any:
+        """Deserialize the record starting at ``offset`` in ``buffer``."""
+        self._check_supported()
+        slots = self.struct.unpack_from(buffer, offset)
+        if not self.is_composite:
+            codec = self._value
+            value = slots[0] if codec.width == 1 else slots
+            return value if codec.decode is None else codec.decode(value)
+        return self._decode_slots(slots)
+
+    def unpack_many(self, buffer: Any) -> list[Any]:
+        """Deserialize every record of a buffer holding whole records, in one pass."""
+        self._check_supported()
+        rows = self.struct.iter_unpack(buffer)
+        if self.is_composite:
+            return [self._decode_slots(slots) for slots in rows]
+        codec = self._value
+        if codec.width == 1:
+            values = [slots[0] for slots in rows]
+        else:
+            values = list(rows)
+        if codec.decode is None:
+            return values
+        return [codec.decode(value) for value in values]
+
+    def _decode_slots(self, slots: tuple[Any, ...]) -> dict[str, Any]:
+        bitmap = slots[0] if self._bitmap_size else b""
+        result: dict[str, Any] = {}
+        for name, bit_byte, bit_mask, pos, width, codec in self._plan:
+            if bitmap and bitmap[bit_byte] & bit_mask:
+                result[name] = None
+                continue
+            value = slots[pos] if width == 1 else slots[pos : pos + width]
+            result[name] = value if codec.decode is None else codec.decode(value)
+        return result
+
+
+class ColumnCodec:
+    """Compiled reader for a subset of a composite record's fields.
+
+    The struct skips over every unselected field, so unpacking a record
+    only converts the requested columns (plus the null bitmap).
+    """
+
+    def __init__(self, type_def: CompositeTypeDefinition, names: list[str]) -> None:
+        self.names = list(names)
+        bitmap_size = type_def.null_bitmap_size
+        field_index = {f.name: i for i, f in enumerate(type_def.fields)}
+
+        selected: list[tuple[int, int, str]] = []  # (offset, output position, name)
+        for out_pos, name in enumerate(self.names):
+            offset = type_def.get_field_offset(name)  # raises KeyError for unknown fields
+            selected.append((offset, out_pos, name))
+        selected.sort()
+
+        fmt = [f"{bitmap_size}s"] if bitmap_size else []
+        pos = 1 if bitmap_size else 0
+        cursor = bitmap_size
+        plan: list[tuple[int, int, int, int, int, FieldCodec]] = []
+        for offset, out_pos, name in selected:
+            if offset < cursor:
+                raise ValueError(f"Field '{name}' selected more than once")
+            i = field_index[name]
+            fdef = type_def.fields[i]
+            codec = field_codec(fdef.type_def)
+            if codec is None:
+                raise TypeError(f"Cannot scan field: {type_def.name}.{name}")
+            if offset > cursor:
+                fmt.append(f"{offset - cursor}x")
+            fmt.append(codec.fmt)
+            plan.append((out_pos, i >> 3, 1 << (i & 7), pos, codec.width, codec))
+            pos += codec.width
+            cursor = offset + fdef.type_def.reference_size
+        if type_def.size_bytes > cursor:
+            fmt.append(f"{type_def.size_bytes - cursor}x")
+
+        self._bitmap_size = bitmap_size
+        self._plan = plan
+        self.struct = struct.Struct("<" + "".join(fmt))
+
+    def decode(self, slots: tuple[Any, ...]) -> tuple[Any, ...]:
+        """Turn one unpacked record into a tuple of the selected values (None for null)."""
+        bitmap = slots[0] if self._bitmap_size else b""
+        values: list[Any] = [None] * len(self.names)
+        for out_pos, bit_byte, bit_mask, pos, width, codec in self._plan:
+            if bitmap and bitmap[bit_byte] & bit_mask:
+                continue
+            value = slots[pos] if width == 1 else slots[pos : pos + width]
+            values[out_pos] = value if codec.decode is None else codec.decode(value)
+        return tuple(values)
@@ -23,6 +23,7 @@ from typed_tables.types import (
     FieldDefinition,
     FractionTypeDefinition,
     InterfaceTypeDefinition,
+    InternedStringTypeDefinition,
     OverflowTypeDefinition,
     PrimitiveType,
     PrimitiveTypeDefinition,
@@ -53,6 +54,7 @@ def load_registry_from_metadata(data_dir: Path) -> TypeRegistry:
         metadata = json.load(f)
 
     registry = TypeRegistry()
+    registry.set_wide_references(bool(metadata.get("wide_references", False)))
     types_data = metadata.get("types", {})
 
     # Phase 1: Pre-register stubs for all composite, enum, and interface types
@@ -137,6 +139,8 @@ def _create_type_from_spec(
     elif kind == "alias":
         base_type = registry.get_or_raise(spec["base_type"])
         return AliasTypeDefinition(name=name, base_type=base_type)
+    elif kind == "interned_string":
+        return InternedStringTypeDefinition(name=name, element_type=registry.get_or_raise("character"))
     elif kind == "string":
         # Already registered by _register_primitives; kept for backward compat
         return None
@@ -530,10 +534,7 @@ def dump_table_resolved(
                         resolved = []
                     else:
                         arr_table = storage.get_array_table_for_type(field.type_def)
-                        resolved = [
-                            arr_table.element_table.get(start_index + j)
-                            for j in range(length)
-                        ]
+                        resolved = arr_table.get(start_index, length)
                     formatted = format_value(resolved, field.type_def)
                 elif isinstance(field_base, CompositeTypeDefinition):
                     # Resolve nested composite (just show index for now)
@@ -604,10 +605,7 @@ def dump_table_json(
                             rec[field.name] = []
                         else:
                             arr_table = storage.get_array_table_for_type(field.type_def)
-                            rec[field.name] = [
-                                arr_table.element_table.get(start_index + j)
-                                for j in range(length)
-                            ]
+                            rec[field.name] = arr_table.get(start_index, length)
                     elif isinstance(field_base, CompositeTypeDefinition):
                         rec[field.name] = f"<{field.type_def.name}[{ref}]>"
                     else:
@@ -82,11 +82,7 @@ class InstanceRef:
                     result[field.name] = []
                 else:
                     array_table = self.schema.storage.get_array_table_for_type(field.type_def)
-                    elements = [
-                        array_table.element_table.get(start_index + i)
-                        for i in range(length)
-                    ]
-                    result[field.name] = elements
+                    result[field.name] = array_table.get(start_index, length)
             elif isinstance(field_base, CompositeTypeDefinition):
                 # Resolve nested composite reference (index)
                 nested_table = self.schema.storage.get_table(field.type_def.name)
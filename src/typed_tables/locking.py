@@ -0,0 +1,152 @@
+"""Inter-process locks on a database directory.
+
+Two lock files in the database directory coordinate processes that share it:
+
+``_writer.lock``
+    Held exclusively by the one writable StorageManager for its whole
+    session. A second writer waits for it (up to the lock timeout).
+    Read-only managers never take it.
+
+``_lock``
+    A reader/writer lock held for the duration of each statement (or a
+    whole transaction): shared by readers, exclusive by the writer. A
+    reader holding it sees the header counts and records the writer
+    published at its last statement boundary, and nothing half-written.
+
+Locks are ``flock`` locks, so they belong to an open file rather than a
+process: two managers in one process exclude each other just like two
+processes do, and the OS drops them if the process dies. Where fcntl is
+unavailable, locking is a no-op.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None  # type: ignore[assignment]
+
+
+LOCK_FILE = "_lock"
+WRITER_LOCK_FILE = "_writer.lock"
+
+# Seconds to wait for a lock before giving up (None waits forever)
+DEFAULT_LOCK_TIMEOUT = 10.0
+
+
+class LockTimeout(TimeoutError):
+    """Raised when a database lock is not granted within the lock timeout."""
+
+
+def _flock(fd: int, operation: int, timeout: float | None, description: str) -> None:
+    """Take a flock lock, polling until it is granted or ``timeout`` expires."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    delay = 0.001
+    while True:
+        try:
+            fcntl.flock(fd, operation | fcntl.LOCK_NB)
+            return
+        except BlockingIOError:
+            pass
+        if deadline is not None and time.monotonic() >= deadline:
+            raise LockTimeout(f"Timed out after {timeout}s waiting for {description}")
+        time.sleep(delay)
+        delay = min(delay * 2, 0.05)
+
+
+class DatabaseLock:
+    """The locks one StorageManager holds on its database directory."""
+
+    def __init__(
+        self, data_dir: Path, read_only: bool = False, timeout: float | None = DEFAULT_LOCK_TIMEOUT,
+    ) -> None:
+        """Open the lock files and, for a writer, take the writer lock.
+
+        Args:
+            data_dir: The database directory (must exist).
+            read_only: Take shared statement locks and no writer lock.
+            timeout: Seconds to wait for any lock, or None to wait forever.
+
+        Raises:
+            LockTimeout: If another writer holds the database.
+        """
+        self.data_dir = data_dir
+        self.read_only = read_only
+        self.timeout = timeout
+        self._writer_fd: int | None = None
+        self._statement_fd: int | None = None
+        self._statement_locked = False
+        if fcntl is None:
+            return
+
+        if read_only:
+            # A read-only manager never creates files; the lock file is
+            # opened once a writer has created it.
+            self._open_reader_lock()
+            return
+
+        self._statement_fd = os.open(data_dir / LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+        self._writer_fd = os.open(data_dir / WRITER_LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            _flock(self._writer_fd, fcntl.LOCK_EX, timeout, f"another writer to close {data_dir}")
+        except BaseException:
+            self.close()
+            raise
+
+    def _open_reader_lock(self) -> None:
+        """Open the statement lock file for shared locking, if it exists."""
+        if fcntl is None:
+            return
+        try:
+            self._statement_fd = os.open(self.data_dir / LOCK_FILE, os.O_RDONLY)
+        except FileNotFoundError:
+            pass
+
+    @property
+    def statement_locked(self) -> bool:
+        """Return whether the statement lock is held."""
+        return self._statement_locked
+
+    def acquire_statement(self) -> None:
+        """Take the statement lock (shared for readers, exclusive for the writer).
+
+        Does nothing if the lock is already held.
+
+        Raises:
+            LockTimeout: If the lock is not granted within the timeout.
+        """
+        if self._statement_locked:
+            return
+        if fcntl is None:
+            self._statement_locked = True
+            return
+        if self.read_only:
+            if self._statement_fd is None:
+                self._open_reader_lock()
+            operation, waiting_for = fcntl.LOCK_SH, "the writer to finish its statement"
+        else:
+            operation, waiting_for = fcntl.LOCK_EX, "readers to finish their statements"
+        if self._statement_fd is not None:
+            _flock(self._statement_fd, operation, self.timeout, waiting_for)
+        self._statement_locked = True
+
+    def release_statement(self) -> None:
+        """Release the statement lock if it is held."""
+        if not self._statement_locked:
+            return
+        self._statement_locked = False
+        if self._statement_fd is not None:
+            fcntl.flock(self._statement_fd, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        """Release every lock and close the lock files."""
+        for fd in (self._statement_fd, self._writer_fd):
+            if fd is not None:
+                os.close(fd)  # closing the descriptor drops its flock
+        self._statement_fd = None
+        self._writer_fd = None
+        self._statement_locked = False
@@ -83,15 +83,22 @@ KEYWORDS: dict[str, str] = {
     "json": "JSON output format for dump",
     "xml": "XML output format for dump",
     "compact": "Compact the database (remove tombstones)",
+    "vacuum": "Compact tables in place (vacuum [Type])",
     "archive": "Bundle the database into a .ttar archive",
     "restore": "Extract a .ttar archive into a database",
     "execute": "Run queries from a script file",
     "import": "Import a script (execute once per database)",
+    "sync": "Flush all pending table writes to disk",
+    "verify": "Check every table file against its page checksums",
+    "begin": "Start a transaction",
+    "commit": "Commit the current transaction",
+    "rollback": "Undo every write since begin",
     "system": "Modifier for system types (show system types)",
     "temporary": "Mark a database as temporary (use … as temporary)",
     "named": "Name a result column (expr named \"label\")",
     "saturating": "Overflow policy: clamp to min/max on overflow",
     "wrapping": "Overflow policy: modular arithmetic on overflow",
+    "interned": "Store a string field once per distinct value (interned string)",
 }
 
 FUNCTIONS: dict[str, str] = {
@@ -0,0 +1,136 @@
+"""Optional NumPy views of table files.
+
+Table records are fixed-size and little-endian, so a table file maps directly
+onto a NumPy structured array. NumPy is not a dependency of typed_tables:
+``HAS_NUMPY`` reports whether it is installed, and everything that needs it
+raises ImportError with an install hint when it is not.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from typed_tables.codec import field_codec, index_format
+from typed_tables.types import (
+    ArrayTypeDefinition,
+    CompositeTypeDefinition,
+    DictionaryTypeDefinition,
+    EnumTypeDefinition,
+    FractionTypeDefinition,
+    InterfaceTypeDefinition,
+    PrimitiveTypeDefinition,
+    TypeDefinition,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+HAS_NUMPY = np is not None
+
+# NumPy type codes for single struct format codes
+_NUMPY_CODES = {
+    "?": "?",
+    "B": "<u1",
+    "b": "<i1",
+    "H": "<u2",
+    "h": "<i2",
+    "I": "<u4",
+    "i": "<i4",
+    "Q": "<u8",
+    "q": "<i8",
+    "e": "<f2",
+    "f": "<f4",
+    "d": "<f8",
+}
+
+# Sub-field names for values stored in more than one slot, by base type
+_SUBFIELD_NAMES = {
+    ArrayTypeDefinition: ("start", "length"),
+    DictionaryTypeDefinition: ("start", "length"),
+    InterfaceTypeDefinition: ("type_id", "index"),
+    FractionTypeDefinition: ("num_start", "num_length", "den_start", "den_length"),
+    EnumTypeDefinition: ("discriminant", "index"),
+    PrimitiveTypeDefinition: ("low", "high"),  # 128-bit integers
+}
+
+# Name of the null-bitmap column in composite record dtypes
+NULLS_FIELD = "_nulls"
+
+
+def require_numpy() -> Any:
+    """Return the numpy module, or raise ImportError if it is not installed."""
+    if np is None:
+        raise ImportError("NumPy is required for this feature (pip install numpy)")
+    return np
+
+
+def field_dtype(type_def: TypeDefinition) -> Any:
+    """Return the NumPy dtype of a value of ``type_def`` stored inline in a record.
+
+    Single-slot values map to a scalar dtype. Multi-slot values (array and
+    string references, interfaces, fractions, 128-bit integers, Swift-style
+    enums) map to a structured dtype with one named sub-field per slot.
+
+    Raises:
+        TypeError: If the type cannot be stored inline.
+    """
+    require_numpy()
+    codec = field_codec(type_def)
+    if codec is None:
+        raise TypeError(f"Cannot map type to a NumPy dtype: {type_def.name}")
+    fmt = codec.fmt
+    if codec.width == 1:
+        return np.dtype(_NUMPY_CODES[fmt])
+    base = type_def.resolve_base_type()
+    names = next(names for cls, names in _SUBFIELD_NAMES.items() if isinstance(base, cls))
+    return np.dtype([(name, _NUMPY_CODES[code]) for name, code in zip(names, fmt)])
+
+
+def record_dtype(type_def: TypeDefinition) -> Any:
+    """Return the structured NumPy dtype of one record of a table of ``type_def``.
+
+    Composite records have a ``_nulls`` column holding the null bitmap bytes
+    (when the type has fields) followed by one column per field. Array tables
+    hold ``(start, length)`` headers; primitive and enum tables hold a
+    single scalar.
+
+    Raises:
+        TypeError: If the table's records cannot be described as a dtype.
+    """
+    require_numpy()
+    if isinstance(type_def, CompositeTypeDefinition):
+        fields: list[tuple[Any, ...]] = []
+        if type_def.null_bitmap_size:
+            fields.append((NULLS_FIELD, "<u1", (type_def.null_bitmap_size,)))
+        for f in type_def.fields:
+            fields.append((f.name, field_dtype(f.type_def)))
+        dtype = np.dtype(fields)
+    elif isinstance(type_def, ArrayTypeDefinition):
+        code = _NUMPY_CODES[index_format(type_def)]
+        dtype = np.dtype([("start", code), ("length", code)])
+    else:
+        base = type_def.resolve_base_type()
+        if not isinstance(base, (PrimitiveTypeDefinition, EnumTypeDefinition)):
+            raise TypeError(f"Cannot map type to a NumPy dtype: {type_def.name}")
+        dtype = field_dtype(base)
+    if dtype.itemsize != type_def.size_bytes:
+        raise TypeError(f"Cannot map type to a NumPy dtype: {type_def.name}")
+    return dtype
+
+
+def null_mask(records: Any, type_def: CompositeTypeDefinition, field_name: str) -> Any:
+    """Return a boolean array that is True where ``field_name`` is null.
+
+    Args:
+        records: A structured array of ``type_def`` records, as returned by
+            Table.as_numpy().
+        type_def: The composite type the records belong to.
+        field_name: The field to test.
+    """
+    require_numpy()
+    for i, f in enumerate(type_def.fields):
+        if f.name == field_name:
+            return (records[NULLS_FIELD][:, i >> 3] & (1 << (i & 7))) != 0
+    raise KeyError(f"Unknown field: {field_name}")
@@ -60,6 +60,12 @@ class QueryLexer:
         "restore": "RESTORE",
         "execute": "EXECUTE",
         "import": "IMPORT",
+        "sync": "SYNC",
+        "verify": "VERIFY",
+        "vacuum": "VACUUM",
+        "begin": "BEGIN",
+        "commit": "COMMIT",
+        "rollback": "ROLLBACK",
         "system": "SYSTEM",
         "temporary": "TEMPORARY",
         "named": "NAMED",
@@ -67,6 +73,7 @@ class QueryLexer:
         "desc": "DESC",
         "saturating": "SATURATING",
         "wrapping": "WRAPPING",
+        "interned": "INTERNED",
         "true": "TRUE",
         "false": "FALSE",
     }
@@ -200,8 +207,9 @@ class QueryLexer:
 
     def t_STRING(self, t: lex.LexToken) -> lex.LexToken:
         r'"([^"\\]|\\.)*"'
-        # Remove quotes and handle escapes
-        t.value = t.value[1:-1].encode().decode("unicode_escape")
+        # Remove quotes and handle escapes (non-Latin-1 characters pass
+        # through unicode_escape as \uXXXX escapes, so they survive intact)
+        t.value = t.value[1:-1].encode("latin-1", "backslashreplace").decode("unicode_escape")
         return t
 
     def t_BACKTICK_IDENTIFIER(self, t: lex.LexToken) -> lex.LexToken:
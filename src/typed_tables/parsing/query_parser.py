@@ -44,8 +44,15 @@ class OverflowTypeSpec:
     base_type: str | ArrayTypeSpec | SetTypeSpec | DictTypeSpec | OverflowTypeSpec
 
 
+@dataclass
+class InternedTypeSpec:
+    """Structured type spec for interned strings: interned string."""
+
+    base_type: str | ArrayTypeSpec | SetTypeSpec | DictTypeSpec | OverflowTypeSpec | InternedTypeSpec
+
+
 # Union type for all type specifications
-TypeSpec = str | ArrayTypeSpec | SetTypeSpec | DictTypeSpec | OverflowTypeSpec
+TypeSpec = str | ArrayTypeSpec | SetTypeSpec | DictTypeSpec | OverflowTypeSpec | InternedTypeSpec
 
 
 @dataclass
@@ -180,6 +187,34 @@ class SetQuery:
     value: str | None = None  # e.g., "80", "inf", "infinity", or None (reset)
 
 
+@dataclass
+class SyncQuery:
+    """A SYNC command — flush all pending table writes to disk."""
+
+    pass
+
+
+@dataclass
+class VerifyQuery:
+    """A VERIFY command — check every table file against its page checksums."""
+
+    pass
+
+
+@dataclass
+class VacuumQuery:
+    """A VACUUM command — compact tables in place."""
+
+    type_name: str | None = None  # None: every table
+
+
+@dataclass
+class TransactionQuery:
+    """A BEGIN, COMMIT, or ROLLBACK command."""
+
+    action: str  # "begin", "commit", or "rollback"
+
+
 @dataclass
 class DescribeQuery:
     """A DESCRIBE query."""
@@ -201,7 +236,7 @@ class FieldDef:
     """A field definition for create type."""
 
     name: str
-    type_name: str | ArrayTypeSpec | SetTypeSpec | DictTypeSpec | OverflowTypeSpec
+    type_name: str | ArrayTypeSpec | SetTypeSpec | DictTypeSpec | OverflowTypeSpec | InternedTypeSpec
     default_value: Any = None
 
 
@@ -236,7 +271,7 @@ class CreateAliasQuery:
     """A CREATE ALIAS query."""
 
     name: str
-    base_type: str | ArrayTypeSpec | SetTypeSpec | DictTypeSpec | OverflowTypeSpec
+    base_type: str | ArrayTypeSpec | SetTypeSpec | DictTypeSpec | OverflowTypeSpec | InternedTypeSpec
 
 
 @dataclass
@@ -523,7 +558,7 @@ class EmptyBraces:
     pass
 
 
-Query = SelectQuery | ShowTypesQuery | DescribeQuery | UseQuery | CreateTypeQuery | CreateInterfaceQuery | CreateAliasQuery | CreateInstanceQuery | CreateEnumQuery | EvalQuery | DeleteQuery | DropDatabaseQuery | DumpQuery | CompactQuery | ArchiveQuery | RestoreQuery | ExecuteQuery | ImportQuery | VariableAssignmentQuery | CollectQuery | UpdateQuery | ScopeBlock | TTGQuery | SetQuery
+Query = SelectQuery | ShowTypesQuery | DescribeQuery | UseQuery | CreateTypeQuery | CreateInterfaceQuery | CreateAliasQuery | CreateInstanceQuery | CreateEnumQuery | EvalQuery | DeleteQuery | DropDatabaseQuery | DumpQuery | CompactQuery | ArchiveQuery | RestoreQuery | ExecuteQuery | ImportQuery | VariableAssignmentQuery | CollectQuery | UpdateQuery | ScopeBlock | TTGQuery | SetQuery | SyncQuery | VerifyQuery | VacuumQuery | TransactionQuery
 
 
 class QueryParser:
@@ -644,24 +679,51 @@ class QueryParser:
         p[0] = ImportQuery(file_path=p[2])
 
     def p_query_set_reset(self, p: yacc.YaccProduction) -> None:
-        """query : SET IDENTIFIER"""
+        """query : SET identifier"""
         p[0] = SetQuery(setting=p[2])
 
     def p_query_set_integer(self, p: yacc.YaccProduction) -> None:
-        """query : SET IDENTIFIER INTEGER"""
+        """query : SET identifier INTEGER"""
         p[0] = SetQuery(setting=p[2], value=str(p[3]))
 
     def p_query_set_identifier(self, p: yacc.YaccProduction) -> None:
-        """query : SET IDENTIFIER IDENTIFIER"""
+        """query : SET identifier trailing_identifier"""
         p[0] = SetQuery(setting=p[2], value=p[3])
 
+    def p_query_set_string(self, p: yacc.YaccProduction) -> None:
+        """query : SET identifier STRING"""
+        p[0] = SetQuery(setting=p[2], value=p[3])
+
+    def p_query_sync(self, p: yacc.YaccProduction) -> None:
+        """query : SYNC"""
+        p[0] = SyncQuery()
+
+    def p_query_verify(self, p: yacc.YaccProduction) -> None:
+        """query : VERIFY"""
+        p[0] = VerifyQuery()
+
+    def p_query_vacuum(self, p: yacc.YaccProduction) -> None:
+        """query : VACUUM"""
+        p[0] = VacuumQuery()
+
+    def p_query_vacuum_type(self, p: yacc.YaccProduction) -> None:
+        """query : VACUUM trailing_identifier
+                 | VACUUM STRING"""
+        p[0] = VacuumQuery(type_name=p[2])
+
+    def p_query_transaction(self, p: yacc.YaccProduction) -> None:
+        """query : BEGIN
+                 | COMMIT
+                 | ROLLBACK"""
+        p[0] = TransactionQuery(action=p[1].lower())
+
     def p_query_describe(self, p: yacc.YaccProduction) -> None:
-        """query : DESCRIBE IDENTIFIER sort_clause
+        """query : DESCRIBE identifier sort_clause
                  | DESCRIBE STRING sort_clause"""
         p[0] = DescribeQuery(table=p[2], sort_by=p[3])
 
     def p_query_describe_variant(self, p: yacc.YaccProduction) -> None:
-        """query : DESCRIBE IDENTIFIER DOT IDENTIFIER sort_clause"""
+        """query : DESCRIBE identifier DOT identifier sort_clause"""
         p[0] = DescribeQuery(table=f"{p[2]}.{p[4]}", sort_by=p[5])
 
     def p_query_use_none(self, p: yacc.YaccProduction) -> None:
@@ -669,7 +731,7 @@ class QueryParser:
         p[0] = UseQuery(path="")
 
     def p_query_use_identifier(self, p: yacc.YaccProduction) -> None:
-        """query : USE IDENTIFIER"""
+        """query : USE trailing_identifier"""
         p[0] = UseQuery(path=p[2])
 
     def p_query_use_string(self, p: yacc.YaccProduction) -> None:
@@ -677,7 +739,7 @@ class QueryParser:
         p[0] = UseQuery(path=p[2])
 
     def p_query_use_identifier_temp(self, p: yacc.YaccProduction) -> None:
-        """query : USE IDENTIFIER AS TEMPORARY"""
+        """query : USE trailing_identifier AS TEMPORARY"""
         p[0] = UseQuery(path=p[2], temporary=True)
 
     def p_query_use_string_temp(self, p: yacc.YaccProduction) -> None:
@@ -685,67 +747,67 @@ class QueryParser:
         p[0] = UseQuery(path=p[2], temporary=True)
 
     def p_query_create_alias(self, p: yacc.YaccProduction) -> None:
-        """query : ALIAS IDENTIFIER EQ type_spec"""
+        """query : ALIAS identifier EQ type_spec"""
         p[0] = CreateAliasQuery(name=p[2], base_type=p[4])
 
     def p_query_create_type(self, p: yacc.YaccProduction) -> None:
-        """query : TYPE IDENTIFIER type_field_list"""
+        """query : TYPE identifier type_field_list"""
         p[0] = CreateTypeQuery(name=p[2], fields=p[3])
 
     def p_query_forward_type(self, p: yacc.YaccProduction) -> None:
-        """query : FORWARD TYPE IDENTIFIER"""
+        """query : FORWARD TYPE identifier"""
         p[0] = ForwardTypeQuery(name=p[3], kind="type")
 
     def p_query_forward_interface(self, p: yacc.YaccProduction) -> None:
-        """query : FORWARD INTERFACE IDENTIFIER"""
+        """query : FORWARD INTERFACE identifier"""
         p[0] = ForwardTypeQuery(name=p[3], kind="interface")
 
     def p_query_forward_enum(self, p: yacc.YaccProduction) -> None:
-        """query : FORWARD ENUM IDENTIFIER"""
+        """query : FORWARD ENUM identifier"""
         p[0] = ForwardTypeQuery(name=p[3], kind="enum")
 
     def p_query_create_type_inherit(self, p: yacc.YaccProduction) -> None:
-        """query : TYPE IDENTIFIER FROM parent_list type_field_list"""
+        """query : TYPE identifier FROM parent_list type_field_list"""
         parents = p[4]
         p[0] = CreateTypeQuery(name=p[2], fields=p[5], parents=parents)
 
     def p_query_create_type_inherit_empty(self, p: yacc.YaccProduction) -> None:
-        """query : TYPE IDENTIFIER FROM parent_list"""
+        """query : TYPE identifier FROM parent_list"""
         parents = p[4]
         p[0] = CreateTypeQuery(name=p[2], fields=[], parents=parents)
 
     def p_parent_list_single(self, p: yacc.YaccProduction) -> None:
-        """parent_list : IDENTIFIER"""
+        """parent_list : identifier"""
         p[0] = [p[1]]
 
     def p_parent_list_multiple(self, p: yacc.YaccProduction) -> None:
-        """parent_list : parent_list COMMA IDENTIFIER"""
+        """parent_list : parent_list COMMA identifier"""
         p[0] = p[1] + [p[3]]
 
     def p_query_create_interface(self, p: yacc.YaccProduction) -> None:
-        """query : INTERFACE IDENTIFIER type_field_list"""
+        """query : INTERFACE identifier type_field_list"""
         p[0] = CreateInterfaceQuery(name=p[2], fields=p[3])
 
     def p_query_create_interface_inherit(self, p: yacc.YaccProduction) -> None:
-        """query : INTERFACE IDENTIFIER FROM parent_list type_field_list"""
+        """query : INTERFACE identifier FROM parent_list type_field_list"""
         p[0] = CreateInterfaceQuery(name=p[2], fields=p[5], parents=p[4])
 
     def p_query_create_interface_inherit_empty(self, p: yacc.YaccProduction) -> None:
-        """query : INTERFACE IDENTIFIER FROM parent_list"""
+        """query : INTERFACE identifier FROM parent_list"""
         p[0] = CreateInterfaceQuery(name=p[2], fields=[], parents=p[4])
 
     def p_query_create_interface_empty(self, p: yacc.YaccProduction) -> None:
-        """query : INTERFACE IDENTIFIER"""
+        """query : INTERFACE identifier"""
         p[0] = CreateInterfaceQuery(name=p[2], fields=[])
 
     def p_query_create_enum(self, p: yacc.YaccProduction) -> None:
-        """query : ENUM IDENTIFIER LBRACE enum_variant_list RBRACE
-                 | ENUM IDENTIFIER LBRACE enum_variant_list COMMA RBRACE"""
+        """query : ENUM identifier LBRACE enum_variant_list RBRACE
+                 | ENUM identifier LBRACE enum_variant_list COMMA RBRACE"""
         p[0] = CreateEnumQuery(name=p[2], variants=p[4])
 
     def p_query_create_enum_backed(self, p: yacc.YaccProduction) -> None:
-        """query : ENUM IDENTIFIER COLON IDENTIFIER LBRACE enum_variant_list RBRACE
-                 | ENUM IDENTIFIER COLON IDENTIFIER LBRACE enum_variant_list COMMA RBRACE"""
+        """query : ENUM identifier COLON identifier LBRACE enum_variant_list RBRACE
+                 | ENUM identifier COLON identifier LBRACE enum_variant_list COMMA RBRACE"""
         p[0] = CreateEnumQuery(name=p[2], variants=p[6], backing_type=p[4])
 
     def p_enum_variant_list_single(self, p: yacc.YaccProduction) -> None:
@@ -757,20 +819,20 @@ class QueryParser:
         p[0] = p[1] + [p[3]]
 
     def p_enum_variant_bare(self, p: yacc.YaccProduction) -> None:
-        """enum_variant : IDENTIFIER"""
+        """enum_variant : identifier"""
         p[0] = EnumVariantSpec(name=p[1])
 
     def p_enum_variant_value(self, p: yacc.YaccProduction) -> None:
-        """enum_variant : IDENTIFIER EQ INTEGER"""
+        """enum_variant : identifier EQ INTEGER"""
         p[0] = EnumVariantSpec(name=p[1], explicit_value=p[3])
 
     def p_enum_variant_fields(self, p: yacc.YaccProduction) -> None:
-        """enum_variant : IDENTIFIER LPAREN type_field_items RPAREN
-                        | IDENTIFIER LPAREN type_field_items COMMA RPAREN"""
+        """enum_variant : identifier LPAREN type_field_items RPAREN
+                        | identifier LPAREN type_field_items COMMA RPAREN"""
         p[0] = EnumVariantSpec(name=p[1], fields=p[3])
 
     def p_enum_variant_empty_fields(self, p: yacc.YaccProduction) -> None:
-        """enum_variant : IDENTIFIER LPAREN RPAREN"""
+        """enum_variant : identifier LPAREN RPAREN"""
         p[0] = EnumVariantSpec(name=p[1], fields=[])
 
     def p_dump_prefix(self, p: yacc.YaccProduction) -> None:
@@ -816,7 +878,7 @@ class QueryParser:
         p[0] = DumpQuery(pretty=pretty, format=fmt, include_system=archive)
 
     def p_query_dump_table(self, p: yacc.YaccProduction) -> None:
-        """query : dump_prefix IDENTIFIER
+        """query : dump_prefix trailing_identifier
                  | dump_prefix STRING"""
         pretty, fmt, archive = p[1]
         p[0] = DumpQuery(table=p[2], pretty=pretty, format=fmt, include_system=archive)
@@ -827,7 +889,7 @@ class QueryParser:
         p[0] = DumpQuery(output_file=p[3], pretty=pretty, format=fmt, include_system=archive)
 
     def p_query_dump_table_to(self, p: yacc.YaccProduction) -> None:
-        """query : dump_prefix IDENTIFIER GT STRING
+        """query : dump_prefix trailing_identifier GT STRING
                  | dump_prefix STRING GT STRING"""
         pretty, fmt, archive = p[1]
         p[0] = DumpQuery(table=p[2], output_file=p[4], pretty=pretty, format=fmt, include_system=archive)
@@ -861,7 +923,7 @@ class QueryParser:
         p[0] = p[1] + [p[3]]
 
     def p_dump_item_table(self, p: yacc.YaccProduction) -> None:
-        """dump_item : IDENTIFIER
+        """dump_item : identifier
                      | STRING"""
         p[0] = DumpItem(table=p[1])
 
@@ -882,7 +944,7 @@ class QueryParser:
         p[0] = p[1] + [p[3]]
 
     def p_collect_source_table(self, p: yacc.YaccProduction) -> None:
-        """collect_source : IDENTIFIER where_clause
+        """collect_source : identifier where_clause
                           | STRING where_clause"""
         p[0] = CollectSource(table=p[1], where=p[2])
 
@@ -891,7 +953,7 @@ class QueryParser:
         p[0] = CollectSource(variable=p[1], where=p[2])
 
     def p_query_drop_database(self, p: yacc.YaccProduction) -> None:
-        """query : DROP IDENTIFIER
+        """query : DROP trailing_identifier
                  | DROP STRING"""
         p[0] = DropDatabaseQuery(path=p[2])
 
@@ -900,7 +962,7 @@ class QueryParser:
         p[0] = DropDatabaseQuery()
 
     def p_query_drop_force(self, p: yacc.YaccProduction) -> None:
-        """query : DROP BANG IDENTIFIER
+        """query : DROP BANG trailing_identifier
                  | DROP BANG STRING"""
         p[0] = DropDatabaseQuery(path=p[3], force=True)
 
@@ -909,8 +971,8 @@ class QueryParser:
         p[0] = DropDatabaseQuery(force=True)
 
     def p_query_variable_assignment(self, p: yacc.YaccProduction) -> None:
-        """query : VARIABLE EQ CREATE IDENTIFIER LPAREN tagged_instance_field_list RPAREN
-                 | VARIABLE EQ CREATE IDENTIFIER LPAREN RPAREN"""
+        """query : VARIABLE EQ CREATE identifier LPAREN tagged_instance_field_list RPAREN
+                 | VARIABLE EQ CREATE identifier LPAREN RPAREN"""
         if len(p) == 8:
             tag_name, fields = p[6]
             p[0] = VariableAssignmentQuery(
@@ -924,31 +986,31 @@ class QueryParser:
             )
 
     def p_query_create_instance(self, p: yacc.YaccProduction) -> None:
-        """query : CREATE IDENTIFIER LPAREN tagged_instance_field_list RPAREN"""
+        """query : CREATE identifier LPAREN tagged_instance_field_list RPAREN"""
         tag_name, fields = p[4]
         p[0] = CreateInstanceQuery(type_name=p[2], fields=fields, tag=tag_name)
 
     def p_query_create_instance_empty(self, p: yacc.YaccProduction) -> None:
-        """query : CREATE IDENTIFIER LPAREN RPAREN"""
+        """query : CREATE identifier LPAREN RPAREN"""
         p[0] = CreateInstanceQuery(type_name=p[2], fields=[])
 
     def p_query_delete(self, p: yacc.YaccProduction) -> None:
-        """query : DELETE IDENTIFIER WHERE condition
+        """query : DELETE identifier WHERE condition
                  | DELETE STRING WHERE condition"""
         p[0] = DeleteQuery(table=p[2], where=p[4])
 
     def p_query_delete_all(self, p: yacc.YaccProduction) -> None:
-        """query : DELETE IDENTIFIER
+        """query : DELETE identifier
                  | DELETE STRING"""
         p[0] = DeleteQuery(table=p[2], where=None)
 
     def p_query_delete_force(self, p: yacc.YaccProduction) -> None:
-        """query : DELETE BANG IDENTIFIER WHERE condition
+        """query : DELETE BANG identifier WHERE condition
                  | DELETE BANG STRING WHERE condition"""
         p[0] = DeleteQuery(table=p[3], where=p[5], force=True)
 
     def p_query_delete_force_all(self, p: yacc.YaccProduction) -> None:
-        """query : DELETE BANG IDENTIFIER
+        """query : DELETE BANG identifier
                  | DELETE BANG STRING"""
         p[0] = DeleteQuery(table=p[3], where=None, force=True)
 
@@ -957,15 +1019,15 @@ class QueryParser:
         p[0] = UpdateQuery(type_name="", var_name=p[2], fields=p[4])
 
     def p_query_update_ref(self, p: yacc.YaccProduction) -> None:
-        """query : UPDATE IDENTIFIER LPAREN INTEGER RPAREN SET instance_field_list"""
+        """query : UPDATE identifier LPAREN INTEGER RPAREN SET instance_field_list"""
         p[0] = UpdateQuery(type_name=p[2], index=p[4], fields=p[7])
 
     def p_query_update_bulk_where(self, p: yacc.YaccProduction) -> None:
-        """query : UPDATE IDENTIFIER SET instance_field_list WHERE condition"""
+        """query : UPDATE identifier SET instance_field_list WHERE condition"""
         p[0] = UpdateQuery(type_name=p[2], fields=p[4], where=p[6])
 
     def p_query_update_bulk_all(self, p: yacc.YaccProduction) -> None:
-        """query : UPDATE IDENTIFIER SET instance_field_list"""
+        """query : UPDATE identifier SET instance_field_list"""
         p[0] = UpdateQuery(type_name=p[2], fields=p[4])
 
     def p_query_scope(self, p: yacc.YaccProduction) -> None:
@@ -1005,11 +1067,11 @@ class QueryParser:
     # --- type_spec: recursive type specification for fields and aliases ---
 
     def p_type_spec_identifier(self, p: yacc.YaccProduction) -> None:
-        """type_spec : IDENTIFIER"""
+        """type_spec : identifier"""
         p[0] = p[1]
 
     def p_type_spec_postfix_array(self, p: yacc.YaccProduction) -> None:
-        """type_spec : IDENTIFIER LBRACKET RBRACKET"""
+        """type_spec : identifier LBRACKET RBRACKET"""
         p[0] = p[1] + "[]"
 
     def p_type_spec_prefix_array(self, p: yacc.YaccProduction) -> None:
@@ -1025,17 +1087,21 @@ class QueryParser:
         p[0] = DictTypeSpec(key_type=p[2], value_type=p[4])
 
     def p_type_field_def(self, p: yacc.YaccProduction) -> None:
-        """type_field_def : IDENTIFIER COLON type_spec"""
+        """type_field_def : identifier COLON type_spec"""
         p[0] = FieldDef(name=p[1], type_name=p[3])
 
     def p_type_field_def_default(self, p: yacc.YaccProduction) -> None:
-        """type_field_def : IDENTIFIER COLON type_spec EQ instance_value"""
+        """type_field_def : identifier COLON type_spec EQ instance_value"""
         p[0] = FieldDef(name=p[1], type_name=p[3], default_value=p[5])
 
     def p_type_spec_overflow(self, p: yacc.YaccProduction) -> None:
         """type_spec : overflow_modifier type_spec"""
         p[0] = OverflowTypeSpec(overflow=p[1], base_type=p[2])
 
+    def p_type_spec_interned(self, p: yacc.YaccProduction) -> None:
+        """type_spec : INTERNED type_spec"""
+        p[0] = InternedTypeSpec(base_type=p[2])
+
     def p_overflow_modifier(self, p: yacc.YaccProduction) -> None:
         """overflow_modifier : SATURATING
                              | WRAPPING"""
@@ -1050,7 +1116,7 @@ class QueryParser:
         p[0] = p[1] + [p[3]]
 
     def p_instance_field(self, p: yacc.YaccProduction) -> None:
-        """instance_field : IDENTIFIER EQ instance_value"""
+        """instance_field : identifier EQ instance_value"""
         value = p[3]
         if isinstance(value, MethodChainValue):
             if len(value.chain) == 1:
@@ -1074,11 +1140,11 @@ class QueryParser:
     # --- mutation_chain: field.method().method() chains in UPDATE SET ---
 
     def p_mutation_chain_base_no_args(self, p: yacc.YaccProduction) -> None:
-        """mutation_chain : IDENTIFIER DOT method_name LPAREN RPAREN"""
+        """mutation_chain : identifier DOT method_name LPAREN RPAREN"""
         p[0] = (p[1], [MethodCall(method_name=p[3], method_args=[])])
 
     def p_mutation_chain_base_with_args(self, p: yacc.YaccProduction) -> None:
-        """mutation_chain : IDENTIFIER DOT method_name LPAREN method_arg_list RPAREN"""
+        """mutation_chain : identifier DOT method_name LPAREN method_arg_list RPAREN"""
         p[0] = (p[1], [MethodCall(method_name=p[3], method_args=p[5])])
 
     def p_mutation_chain_extend_no_args(self, p: yacc.YaccProduction) -> None:
@@ -1094,7 +1160,7 @@ class QueryParser:
         p[0] = (field_name, chain)
 
     def p_method_name_identifier(self, p: yacc.YaccProduction) -> None:
-        """method_name : IDENTIFIER"""
+        """method_name : identifier"""
         p[0] = p[1]
 
     def p_method_name_delete(self, p: yacc.YaccProduction) -> None:
@@ -1118,11 +1184,11 @@ class QueryParser:
         p[0] = p[1]
 
     def p_method_arg_sort_key_desc(self, p: yacc.YaccProduction) -> None:
-        """method_arg : DOT IDENTIFIER DESC"""
+        """method_arg : DOT identifier DESC"""
         p[0] = SortKeyExpr(field_name=p[2], descending=True)
 
     def p_method_arg_sort_key_asc(self, p: yacc.YaccProduction) -> None:
-        """method_arg : DOT IDENTIFIER ASC"""
+        """method_arg : DOT identifier ASC"""
         p[0] = SortKeyExpr(field_name=p[2], descending=False)
 
     def p_method_arg_bare_desc(self, p: yacc.YaccProduction) -> None:
@@ -1134,7 +1200,7 @@ class QueryParser:
         p[0] = SortKeyExpr(field_name=None, descending=False)
 
     def p_tagged_instance_field_list_with_tag(self, p: yacc.YaccProduction) -> None:
-        """tagged_instance_field_list : TAG LPAREN IDENTIFIER RPAREN COMMA instance_field_list"""
+        """tagged_instance_field_list : TAG LPAREN identifier RPAREN COMMA instance_field_list"""
         p[0] = (p[3], p[6])  # (tag_name, field_list)
 
     def p_tagged_instance_field_list_no_tag(self, p: yacc.YaccProduction) -> None:
@@ -1170,11 +1236,11 @@ class QueryParser:
         p[0] = -p[2]
 
     def p_instance_value_func(self, p: yacc.YaccProduction) -> None:
-        """instance_value : IDENTIFIER LPAREN RPAREN"""
+        """instance_value : identifier LPAREN RPAREN"""
         p[0] = FunctionCall(name=p[1])
 
     def p_instance_value_func_with_positional_args(self, p: yacc.YaccProduction) -> None:
-        """instance_value : IDENTIFIER LPAREN func_positional_args RPAREN"""
+        """instance_value : identifier LPAREN func_positional_args RPAREN"""
         p[0] = FunctionCall(name=p[1], args=p[3])
 
     def p_func_positional_args_two(self, p: yacc.YaccProduction) -> None:
@@ -1186,61 +1252,61 @@ class QueryParser:
         p[0] = p[1] + [p[3]]
 
     def p_instance_value_func_single_string(self, p: yacc.YaccProduction) -> None:
-        """instance_value : IDENTIFIER LPAREN STRING RPAREN"""
+        """instance_value : identifier LPAREN STRING RPAREN"""
         p[0] = FunctionCall(name=p[1], args=[p[3]])
 
     def p_instance_value_composite_ref(self, p: yacc.YaccProduction) -> None:
-        """instance_value : IDENTIFIER LPAREN INTEGER RPAREN"""
+        """instance_value : identifier LPAREN INTEGER RPAREN"""
         p[0] = CompositeRef(type_name=p[1], index=p[3])
 
     def p_instance_value_inline_instance(self, p: yacc.YaccProduction) -> None:
-        """instance_value : IDENTIFIER LPAREN tagged_instance_field_list RPAREN"""
+        """instance_value : identifier LPAREN tagged_instance_field_list RPAREN"""
         tag_name, fields = p[3]
         p[0] = InlineInstance(type_name=p[1], fields=fields, tag=tag_name)
 
     def p_instance_value_enum_bare(self, p: yacc.YaccProduction) -> None:
-        """instance_value : IDENTIFIER DOT IDENTIFIER"""
+        """instance_value : identifier DOT identifier"""
         p[0] = EnumValueExpr(enum_name=p[1], variant_name=p[3])
 
     def p_instance_value_enum_with_args(self, p: yacc.YaccProduction) -> None:
-        """instance_value : IDENTIFIER DOT IDENTIFIER LPAREN instance_field_list RPAREN"""
+        """instance_value : identifier DOT identifier LPAREN instance_field_list RPAREN"""
         p[0] = EnumValueExpr(enum_name=p[1], variant_name=p[3], args=p[5])
 
     def p_instance_value_enum_with_args_empty(self, p: yacc.YaccProduction) -> None:
-        """instance_value : IDENTIFIER DOT IDENTIFIER LPAREN RPAREN"""
+        """instance_value : identifier DOT identifier LPAREN RPAREN"""
         p[0] = EnumValueExpr(enum_name=p[1], variant_name=p[3], args=[])
 
     def p_instance_value_enum_shorthand_bare(self, p: yacc.YaccProduction) -> None:
-        """instance_value : DOT IDENTIFIER"""
+        """instance_value : DOT identifier"""
         p[0] = EnumValueExpr(enum_name=None, variant_name=p[2])
 
     def p_instance_value_enum_shorthand_with_args(self, p: yacc.YaccProduction) -> None:
-        """instance_value : DOT IDENTIFIER LPAREN instance_field_list RPAREN"""
+        """instance_value : DOT identifier LPAREN instance_field_list RPAREN"""
         p[0] = EnumValueExpr(enum_name=None, variant_name=p[2], args=p[4])
 
     def p_instance_value_enum_shorthand_with_args_empty(self, p: yacc.YaccProduction) -> None:
-        """instance_value : DOT IDENTIFIER LPAREN RPAREN"""
+        """instance_value : DOT identifier LPAREN RPAREN"""
         p[0] = EnumValueExpr(enum_name=None, variant_name=p[2], args=[])
 
     # --- Method chain values (SORT/DELETE keyword methods + positional args + chaining) ---
 
     def p_instance_value_method_keyword_bare(self, p: yacc.YaccProduction) -> None:
-        """instance_value : IDENTIFIER DOT SORT
-                          | IDENTIFIER DOT DELETE"""
+        """instance_value : identifier DOT SORT
+                          | identifier DOT DELETE"""
         p[0] = MethodChainValue(source_field=p[1], chain=[MethodCall(method_name=p[3])])
 
     def p_instance_value_method_keyword_no_args(self, p: yacc.YaccProduction) -> None:
-        """instance_value : IDENTIFIER DOT SORT LPAREN RPAREN
-                          | IDENTIFIER DOT DELETE LPAREN RPAREN"""
+        """instance_value : identifier DOT SORT LPAREN RPAREN
+                          | identifier DOT DELETE LPAREN RPAREN"""
         p[0] = MethodChainValue(source_field=p[1], chain=[MethodCall(method_name=p[3], method_args=[])])
 
     def p_instance_value_method_keyword_with_args(self, p: yacc.YaccProduction) -> None:
-        """instance_value : IDENTIFIER DOT SORT LPAREN method_arg_list RPAREN
-                          | IDENTIFIER DOT DELETE LPAREN method_arg_list RPAREN"""
+        """instance_value : identifier DOT SORT LPAREN method_arg_list RPAREN
+                          | identifier DOT DELETE LPAREN method_arg_list RPAREN"""
         p[0] = MethodChainValue(source_field=p[1], chain=[MethodCall(method_name=p[3], method_args=p[5])])
 
     def p_instance_value_method_positional_args(self, p: yacc.YaccProduction) -> None:
-        """instance_value : IDENTIFIER DOT IDENTIFIER LPAREN method_arg_list RPAREN"""
+        """instance_value : identifier DOT identifier LPAREN method_arg_list RPAREN"""
         p[0] = MethodChainValue(source_field=p[1], chain=[MethodCall(method_name=p[3], method_args=p[5])])
 
     def p_instance_value_chain_extend_no_args(self, p: yacc.YaccProduction) -> None:
@@ -1272,7 +1338,7 @@ class QueryParser:
             raise SyntaxError(f"Cannot chain method call on {type(base).__name__}")
 
     def p_instance_value_tag_reference(self, p: yacc.YaccProduction) -> None:
-        """instance_value : IDENTIFIER"""
+        """instance_value : identifier"""
         p[0] = TagReference(name=p[1])
 
     def p_instance_value_null(self, p: yacc.YaccProduction) -> None:
@@ -1366,36 +1432,36 @@ class QueryParser:
         p[0] = -p[2]
 
     def p_array_element_inline_instance(self, p: yacc.YaccProduction) -> None:
-        """array_element : IDENTIFIER LPAREN tagged_instance_field_list RPAREN"""
+        """array_element : identifier LPAREN tagged_instance_field_list RPAREN"""
         tag_name, fields = p[3]
         p[0] = InlineInstance(type_name=p[1], fields=fields, tag=tag_name)
 
     def p_array_element_tag_reference(self, p: yacc.YaccProduction) -> None:
-        """array_element : IDENTIFIER"""
+        """array_element : identifier"""
         p[0] = TagReference(name=p[1])
 
     def p_array_element_enum_shorthand_bare(self, p: yacc.YaccProduction) -> None:
-        """array_element : DOT IDENTIFIER"""
+        """array_element : DOT identifier"""
         p[0] = EnumValueExpr(enum_name=None, variant_name=p[2])
 
     def p_array_element_enum_shorthand_with_args(self, p: yacc.YaccProduction) -> None:
-        """array_element : DOT IDENTIFIER LPAREN instance_field_list RPAREN"""
+        """array_element : DOT identifier LPAREN instance_field_list RPAREN"""
         p[0] = EnumValueExpr(enum_name=None, variant_name=p[2], args=p[4])
 
     def p_array_element_enum_shorthand_with_args_empty(self, p: yacc.YaccProduction) -> None:
-        """array_element : DOT IDENTIFIER LPAREN RPAREN"""
+        """array_element : DOT identifier LPAREN RPAREN"""
         p[0] = EnumValueExpr(enum_name=None, variant_name=p[2], args=[])
 
     def p_array_element_enum_qualified_bare(self, p: yacc.YaccProduction) -> None:
-        """array_element : IDENTIFIER DOT IDENTIFIER"""
+        """array_element : identifier DOT identifier"""
         p[0] = EnumValueExpr(enum_name=p[1], variant_name=p[3])
 
     def p_array_element_enum_qualified_with_args(self, p: yacc.YaccProduction) -> None:
-        """array_element : IDENTIFIER DOT IDENTIFIER LPAREN instance_field_list RPAREN"""
+        """array_element : identifier DOT identifier LPAREN instance_field_list RPAREN"""
         p[0] = EnumValueExpr(enum_name=p[1], variant_name=p[3], args=p[5])
 
     def p_array_element_enum_qualified_with_args_empty(self, p: yacc.YaccProduction) -> None:
-        """array_element : IDENTIFIER DOT IDENTIFIER LPAREN RPAREN"""
+        """array_element : identifier DOT identifier LPAREN RPAREN"""
         p[0] = EnumValueExpr(enum_name=p[1], variant_name=p[3], args=[])
 
     def p_array_element_null(self, p: yacc.YaccProduction) -> None:
@@ -1444,11 +1510,11 @@ class QueryParser:
         p[0] = p[1]
 
     def p_eval_expr_func(self, p: yacc.YaccProduction) -> None:
-        """eval_expr : IDENTIFIER LPAREN RPAREN"""
+        """eval_expr : identifier LPAREN RPAREN"""
         p[0] = FunctionCall(name=p[1])
 
     def p_eval_expr_func_with_args(self, p: yacc.YaccProduction) -> None:
-        """eval_expr : IDENTIFIER LPAREN eval_arg_list RPAREN"""
+        """eval_expr : identifier LPAREN eval_arg_list RPAREN"""
         p[0] = FunctionCall(name=p[1], args=p[3])
 
     def p_eval_arg_list_single(self, p: yacc.YaccProduction) -> None:
@@ -1540,12 +1606,12 @@ class QueryParser:
             )
 
     def p_from_clause(self, p: yacc.YaccProduction) -> None:
-        """from_clause : FROM IDENTIFIER
+        """from_clause : FROM identifier
                        | FROM STRING"""
         p[0] = p[2]
 
     def p_from_clause_variant(self, p: yacc.YaccProduction) -> None:
-        """from_clause : FROM IDENTIFIER DOT IDENTIFIER"""
+        """from_clause : FROM identifier DOT identifier"""
         p[0] = (p[2], p[4])  # (type_name, variant_name) tuple
 
     def p_from_clause_variable(self, p: yacc.YaccProduction) -> None:
@@ -1645,7 +1711,7 @@ class QueryParser:
                 p[0] = SelectField(name=field_name, method_chain=chain)
 
     def p_select_field_method_call_with_index(self, p: yacc.YaccProduction) -> None:
-        """select_field : field_path LBRACKET array_index_item RBRACKET DOT IDENTIFIER LPAREN RPAREN"""
+        """select_field : field_path LBRACKET array_index_item RBRACKET DOT identifier LPAREN RPAREN"""
         p[0] = SelectField(
             name=p[1],
             array_index=ArrayIndex(index=p[3]),
@@ -1681,11 +1747,11 @@ class QueryParser:
         p[0] = ArraySlice(start=None, end=p[2])
 
     def p_field_path_single(self, p: yacc.YaccProduction) -> None:
-        """field_path : IDENTIFIER"""
+        """field_path : identifier"""
         p[0] = p[1]
 
     def p_field_path_dotted(self, p: yacc.YaccProduction) -> None:
-        """field_path : field_path DOT IDENTIFIER
+        """field_path : field_path DOT identifier
                       | field_path DOT SORT
                       | field_path DOT DELETE"""
         p[0] = f"{p[1]}.{p[3]}"
@@ -1699,21 +1765,21 @@ class QueryParser:
         p[0] = p[2]
 
     def p_condition_comparison(self, p: yacc.YaccProduction) -> None:
-        """condition : IDENTIFIER EQ value
-                     | IDENTIFIER NEQ value
-                     | IDENTIFIER LT value
-                     | IDENTIFIER LTE value
-                     | IDENTIFIER GT value
-                     | IDENTIFIER GTE value"""
+        """condition : identifier EQ value
+                     | identifier NEQ value
+                     | identifier LT value
+                     | identifier LTE value
+                     | identifier GT value
+                     | identifier GTE value"""
         op_map = {"=": "eq", "!=": "neq", "<": "lt", "<=": "lte", ">": "gt", ">=": "gte"}
         p[0] = Condition(field=p[1], operator=op_map[p[2]], value=p[3])
 
     def p_condition_starts_with(self, p: yacc.YaccProduction) -> None:
-        """condition : IDENTIFIER STARTS WITH STRING"""
+        """condition : identifier STARTS WITH STRING"""
         p[0] = Condition(field=p[1], operator="starts_with", value=p[4])
 
     def p_condition_matches(self, p: yacc.YaccProduction) -> None:
-        """condition : IDENTIFIER MATCHES REGEX"""
+        """condition : identifier MATCHES REGEX"""
         p[0] = Condition(field=p[1], operator="matches", value=p[3])
 
     # --- WHERE condition rules using method_chain_expr ---
@@ -1808,27 +1874,27 @@ class QueryParser:
         p[0] = NullValue()
 
     def p_value_enum_shorthand_bare(self, p: yacc.YaccProduction) -> None:
-        """value : DOT IDENTIFIER"""
+        """value : DOT identifier"""
         p[0] = EnumValueExpr(enum_name=None, variant_name=p[2])
 
     def p_value_enum_shorthand_with_args(self, p: yacc.YaccProduction) -> None:
-        """value : DOT IDENTIFIER LPAREN instance_field_list RPAREN"""
+        """value : DOT identifier LPAREN instance_field_list RPAREN"""
         p[0] = EnumValueExpr(enum_name=None, variant_name=p[2], args=p[4])
 
     def p_value_enum_shorthand_with_args_empty(self, p: yacc.YaccProduction) -> None:
-        """value : DOT IDENTIFIER LPAREN RPAREN"""
+        """value : DOT identifier LPAREN RPAREN"""
         p[0] = EnumValueExpr(enum_name=None, variant_name=p[2], args=[])
 
     def p_value_enum_qualified_bare(self, p: yacc.YaccProduction) -> None:
-        """value : IDENTIFIER DOT IDENTIFIER"""
+        """value : identifier DOT identifier"""
         p[0] = EnumValueExpr(enum_name=p[1], variant_name=p[3])
 
     def p_value_enum_qualified_with_args(self, p: yacc.YaccProduction) -> None:
-        """value : IDENTIFIER DOT IDENTIFIER LPAREN instance_field_list RPAREN"""
+        """value : identifier DOT identifier LPAREN instance_field_list RPAREN"""
         p[0] = EnumValueExpr(enum_name=p[1], variant_name=p[3], args=p[5])
 
     def p_value_enum_qualified_with_args_empty(self, p: yacc.YaccProduction) -> None:
-        """value : IDENTIFIER DOT IDENTIFIER LPAREN RPAREN"""
+        """value : identifier DOT identifier LPAREN RPAREN"""
         p[0] = EnumValueExpr(enum_name=p[1], variant_name=p[3], args=[])
 
     def p_group_clause_empty(self, p: yacc.YaccProduction) -> None:
@@ -1856,13 +1922,32 @@ class QueryParser:
         p[0] = p[1] + [p[3]]
 
     def p_sort_key_identifier(self, p: yacc.YaccProduction) -> None:
-        """sort_key : IDENTIFIER"""
+        """sort_key : identifier"""
         p[0] = p[1]
 
     def p_sort_key_reserved(self, p: yacc.YaccProduction) -> None:
         """sort_key : TYPE"""
         p[0] = p[1].lower()
 
+    def p_identifier(self, p: yacc.YaccProduction) -> None:
+        """identifier : IDENTIFIER
+                      | SYNC
+                      | VERIFY
+                      | VACUUM
+                      | BEGIN
+                      | COMMIT
+                      | ROLLBACK
+                      | INTERNED"""
+        # Keywords added after the language was in use remain valid names
+        p[0] = p[1]
+
+    def p_trailing_identifier(self, p: yacc.YaccProduction) -> None:
+        """trailing_identifier : IDENTIFIER
+                               | INTERNED"""
+        # An optional operand ending a statement: a statement keyword here
+        # starts the next statement instead of naming something
+        p[0] = p[1]
+
     def p_offset_clause_empty(self, p: yacc.YaccProduction) -> None:
         """offset_clause : """
         p[0] = 0
@@ -4,15 +4,16 @@ from __future__ import annotations
 
 import gzip
 import json
+import operator
 import os
 import re
 import shutil
 import struct
 import tempfile
 import uuid as uuid_module
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Any, Iterator
+from typing import Any, Callable, Iterable, Iterator
 
 from typed_tables.parsing.query_parser import (
     ArchiveQuery,
@@ -48,6 +49,7 @@ from typed_tables.parsing.query_parser import (
     FieldValue,
     FunctionCall,
     InlineInstance,
+    InternedTypeSpec,
     MethodCall,
     MethodCallExpr,
     MethodChainValue,
@@ -62,6 +64,10 @@ from typed_tables.parsing.query_parser import (
     SelectField,
     SetQuery,
     SortKeyExpr,
+    SyncQuery,
+    VerifyQuery,
+    VacuumQuery,
+    TransactionQuery,
     SelectQuery,
     ShowTypesQuery,
     TTGQuery,
@@ -73,7 +79,9 @@ from typed_tables.parsing.query_parser import (
     VariableAssignmentQuery,
     VariableReference,
 )
-from typed_tables.storage import StorageManager
+from typed_tables.array_table import BitTable
+from typed_tables.checksum import page_records
+from typed_tables.storage import DEFAULT_DURABILITY, StorageManager
 from fractions import Fraction
 from typed_tables.types import (
     PRIMITIVE_TYPE_NAMES,
@@ -92,7 +100,9 @@ from typed_tables.types import (
     FieldDefinition,
     FractionTypeDefinition,
     InterfaceTypeDefinition,
+    InternedStringTypeDefinition,
     NULL_REF,
+    NULL_REF_32,
     OverflowTypeDefinition,
     PrimitiveType,
     PrimitiveTypeDefinition,
@@ -151,14 +161,25 @@ def _fraction_decode(storage: StorageManager, num_start: int, num_len: int, den_
     if num_len == 0:
         return Fraction(0)
     nt = storage.get_fraction_num_table()
-    num_bytes = bytes(nt.element_table.get(num_start + j) for j in range(num_len))
+    num_bytes = nt.get_bytes(num_start, num_len)
     numerator = int.from_bytes(num_bytes, 'little', signed=True)
     dt = storage.get_fraction_den_table()
-    den_bytes = bytes(dt.element_table.get(den_start + j) for j in range(den_len))
+    den_bytes = dt.get_bytes(den_start, den_len)
     denominator = int.from_bytes(den_bytes, 'little', signed=False)
     return Fraction(numerator, denominator)
 
 
+def _bigint_encode(value: int, type_def: TypeDefinition, storage: StorageManager) -> tuple[int, int]:
+    """Encode a bigint/biguint value → (start_index, length), the value itself when it fits."""
+    return storage.get_array_table_for_type(type_def).insert_int(int(value))
+
+
+def _bigint_decode(storage: StorageManager, type_def: TypeDefinition, start_index: int, length: int) -> BigInt | BigUInt:
+    """Decode (start_index, length) → BigInt or BigUInt, inline or from the byte heap."""
+    value = storage.get_array_table_for_type(type_def).get_int(start_index, length)
+    return BigInt(value) if is_bigint_type(type_def) else BigUInt(value)
+
+
 @dataclass
 class QueryResult:
     """Result of a query execution."""
@@ -291,6 +312,39 @@ class SetResult(QueryResult):
     value: Any = None
 
 
+@dataclass
+class SyncResult(QueryResult):
+    """Result of a SYNC command."""
+
+    table_count: int = 0
+
+
+@dataclass
+class VerifyResult(QueryResult):
+    """Result of a VERIFY command: one row per bad page or unchecked table."""
+
+    table_count: int = 0
+    page_count: int = 0
+    problem_count: int = 0
+
+
+@dataclass
+class VacuumResult(QueryResult):
+    """Result of a VACUUM command."""
+
+    table_count: int = 0  # tables compacted
+    remapped_count: int = 0  # other tables whose references were updated
+    records_before: int = 0
+    records_after: int = 0
+
+
+@dataclass
+class TransactionResult(QueryResult):
+    """Result of a BEGIN, COMMIT, or ROLLBACK command."""
+
+    action: str = ""
+
+
 @dataclass
 class ScopeState:
     """State for a single scope level.
@@ -304,9 +358,21 @@ class ScopeState:
     variables: dict[str, tuple[str, int | list[int]]]  # var_name → (type_name, index_or_indices)
 
 
+@dataclass
+class AutoVacuumStats:
+    """What auto-vacuum has done in this session (reported by status)."""
+
+    runs: int = 0  # tables vacuumed
+    bytes_reclaimed: int = 0  # total shrinkage of their files
+    last_table: str | None = None
+
+
 class QueryExecutor:
     """Executes TTQ queries against storage."""
 
+    # Nesting depth of execute() calls; statement boundaries are at depth 0
+    _statement_depth = 0
+
     def __init__(self, storage: StorageManager, registry: TypeRegistry) -> None:
         self.storage = storage
         self.registry = registry
@@ -317,6 +383,9 @@ class QueryExecutor:
         # Script execution tracking
         self._script_stack: list[Path] = []  # stack of script directories for relative path resolution
         self._loaded_scripts: set[str] = set()  # absolute paths of scripts loaded via execute
+        # Session variables as they were at BEGIN, restored on ROLLBACK
+        self._transaction_variables: dict[str, tuple[str, int | list[int]]] | None = None
+        self.auto_vacuum_stats = AutoVacuumStats()
 
     @staticmethod
     def _sort_rows(rows: list[dict[str, Any]], sort_by: list[str], defaults: list[str] | None = None) -> list[dict[str, Any]]:
@@ -331,8 +400,39 @@ class QueryExecutor:
             )
         return sorted(rows, key=sort_key)
 
+    # Statements that change the database, rejected when it is open read-only
+    _WRITE_QUERIES = (
+        CreateInterfaceQuery, CreateTypeQuery, ForwardTypeQuery, CreateAliasQuery,
+        CreateEnumQuery, CreateInstanceQuery, DeleteQuery, UpdateQuery,
+        DropDatabaseQuery, ImportQuery,
+    )
+
+    # Statements that can leave dead records behind, after which auto-vacuum runs
+    _AUTO_VACUUM_QUERIES = (
+        CreateInstanceQuery, DeleteQuery, UpdateQuery, VariableAssignmentQuery,
+        ScopeBlock, ExecuteQuery, ImportQuery,
+    )
+
     def execute(self, query: Query) -> QueryResult:
         """Execute a query and return results."""
+        self._statement_depth += 1
+        try:
+            if self.storage is not None:
+                if self.storage.read_only and isinstance(query, self._WRITE_QUERIES):
+                    raise PermissionError("Database is open read-only")
+                if self._statement_depth == 1:
+                    self.storage.begin_statement()
+            result = self._dispatch(query)
+            if self._statement_depth == 1 and isinstance(query, self._AUTO_VACUUM_QUERIES):
+                self.auto_vacuum()
+            return result
+        finally:
+            self._statement_depth -= 1
+            if self._statement_depth == 0 and self.storage is not None:
+                self.storage.end_statement()
+
+    def _dispatch(self, query: Query) -> QueryResult:
+        """Route a query to its handler."""
         if isinstance(query, ShowTypesQuery):
             return self._execute_show_types(query)
         elif isinstance(query, TTGQuery):
@@ -383,6 +483,14 @@ class QueryExecutor:
             return self._execute_import(query)
         elif isinstance(query, SetQuery):
             return self._execute_set(query)
+        elif isinstance(query, SyncQuery):
+            return self._execute_sync(query)
+        elif isinstance(query, VerifyQuery):
+            return self._execute_verify(query)
+        elif isinstance(query, VacuumQuery):
+            return self._execute_vacuum(query)
+        elif isinstance(query, TransactionQuery):
+            return self._execute_transaction(query)
         else:
             raise ValueError(f"Unknown query type: {type(query)}")
 
@@ -470,7 +578,16 @@ class QueryExecutor:
         return errors
 
     def _execute_scope_block(self, query: ScopeBlock) -> QueryResult:
-        """Execute a scope block - enter scope, execute statements, exit scope."""
+        """Execute a scope block - enter scope, execute statements, exit scope.
+
+        The block is atomic: it runs in its own transaction (or, when one is
+        already open, back to a savepoint) and every table write it made is
+        undone if a statement fails or a tag cannot be resolved.
+        """
+        owns_transaction = not self.storage.in_transaction
+        if owns_transaction:
+            self.storage.begin()
+        savepoint = self.storage.savepoint()
         self._push_scope()
 
         results = []
@@ -487,15 +604,20 @@ class QueryExecutor:
             patch_errors = self._apply_deferred_patches()
             errors.extend(patch_errors)
 
+        except BaseException:
+            self._end_scope_transaction(owns_transaction, savepoint, success=False)
+            raise
         finally:
             # Always pop scope, even on error
             self._pop_scope()
 
+        self._end_scope_transaction(owns_transaction, savepoint, success=not errors)
+
         if errors:
             return ScopeResult(
                 columns=[],
                 rows=[],
-                message=f"Scope completed with errors: {'; '.join(errors)}",
+                message=f"Scope rolled back due to errors: {'; '.join(errors)}",
                 statement_count=len(results),
             )
 
@@ -506,6 +628,16 @@ class QueryExecutor:
             statement_count=len(results),
         )
 
+    def _end_scope_transaction(self, owns_transaction: bool, savepoint: int, success: bool) -> None:
+        """Commit or undo the writes of a finished scope block."""
+        if owns_transaction:
+            if success:
+                self.storage.commit()
+            else:
+                self.storage.rollback()
+        elif not success:
+            self.storage.rollback_to(savepoint)
+
     def _execute_show_types(self, query: ShowTypesQuery) -> QueryResult:
         """Execute SHOW TYPES query, optionally filtered by kind."""
         # Collect primitive/alias names referenced by user-defined types
@@ -1151,7 +1283,7 @@ class QueryExecutor:
             message=f"Dropping database: {query.path}",
         )
 
-    def _resolve_type_spec(self, spec: str | ArrayTypeSpec | SetTypeSpec | DictTypeSpec | OverflowTypeSpec) -> TypeDefinition | None:
+    def _resolve_type_spec(self, spec: str | ArrayTypeSpec | SetTypeSpec | DictTypeSpec | OverflowTypeSpec | InternedTypeSpec) -> TypeDefinition | None:
         """Resolve a type specification (string or structured TypeSpec) to a TypeDefinition.
 
         Returns None if the type cannot be resolved.
@@ -1161,6 +1293,11 @@ class QueryExecutor:
             if base_td is None:
                 return None
             return self.registry.get_or_create_overflow_type(spec.overflow, base_td)
+        elif isinstance(spec, InternedTypeSpec):
+            base_td = self._resolve_type_spec(spec.base_type)
+            if base_td is None or not is_string_type(base_td):
+                return None
+            return self.registry.get_or_create_interned_type(base_td)
         elif isinstance(spec, str):
             if spec.endswith("[]"):
                 base_name = spec[:-2]
@@ -1184,10 +1321,12 @@ class QueryExecutor:
             return self.registry.get_or_create_dict_type(key_td, val_td)
         return None
 
-    def _type_spec_to_string(self, spec: str | ArrayTypeSpec | SetTypeSpec | DictTypeSpec | OverflowTypeSpec) -> str:
+    def _type_spec_to_string(self, spec: str | ArrayTypeSpec | SetTypeSpec | DictTypeSpec | OverflowTypeSpec | InternedTypeSpec) -> str:
         """Convert a TypeSpec AST node back to a human-readable string."""
         if isinstance(spec, OverflowTypeSpec):
             return f"{spec.overflow} {self._type_spec_to_string(spec.base_type)}"
+        elif isinstance(spec, InternedTypeSpec):
+            return f"interned {self._type_spec_to_string(spec.base_type)}"
         elif isinstance(spec, str):
             return spec
         elif isinstance(spec, ArrayTypeSpec):
@@ -1313,6 +1452,9 @@ class QueryExecutor:
         # Build field definitions from query
         fields: list[FieldDefinition] = parent_fields.copy()
         for field_def in query.fields:
+            err = self._validate_interned_modifier(field_def.type_name, field_def.name)
+            if err:
+                return CreateResult(columns=[], rows=[], message=err, type_name=query.name)
             field_type = self._resolve_type_spec(field_def.type_name)
             if field_type is None:
                 type_str = self._type_spec_to_string(field_def.type_name)
@@ -1473,6 +1615,9 @@ class QueryExecutor:
         # Build field definitions from query
         fields: list[FieldDefinition] = parent_fields.copy()
         for field_def in query.fields:
+            err = self._validate_interned_modifier(field_def.type_name, field_def.name)
+            if err:
+                return CreateResult(columns=[], rows=[], message=err, type_name=query.name)
             field_type = self._resolve_type_spec(field_def.type_name)
             if field_type is None:
                 type_str = self._type_spec_to_string(field_def.type_name)
@@ -1920,6 +2065,23 @@ class QueryExecutor:
         fields: list,
     ) -> UpdateResult | None:
         """Apply SET field assignments to a single record. Returns an error UpdateResult or None on success."""
+        try:
+            error = self._write_update_fields(type_name, base, table, index, fields)
+        except BaseException:
+            self.storage.settle_released_blocks(written=False)
+            raise
+        # Array blocks moved out of are reusable only once the record no longer points at them
+        self.storage.settle_released_blocks(written=error is None)
+        return error
+
+    def _write_update_fields(
+        self,
+        type_name: str,
+        base: CompositeTypeDefinition,
+        table: Any,
+        index: int,
+        fields: list,
+    ) -> UpdateResult | None:
         raw_record = table.get(index)
 
         for fv in fields:
@@ -1977,6 +2139,8 @@ class QueryExecutor:
                         return error
                     continue
 
+            # Assignment replaces whatever array the field held
+            self._release_field_value(field_def, raw_record.get(fv.name))
             resolved_value = self._resolve_instance_value(fv.value)
 
             # Resolve shorthand enum expressions for update context
@@ -2107,16 +2271,7 @@ class QueryExecutor:
                         columns=[], rows=[],
                         message=f"biguint field '{fv.name}' cannot store negative value: {val}",
                     )
-                if val == 0:
-                    byte_list = [0]
-                elif signed:
-                    byte_length = (val.bit_length() + 8) // 8
-                    byte_list = list(val.to_bytes(byte_length, byteorder='little', signed=True))
-                else:
-                    byte_length = (val.bit_length() + 7) // 8
-                    byte_list = list(val.to_bytes(byte_length, byteorder='little', signed=False))
-                array_table = self.storage.get_array_table_for_type(field_def.type_def)
-                raw_record[fv.name] = array_table.insert(byte_list)
+                raw_record[fv.name] = _bigint_encode(val, field_def.type_def, self.storage)
             elif isinstance(field_base, ArrayTypeDefinition):
                 if isinstance(resolved_value, str):
                     resolved_value = list(resolved_value)
@@ -2252,10 +2407,7 @@ class QueryExecutor:
             if length == 0:
                 return {}
             array_table = self.storage.get_array_table_for_type(field_def.type_def)
-            entry_indices = [
-                array_table.element_table.get(start_index + j)
-                for j in range(length)
-            ]
+            entry_indices = array_table.get(start_index, length)
             entry_type = field_base.entry_type
             entry_table = self.storage.get_table(entry_type.name)
             result = {}
@@ -2272,10 +2424,7 @@ class QueryExecutor:
             return []
 
         array_table = self.storage.get_array_table_for_type(field_def.type_def)
-        elements = [
-            array_table.element_table.get(start_index + j)
-            for j in range(length)
-        ]
+        elements = array_table.get(start_index, length)
         if is_string_type(field_def.type_def):
             return "".join(elements)
 
@@ -2324,8 +2473,25 @@ class QueryExecutor:
             return resolved
         return elements
 
+    def _release_field_value(self, field_def: FieldDefinition, value: Any) -> None:
+        """Release the element storage of a field value that is being replaced or deleted.
+
+        Only the field's own array (or fraction bytes) is released; strings
+        inside a string array and dict entry records are left to ``compact``.
+        """
+        if value is None:
+            return
+        field_base = field_def.type_def.resolve_base_type()
+        if isinstance(field_base, FractionTypeDefinition):
+            num_start, num_len, den_start, den_len = value
+            self.storage.get_fraction_num_table().release(num_start, num_len)
+            self.storage.get_fraction_den_table().release(den_start, den_len)
+        elif isinstance(field_base, (ArrayTypeDefinition, DictionaryTypeDefinition)):
+            self.storage.get_array_table_for_type(field_def.type_def).release(*value)
+
     def _write_chain_result(self, raw_record: dict, field_name: str, field_def: Any, value: Any) -> None:
         """Write the result of a chain back to the raw_record."""
+        self._release_field_value(field_def, raw_record.get(field_name))
         if value is None:
             raw_record[field_name] = None
             return
@@ -2536,7 +2702,7 @@ class QueryExecutor:
             array_table = self.storage.get_array_table_for_type(field_def.type_def)
             elements = array_table.get(start_index, length)
             elements.reverse()
-            array_table.update_in_place(start_index, length, elements)
+            raw_record[fv.name] = array_table.update_in_place(start_index, length, elements)
             return None
 
         elif fv.method_name == "append":
@@ -2598,14 +2764,14 @@ class QueryExecutor:
                     )
             else:
                 start_index, length = ref
-                if index_arg < 0 or index_arg > length:
+                existing = array_table.get(start_index, length)
+                if index_arg < 0 or index_arg > len(existing):
                     return UpdateResult(
                         columns=[], rows=[],
-                        message=f"insert() index {index_arg} out of range for array of length {length}",
+                        message=f"insert() index {index_arg} out of range for array of length {len(existing)}",
                     )
-                existing = array_table.get(start_index, length)
                 spliced = existing[:index_arg] + insert_elements + existing[index_arg:]
-                raw_record[fv.name] = array_table.insert(spliced)
+                raw_record[fv.name] = array_table.replace(start_index, length, spliced)
             return None
 
         elif fv.method_name == "delete":
@@ -2621,16 +2787,17 @@ class QueryExecutor:
                     message=f"Cannot apply delete() to null array field '{fv.name}'",
                 )
             start_index, length = ref
+            array_table = self.storage.get_array_table_for_type(field_def.type_def)
+            count = array_table.element_count(start_index, length)
             indices_to_delete = set()
             for arg in args:
                 idx = int(self._resolve_instance_value(arg))
-                if idx < 0 or idx >= length:
+                if idx < 0 or idx >= count:
                     return UpdateResult(
                         columns=[], rows=[],
-                        message=f"delete() index {idx} out of range for array of length {length}",
+                        message=f"delete() index {idx} out of range for array of length {count}",
                     )
                 indices_to_delete.add(idx)
-            array_table = self.storage.get_array_table_for_type(field_def.type_def)
             raw_record[fv.name] = array_table.delete(start_index, length, indices_to_delete)
             return None
 
@@ -2699,11 +2866,11 @@ class QueryExecutor:
                     if len(replacement) == 1:
                         # Length-preserving: update in place
                         elements[i] = replacement[0]
-                        array_table.update_in_place(start_index, length, elements)
+                        raw_record[fv.name] = array_table.update_in_place(start_index, length, elements)
                     else:
                         # Different length: copy-on-write
                         new_elements = elements[:i] + replacement + elements[i + 1:]
-                        raw_record[fv.name] = array_table.insert(new_elements)
+                        raw_record[fv.name] = array_table.replace(start_index, length, new_elements)
                     return None
             return None  # not found → no-op
 
@@ -2731,7 +2898,7 @@ class QueryExecutor:
                         elements[i] = replacement[0]
                         found = True
                 if found:
-                    array_table.update_in_place(start_index, length, elements)
+                    raw_record[fv.name] = array_table.update_in_place(start_index, length, elements)
             else:
                 # Different length: build new list
                 new_elements = []
@@ -2742,7 +2909,7 @@ class QueryExecutor:
                     else:
                         new_elements.append(elem)
                 if found:
-                    raw_record[fv.name] = array_table.insert(new_elements)
+                    raw_record[fv.name] = array_table.replace(start_index, length, new_elements)
             return None  # no matches → no-op
 
         elif fv.method_name == "sort":
@@ -2763,7 +2930,7 @@ class QueryExecutor:
                 return sort_keys  # error
 
             elements = self._sort_array_elements(elements, sort_keys, is_composite, elem_base)
-            array_table.update_in_place(start_index, length, elements)
+            raw_record[fv.name] = array_table.update_in_place(start_index, length, elements)
             return None
 
         elif fv.method_name == "swap":
@@ -2779,23 +2946,24 @@ class QueryExecutor:
                     message=f"Cannot apply swap() to null array field '{fv.name}'",
                 )
             start_index, length = ref
+            array_table = self.storage.get_array_table_for_type(field_def.type_def)
+            count = array_table.element_count(start_index, length)
             i, j = int(args[0]), int(args[1])
-            if i < 0 or i >= length:
+            if i < 0 or i >= count:
                 return UpdateResult(
                     columns=[], rows=[],
-                    message=f"swap() index {i} out of range for array of length {length}",
+                    message=f"swap() index {i} out of range for array of length {count}",
                 )
-            if j < 0 or j >= length:
+            if j < 0 or j >= count:
                 return UpdateResult(
                     columns=[], rows=[],
-                    message=f"swap() index {j} out of range for array of length {length}",
+                    message=f"swap() index {j} out of range for array of length {count}",
                 )
             if i == j:
                 return None  # no-op
-            array_table = self.storage.get_array_table_for_type(field_def.type_def)
             elements = array_table.get(start_index, length)
             elements[i], elements[j] = elements[j], elements[i]
-            array_table.update_in_place(start_index, length, elements)
+            raw_record[fv.name] = array_table.update_in_place(start_index, length, elements)
             return None
 
         else:
@@ -2866,12 +3034,12 @@ class QueryExecutor:
 
         # Write back as char array
         new_chars = list(result)
-        if len(new_chars) == length:
+        if len(new_chars) == len(chars):
             # Same length — update in place
-            array_table.update_in_place(start_index, length, new_chars)
+            raw_record[fv.name] = array_table.update_in_place(start_index, length, new_chars)
         else:
-            # Different length — insert new
-            raw_record[fv.name] = array_table.insert(new_chars)
+            # Different length — copy-on-write
+            raw_record[fv.name] = array_table.replace(start_index, length, new_chars)
         return None
 
     def _resolve_append_elements(
@@ -3237,6 +3405,15 @@ class QueryExecutor:
             return f"Overflow modifier '{overflow}' not allowed on {base.primitive.value} field '{field_name}'"
         return f"Overflow modifier '{overflow}' only allowed on integer fields, not '{field_type.name}' field '{field_name}'"
 
+    def _validate_interned_modifier(self, spec: Any, field_name: str) -> str | None:
+        """Validate that an interned modifier is only applied to strings. Returns error message or None."""
+        if not isinstance(spec, InternedTypeSpec):
+            return None
+        base_td = self._resolve_type_spec(spec.base_type)
+        if base_td is None or is_string_type(base_td):
+            return None
+        return f"Interned modifier only allowed on string fields, not '{base_td.name}' field '{field_name}'"
+
     def _resolve_default_value(self, raw_value: Any, type_def: TypeDefinition) -> Any:
         """Resolve a default value from a type field definition.
 
@@ -3448,8 +3625,7 @@ class QueryExecutor:
                     entry_type = vf_base.entry_type
                     entry_base = entry_type.resolve_base_type()
                     resolved_dict = {}
-                    for j in range(length):
-                        entry_idx = arr_table.element_table.get(start_index + j)
+                    for entry_idx in arr_table.get(start_index, length):
                         entry_table = self.storage.get_table(entry_type.name)
                         entry_record = entry_table.get(entry_idx)
                         key_field = entry_base.get_field("key")
@@ -3464,10 +3640,7 @@ class QueryExecutor:
                     enum_val.fields[vf.name] = [] if not is_string_type(vf.type_def) else ""
                 else:
                     arr_table = self.storage.get_array_table_for_type(vf.type_def)
-                    elements = [
-                        arr_table.element_table.get(start_index + j)
-                        for j in range(length)
-                    ]
+                    elements = arr_table.get(start_index, length)
                     if is_string_type(vf.type_def):
                         enum_val.fields[vf.name] = "".join(elements)
                     else:
@@ -3494,8 +3667,7 @@ class QueryExecutor:
                             str_elements = []
                             for elem in elements:
                                 cs, cl = elem
-                                chars = [char_table.element_table.get(cs + k) for k in range(cl)]
-                                str_elements.append("".join(chars))
+                                str_elements.append(char_table.get_string(cs, cl))
                             elements = str_elements
                         enum_val.fields[vf.name] = elements
 
@@ -3656,16 +3828,7 @@ class QueryExecutor:
                 signed = isinstance(field_base, BigIntTypeDefinition)
                 if not signed and val < 0:
                     raise ValueError(f"biguint field '{field.name}' cannot store negative value: {val}")
-                if val == 0:
-                    byte_list = [0]
-                elif signed:
-                    byte_length = (val.bit_length() + 8) // 8
-                    byte_list = list(val.to_bytes(byte_length, byteorder='little', signed=True))
-                else:
-                    byte_length = (val.bit_length() + 7) // 8
-                    byte_list = list(val.to_bytes(byte_length, byteorder='little', signed=False))
-                array_table = self.storage.get_array_table_for_type(field.type_def)
-                field_references[field.name] = array_table.insert(byte_list)
+                field_references[field.name] = _bigint_encode(val, field.type_def, self.storage)
                 continue
 
             if isinstance(field_base, ArrayTypeDefinition):
@@ -4347,7 +4510,15 @@ class QueryExecutor:
         table = self.storage.get_table(query.table)
         for record in records_to_delete:
             index = record["_index"]
-            table.delete(index)
+            raw_record = table.get(index)
+            for field_def in base.fields:
+                self._release_field_value(field_def, raw_record.get(field_def.name))
+            try:
+                table.delete(index)
+            except BaseException:
+                self.storage.settle_released_blocks(written=False)
+                raise
+            self.storage.settle_released_blocks(written=True)
 
         return DeleteResult(
             columns=["deleted"],
@@ -4358,6 +4529,7 @@ class QueryExecutor:
 
     def _execute_select(self, query: SelectQuery) -> QueryResult:
         """Execute SELECT query."""
+        where_applied = False
         # Resolve the source: either a variable or a table name
         if query.source_var:
             var_binding = self._lookup_variable(query.source_var)
@@ -4426,7 +4598,23 @@ class QueryExecutor:
                     columns, rows = self._select_fields(records, query, type_def)
                     return QueryResult(columns=columns, rows=rows)
 
-            records = list(self._load_all_records(query.table, type_def))
+            base = type_def.resolve_base_type()
+            if isinstance(base, CompositeTypeDefinition):
+                columnar = self._select_columnar(query, base)
+                if isinstance(columnar, QueryResult):
+                    return columnar
+                if columnar is not None:
+                    # WHERE already evaluated on the scanned columns
+                    table = self.storage.get_table(query.table)
+                    records = [
+                        self._resolve_composite_record(base, i, table.get(i))
+                        for i in columnar
+                    ]
+                    where_applied = True
+                else:
+                    records = list(self._load_all_records(query.table, type_def))
+            else:
+                records = list(self._load_all_records(query.table, type_def))
 
         base = type_def.resolve_base_type()
 
@@ -4481,7 +4669,7 @@ class QueryExecutor:
                 return QueryResult(columns=columns, rows=rows)
 
         # Apply WHERE filter
-        if query.where:
+        if query.where and not where_applied:
             records = [r for r in records if self._evaluate_condition(r, query.where)]
 
         # Apply GROUP BY
@@ -4503,6 +4691,246 @@ class QueryExecutor:
 
         return QueryResult(columns=columns, rows=rows)
 
+    @staticmethod
+    def _scannable_fields(base: CompositeTypeDefinition) -> set[str]:
+        """Return the fields whose stored value is also their query value (inline primitives)."""
+        return {
+            f.name for f in base.fields
+            if isinstance(f.type_def.resolve_base_type(), PrimitiveTypeDefinition)
+        }
+
+    @classmethod
+    def _condition_fields(cls, condition: Condition | CompoundCondition) -> set[str]:
+        """Return the field names a WHERE condition reads."""
+        if isinstance(condition, CompoundCondition):
+            return cls._condition_fields(condition.left) | cls._condition_fields(condition.right)
+        return {condition.field}
+
+    def _scan_columns(
+        self, type_name: str, names: list[str], where: Condition | CompoundCondition | None,
+    ) -> list[dict[str, Any]]:
+        """Read only the named primitive columns of a table as partial rows, filtered by WHERE."""
+        table = self.storage.get_table(type_name)
+        rows = []
+        for index, values in table.scan_fields(names):
+            row = dict(zip(names, values))
+            row["_index"] = index
+            if where is None or self._evaluate_condition(row, where):
+                rows.append(row)
+        return rows
+
+    def _select_columnar(
+        self, query: SelectQuery, base: CompositeTypeDefinition,
+    ) -> QueryResult | list[int] | None:
+        """Answer a SELECT from scanned columns where possible.
+
+        Returns a finished result for global aggregates over primitive
+        fields, the matching record indices when only the WHERE clause can be
+        answered from primitive fields, or None to fall back to full records.
+        """
+        if not (self.storage.data_dir / f"{query.table}.bin").exists():
+            return None
+        scannable = self._scannable_fields(base)
+        where_fields = self._condition_fields(query.where) if query.where else set()
+        where = query.where
+        if not where_fields <= scannable | {"_index"}:
+            # Equality on interned strings compares stored references
+            where = self._interned_condition(base, query.where, scannable) if query.where else None
+            if where is None:
+                return None
+        where_names = sorted(where_fields - {"_index"})
+
+        aggregate_only = (
+            any(f.aggregate for f in query.fields)
+            and not (query.group_by or query.sort_by or query.offset or query.limit is not None)
+            and all(
+                f.array_index is None and f.post_path is None
+                and f.method_name is None and f.method_chain is None
+                and (f.name in scannable or (f.aggregate == "count" and f.name == "*"))
+                for f in query.fields
+            )
+        )
+        if aggregate_only:
+            vectorized = self._aggregate_numpy(query, base)
+            if vectorized is not None:
+                return vectorized
+            names = sorted(set(where_names) | {f.name for f in query.fields if f.name != "*"})
+            rows = self._scan_columns(query.table, names, where)
+            columns, result_rows = self._compute_global_aggregates(rows, query.fields)
+            return QueryResult(columns=columns, rows=result_rows)
+
+        if not where:
+            return None
+        masked = self._where_numpy(query.table, base, where)
+        if masked is not None:
+            return masked[1].nonzero()[0].tolist()
+        rows = self._scan_columns(query.table, where_names, where)
+        return [row["_index"] for row in rows]
+
+    def _interned_condition(
+        self, base: CompositeTypeDefinition, condition: Condition | CompoundCondition, scannable: set[str],
+    ) -> Condition | CompoundCondition | None:
+        """Rewrite a WHERE condition to compare interned strings by reference.
+
+        Interned strings are stored once per distinct value, so ``field = "x"``
+        holds exactly when the field's (start_index, length) is the reference
+        of "x". Returns the condition with each such literal replaced by its
+        reference, or None if some test still needs decoded records.
+        """
+        if isinstance(condition, CompoundCondition):
+            left = self._interned_condition(base, condition.left, scannable)
+            right = self._interned_condition(base, condition.right, scannable)
+            if left is None or right is None:
+                return None
+            return CompoundCondition(left=left, operator=condition.operator, right=right)
+
+        if condition.field in scannable or condition.field == "_index":
+            return condition
+        fdef = base.get_field(condition.field)
+        if (fdef is None
+                or not isinstance(fdef.type_def.resolve_base_type(), InternedStringTypeDefinition)
+                or condition.operator not in ("eq", "neq")
+                or condition.method_name is not None or condition.method_chain is not None):
+            return None
+        if isinstance(condition.value, NullValue):
+            return condition
+        if not isinstance(condition.value, str):
+            return None
+        ref = self.storage.get_array_table_for_type(fdef.type_def).lookup(condition.value)
+        # A value that was never stored matches no record
+        return replace(condition, value=ref if ref is not None else (-1, 0))
+
+    # Aggregates computed on NumPy columns; anything else uses the Python scan
+    _NUMPY_AGGREGATES = frozenset({"count", "sum", "average", "min", "max"})
+
+    _NUMPY_COMPARISONS = {
+        "eq": operator.eq,
+        "neq": operator.ne,
+        "lt": operator.lt,
+        "lte": operator.le,
+        "gt": operator.gt,
+        "gte": operator.ge,
+    }
+
+    @staticmethod
+    def _numeric_fields(base: CompositeTypeDefinition) -> set[str]:
+        """Return the fields whose NumPy column compares and sums like the Python value."""
+        excluded = (PrimitiveType.CHARACTER, PrimitiveType.INT128, PrimitiveType.UINT128)
+        names = set()
+        for f in base.fields:
+            field_base = f.type_def.resolve_base_type()
+            if isinstance(field_base, PrimitiveTypeDefinition) and field_base.primitive not in excluded:
+                names.add(f.name)
+        return names
+
+    def _where_numpy(
+        self, type_name: str, base: CompositeTypeDefinition,
+        where: Condition | CompoundCondition | None,
+    ) -> tuple[Any, Any] | None:
+        """Evaluate WHERE as a vectorized mask over the table's NumPy view.
+
+        Returns (records, mask) where mask is True for live records that
+        match, or None if NumPy is missing or the condition needs the
+        Python evaluator.
+        """
+        from typed_tables import numpy_support
+
+        if not numpy_support.HAS_NUMPY:
+            return None
+        table = self.storage.get_table(type_name)
+        records = table.as_numpy()
+        mask = table.live_mask()
+        if where is not None:
+            matched = self._numpy_condition_mask(records, base, where)
+            if matched is None:
+                return None
+            mask &= matched
+        return records, mask
+
+    def _numpy_condition_mask(
+        self, records: Any, base: CompositeTypeDefinition, condition: Condition | CompoundCondition,
+    ) -> Any | None:
+        """Return a boolean array with _evaluate_condition()'s result for every record, or None."""
+        from typed_tables.numpy_support import np, null_mask
+
+        if isinstance(condition, CompoundCondition):
+            left = self._numpy_condition_mask(records, base, condition.left)
+            right = self._numpy_condition_mask(records, base, condition.right)
+            if left is None or right is None:
+                return None
+            return left & right if condition.operator == "and" else left | right
+
+        if condition.method_name is not None or condition.method_chain is not None:
+            return None
+        compare = self._NUMPY_COMPARISONS.get(condition.operator)
+        value = condition.value
+        if compare is None or not (isinstance(value, NullValue) or type(value) in (int, float, bool)):
+            return None
+
+        if condition.field == "_index":
+            column = np.arange(len(records))
+            nulls = np.zeros(len(records), dtype=bool)
+        elif condition.field in self._numeric_fields(base):
+            column = records[condition.field]
+            if column.dtype.kind == "f":
+                # Compare at the precision Python sees after decoding
+                column = column.astype(np.float64)
+            nulls = null_mask(records, base, condition.field)
+        else:
+            return None
+
+        if isinstance(value, NullValue):
+            if condition.operator == "eq":
+                result = nulls
+            elif condition.operator == "neq":
+                result = ~nulls
+            else:
+                result = np.zeros(len(records), dtype=bool)
+        else:
+            # Null fields fail every comparison (before negation)
+            result = compare(column, value) & ~nulls
+        return ~result if condition.negate else result
+
+    def _aggregate_numpy(self, query: SelectQuery, base: CompositeTypeDefinition) -> QueryResult | None:
+        """Compute a global aggregate SELECT on NumPy columns, or None to use the Python scan."""
+        numeric = self._numeric_fields(base)
+        for f in query.fields:
+            if f.aggregate not in self._NUMPY_AGGREGATES:
+                return None
+            if f.aggregate != "count" and f.name not in numeric:
+                return None
+        masked = self._where_numpy(query.table, base, query.where)
+        if masked is None:
+            return None
+
+        from typed_tables.numpy_support import np, null_mask
+
+        records, mask = masked
+        matched = int(mask.sum())
+        columns = []
+        row: dict[str, Any] = {}
+        for f in query.fields:
+            col_name = f"{f.aggregate}({f.name})"
+            columns.append(col_name)
+            if f.aggregate == "count":
+                row[col_name] = matched
+                continue
+            values = records[f.name][mask & ~null_mask(records, base, f.name)]
+            if len(values) == 0:
+                row[col_name] = None
+            elif f.aggregate in ("min", "max"):
+                row[col_name] = (values.min() if f.aggregate == "min" else values.max()).item()
+            else:
+                if values.dtype.kind == "f":
+                    total: int | float = float(values.sum(dtype=np.float64))
+                elif values.dtype.itemsize == 8:
+                    # 64-bit sums can overflow; Python ints cannot
+                    total = sum(values.tolist())
+                else:
+                    total = int(values.sum(dtype=np.int64))
+                row[col_name] = total if f.aggregate == "sum" else total / len(values)
+        return QueryResult(columns=columns, rows=[row])
+
     def _load_all_records(
         self, type_name: str, type_def: TypeDefinition
     ) -> Iterator[dict[str, Any]]:
@@ -4511,173 +4939,8 @@ class QueryExecutor:
 
         if isinstance(base, CompositeTypeDefinition):
             table = self.storage.get_table(type_name)
-            for i in range(table.count):
-                # Skip deleted records
-                if table.is_deleted(i):
-                    continue
-
-                record = table.get(i)
-                resolved = {"_index": i}
-
-                for field in base.fields:
-                    ref = record[field.name]
-
-                    if ref is None:
-                        resolved[field.name] = None
-                        continue
-
-                    field_base = field.type_def.resolve_base_type()
-
-                    if isinstance(field_base, EnumTypeDefinition):
-                        if field_base.has_associated_values:
-                            # Swift-style: ref is (disc, index) tuple — resolve from variant table
-                            enum_val = self._resolve_swift_enum_ref(ref, field_base)
-                            self._resolve_enum_associated_values(enum_val, field_base)
-                            resolved[field.name] = enum_val
-                        else:
-                            # C-style: ref is already an EnumValue
-                            self._resolve_enum_associated_values(ref, field_base)
-                            resolved[field.name] = ref
-                    elif isinstance(field_base, FractionTypeDefinition):
-                        resolved[field.name] = _fraction_decode(self.storage, ref[0], ref[1], ref[2], ref[3])
-                    elif isinstance(field_base, DictionaryTypeDefinition):
-                        start_index, length = ref
-                        if length == 0:
-                            resolved[field.name] = {}
-                        else:
-                            arr_table = self.storage.get_array_table_for_type(field.type_def)
-                            entry_type = field_base.entry_type
-                            entry_base = entry_type.resolve_base_type()
-                            result_dict = {}
-                            for j in range(length):
-                                entry_idx = arr_table.element_table.get(start_index + j)
-                                entry_table = self.storage.get_table(entry_type.name)
-                                entry_record = entry_table.get(entry_idx)
-                                # Resolve key and value from entry record
-                                key_ref = entry_record["key"]
-                                val_ref = entry_record["value"]
-                                key_val = self._resolve_entry_field(key_ref, entry_base.get_field("key"))
-                                val_val = self._resolve_entry_field(val_ref, entry_base.get_field("value"))
-                                result_dict[key_val] = val_val
-                            resolved[field.name] = result_dict
-                    elif isinstance(field_base, SetTypeDefinition):
-                        start_index, length = ref
-                        if length == 0:
-                            resolved[field.name] = SetValue()
-                        else:
-                            arr_table = self.storage.get_array_table_for_type(field.type_def)
-                            elements = [
-                                arr_table.element_table.get(start_index + j)
-                                for j in range(length)
-                            ]
-                            if is_string_type(field_base.element_type):
-                                # String set elements: each element is (start, length) in char table
-                                char_table = self.storage.get_array_table_for_type(field_base.element_type)
-                                str_elements = []
-                                for elem in elements:
-                                    cs, cl = elem
-                                    chars = [char_table.element_table.get(cs + k) for k in range(cl)]
-                                    str_elements.append("".join(chars))
-                                resolved[field.name] = SetValue(str_elements)
-                            else:
-                                # Resolve enum elements in sets
-                                elem_base = field_base.element_type.resolve_base_type()
-                                if isinstance(elem_base, EnumTypeDefinition):
-                                    resolved_elems = []
-                                    for el in elements:
-                                        if elem_base.has_associated_values and isinstance(el, tuple):
-                                            ev = self._resolve_swift_enum_ref(el, elem_base)
-                                            self._resolve_enum_associated_values(ev, elem_base)
-                                            resolved_elems.append(ev)
-                                        elif not elem_base.has_associated_values:
-                                            if isinstance(el, EnumValue):
-                                                resolved_elems.append(el)
-                                            else:
-                                                v = elem_base.get_variant_by_discriminant(el)
-                                                if v:
-                                                    resolved_elems.append(EnumValue(variant_name=v.name, discriminant=el))
-                                                else:
-                                                    resolved_elems.append(el)
-                                        else:
-                                            resolved_elems.append(el)
-                                    elements = resolved_elems
-                                resolved[field.name] = SetValue(elements)
-                    elif isinstance(field_base, FractionTypeDefinition):
-                        resolved[field.name] = _fraction_decode(self.storage, ref[0], ref[1], ref[2], ref[3])
-                    elif isinstance(field_base, (BigIntTypeDefinition, BigUIntTypeDefinition)):
-                        start_index, length = ref
-                        if length == 0:
-                            if isinstance(field_base, BigIntTypeDefinition):
-                                resolved[field.name] = BigInt(0)
-                            else:
-                                resolved[field.name] = BigUInt(0)
-                        else:
-                            arr_table = self.storage.get_array_table_for_type(field.type_def)
-                            elements = [arr_table.element_table.get(start_index + j) for j in range(length)]
-                            signed = isinstance(field_base, BigIntTypeDefinition)
-                            val = int.from_bytes(bytes(elements), 'little', signed=signed)
-                            if signed:
-                                resolved[field.name] = BigInt(val)
-                            else:
-                                resolved[field.name] = BigUInt(val)
-                    elif isinstance(field_base, ArrayTypeDefinition):
-                        start_index, length = ref
-                        if length == 0:
-                            resolved[field.name] = []
-                        else:
-                            arr_table = self.storage.get_array_table_for_type(field.type_def)
-                            elements = [
-                                arr_table.element_table.get(start_index + j)
-                                for j in range(length)
-                            ]
-                            if is_string_type(field.type_def):
-                                resolved[field.name] = "".join(elements)
-                            elif is_string_type(field_base.element_type):
-                                char_table = self.storage.get_array_table_for_type(field_base.element_type)
-                                str_elements = []
-                                for elem in elements:
-                                    cs, cl = elem
-                                    chars = [char_table.element_table.get(cs + k) for k in range(cl)]
-                                    str_elements.append("".join(chars))
-                                resolved[field.name] = str_elements
-                            else:
-                                # Resolve enum elements in arrays
-                                elem_base = field_base.element_type.resolve_base_type()
-                                if isinstance(elem_base, EnumTypeDefinition):
-                                    resolved_elems = []
-                                    for el in elements:
-                                        if elem_base.has_associated_values and isinstance(el, tuple):
-                                            ev = self._resolve_swift_enum_ref(el, elem_base)
-                                            self._resolve_enum_associated_values(ev, elem_base)
-                                            resolved_elems.append(ev)
-                                        elif not elem_base.has_associated_values:
-                                            if isinstance(el, EnumValue):
-                                                resolved_elems.append(el)
-                                            else:
-                                                v = elem_base.get_variant_by_discriminant(el)
-                                                if v:
-                                                    resolved_elems.append(EnumValue(variant_name=v.name, discriminant=el))
-                                                else:
-                                                    resolved_elems.append(el)
-                                        else:
-                                            resolved_elems.append(el)
-                                    elements = resolved_elems
-                                resolved[field.name] = elements
-                    elif isinstance(field_base, InterfaceTypeDefinition):
-                        # ref is (type_id, index) tuple
-                        type_id, idx = ref
-                        concrete_name = self.registry.get_type_name_by_id(type_id)
-                        if concrete_name:
-                            resolved[field.name] = f"<{concrete_name}[{idx}]>"
-                        else:
-                            resolved[field.name] = f"<type_id={type_id}[{idx}]>"
-                    elif isinstance(field_base, CompositeTypeDefinition):
-                        resolved[field.name] = f"<{field.type_def.name}[{ref}]>"
-                    else:
-                        # Primitive — value is already inline
-                        resolved[field.name] = bool(ref) if is_boolean_type(field.type_def) else ref
-
-                yield resolved
+            for i, record in table.iter_records():
+                yield self._resolve_composite_record(base, i, record)
 
         elif isinstance(base, InterfaceTypeDefinition):
             # Interface type — fan out across all implementing types
@@ -4700,57 +4963,200 @@ class QueryExecutor:
             # Primitive/alias type — scan all composites that contain this field type
             yield from self._load_records_by_field_type(type_name, type_def)
 
-    def _resolve_entry_field(self, ref: Any, field_def: FieldDefinition) -> Any:
-        """Resolve a single field from a dict entry composite (key or value)."""
-        if ref is None:
-            return None
-        field_base = field_def.type_def.resolve_base_type()
-        if isinstance(field_base, ArrayTypeDefinition):
-            start_index, length = ref
-            if length == 0:
-                return [] if not is_string_type(field_def.type_def) else ""
-            arr_table = self.storage.get_array_table_for_type(field_def.type_def)
-            elements = [arr_table.element_table.get(start_index + j) for j in range(length)]
-            if is_string_type(field_def.type_def):
-                return "".join(elements)
-            if is_string_type(field_base.element_type):
-                char_table = self.storage.get_array_table_for_type(field_base.element_type)
-                str_elements = []
-                for elem in elements:
-                    cs, cl = elem
-                    chars = [char_table.element_table.get(cs + k) for k in range(cl)]
-                    str_elements.append("".join(chars))
-                return str_elements
-            return elements
-        if isinstance(field_base, EnumTypeDefinition):
-            if field_base.has_associated_values:
-                if isinstance(ref, tuple):
-                    enum_val = self._resolve_swift_enum_ref(ref, field_base)
-                    self._resolve_enum_associated_values(enum_val, field_base)
-                    return enum_val
-                return ref
-            else:
-                # C-style enum — resolve discriminant to EnumValue
-                if isinstance(ref, EnumValue):
-                    return ref
-                variant = field_base.get_variant_by_discriminant(ref)
-                if variant:
-                    return EnumValue(variant_name=variant.name, discriminant=ref)
-                return ref
-        if isinstance(field_base, CompositeTypeDefinition):
-            return f"<{field_def.type_def.name}[{ref}]>"
-        if is_boolean_type(field_def.type_def):
-            return bool(ref)
-        return ref
+    def _resolve_composite_record(
+        self, base: CompositeTypeDefinition, index: int, record: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Resolve the raw field refs of a composite record into values."""
+        resolved = {"_index": index}
 
-    def _load_records_by_interface(
-        self, interface_name: str, interface_def: InterfaceTypeDefinition
-    ) -> Iterator[dict[str, Any]]:
-        """Load records from all types implementing an interface.
+        for field in base.fields:
+            ref = record[field.name]
 
-        Returns records with interface fields + _type and _index columns.
-        """
-        interface_field_names = [f.name for f in interface_def.fields]
+            if ref is None:
+                resolved[field.name] = None
+                continue
+
+            field_base = field.type_def.resolve_base_type()
+
+            if isinstance(field_base, EnumTypeDefinition):
+                if field_base.has_associated_values:
+                    # Swift-style: ref is (disc, index) tuple — resolve from variant table
+                    enum_val = self._resolve_swift_enum_ref(ref, field_base)
+                    self._resolve_enum_associated_values(enum_val, field_base)
+                    resolved[field.name] = enum_val
+                else:
+                    # C-style: ref is already an EnumValue
+                    self._resolve_enum_associated_values(ref, field_base)
+                    resolved[field.name] = ref
+            elif isinstance(field_base, FractionTypeDefinition):
+                resolved[field.name] = _fraction_decode(self.storage, ref[0], ref[1], ref[2], ref[3])
+            elif isinstance(field_base, DictionaryTypeDefinition):
+                start_index, length = ref
+                if length == 0:
+                    resolved[field.name] = {}
+                else:
+                    arr_table = self.storage.get_array_table_for_type(field.type_def)
+                    entry_type = field_base.entry_type
+                    entry_base = entry_type.resolve_base_type()
+                    result_dict = {}
+                    for entry_idx in arr_table.get(start_index, length):
+                        entry_table = self.storage.get_table(entry_type.name)
+                        entry_record = entry_table.get(entry_idx)
+                        # Resolve key and value from entry record
+                        key_ref = entry_record["key"]
+                        val_ref = entry_record["value"]
+                        key_val = self._resolve_entry_field(key_ref, entry_base.get_field("key"))
+                        val_val = self._resolve_entry_field(val_ref, entry_base.get_field("value"))
+                        result_dict[key_val] = val_val
+                    resolved[field.name] = result_dict
+            elif isinstance(field_base, SetTypeDefinition):
+                start_index, length = ref
+                if length == 0:
+                    resolved[field.name] = SetValue()
+                else:
+                    arr_table = self.storage.get_array_table_for_type(field.type_def)
+                    elements = arr_table.get(start_index, length)
+                    if is_string_type(field_base.element_type):
+                        # String set elements: each element is (start, length) in char table
+                        char_table = self.storage.get_array_table_for_type(field_base.element_type)
+                        str_elements = []
+                        for elem in elements:
+                            cs, cl = elem
+                            str_elements.append(char_table.get_string(cs, cl))
+                        resolved[field.name] = SetValue(str_elements)
+                    else:
+                        # Resolve enum elements in sets
+                        elem_base = field_base.element_type.resolve_base_type()
+                        if isinstance(elem_base, EnumTypeDefinition):
+                            resolved_elems = []
+                            for el in elements:
+                                if elem_base.has_associated_values and isinstance(el, tuple):
+                                    ev = self._resolve_swift_enum_ref(el, elem_base)
+                                    self._resolve_enum_associated_values(ev, elem_base)
+                                    resolved_elems.append(ev)
+                                elif not elem_base.has_associated_values:
+                                    if isinstance(el, EnumValue):
+                                        resolved_elems.append(el)
+                                    else:
+                                        v = elem_base.get_variant_by_discriminant(el)
+                                        if v:
+                                            resolved_elems.append(EnumValue(variant_name=v.name, discriminant=el))
+                                        else:
+                                            resolved_elems.append(el)
+                                else:
+                                    resolved_elems.append(el)
+                            elements = resolved_elems
+                        resolved[field.name] = SetValue(elements)
+            elif isinstance(field_base, FractionTypeDefinition):
+                resolved[field.name] = _fraction_decode(self.storage, ref[0], ref[1], ref[2], ref[3])
+            elif isinstance(field_base, (BigIntTypeDefinition, BigUIntTypeDefinition)):
+                resolved[field.name] = _bigint_decode(self.storage, field.type_def, *ref)
+            elif isinstance(field_base, ArrayTypeDefinition):
+                start_index, length = ref
+                if length == 0:
+                    resolved[field.name] = []
+                else:
+                    arr_table = self.storage.get_array_table_for_type(field.type_def)
+                    if is_string_type(field.type_def):
+                        resolved[field.name] = arr_table.get_string(start_index, length)
+                    else:
+                        elements = arr_table.get(start_index, length)
+                        if is_string_type(field_base.element_type):
+                            char_table = self.storage.get_array_table_for_type(field_base.element_type)
+                            str_elements = []
+                            for elem in elements:
+                                cs, cl = elem
+                                str_elements.append(char_table.get_string(cs, cl))
+                            resolved[field.name] = str_elements
+                        else:
+                            # Resolve enum elements in arrays
+                            elem_base = field_base.element_type.resolve_base_type()
+                            if isinstance(elem_base, EnumTypeDefinition):
+                                resolved_elems = []
+                                for el in elements:
+                                    if elem_base.has_associated_values and isinstance(el, tuple):
+                                        ev = self._resolve_swift_enum_ref(el, elem_base)
+                                        self._resolve_enum_associated_values(ev, elem_base)
+                                        resolved_elems.append(ev)
+                                    elif not elem_base.has_associated_values:
+                                        if isinstance(el, EnumValue):
+                                            resolved_elems.append(el)
+                                        else:
+                                            v = elem_base.get_variant_by_discriminant(el)
+                                            if v:
+                                                resolved_elems.append(EnumValue(variant_name=v.name, discriminant=el))
+                                            else:
+                                                resolved_elems.append(el)
+                                    else:
+                                        resolved_elems.append(el)
+                                elements = resolved_elems
+                            resolved[field.name] = elements
+            elif isinstance(field_base, InterfaceTypeDefinition):
+                # ref is (type_id, index) tuple
+                type_id, idx = ref
+                concrete_name = self.registry.get_type_name_by_id(type_id)
+                if concrete_name:
+                    resolved[field.name] = f"<{concrete_name}[{idx}]>"
+                else:
+                    resolved[field.name] = f"<type_id={type_id}[{idx}]>"
+            elif isinstance(field_base, CompositeTypeDefinition):
+                resolved[field.name] = f"<{field.type_def.name}[{ref}]>"
+            else:
+                # Primitive — value is already inline
+                resolved[field.name] = bool(ref) if is_boolean_type(field.type_def) else ref
+
+        return resolved
+
+    def _resolve_entry_field(self, ref: Any, field_def: FieldDefinition) -> Any:
+        """Resolve a single field from a dict entry composite (key or value)."""
+        if ref is None:
+            return None
+        field_base = field_def.type_def.resolve_base_type()
+        if isinstance(field_base, ArrayTypeDefinition):
+            start_index, length = ref
+            if length == 0:
+                return [] if not is_string_type(field_def.type_def) else ""
+            arr_table = self.storage.get_array_table_for_type(field_def.type_def)
+            elements = arr_table.get(start_index, length)
+            if is_string_type(field_def.type_def):
+                return "".join(elements)
+            if is_string_type(field_base.element_type):
+                char_table = self.storage.get_array_table_for_type(field_base.element_type)
+                str_elements = []
+                for elem in elements:
+                    cs, cl = elem
+                    str_elements.append(char_table.get_string(cs, cl))
+                return str_elements
+            return elements
+        if isinstance(field_base, EnumTypeDefinition):
+            if field_base.has_associated_values:
+                if isinstance(ref, tuple):
+                    enum_val = self._resolve_swift_enum_ref(ref, field_base)
+                    self._resolve_enum_associated_values(enum_val, field_base)
+                    return enum_val
+                return ref
+            else:
+                # C-style enum — resolve discriminant to EnumValue
+                if isinstance(ref, EnumValue):
+                    return ref
+                variant = field_base.get_variant_by_discriminant(ref)
+                if variant:
+                    return EnumValue(variant_name=variant.name, discriminant=ref)
+                return ref
+        if isinstance(field_base, CompositeTypeDefinition):
+            return f"<{field_def.type_def.name}[{ref}]>"
+        if is_boolean_type(field_def.type_def):
+            return bool(ref)
+        return ref
+
+    def _load_records_by_interface(
+        self, interface_name: str, interface_def: InterfaceTypeDefinition
+    ) -> Iterator[dict[str, Any]]:
+        """Load records from all types implementing an interface.
+
+        Returns records with interface fields + _type and _index columns.
+        """
+        interface_field_names = [f.name for f in interface_def.fields]
         impl_types = self.registry.find_implementing_types(interface_name)
 
         for impl_name, impl_def in impl_types:
@@ -4759,11 +5165,7 @@ class QueryExecutor:
                 continue
 
             table = self.storage.get_table(impl_name)
-            for i in range(table.count):
-                if table.is_deleted(i):
-                    continue
-
-                record = table.get(i)
+            for i, record in table.iter_records():
                 resolved: dict[str, Any] = {"_type": impl_name, "_index": i}
 
                 for field in impl_def.fields:
@@ -4788,43 +5190,26 @@ class QueryExecutor:
                     elif isinstance(field_base, FractionTypeDefinition):
                         resolved[field.name] = _fraction_decode(self.storage, ref[0], ref[1], ref[2], ref[3])
                     elif isinstance(field_base, (BigIntTypeDefinition, BigUIntTypeDefinition)):
-                        start_index, length = ref
-                        if length == 0:
-                            if isinstance(field_base, BigIntTypeDefinition):
-                                resolved[field.name] = BigInt(0)
-                            else:
-                                resolved[field.name] = BigUInt(0)
-                        else:
-                            arr_table = self.storage.get_array_table_for_type(field.type_def)
-                            elements = [arr_table.element_table.get(start_index + j) for j in range(length)]
-                            signed = isinstance(field_base, BigIntTypeDefinition)
-                            val = int.from_bytes(bytes(elements), 'little', signed=signed)
-                            if signed:
-                                resolved[field.name] = BigInt(val)
-                            else:
-                                resolved[field.name] = BigUInt(val)
+                        resolved[field.name] = _bigint_decode(self.storage, field.type_def, *ref)
                     elif isinstance(field_base, ArrayTypeDefinition):
                         start_index, length = ref
                         if length == 0:
                             resolved[field.name] = []
                         else:
                             arr_table = self.storage.get_array_table_for_type(field.type_def)
-                            elements = [
-                                arr_table.element_table.get(start_index + j)
-                                for j in range(length)
-                            ]
                             if is_string_type(field.type_def):
-                                resolved[field.name] = "".join(elements)
-                            elif is_string_type(field_base.element_type):
-                                char_table = self.storage.get_array_table_for_type(field_base.element_type)
-                                str_elements = []
-                                for elem in elements:
-                                    cs, cl = elem
-                                    chars = [char_table.element_table.get(cs + k) for k in range(cl)]
-                                    str_elements.append("".join(chars))
-                                resolved[field.name] = str_elements
+                                resolved[field.name] = arr_table.get_string(start_index, length)
                             else:
-                                resolved[field.name] = elements
+                                elements = arr_table.get(start_index, length)
+                                if is_string_type(field_base.element_type):
+                                    char_table = self.storage.get_array_table_for_type(field_base.element_type)
+                                    str_elements = []
+                                    for elem in elements:
+                                        cs, cl = elem
+                                        str_elements.append(char_table.get_string(cs, cl))
+                                    resolved[field.name] = str_elements
+                                else:
+                                    resolved[field.name] = elements
                     elif isinstance(field_base, CompositeTypeDefinition):
                         resolved[field.name] = f"<{field.type_def.name}[{ref}]>"
                     else:
@@ -4854,34 +5239,21 @@ class QueryExecutor:
                 continue
             field_def = next(f for f in comp_def.fields if f.name == field_name)
             table = self.storage.get_table(comp_name)
-            for i in range(table.count):
-                if table.is_deleted(i):
-                    continue
-                record = table.get(i)
+            for i, record in table.iter_records():
                 ref = record[field_name]
                 if ref is None:
                     continue
                 if is_frac:
                     value = _fraction_decode(self.storage, ref[0], ref[1], ref[2], ref[3])
                 elif is_bi or is_bu:
-                    start_index, length = ref
-                    if length == 0:
-                        value = BigInt(0) if is_bi else BigUInt(0)
-                    else:
-                        arr_table = self.storage.get_array_table_for_type(field_def.type_def)
-                        elements = [arr_table.element_table.get(start_index + j) for j in range(length)]
-                        val = int.from_bytes(bytes(elements), 'little', signed=is_bi)
-                        value = BigInt(val) if is_bi else BigUInt(val)
+                    value = _bigint_decode(self.storage, field_def.type_def, *ref)
                 elif is_string:
                     start_index, length = ref
                     if length == 0:
                         value = ""
                     else:
                         arr_table = self.storage.get_array_table_for_type(field_def.type_def)
-                        value = "".join(
-                            arr_table.element_table.get(start_index + j)
-                            for j in range(length)
-                        )
+                        value = arr_table.get_string(start_index, length)
                 else:
                     value = bool(ref) if is_boolean_type(field_def.type_def) else ref
                 yield {
@@ -4915,10 +5287,7 @@ class QueryExecutor:
             if not table_file.exists():
                 continue
             table = self.storage.get_table(comp_name)
-            for i in range(table.count):
-                if table.is_deleted(i):
-                    continue
-                record = table.get(i)
+            for i, record in table.iter_records():
                 ref = record[field_name]
                 if ref is None:
                     continue
@@ -4954,10 +5323,7 @@ class QueryExecutor:
                                     row[vf.name] = []
                                 else:
                                     arr_table = self.storage.get_array_table_for_type(vf.type_def)
-                                    elements = [
-                                        arr_table.element_table.get(start_index + j)
-                                        for j in range(length)
-                                    ]
+                                    elements = arr_table.get(start_index, length)
                                     if is_string_type(vf.type_def):
                                         row[vf.name] = "".join(elements)
                                     else:
@@ -5027,43 +5393,26 @@ class QueryExecutor:
                 elif isinstance(field_base, FractionTypeDefinition):
                     resolved[field.name] = _fraction_decode(self.storage, ref[0], ref[1], ref[2], ref[3])
                 elif isinstance(field_base, (BigIntTypeDefinition, BigUIntTypeDefinition)):
-                    start_index, length = ref
-                    if length == 0:
-                        if isinstance(field_base, BigIntTypeDefinition):
-                            resolved[field.name] = BigInt(0)
-                        else:
-                            resolved[field.name] = BigUInt(0)
-                    else:
-                        arr_table = self.storage.get_array_table_for_type(field.type_def)
-                        elements = [arr_table.element_table.get(start_index + j) for j in range(length)]
-                        signed = isinstance(field_base, BigIntTypeDefinition)
-                        val = int.from_bytes(bytes(elements), 'little', signed=signed)
-                        if signed:
-                            resolved[field.name] = BigInt(val)
-                        else:
-                            resolved[field.name] = BigUInt(val)
+                    resolved[field.name] = _bigint_decode(self.storage, field.type_def, *ref)
                 elif isinstance(field_base, ArrayTypeDefinition):
                     start_index, length = ref
                     if length == 0:
                         resolved[field.name] = []
                     else:
                         arr_table = self.storage.get_array_table_for_type(field.type_def)
-                        elements = [
-                            arr_table.element_table.get(start_index + j)
-                            for j in range(length)
-                        ]
                         if is_string_type(field.type_def):
-                            resolved[field.name] = "".join(elements)
-                        elif is_string_type(field_base.element_type):
-                            char_table = self.storage.get_array_table_for_type(field_base.element_type)
-                            str_elements = []
-                            for elem in elements:
-                                cs, cl = elem
-                                chars = [char_table.element_table.get(cs + k) for k in range(cl)]
-                                str_elements.append("".join(chars))
-                            resolved[field.name] = str_elements
+                            resolved[field.name] = arr_table.get_string(start_index, length)
                         else:
-                            resolved[field.name] = elements
+                            elements = arr_table.get(start_index, length)
+                            if is_string_type(field_base.element_type):
+                                char_table = self.storage.get_array_table_for_type(field_base.element_type)
+                                str_elements = []
+                                for elem in elements:
+                                    cs, cl = elem
+                                    str_elements.append(char_table.get_string(cs, cl))
+                                resolved[field.name] = str_elements
+                            else:
+                                resolved[field.name] = elements
                 elif isinstance(field_base, InterfaceTypeDefinition):
                     type_id, idx = ref
                     concrete_name = self.registry.get_type_name_by_id(type_id)
@@ -5228,6 +5577,18 @@ class QueryExecutor:
                         return True
                 return False
             return False
+        elif method_name in ("popcount", "any", "all"):
+            if args:
+                raise RuntimeError(f"{method_name}() takes no arguments")
+            if value is None:
+                value = []
+            # Flags decode to bools; 0/1 integers (which compare equal) do not qualify
+            if not isinstance(value, list) or not all(type(v) is bool for v in value):
+                raise RuntimeError(f"{method_name}() requires a bit or boolean array")
+            set_count = value.count(True)
+            if method_name == "popcount":
+                return set_count
+            return set_count > 0 if method_name == "any" else set_count == len(value)
         elif method_name in ("min", "max"):
             if value is None or not isinstance(value, list) or len(value) == 0:
                 return None
@@ -5368,7 +5729,7 @@ class QueryExecutor:
     def _apply_projection_method(self, value: Any, method_name: str, args: list[Any] | None) -> Any:
         """Apply a method as an immutable projection (returns copy, no storage writes)."""
         # Read-only methods → delegate
-        if method_name in ("length", "isEmpty", "contains", "min", "max"):
+        if method_name in ("length", "isEmpty", "contains", "min", "max", "popcount", "any", "all"):
             return self._apply_array_method(value, method_name, args)
 
         # Set-specific methods
@@ -5739,11 +6100,23 @@ class QueryExecutor:
             # Aggregate over all records
             return self._compute_global_aggregates(records, query.fields)
 
+        bit_refs = self._bit_method_refs(records, query.fields, type_def) if records else {}
+
         # Project records to selected columns
         rows = []
         for record in records:
             row = {}
             for field in query.fields:
+                if field.name in bit_refs and field.method_name in ("popcount", "any", "all"):
+                    # popcount()/any()/all() run on the packed bytes of the stored array
+                    bit_table, refs = bit_refs[field.name]
+                    ref = refs.get(record["_index"])
+                    if ref is None:
+                        ref = (0, 0)
+                    if field.method_args:
+                        raise RuntimeError(f"{field.method_name}() takes no arguments")
+                    row[self._format_method_col_name(field)] = getattr(bit_table, field.method_name)(*ref)
+                    continue
                 if field.aggregate:
                     col_name = f"{field.aggregate}({field.name})"
                     if field.aggregate == "count":
@@ -5787,6 +6160,42 @@ class QueryExecutor:
 
         return columns, rows
 
+    def _bit_method_refs(
+        self,
+        records: list[dict[str, Any]],
+        fields: list[Any],
+        type_def: TypeDefinition,
+    ) -> dict[str, tuple[BitTable, dict[int, Any]]]:
+        """Find the packed bit tables and stored refs of fields projected through popcount/any/all.
+
+        Returns field name -> (bit table, record index -> (start_index, length))
+        for each composite field selected as ``field.popcount()``, ``.any()`` or
+        ``.all()``. Fields in databases without packed bits are left out and
+        answered from their decoded values.
+        """
+        base = type_def.resolve_base_type()
+        if not isinstance(base, CompositeTypeDefinition) or "_index" not in records[0]:
+            return {}
+        result: dict[str, tuple[BitTable, dict[int, Any]]] = {}
+        for field in fields:
+            if (field.method_name not in ("popcount", "any", "all") or field.method_chain is not None
+                    or field.array_index is not None or field.post_path is not None
+                    or len(field.path) != 1 or field.name in result):
+                continue
+            fdef = base.get_field(field.name)
+            if fdef is None:
+                continue
+            field_base = fdef.type_def.resolve_base_type()
+            elem_base = (field_base.element_type.resolve_base_type()
+                         if isinstance(field_base, ArrayTypeDefinition) else None)
+            if not (isinstance(elem_base, PrimitiveTypeDefinition) and elem_base.primitive == PrimitiveType.BIT):
+                raise RuntimeError(f"{field.method_name}() requires a bit or boolean array")
+            bit_table = self.storage.get_array_table_for_type(fdef.type_def)
+            if isinstance(bit_table, BitTable):
+                refs = dict(self.storage.get_table(type_def.name).scan_field(field.name))
+                result[field.name] = (bit_table, refs)
+        return result
+
     def _resolve_field_path(
         self,
         record: dict[str, Any],
@@ -5864,28 +6273,13 @@ class QueryExecutor:
                 resolved[f.name] = _fraction_decode(self.storage, ref[0], ref[1], ref[2], ref[3])
             elif isinstance(field_type_base, ArrayTypeDefinition):
                 start_index, length = ref
-                if is_bigint_type(f.type_def):
-                    if length == 0:
-                        resolved[f.name] = BigInt(0)
-                    else:
-                        arr_table = self.storage.get_array_table_for_type(f.type_def)
-                        elements = [arr_table.element_table.get(start_index + j) for j in range(length)]
-                        resolved[f.name] = BigInt(int.from_bytes(bytes(elements), 'little', signed=True))
-                elif is_biguint_type(f.type_def):
-                    if length == 0:
-                        resolved[f.name] = BigUInt(0)
-                    else:
-                        arr_table = self.storage.get_array_table_for_type(f.type_def)
-                        elements = [arr_table.element_table.get(start_index + j) for j in range(length)]
-                        resolved[f.name] = BigUInt(int.from_bytes(bytes(elements), 'little', signed=False))
+                if is_bigint_type(f.type_def) or is_biguint_type(f.type_def):
+                    resolved[f.name] = _bigint_decode(self.storage, f.type_def, start_index, length)
                 elif length == 0:
                     resolved[f.name] = []
                 else:
                     arr_table = self.storage.get_array_table_for_type(f.type_def)
-                    elements = [
-                        arr_table.element_table.get(start_index + j)
-                        for j in range(length)
-                    ]
+                    elements = arr_table.get(start_index, length)
                     if is_string_type(f.type_def):
                         resolved[f.name] = "".join(elements)
                     else:
@@ -6082,7 +6476,8 @@ class QueryExecutor:
         field_type_name = type_def.name
         if field_type_name.endswith("[]"):
             base_elem = field_type_name[:-2]
-            field_type_name = f"{base_elem}[]"
+            # Modified element types ("interned string") need the prefix form
+            field_type_name = f"[{base_elem}]" if " " in base_elem else f"{base_elem}[]"
         return field_type_name, ""
 
     def _format_default_for_dump(self, value: Any, type_def: TypeDefinition) -> str:
@@ -6190,6 +6585,9 @@ class QueryExecutor:
 
         lines: list[str] = []
         lines.append("-- TTQ dump")
+        if dump_targets is None and self.registry.wide_references:
+            # Must precede the first record written by the script
+            lines.append("set wide_references on")
 
         # Collect user-defined types (skip primitives and auto-generated array types)
         aliases: list[tuple[str, AliasTypeDefinition]] = []
@@ -6434,9 +6832,7 @@ class QueryExecutor:
             if not table_file.exists():
                 continue
             table = self.storage.get_table(name)
-            for i in range(table.count):
-                if table.is_deleted(i):
-                    continue
+            for i in table.iter_live():
                 if not _include_record(name, i):
                     continue
                 raw_record = table.get(i)
@@ -6450,8 +6846,7 @@ class QueryExecutor:
                         elem_base = field_base.element_type.resolve_base_type()
                         if isinstance(elem_base, CompositeTypeDefinition):
                             arr_table = self.storage.get_array_table_for_type(f.type_def)
-                            for j in range(length):
-                                elem = arr_table.element_table.get(start_index + j)
+                            for elem in arr_table.get(start_index, length):
                                 if isinstance(elem, dict):
                                     # Array element composites are stored inline,
                                     # not as index references — skip for ref counting
@@ -6627,9 +7022,7 @@ class QueryExecutor:
             if not table_file.exists():
                 continue
             table = self.storage.get_table(name)
-            for i in range(table.count):
-                if table.is_deleted(i):
-                    continue
+            for i in table.iter_live():
                 key = (name, i)
                 if key in dump_vars:
                     _emit_var(key)
@@ -6676,9 +7069,7 @@ class QueryExecutor:
             if not table_file.exists():
                 continue
             table = self.storage.get_table(name)
-            for i in range(table.count):
-                if table.is_deleted(i):
-                    continue
+            for i in table.iter_live():
                 if not _include_record(name, i):
                     continue
                 key = (name, i)
@@ -6698,9 +7089,7 @@ class QueryExecutor:
             if not table_file.exists():
                 continue
             table = self.storage.get_table(name)
-            for i in range(table.count):
-                if table.is_deleted(i):
-                    continue
+            for i in table.iter_live():
                 if not _include_record(name, i):
                     continue
                 # Skip records that were emitted as variable assignments
@@ -6799,13 +7188,7 @@ class QueryExecutor:
                 return str(frac)
 
             if is_bigint_type(field_type) or is_biguint_type(field_type):
-                start_idx, length = val
-                if length == 0:
-                    return "0"
-                arr_table = self.storage.get_array_table_for_type(field_type)
-                byte_list = [arr_table.element_table.get(start_idx + j) for j in range(length)]
-                signed = is_bigint_type(field_type)
-                return str(int.from_bytes(bytes(byte_list), byteorder='little', signed=signed))
+                return str(_bigint_decode(self.storage, field_type, *val))
 
             if isinstance(base, ArrayTypeDefinition):
                 start_idx, length = val
@@ -6818,13 +7201,13 @@ class QueryExecutor:
 
                 # String type → joined string
                 if is_string_type(field_type):
-                    chars = [arr_table.element_table.get(start_idx + j) for j in range(length)]
+                    chars = arr_table.get(start_idx, length)
                     s = "".join(chars)
                     # YAML string - use double quotes
                     escaped = s.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
                     return f'"{escaped}"'
 
-                elements = [arr_table.element_table.get(start_idx + j) for j in range(length)]
+                elements = arr_table.get(start_idx, length)
 
                 # String array (string[]) — resolve each (start, length) to a string
                 if is_string_type(base.element_type):
@@ -6832,7 +7215,7 @@ class QueryExecutor:
                     elem_strs = []
                     for elem in elements:
                         cs, cl = elem
-                        chars = [char_table.element_table.get(cs + k) for k in range(cl)]
+                        chars = char_table.get(cs, cl)
                         s = "".join(chars)
                         escaped = s.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
                         elem_strs.append(f'"{escaped}"')
@@ -6902,8 +7285,8 @@ class QueryExecutor:
             table = self.storage.get_table(name)
 
             records_output = []
-            for i in range(table.count):
-                if table.is_deleted(i) or not _include_record(name, i):
+            for i in table.iter_live():
+                if not _include_record(name, i):
                     continue
 
                 raw = table.get(i)
@@ -6991,13 +7374,7 @@ class QueryExecutor:
                 return {"numerator": frac.numerator, "denominator": frac.denominator}
 
             if is_bigint_type(field_type) or is_biguint_type(field_type):
-                start_idx, length = val
-                if length == 0:
-                    return 0
-                arr_table = self.storage.get_array_table_for_type(field_type)
-                byte_list = [arr_table.element_table.get(start_idx + j) for j in range(length)]
-                signed = is_bigint_type(field_type)
-                return int.from_bytes(bytes(byte_list), byteorder='little', signed=signed)
+                return int(_bigint_decode(self.storage, field_type, *val))
 
             if isinstance(base, ArrayTypeDefinition):
                 start_idx, length = val
@@ -7010,10 +7387,10 @@ class QueryExecutor:
 
                 # String type → joined string
                 if is_string_type(field_type):
-                    chars = [arr_table.element_table.get(start_idx + j) for j in range(length)]
+                    chars = arr_table.get(start_idx, length)
                     return "".join(chars)
 
-                elements = [arr_table.element_table.get(start_idx + j) for j in range(length)]
+                elements = arr_table.get(start_idx, length)
 
                 # String array (string[]) — resolve each (start, length) to a string
                 if is_string_type(base.element_type):
@@ -7021,8 +7398,7 @@ class QueryExecutor:
                     str_elements = []
                     for elem in elements:
                         cs, cl = elem
-                        chars = [char_table.element_table.get(cs + k) for k in range(cl)]
-                        str_elements.append("".join(chars))
+                        str_elements.append(char_table.get_string(cs, cl))
                     return str_elements
 
                 if isinstance(elem_base, CompositeTypeDefinition):
@@ -7057,8 +7433,8 @@ class QueryExecutor:
             table = self.storage.get_table(name)
 
             records = []
-            for i in range(table.count):
-                if table.is_deleted(i) or not _include_record(name, i):
+            for i in table.iter_live():
+                if not _include_record(name, i):
                     continue
 
                 raw = table.get(i)
@@ -7154,13 +7530,7 @@ class QueryExecutor:
                 return f"{ind}<{field_name}>{frac}</{field_name}>"
 
             if is_bigint_type(field_type) or is_biguint_type(field_type):
-                start_idx, length = val
-                if length == 0:
-                    return f"{ind}<{field_name}>0</{field_name}>"
-                arr_table = self.storage.get_array_table_for_type(field_type)
-                byte_list = [arr_table.element_table.get(start_idx + j) for j in range(length)]
-                signed = is_bigint_type(field_type)
-                int_val = int.from_bytes(bytes(byte_list), byteorder='little', signed=signed)
+                int_val = _bigint_decode(self.storage, field_type, *val)
                 return f"{ind}<{field_name}>{int_val}</{field_name}>"
 
             if isinstance(base, ArrayTypeDefinition):
@@ -7174,18 +7544,15 @@ class QueryExecutor:
 
                 # String type → joined string
                 if is_string_type(field_type):
-                    chars = [arr_table.element_table.get(start_idx + j) for j in range(length)]
-                    text = escape("".join(chars))
+                    text = escape(arr_table.get_string(start_idx, length))
                     return f"{ind}<{field_name}>{text}</{field_name}>"
 
                 # String array (string[]) — resolve each (start, length) to a string
                 if is_string_type(base.element_type):
                     char_table = self.storage.get_array_table_for_type(base.element_type)
                     elements_xml = []
-                    for j in range(length):
-                        cs, cl = arr_table.element_table.get(start_idx + j)
-                        chars = [char_table.element_table.get(cs + k) for k in range(cl)]
-                        text = escape("".join(chars))
+                    for cs, cl in arr_table.get(start_idx, length):
+                        text = escape(char_table.get_string(cs, cl))
                         elements_xml.append(f"{ind_inner}<item>{text}</item>")
                     if pretty:
                         inner = newline + newline.join(elements_xml) + newline + ind
@@ -7195,8 +7562,7 @@ class QueryExecutor:
 
                 # Build array elements
                 elements_xml = []
-                for j in range(length):
-                    elem_val = arr_table.element_table.get(start_idx + j)
+                for elem_val in arr_table.get(start_idx, length):
                     if isinstance(elem_base, CompositeTypeDefinition):
                         if elem_val is None:
                             elements_xml.append(f"{ind_inner}<item null=\"true\"/>")
@@ -7236,8 +7602,8 @@ class QueryExecutor:
             table = self.storage.get_table(name)
 
             has_records = False
-            for i in range(table.count):
-                if table.is_deleted(i) or not _include_record(name, i):
+            for i in table.iter_live():
+                if not _include_record(name, i):
                     continue
 
                 if not has_records:
@@ -7440,9 +7806,7 @@ class QueryExecutor:
             if not table_file.exists():
                 continue
             table = self.storage.get_table(name)
-            for i in range(table.count):
-                if table.is_deleted(i):
-                    continue
+            for i in table.iter_live():
                 if not include_record(name, i):
                     continue
                 key = (name, i)
@@ -7541,8 +7905,7 @@ class QueryExecutor:
             key_base = key_field.type_def.resolve_base_type()
             val_base = val_field.type_def.resolve_base_type()
             entry_strs = []
-            for j in range(length):
-                entry_idx = arr_table.element_table.get(start_index + j)
+            for entry_idx in arr_table.get(start_index, length):
                 entry_table = self.storage.get_table(entry_type.name)
                 entry_record = entry_table.get(entry_idx)
                 k_str = self._format_field_value(
@@ -7564,14 +7927,14 @@ class QueryExecutor:
                 return "{,}"
             arr_table = self.storage.get_array_table_for_type(field.type_def)
             elem_base = field_base.element_type.resolve_base_type()
-            elements = [arr_table.element_table.get(start_index + j) for j in range(length)]
+            elements = arr_table.get(start_index, length)
             if is_string_type(field_base.element_type):
                 # String set elements: each is (start, length) in char table
                 char_table = self.storage.get_array_table_for_type(field_base.element_type)
                 elem_strs = []
                 for elem in elements:
                     cs, cl = elem
-                    chars = [char_table.element_table.get(cs + k) for k in range(cl)]
+                    chars = char_table.get(cs, cl)
                     elem_strs.append(self._format_ttq_string("".join(chars)))
             elif isinstance(elem_base, EnumTypeDefinition):
                 elem_strs = []
@@ -7600,14 +7963,7 @@ class QueryExecutor:
             return f"fraction({frac.numerator}, {frac.denominator})"
 
         elif is_bigint_type(field.type_def) or is_biguint_type(field.type_def):
-            start_index, length = ref
-            if length == 0:
-                return "0"
-            arr_table = self.storage.get_array_table_for_type(field.type_def)
-            byte_list = [arr_table.element_table.get(start_index + j) for j in range(length)]
-            signed = is_bigint_type(field.type_def)
-            value = int.from_bytes(bytes(byte_list), byteorder='little', signed=signed)
-            return str(value)
+            return str(_bigint_decode(self.storage, field.type_def, *ref))
 
         elif isinstance(field_base, ArrayTypeDefinition):
             start_index, length = ref
@@ -7619,11 +7975,11 @@ class QueryExecutor:
 
             # String type → joined string
             if is_string_type(field.type_def):
-                chars = [arr_table.element_table.get(start_index + j) for j in range(length)]
+                chars = arr_table.get(start_index, length)
                 s = "".join(chars)
                 return self._format_ttq_string(s)
 
-            elements = [arr_table.element_table.get(start_index + j) for j in range(length)]
+            elements = arr_table.get(start_index, length)
 
             # String array (string[]) — resolve each (start, length) to a string
             if is_string_type(field_base.element_type):
@@ -7631,7 +7987,7 @@ class QueryExecutor:
                 elem_strs = []
                 for elem in elements:
                     cs, cl = elem
-                    chars = [char_table.element_table.get(cs + k) for k in range(cl)]
+                    chars = char_table.get(cs, cl)
                     s = "".join(chars)
                     elem_strs.append(self._format_ttq_string(s))
                 return f"[{', '.join(elem_strs)}]"
@@ -7785,7 +8141,7 @@ class QueryExecutor:
                             field_strs.append(f"{vf.name}=[]")
                         else:
                             arr_table = self.storage.get_array_table_for_type(vf.type_def)
-                            elements = [arr_table.element_table.get(start_index + j) for j in range(length)]
+                            elements = arr_table.get(start_index, length)
                             if is_string_type(vf.type_def):
                                 field_strs.append(f"{vf.name}={self._format_ttq_string(''.join(elements))}")
                             else:
@@ -7816,8 +8172,7 @@ class QueryExecutor:
                             key_field = entry_base.get_field("key")
                             val_field = entry_base.get_field("value")
                             entry_strs = []
-                            for j in range(length):
-                                entry_idx = arr_table.element_table.get(start_index + j)
+                            for entry_idx in arr_table.get(start_index, length):
                                 entry_table = self.storage.get_table(entry_type.name)
                                 entry_record = entry_table.get(entry_idx)
                                 k_str = self._format_field_value(key_field, entry_record["key"])
@@ -7892,16 +8247,7 @@ class QueryExecutor:
                 signed = isinstance(field_base, BigIntTypeDefinition)
                 if not signed and val < 0:
                     raise ValueError(f"biguint field '{field.name}' cannot store negative value: {val}")
-                if val == 0:
-                    byte_list = [0]
-                elif signed:
-                    byte_length = (val.bit_length() + 8) // 8
-                    byte_list = list(val.to_bytes(byte_length, byteorder='little', signed=True))
-                else:
-                    byte_length = (val.bit_length() + 7) // 8
-                    byte_list = list(val.to_bytes(byte_length, byteorder='little', signed=False))
-                array_table = self.storage.get_array_table_for_type(field.type_def)
-                field_references[field.name] = array_table.insert(byte_list)
+                field_references[field.name] = _bigint_encode(val, field.type_def, self.storage)
                 continue
 
             if isinstance(field_base, ArrayTypeDefinition):
@@ -8108,8 +8454,15 @@ class QueryExecutor:
 
     # --- Set ---
 
-    _VALID_SETTINGS = {"max_width"}
-    _SETTING_DEFAULTS = {"max_width": 40}
+    _VALID_SETTINGS = {
+        "max_width", "durability", "wal", "reuse_slots", "cache_size", "checksums", "verify_reads",
+        "wide_references", "auto_vacuum", "auto_vacuum_size",
+    }
+    _SETTING_DEFAULTS = {
+        "max_width": 40, "durability": DEFAULT_DURABILITY, "wal": False, "reuse_slots": False,
+        "cache_size": 0, "checksums": False, "verify_reads": False, "wide_references": False,
+        "auto_vacuum": None, "auto_vacuum_size": None,
+    }
 
     def _execute_set(self, query: SetQuery) -> SetResult:
         """Execute a SET command — configure a session setting."""
@@ -8117,6 +8470,23 @@ class QueryExecutor:
         if setting not in self._VALID_SETTINGS:
             raise ValueError(f"Unknown setting: {setting}")
 
+        if setting == "durability":
+            return self._execute_set_durability(query)
+        if setting == "wal":
+            return self._execute_set_wal(query)
+        if setting == "reuse_slots":
+            return self._execute_set_reuse_slots(query)
+        if setting == "cache_size":
+            return self._execute_set_cache_size(query)
+        if setting == "checksums":
+            return self._execute_set_checksums(query)
+        if setting == "verify_reads":
+            return self._execute_set_verify_reads(query)
+        if setting == "wide_references":
+            return self._execute_set_wide_references(query)
+        if setting in ("auto_vacuum", "auto_vacuum_size"):
+            return self._execute_set_auto_vacuum(query)
+
         if query.value is None:
             # Reset to default
             resolved = self._SETTING_DEFAULTS[setting]
@@ -8140,20 +8510,219 @@ class QueryExecutor:
             value=resolved,
         )
 
-    # --- Compact ---
+    def _execute_set_durability(self, query: SetQuery) -> SetResult:
+        """Change when table writes are flushed to disk."""
+        if query.value is None:
+            resolved = self.storage.set_durability(self._SETTING_DEFAULTS["durability"])
+            msg = f"Reset durability to default ({resolved})"
+        else:
+            resolved = self.storage.set_durability(query.value)
+            msg = f"Set durability to {resolved}"
+        return SetResult(
+            columns=[], rows=[],
+            message=msg,
+            setting="durability",
+            value=resolved,
+        )
 
-    def _execute_compact(self, query: CompactQuery) -> CompactResult:
-        """Execute a COMPACT TO query: create a compacted copy of the database."""
-        output_path = Path(query.output_path)
+    @staticmethod
+    def _parse_on_off(setting: str, value: str | None, default: bool) -> bool:
+        """Parse an on/off setting value (None means the default)."""
+        if value is None:
+            return default
+        lowered = value.lower()
+        if lowered in ("on", "1", "yes"):
+            return True
+        if lowered in ("off", "0", "no"):
+            return False
+        raise ValueError(f"Invalid value for {setting}: {value} (expected on or off)")
+
+    def _execute_set_wal(self, query: SetQuery) -> SetResult:
+        """Turn the write-ahead log on or off for the current database."""
+        enabled = self._parse_on_off("wal", query.value, self._SETTING_DEFAULTS["wal"])
+        self.storage.set_wal(enabled)
+        state = "on" if enabled else "off"
+        msg = f"Reset wal to default ({state})" if query.value is None else f"Set wal {state}"
+        return SetResult(
+            columns=[], rows=[],
+            message=msg,
+            setting="wal",
+            value=enabled,
+        )
 
-        # Error if output path already exists
-        if output_path.exists():
-            return CompactResult(
-                columns=[], rows=[],
-                message=f"Output path already exists: {output_path}",
-            )
+    def _execute_set_reuse_slots(self, query: SetQuery) -> SetResult:
+        """Turn reuse of deleted composite record slots on or off."""
+        enabled = self._parse_on_off("reuse_slots", query.value, self._SETTING_DEFAULTS["reuse_slots"])
+        self.storage.set_reuse_slots(enabled)
+        state = "on" if enabled else "off"
+        msg = f"Reset reuse_slots to default ({state})" if query.value is None else f"Set reuse_slots {state}"
+        return SetResult(
+            columns=[], rows=[],
+            message=msg,
+            setting="reuse_slots",
+            value=enabled,
+        )
+
+    def _execute_set_cache_size(self, query: SetQuery) -> SetResult:
+        """Set how many decoded records each table caches (0 turns caching off)."""
+        if query.value is None:
+            resolved = self._SETTING_DEFAULTS["cache_size"]
+            msg = f"Reset cache_size to default ({resolved})"
+        else:
+            try:
+                resolved = int(query.value)
+            except ValueError:
+                raise ValueError(f"Invalid value for cache_size: {query.value}")
+            if resolved < 0:
+                raise ValueError(f"cache_size must be a non-negative integer, got {resolved}")
+            msg = f"Set cache_size to {resolved}" if resolved else "Set cache_size to 0 (caching off)"
+        self.storage.set_cache_size(resolved)
+        return SetResult(
+            columns=[], rows=[],
+            message=msg,
+            setting="cache_size",
+            value=resolved,
+        )
+
+    def _execute_set_checksums(self, query: SetQuery) -> SetResult:
+        """Turn page checksums on or off for the current database (saved with it)."""
+        enabled = self._parse_on_off("checksums", query.value, self._SETTING_DEFAULTS["checksums"])
+        self.storage.set_checksums(enabled)
+        state = "on" if enabled else "off"
+        msg = f"Reset checksums to default ({state})" if query.value is None else f"Set checksums {state}"
+        return SetResult(
+            columns=[], rows=[],
+            message=msg,
+            setting="checksums",
+            value=enabled,
+        )
+
+    def _execute_set_verify_reads(self, query: SetQuery) -> SetResult:
+        """Turn checksum checks on every record read on or off."""
+        enabled = self._parse_on_off("verify_reads", query.value, self._SETTING_DEFAULTS["verify_reads"])
+        self.storage.set_verify_reads(enabled)
+        state = "on" if enabled else "off"
+        msg = f"Reset verify_reads to default ({state})" if query.value is None else f"Set verify_reads {state}"
+        if enabled and not self.storage.checksums:
+            msg += " (checksums are off for this database; use 'set checksums on')"
+        return SetResult(
+            columns=[], rows=[],
+            message=msg,
+            setting="verify_reads",
+            value=enabled,
+        )
 
-        # Collect all composite type names that have .bin files
+    def _execute_set_wide_references(self, query: SetQuery) -> SetResult:
+        """Switch the current database to 64-bit references (before any data is stored)."""
+        enabled = self._parse_on_off(
+            "wide_references", query.value, self._SETTING_DEFAULTS["wide_references"],
+        )
+        self.storage.set_wide_references(enabled)
+        state = "on" if enabled else "off"
+        msg = (
+            f"Reset wide_references to default ({state})" if query.value is None
+            else f"Set wide_references {state}"
+        )
+        return SetResult(
+            columns=[], rows=[],
+            message=msg,
+            setting="wide_references",
+            value=enabled,
+        )
+
+    def _execute_set_auto_vacuum(self, query: SetQuery) -> SetResult:
+        """Set one criterion of the auto-vacuum policy (saved with the database).
+
+        ``auto_vacuum`` is the dead percentage of a table and
+        ``auto_vacuum_size`` its dead bytes above which it is vacuumed;
+        ``off`` (or the default) clears the criterion.
+        """
+        setting = query.setting
+        if query.value is None or query.value.lower() in ("off", "0", "no"):
+            resolved = self._SETTING_DEFAULTS[setting]
+        else:
+            try:
+                resolved = int(query.value)
+            except ValueError:
+                raise ValueError(f"Invalid value for {setting}: {query.value}")
+        field = "dead_percent" if setting == "auto_vacuum" else "dead_bytes"
+        self.storage.set_auto_vacuum(replace(self.storage.auto_vacuum, **{field: resolved}))
+        if query.value is None:
+            msg = f"Reset {setting} to default (off)"
+        elif resolved is None:
+            msg = f"Set {setting} off"
+        elif setting == "auto_vacuum":
+            msg = f"Set auto_vacuum to {resolved}% dead"
+        else:
+            msg = f"Set auto_vacuum_size to {resolved} dead bytes"
+        return SetResult(
+            columns=[], rows=[],
+            message=msg,
+            setting=setting,
+            value=resolved,
+        )
+
+    def _execute_sync(self, query: SyncQuery) -> SyncResult:
+        """Execute a SYNC command — flush all pending table writes."""
+        flushed = self.storage.sync()
+        return SyncResult(
+            columns=[], rows=[],
+            message=f"Synced {flushed} table(s)",
+            table_count=flushed,
+        )
+
+    def _execute_verify(self, query: VerifyQuery) -> VerifyResult:
+        """Execute a VERIFY command — check all table files against their checksums."""
+        report = self.storage.verify()
+        data_dir = self.storage.data_dir
+        rows: list[dict[str, Any]] = []
+        for checked in report.problems:
+            table = checked.path.relative_to(data_dir).with_suffix("").as_posix()
+            if checked.missing:
+                rows.append({"table": table, "page": None, "records": None, "problem": "no checksums"})
+                continue
+            for page in checked.bad_pages:
+                first, last = page_records(page, checked.record_size)
+                records = f"{first}-{last}" if first <= last else None
+                rows.append({"table": table, "page": page, "records": records, "problem": "checksum mismatch"})
+        tables = len(report.files)
+        if rows:
+            message = f"Verified {tables} table(s), {report.pages} page(s): {len(rows)} problem(s) found"
+        else:
+            message = f"Verified {tables} table(s), {report.pages} page(s): no problems found"
+        return VerifyResult(
+            columns=["table", "page", "records", "problem"] if rows else [],
+            rows=rows,
+            message=message,
+            table_count=tables,
+            page_count=report.pages,
+            problem_count=len(rows),
+        )
+
+    def _execute_transaction(self, query: TransactionQuery) -> TransactionResult:
+        """Execute BEGIN, COMMIT, or ROLLBACK."""
+        if self._in_scope():
+            raise ValueError(f"Cannot {query.action} inside a scope block")
+        if query.action == "begin":
+            self.storage.begin()
+            self._transaction_variables = dict(self.variables)
+            message = "Transaction started"
+        elif query.action == "commit":
+            self.storage.commit()
+            self._transaction_variables = None
+            message = "Transaction committed"
+        else:
+            undone = self.storage.rollback()
+            if self._transaction_variables is not None:
+                self.variables = self._transaction_variables
+                self._transaction_variables = None
+            message = f"Transaction rolled back ({undone} write(s) undone)"
+        return TransactionResult(columns=[], rows=[], message=message, action=query.action)
+
+    # --- Compact ---
+
+    def _stored_composite_types(self) -> list[tuple[str, CompositeTypeDefinition]]:
+        """Return the composite types that have a .bin file on disk."""
         composite_types: list[tuple[str, CompositeTypeDefinition]] = []
         for type_name in self.registry.list_types():
             type_def = self.registry.get(type_name)
@@ -8161,25 +8730,18 @@ class QueryExecutor:
                 bin_file = self.storage.data_dir / f"{type_name}.bin"
                 if bin_file.exists():
                     composite_types.append((type_name, type_def))
+        return composite_types
 
-        # Phase 1: Build composite index mappings
-        comp_index_map: dict[str, dict[int, int]] = {}  # type_name → {old_idx: new_idx}
-        total_before = 0
-        total_after = 0
-
-        for type_name, type_def in composite_types:
-            table = self.storage.get_table(type_name)
-            old_to_new: dict[int, int] = {}
-            new_idx = 0
-            for old_idx in range(table.count):
-                if not table.is_deleted(old_idx):
-                    old_to_new[old_idx] = new_idx
-                    new_idx += 1
-            comp_index_map[type_name] = old_to_new
-            total_before += table.count
-            total_after += new_idx
+    def _collect_live_refs(
+        self,
+        composite_types: list[tuple[str, CompositeTypeDefinition]],
+        live: dict[str, Iterable[int]],
+    ) -> tuple[dict[str, set[tuple[int, int]]], dict[str, dict[str, set[int]]]]:
+        """Collect the array ranges and variant indices referenced by live records.
 
-        # Phase 2: Collect referenced array ranges and variant indices
+        ``live`` maps each composite type name to the indices of its live
+        records.  Returns ``(array_refs, variant_refs)``.
+        """
         # array_refs[type_name] = set of (start_index, length) tuples
         array_refs: dict[str, set[tuple[int, int]]] = {}
         # variant_refs[enum_name][variant_name] = set of variant_table indices
@@ -8205,6 +8767,11 @@ class QueryExecutor:
                         if "_frac_den" not in array_refs:
                             array_refs["_frac_den"] = set()
                         array_refs["_frac_den"].add((den_start, den_len))
+                elif isinstance(fld_base, (BigIntTypeDefinition, BigUIntTypeDefinition)):
+                    start_idx, length = val
+                    # Values stored inline in the pair take no heap bytes
+                    if length > 0 and not self.storage.get_array_table_for_type(fld.type_def).is_inline(length):
+                        array_refs.setdefault(fld.type_def.name, set()).add((start_idx, length))
                 elif isinstance(fld_base, DictionaryTypeDefinition):
                     start_idx, length = val
                     if length > 0:
@@ -8219,6 +8786,21 @@ class QueryExecutor:
                         if arr_type_name not in array_refs:
                             array_refs[arr_type_name] = set()
                         array_refs[arr_type_name].add((start_idx, length))
+                        element_base = fld_base.element_type.resolve_base_type()
+                        if isinstance(element_base, CompositeTypeDefinition):
+                            # Records of composite arrays are stored inline, with their own references
+                            arr_table = self.storage.get_array_table_for_type(fld.type_def)
+                            for elem in arr_table.get(start_idx, length):
+                                _collect_refs_from_record(elem, element_base.fields)
+                        elif is_string_type(fld_base.element_type):
+                            # Elements of string arrays and sets are ranges of the string's own table
+                            elem_type_name = fld_base.element_type.name
+                            if elem_type_name not in array_refs:
+                                array_refs[elem_type_name] = set()
+                            arr_table = self.storage.get_array_table_for_type(fld.type_def)
+                            for elem in arr_table.get(start_idx, length):
+                                if elem[1] > 0:
+                                    array_refs[elem_type_name].add(tuple(elem))
                 elif isinstance(fld_base, EnumTypeDefinition) and fld_base.has_associated_values:
                     disc, variant_idx = val
                     if variant_idx != NULL_REF:
@@ -8234,9 +8816,8 @@ class QueryExecutor:
         # Walk all live composite records
         for type_name, type_def in composite_types:
             table = self.storage.get_table(type_name)
-            for old_idx in comp_index_map[type_name]:
-                record = table.get(old_idx)
-                _collect_refs_from_record(record, type_def.fields)
+            for idx in live[type_name]:
+                _collect_refs_from_record(table.get(idx), type_def.fields)
 
         # Walk all live variant records to collect nested array refs
         for enum_name, variants_dict in variant_refs.items():
@@ -8252,6 +8833,58 @@ class QueryExecutor:
                     vrecord = variant_table.get(vidx)
                     _collect_refs_from_record(vrecord, variant.fields)
 
+        return array_refs, variant_refs
+
+    def count_dead_elements(self) -> None:
+        """Recount dead elements for array tables whose count is unknown.
+
+        Counts are normally tracked incrementally; a database written before
+        that (or closed without saving its block state) needs one walk of the
+        live records to establish them.
+        """
+        self.storage.open_all_tables()
+        unknown = [(name, t) for name, t in self.storage.iter_array_tables() if t.dead_count is None]
+        if not unknown:
+            return
+        composite_types = self._stored_composite_types()
+        live = {name: self.storage.get_table(name).iter_live() for name, _ in composite_types}
+        array_refs, _ = self._collect_live_refs(composite_types, live)
+        for name, array_table in unknown:
+            used = sum(length for _, length in array_refs.get(name, ()))
+            array_table.set_dead_count(max(array_table.count - used, 0))
+
+    def _execute_compact(self, query: CompactQuery) -> CompactResult:
+        """Execute a COMPACT TO query: create a compacted copy of the database."""
+        output_path = Path(query.output_path)
+
+        # Error if output path already exists
+        if output_path.exists():
+            return CompactResult(
+                columns=[], rows=[],
+                message=f"Output path already exists: {output_path}",
+            )
+
+        composite_types = self._stored_composite_types()
+
+        # Phase 1: Build composite index mappings
+        comp_index_map: dict[str, dict[int, int]] = {}  # type_name → {old_idx: new_idx}
+        total_before = 0
+        total_after = 0
+
+        for type_name, type_def in composite_types:
+            table = self.storage.get_table(type_name)
+            old_to_new: dict[int, int] = {}
+            new_idx = 0
+            for old_idx in table.iter_live():
+                old_to_new[old_idx] = new_idx
+                new_idx += 1
+            comp_index_map[type_name] = old_to_new
+            total_before += table.count
+            total_after += new_idx
+
+        # Phase 2: Collect referenced array ranges and variant indices
+        array_refs, variant_refs = self._collect_live_refs(composite_types, comp_index_map)
+
         # Phase 3: Build array start_index mapping
         array_start_map: dict[str, dict[int, int]] = {}  # type_name → {old_start: new_start}
         for arr_type_name, ranges in array_refs.items():
@@ -8288,63 +8921,23 @@ class QueryExecutor:
         try:
             # Phase 6: Write compacted array element tables
             for arr_type_name, ranges in array_refs.items():
-                sorted_ranges = sorted(ranges, key=lambda r: r[0])
                 # Special case: fraction byte tables (not in registry)
-                if arr_type_name in ("_frac_num", "_frac_den"):
-                    if arr_type_name == "_frac_num":
-                        src_array_table = self.storage.get_fraction_num_table()
-                        dst_array_table = out_storage.get_fraction_num_table()
-                    else:
-                        src_array_table = self.storage.get_fraction_den_table()
-                        dst_array_table = out_storage.get_fraction_den_table()
-                    for old_start, length in sorted_ranges:
-                        elements = src_array_table.get(old_start, length)
-                        dst_array_table.insert(elements)
-                    continue
-                type_def = self.registry.get(arr_type_name)
-                if type_def is None:
-                    continue
-                base = type_def.resolve_base_type()
-                # Dict array tables store uint32 entry composite indices
-                if isinstance(base, DictionaryTypeDefinition):
-                    entry_type_name = base.entry_type.name
+                if arr_type_name == "_frac_num":
+                    src_array_table = self.storage.get_fraction_num_table()
+                    dst_array_table = out_storage.get_fraction_num_table()
+                elif arr_type_name == "_frac_den":
+                    src_array_table = self.storage.get_fraction_den_table()
+                    dst_array_table = out_storage.get_fraction_den_table()
+                else:
+                    type_def = self.registry.get(arr_type_name)
+                    if type_def is None:
+                        continue
                     src_array_table = self.storage.get_array_table_for_type(type_def)
                     dst_array_table = out_storage.get_array_table_for_type(type_def)
-                    for old_start, length in sorted_ranges:
-                        elements = src_array_table.get(old_start, length)
-                        if entry_type_name in comp_index_map:
-                            remapped_elements = []
-                            for elem in elements:
-                                new_idx = comp_index_map[entry_type_name].get(elem)
-                                if new_idx is not None:
-                                    remapped_elements.append(new_idx)
-                                else:
-                                    remapped_elements.append(NULL_REF)
-                            elements = remapped_elements
-                        dst_array_table.insert(elements)
-                    continue
-                element_base = base.element_type.resolve_base_type() if isinstance(base, ArrayTypeDefinition) else None
-                src_array_table = self.storage.get_array_table_for_type(type_def)
-                dst_array_table = out_storage.get_array_table_for_type(type_def)
-                for old_start, length in sorted_ranges:
+                remap = self._element_remap(arr_type_name, comp_index_map, array_start_map, variant_index_map)
+                for old_start, length in sorted(ranges, key=lambda r: r[0]):
                     elements = src_array_table.get(old_start, length)
-                    # Remap composite ref elements (e.g., Person[] stores uint32 indices)
-                    if isinstance(element_base, CompositeTypeDefinition):
-                        ref_type_name = element_base.name
-                        remapped_elements = []
-                        for elem in elements:
-                            if ref_type_name in comp_index_map:
-                                new_idx = comp_index_map[ref_type_name].get(elem)
-                                if new_idx is not None:
-                                    remapped_elements.append(new_idx)
-                                else:
-                                    # Dangling ref — skip element (can't store null in element table)
-                                    # Use NULL_REF as sentinel
-                                    remapped_elements.append(NULL_REF)
-                            else:
-                                remapped_elements.append(elem)
-                        elements = remapped_elements
-                    dst_array_table.insert(elements)
+                    dst_array_table.insert(elements if remap is None else remap(elements))
 
             # Phase 7: Write compacted variant tables
             for enum_name, variants_dict in variant_index_map.items():
@@ -8417,6 +9010,8 @@ class QueryExecutor:
                         remapped[fld.name] = (type_id, new_idx)
                     else:
                         remapped[fld.name] = None  # Dangling ref
+                elif ref_type_name:
+                    remapped[fld.name] = val  # Table not being remapped
                 else:
                     remapped[fld.name] = None  # Unknown type
             elif isinstance(fld_base, CompositeTypeDefinition):
@@ -8439,6 +9034,13 @@ class QueryExecutor:
                 if den_len > 0 and "_frac_den" in array_start_map and den_start in array_start_map["_frac_den"]:
                     new_den_start = array_start_map["_frac_den"][den_start]
                 remapped[fld.name] = (new_num_start, num_len, new_den_start, den_len)
+            elif isinstance(fld_base, (BigIntTypeDefinition, BigUIntTypeDefinition)):
+                old_start, length = val
+                start_map = array_start_map.get(fld.type_def.name, {})
+                if length > 0 and not self.storage.get_array_table_for_type(fld.type_def).is_inline(length):
+                    remapped[fld.name] = (start_map.get(old_start, old_start), length)
+                else:
+                    remapped[fld.name] = val
             elif isinstance(fld_base, DictionaryTypeDefinition):
                 old_start, length = val
                 if length == 0:
@@ -8480,6 +9082,382 @@ class QueryExecutor:
 
         return remapped
 
+    # --- Vacuum ---
+
+    def _execute_vacuum(self, query: VacuumQuery) -> VacuumResult:
+        """Execute a VACUUM command: compact tables in place.
+
+        Each table with deleted records or dead elements is written to a
+        side file next to it, as is a copy of every other table holding
+        references into it that change; the side files then replace the
+        originals in a single swap (see StorageManager.swap_vacuum_files)
+        before the next table is compacted. Disk space is only needed for
+        one table and its referrers at a time, never for a copy of the
+        whole database.
+        """
+        self.storage.open_all_tables()
+        targets = self._vacuum_targets(query.type_name)
+        if isinstance(targets, str):
+            return VacuumResult(columns=[], rows=[], message=targets)
+        return self._vacuum(*targets)
+
+    def _vacuum(
+        self,
+        comp_targets: list[tuple[str, CompositeTypeDefinition]],
+        array_targets: Iterable[str],
+        enum_targets: list[EnumTypeDefinition],
+    ) -> VacuumResult:
+        """Compact the given composite tables, array tables and enums' variant tables in place.
+
+        Tables are compacted one at a time, each swapped in before the next
+        is written, so the extra disk space needed at any moment is that of
+        one table and the copies of the tables referring into it. Tables
+        with no deleted records or dead elements are left untouched.
+        """
+        steps: list[tuple[list[tuple[str, CompositeTypeDefinition]], list[str], list[EnumTypeDefinition]]] = []
+        steps += [([target], [], []) for target in comp_targets]
+        steps += [([], [name], []) for name in array_targets]
+        steps += [([], [], [enum_def]) for enum_def in enum_targets]
+        rewritten: list[Path] = []
+        remapped: set[Path] = set()
+        records_before = records_after = 0
+        for step in steps:
+            step_rewritten, step_remapped, before, after = self._vacuum_step(*step)
+            rewritten += step_rewritten
+            remapped.update(step_remapped)
+            records_before += before
+            records_after += after
+        # Tables compacted in a later step than the one that remapped them count once
+        remapped.difference_update(rewritten)
+
+        message = f"Vacuumed {len(rewritten)} table(s) ({records_before} -> {records_after} records)"
+        if remapped:
+            message += f", updated references in {len(remapped)} other table(s)"
+        return VacuumResult(
+            columns=[], rows=[],
+            message=message,
+            table_count=len(rewritten),
+            remapped_count=len(remapped),
+            records_before=records_before,
+            records_after=records_after,
+        )
+
+    def _vacuum_step(
+        self,
+        comp_targets: list[tuple[str, CompositeTypeDefinition]],
+        array_names: list[str],
+        enum_targets: list[EnumTypeDefinition],
+    ) -> tuple[list[Path], list[Path], int, int]:
+        """Compact the targets that have something dead and swap them in.
+
+        Returns (compacted files, files whose references changed, records
+        before, records after).
+        """
+        # Any open table may hold references that change
+        self.storage.open_all_tables()
+        array_tables = dict(self.storage.iter_array_tables())
+        if any(array_tables[name].dead_count is None for name in array_names if name in array_tables):
+            self.count_dead_elements()
+        comp_targets = [
+            (type_name, type_def) for type_name, type_def in comp_targets
+            if self.storage.get_table(type_name).deleted_count > 0
+        ]
+        array_targets = {
+            name: array_tables[name] for name in array_names
+            if name in array_tables and array_tables[name].dead_count
+        }
+
+        # Where each live record, array and variant record of the targets moves to
+        comp_index_map: dict[str, dict[int, int]] = {}
+        for type_name, _ in comp_targets:
+            live = self.storage.get_table(type_name).iter_live()
+            comp_index_map[type_name] = {old_idx: new_idx for new_idx, old_idx in enumerate(live)}
+        array_start_map: dict[str, dict[int, int]] = {}
+        variant_index_map: dict[str, dict[str, dict[int, int]]] = {}
+        array_ranges: dict[str, list[tuple[int, int]]] = {}
+        if array_targets or enum_targets:
+            composite_types = self._stored_composite_types()
+            live_indices = {name: self.storage.get_table(name).iter_live() for name, _ in composite_types}
+            array_refs, variant_refs = self._collect_live_refs(composite_types, live_indices)
+            for arr_type_name in array_targets:
+                array_ranges[arr_type_name] = sorted(array_refs.get(arr_type_name, ()))
+                mapping: dict[int, int] = {}
+                new_start = 0
+                for old_start, length in array_ranges[arr_type_name]:
+                    mapping[old_start] = new_start
+                    new_start += length
+                array_start_map[arr_type_name] = mapping
+            for enum_def in enum_targets:
+                live_variants = variant_refs.get(enum_def.name, {})
+                variant_index_map[enum_def.name] = {
+                    variant.name: {old: new for new, old in enumerate(sorted(live_variants.get(variant.name, ())))}
+                    for variant in enum_def.variants if variant.fields
+                    # Variant tables whose records are all referenced keep their indexes
+                    and len(live_variants.get(variant.name, ())) < self._variant_count(enum_def, variant.name)
+                }
+                if not variant_index_map[enum_def.name]:
+                    del variant_index_map[enum_def.name]
+        enum_targets = [enum_def for enum_def in enum_targets if enum_def.name in variant_index_map]
+        if not (comp_targets or array_targets or enum_targets):
+            return [], [], 0, 0
+        self.storage.begin_vacuum()
+        maps = (comp_index_map, array_start_map, variant_index_map)
+
+        rewritten: list[Path] = []
+        remapped: list[Path] = []
+        records_before = records_after = 0
+        side_tables: list[Any] = []
+        try:
+            # Compacted tables
+            for type_name, type_def in comp_targets:
+                table = self.storage.get_table(type_name)
+                side = self.storage.vacuum_side_table(table)
+                side_tables.append(side)
+                side.reserve(len(comp_index_map[type_name]))
+                for old_idx in comp_index_map[type_name]:
+                    side.insert(self._remap_record(table.get(old_idx), type_def.fields, *maps))
+                rewritten.append(table.file_path)
+                records_before += table.count
+                records_after += side.count
+            for arr_type_name, array_table in array_targets.items():
+                elements = array_table.element_table
+                side_array = self.storage.vacuum_side_array_table(array_table)
+                side_tables.append(side_array)
+                side = side_array.element_table
+                side.reserve(sum(length for _, length in array_ranges[arr_type_name]))
+                remap = self._element_remap(arr_type_name, *maps)
+                for old_start, length in array_ranges[arr_type_name]:
+                    if remap is None:
+                        side.insert_raw(bytes(elements.get_raw_range(old_start, length)))
+                    else:
+                        side.insert_raw(side.pack_many(remap(elements.get_range(old_start, length))))
+                rewritten.append(elements.file_path)
+                records_before += elements.count
+                records_after += side.count
+            for enum_def in enum_targets:
+                for variant_name, idx_mapping in variant_index_map[enum_def.name].items():
+                    variant = enum_def.get_variant(variant_name)
+                    table = self.storage.get_variant_table(enum_def, variant_name)
+                    if not table.file_path.exists():
+                        continue
+                    side = self.storage.vacuum_side_table(table)
+                    side_tables.append(side)
+                    side.reserve(len(idx_mapping))
+                    for old_idx in idx_mapping:
+                        side.insert(self._remap_record(table.get(old_idx), variant.fields, *maps))
+                    rewritten.append(table.file_path)
+                    records_before += table.count
+                    records_after += side.count
+
+            # Copies of the other tables, where references into the compacted ones changed
+            for table, fields, indices in self._vacuum_referencing_tables(maps, comp_targets, enum_targets):
+                side = None
+                for idx in indices:
+                    record = table.get(idx)
+                    new_record = self._remap_record(record, fields, *maps)
+                    if new_record != record:
+                        if side is None:
+                            side = self.storage.vacuum_side_table(table, copy=True)
+                            side_tables.append(side)
+                        side.update(idx, new_record)
+                if side is not None:
+                    remapped.append(table.file_path)
+            for arr_type_name, array_table in self.storage.iter_array_tables():
+                remap = self._element_remap(arr_type_name, *maps)
+                if remap is None or arr_type_name in array_targets:
+                    continue
+                elements = array_table.element_table
+                side = None
+                for start in range(0, elements.count, 4096):
+                    old = elements.get_range(start, min(4096, elements.count - start))
+                    new = remap(old)
+                    if new != old:
+                        if side is None:
+                            side = self.storage.vacuum_side_table(elements, copy=True)
+                            side_tables.append(side)
+                        side.write_raw(start, side.pack_many(new))
+                if side is not None:
+                    remapped.append(elements.file_path)
+        except BaseException:
+            for side in side_tables:
+                side.close()
+            self.storage.abort_vacuum()
+            raise
+        for side in side_tables:
+            side.close()
+        self.storage.swap_vacuum_files(rewritten, remapped)
+
+        # Variables bound to records of compacted tables follow the records
+        for var_name, (type_name, ref) in list(self.variables.items()):
+            mapping = comp_index_map.get(type_name)
+            if mapping is None:
+                continue
+            if isinstance(ref, list):
+                self.variables[var_name] = (type_name, [mapping[idx] for idx in ref if idx in mapping])
+            elif ref in mapping:
+                self.variables[var_name] = (type_name, mapping[ref])
+            else:
+                del self.variables[var_name]
+        return rewritten, remapped, records_before, records_after
+
+    def _variant_count(self, enum_def: EnumTypeDefinition, variant_name: str) -> int:
+        """Return the number of records in a variant table, 0 when it has no file."""
+        table = self.storage.get_variant_table(enum_def, variant_name)
+        return table.count if table.file_path.exists() else 0
+
+    def auto_vacuum(self) -> VacuumResult | None:
+        """Vacuum the array element table most in need of it under the auto-vacuum policy.
+
+        Runs after every statement that can leave dead records behind, and
+        may also be called by an application while it is idle. Composite
+        tables are left to an explicit VACUUM, since it renumbers their
+        records. At most one table is vacuumed per call, so the work is
+        spread over many statements. Returns None when the policy is off or
+        no table qualifies, and inside a transaction or on a read-only
+        database.
+        """
+        storage = self.storage
+        if storage is None or storage.read_only or storage.in_transaction or not storage.auto_vacuum.enabled:
+            return None
+        array_tables = dict(storage.iter_array_tables())
+        if any(array_table.dead_count is None for array_table in array_tables.values()):
+            self.count_dead_elements()
+        candidates = storage.auto_vacuum_candidates()
+        if not candidates:
+            return None
+        worst = max(candidates, key=lambda frag: frag.dead_bytes)
+        path = worst.table.file_path
+        size_before = path.stat().st_size
+        result = self._vacuum([], [worst.type_name], [])
+        stats = self.auto_vacuum_stats
+        stats.runs += 1
+        stats.bytes_reclaimed += max(size_before - path.stat().st_size, 0)
+        stats.last_table = worst.type_name
+        return result
+
+    def _vacuum_targets(
+        self, type_name: str | None,
+    ) -> tuple[list[tuple[str, CompositeTypeDefinition]], dict[str, Any], list[EnumTypeDefinition]] | str:
+        """Return the composite types, array tables and enums a VACUUM compacts, or an error message."""
+        composite_types = self._stored_composite_types()
+        # Interned strings never move or free their storage, so there is nothing to reclaim
+        array_tables = {
+            name: array_table for name, array_table in self.storage.iter_array_tables()
+            if not isinstance(array_table.array_type, InternedStringTypeDefinition)
+            and array_table.element_table.file_path.exists()
+        }
+        enums = [
+            type_def for type_def in (self.registry.get(name) for name in self.registry.list_types())
+            if isinstance(type_def, EnumTypeDefinition) and type_def.has_associated_values
+            and (self.storage.data_dir / type_def.name).is_dir()
+        ]
+        if type_name is None:
+            return composite_types, array_tables, enums
+        type_def = self.registry.get(type_name)
+        if type_def is None:
+            return f"Unknown type: {type_name}"
+        if isinstance(type_def, FractionTypeDefinition):
+            return [], {name: t for name, t in array_tables.items() if name in ("_frac_num", "_frac_den")}, []
+        base = type_def.resolve_base_type()
+        composite = [(name, td) for name, td in composite_types if td is base]
+        if composite:
+            return composite, {}, []
+        if type_name in array_tables:
+            return [], {type_name: array_tables[type_name]}, []
+        enum = [td for td in enums if td.name == type_name]
+        if enum:
+            return [], {}, enum
+        if isinstance(base, InternedStringTypeDefinition):
+            return f"Interned strings are never freed, so {type_name} has nothing to vacuum"
+        return f"No table to vacuum for type {type_name}"
+
+    def _vacuum_referencing_tables(
+        self,
+        maps: tuple[dict[str, dict[int, int]], dict[str, dict[int, int]], dict[str, dict[str, dict[int, int]]]],
+        comp_targets: list[tuple[str, CompositeTypeDefinition]],
+        enum_targets: list[EnumTypeDefinition],
+    ) -> Iterator[tuple[Any, list[FieldDefinition], Iterable[int]]]:
+        """Yield (table, fields, record indices) for each record table that may refer into a vacuumed one."""
+        comp_index_map, array_start_map, variant_index_map = maps
+
+        def refers(fields: list[FieldDefinition]) -> bool:
+            for fld in fields:
+                base = fld.type_def.resolve_base_type()
+                if isinstance(base, InterfaceTypeDefinition):
+                    if comp_index_map:
+                        return True
+                elif isinstance(base, CompositeTypeDefinition):
+                    if base.name in comp_index_map:
+                        return True
+                elif isinstance(base, FractionTypeDefinition):
+                    if "_frac_num" in array_start_map or "_frac_den" in array_start_map:
+                        return True
+                elif isinstance(base, (ArrayTypeDefinition, DictionaryTypeDefinition)):
+                    if fld.type_def.name in array_start_map:
+                        return True
+                elif isinstance(base, EnumTypeDefinition) and base.has_associated_values:
+                    if base.name in variant_index_map:
+                        return True
+            return False
+
+        skip = {name for name, _ in comp_targets}
+        for type_name, type_def in self._stored_composite_types():
+            if type_name not in skip and refers(type_def.fields):
+                table = self.storage.get_table(type_name)
+                yield table, type_def.fields, table.iter_live()
+        skip = {enum_def.name for enum_def in enum_targets}
+        for type_name in self.registry.list_types():
+            enum_def = self.registry.get(type_name)
+            if not isinstance(enum_def, EnumTypeDefinition) or enum_def.name in skip:
+                continue
+            for variant in enum_def.variants:
+                if variant.fields and refers(variant.fields):
+                    if (self.storage.data_dir / enum_def.name / f"{variant.name}.bin").exists():
+                        # Variant records left behind by updates are remapped too; nothing reads them
+                        table = self.storage.get_variant_table(enum_def, variant.name)
+                        yield table, variant.fields, range(table.count)
+
+    def _element_remap(
+        self,
+        arr_type_name: str,
+        comp_index_map: dict[str, dict[int, int]],
+        array_start_map: dict[str, dict[int, int]],
+        variant_index_map: dict[str, dict[str, dict[int, int]]],
+    ) -> Callable[[list[Any]], list[Any]] | None:
+        """Return a function remapping the references in a list of an array table's elements.
+
+        Returns None when the elements hold no references that move.
+        """
+        type_def = self.registry.get(arr_type_name)
+        if type_def is None:
+            return None  # fraction byte tables
+        base = type_def.resolve_base_type()
+        if isinstance(base, DictionaryTypeDefinition):
+            # Dict arrays store entry composite indices
+            entry_map = comp_index_map.get(base.entry_type.name)
+            if entry_map is None:
+                return None
+            # Entries of deleted records become null
+            null = NULL_REF if base.wide_references else NULL_REF_32
+            return lambda elements: [entry_map.get(elem, null) for elem in elements]
+        if not isinstance(base, ArrayTypeDefinition):
+            return None
+        element_base = base.element_type.resolve_base_type()
+        if isinstance(element_base, CompositeTypeDefinition):
+            # Composite arrays store their records inline
+            fields = element_base.fields
+            return lambda elements: [
+                self._remap_record(elem, fields, comp_index_map, array_start_map, variant_index_map)
+                for elem in elements
+            ]
+        if is_string_type(base.element_type):
+            # Elements of string arrays and sets are ranges of the string's own table
+            start_map = array_start_map.get(base.element_type.name)
+            if start_map is None:
+                return None
+            return lambda elements: [(start_map.get(cs, cs), cl) if cl > 0 else (0, 0) for cs, cl in elements]
+        return None
+
     def _execute_archive(self, query: ArchiveQuery) -> ArchiveResult:
         """Execute an ARCHIVE TO query: compact then bundle into a .ttar file."""
         if query.output_file is None:
@@ -8530,7 +9508,10 @@ class QueryExecutor:
                 data_offset += trimmed
 
             # Write the archive
-            total_bytes = _write_ttar(output_path, metadata_bytes, file_entries, bin_files)
+            total_bytes = _write_ttar(
+                output_path, metadata_bytes, file_entries, bin_files,
+                wide=self.registry.wide_references,
+            )
 
             return ArchiveResult(
                 columns=[], rows=[],
@@ -8578,6 +9559,7 @@ class QueryExecutor:
                     synth = CompositeTypeDefinition(
                         name=f"_{enum_name}_{variant_name}",
                         fields=list(variant.fields),
+                        wide_references=enum_def.wide_references,
                     )
                     return synth.size_bytes
         return None
@@ -8588,10 +9570,18 @@ def _write_ttar(
     metadata_bytes: bytes,
     file_entries: list[tuple[str, int, int]],
     bin_files: list[tuple[str, Path]],
+    wide: bool = False,
 ) -> int:
-    """Write a .ttar archive file. Returns total bytes written."""
+    """Write a .ttar archive file. Returns total bytes written.
+
+    Version 1 archives store data offsets and lengths as uint32. Version 2
+    stores them as uint64 and is written for databases with wide references
+    and for any archive whose data section exceeds 4 GB.
+    """
     MAGIC = b"TTAR"
-    VERSION = 1
+    data_size = sum(length for _, _, length in file_entries)
+    VERSION = 2 if wide or data_size > 0xFFFFFFFF else 1
+    offset_fmt = "<Q" if VERSION == 2 else "<I"
 
     opener = gzip.open if output_path.suffix == ".gz" else open
     with opener(output_path, "wb") as f:
@@ -8607,8 +9597,8 @@ def _write_ttar(
             path_bytes = rel_path.encode("utf-8")
             f.write(struct.pack("<H", len(path_bytes)))
             f.write(path_bytes)
-            f.write(struct.pack("<I", data_offset))
-            f.write(struct.pack("<I", data_length))
+            f.write(struct.pack(offset_fmt, data_offset))
+            f.write(struct.pack(offset_fmt, data_length))
 
         # Data section
         for (rel_path, abs_path), (_, _, data_length) in zip(bin_files, file_entries):
@@ -8672,11 +9662,13 @@ def execute_restore(query: RestoreQuery) -> RestoreResult:
 
             # Read version
             version = struct.unpack("<H", f.read(2))[0]
-            if version != 1:
+            if version not in (1, 2):
                 return RestoreResult(
                     columns=[], rows=[],
                     message=f"Unsupported archive version: {version}",
                 )
+            # Version 2 archives have uint64 data offsets and lengths
+            offset_fmt, offset_size = ("<Q", 8) if version == 2 else ("<I", 4)
 
             # Read metadata
             metadata_len = struct.unpack("<I", f.read(4))[0]
@@ -8690,8 +9682,8 @@ def execute_restore(query: RestoreQuery) -> RestoreResult:
             for _ in range(file_count):
                 path_len = struct.unpack("<H", f.read(2))[0]
                 rel_path = f.read(path_len).decode("utf-8")
-                data_offset = struct.unpack("<I", f.read(4))[0]
-                data_length = struct.unpack("<I", f.read(4))[0]
+                data_offset = struct.unpack(offset_fmt, f.read(offset_size))[0]
+                data_length = struct.unpack(offset_fmt, f.read(offset_size))[0]
                 file_index.append((rel_path, data_offset, data_length))
 
             # Record where data section starts
@@ -12,9 +12,10 @@ from pathlib import Path
 from typing import Any
 
 from typed_tables.dump import load_registry_from_metadata
+from typed_tables.locking import DEFAULT_LOCK_TIMEOUT
 from typed_tables.parsing.query_parser import ArchiveQuery, DropDatabaseQuery, EvalQuery, ExecuteQuery, ImportQuery, QueryParser, RestoreQuery, SetQuery, UseQuery
-from typed_tables.query_executor import ArchiveResult, CollectResult, CompactResult, CreateResult, DeleteResult, DropResult, DumpResult, ExecuteResult, ImportResult, QueryExecutor, QueryResult, RestoreResult, ScopeResult, SetResult, UpdateResult, UseResult, VariableAssignmentResult, execute_restore
-from typed_tables.storage import StorageManager
+from typed_tables.query_executor import ArchiveResult, CollectResult, CompactResult, CreateResult, DeleteResult, DropResult, DumpResult, ExecuteResult, ImportResult, QueryExecutor, QueryResult, RestoreResult, ScopeResult, SetResult, SyncResult, TransactionResult, UpdateResult, UseResult, VacuumResult, VariableAssignmentResult, VerifyResult, execute_restore
+from typed_tables.storage import DEFAULT_DURABILITY, DURABILITY_MODES, StorageManager
 from fractions import Fraction
 
 from typed_tables.types import (
@@ -173,7 +174,7 @@ def print_result(result: QueryResult, max_width: int | None = 40) -> None:
         return
 
     # Special handling for UseResult, CreateResult, DeleteResult, DropResult, VariableAssignmentResult, CollectResult, ScopeResult - show message as success, not error
-    if isinstance(result, (UseResult, CreateResult, DeleteResult, DropResult, VariableAssignmentResult, CollectResult, UpdateResult, ScopeResult, CompactResult, ArchiveResult, RestoreResult, ExecuteResult, ImportResult, SetResult)):
+    if isinstance(result, (UseResult, CreateResult, DeleteResult, DropResult, VariableAssignmentResult, CollectResult, UpdateResult, ScopeResult, CompactResult, ArchiveResult, RestoreResult, ExecuteResult, ImportResult, SetResult, SyncResult, TransactionResult, VerifyResult, VacuumResult)):
         if result.message:
             print(result.message)
         if not result.rows:
@@ -293,7 +294,7 @@ def _analyze_table_file(
         base = type_def.resolve_base_type()
 
         if isinstance(base, ArrayTypeDefinition):
-            # Array element table — no deletion concept
+            # Array element table
             kind = "Array"
             try:
                 array_table = executor.storage.get_array_table(table_name)
@@ -341,15 +342,13 @@ def _analyze_table_file(
 
     # Count live records
     if kind == "Array":
-        # Array element tables don't support deletion
-        live_records = total_records
-        deleted_records = 0
+        # Dead elements are those no array refers to any more
+        if array_table.dead_count is None:
+            executor.count_dead_elements()
+        deleted_records = array_table.dead_count or 0
     else:
-        deleted_records = 0
-        for i in range(total_records):
-            if table.is_deleted(i):
-                deleted_records += 1
-        live_records = total_records - deleted_records
+        deleted_records = table.deleted_count
+    live_records = total_records - deleted_records
 
     live_size = HEADER_SIZE + live_records * record_size
     dead_size = deleted_records * record_size
@@ -477,12 +476,47 @@ def print_status(data_dir: Path | None, executor: QueryExecutor | None) -> None:
     vals = [totals_row.get(col, "").ljust(col_widths[col]) for col in columns]
     print(" | ".join(vals))
 
-
-def run_repl(data_dir: Path | None) -> int:
+    storage = executor.storage
+    if storage is None:
+        return
+    if storage.cache_size:
+        hits, misses = storage.cache_stats()
+        lookups = hits + misses
+        rate = f"{hits * 100 / lookups:.1f}%" if lookups else "n/a"
+        print()
+        print(f"Record cache: {storage.cache_size} per table, {hits} hits, {misses} misses (hit rate {rate})")
+
+    policy = storage.auto_vacuum
+    stats = executor.auto_vacuum_stats
+    if policy.enabled or stats.runs:
+        criteria = []
+        if policy.dead_percent is not None:
+            criteria.append(f"over {policy.dead_percent}% dead")
+        if policy.dead_bytes is not None:
+            criteria.append(f"over {_format_size(policy.dead_bytes)} dead")
+        print()
+        print(
+            f"Auto vacuum: {' or '.join(criteria) if criteria else 'off'}; "
+            f"{stats.runs} table{'s' if stats.runs != 1 else ''} vacuumed this session, "
+            f"{_format_size(stats.bytes_reclaimed)} reclaimed"
+        )
+        # Tables waiting for a vacuum: one is vacuumed per write statement
+        pending = [frag.type_name for frag in storage.auto_vacuum_candidates()]
+        if pending:
+            print(f"Over threshold: {', '.join(pending)}")
+
+
+def run_repl(
+    data_dir: Path | None,
+    durability: str = DEFAULT_DURABILITY,
+    wal: bool = False,
+    read_only: bool = False,
+    lock_timeout: float | None = DEFAULT_LOCK_TIMEOUT,
+) -> int:
     """Run the interactive REPL."""
     print(f"TTQ REPL - Typed Tables Query Language")
     if data_dir:
-        print(f"Data directory: {data_dir}")
+        print(f"Data directory: {data_dir}" + (" (read-only)" if read_only else ""))
     else:
         print("No data directory loaded. Use 'use <path>' to select a database.")
     print(f"Type 'help' for commands, 'exit' to quit.\n")
@@ -492,16 +526,27 @@ def run_repl(data_dir: Path | None) -> int:
     executor: QueryExecutor | None = None
     temp_databases: set[Path] = set()
     max_width: int | None = 40  # Default column width; None = no limit
+    reuse_slots = False
+    cache_size = 0
+    verify_reads = False
 
     def load_database(path: Path) -> tuple[TypeRegistry, StorageManager, QueryExecutor, bool]:
         """Load a database from the given path. Returns (registry, storage, executor, is_new)."""
         is_new = not path.exists()
+        if is_new and read_only:
+            raise FileNotFoundError(f"Data directory not found: {path}")
         if is_new:
             path.mkdir(parents=True, exist_ok=True)
             reg = TypeRegistry()
         else:
             reg = load_registry_from_metadata(path)
-        stor = StorageManager(path, reg)
+        stor = StorageManager(
+            path, reg, durability=durability, wal=wal, reuse_slots=reuse_slots,
+            read_only=read_only, lock_timeout=lock_timeout, cache_size=cache_size,
+            verify_reads=verify_reads,
+        )
+        if stor.recovery_report is not None:
+            print(f"Recovered {stor.recovery_report.committed_units} statement(s) from write-ahead log")
         exec = QueryExecutor(stor, reg)
         return reg, stor, exec, is_new
 
@@ -566,7 +611,7 @@ def run_repl(data_dir: Path | None) -> int:
             "show ", "describe ", "use ", "use", "drop", "drop!", "drop ",
             "drop! ", "dump", "delete ", "delete!", "delete! ", "from ",
             "forward ", "alias ",
-            "compact ", "archive ", "restore ", "execute ", "import ",
+            "compact ", "archive ", "restore ", "execute ", "import ", "vacuum ",
         )
         for prefix in simple_prefixes:
             if lower.startswith(prefix) or lower == prefix.strip():
@@ -770,12 +815,32 @@ def run_repl(data_dir: Path | None) -> int:
                     continue
 
                 # Handle SET query — session setting, doesn't need executor/database
+                if isinstance(query, SetQuery) and query.setting != "max_width":
+                    # Storage settings apply to the current database
+                    if executor is None:
+                        print("No database selected. Use 'use <path>' to select a database first.")
+                    else:
+                        try:
+                            result = executor.execute(query)
+                            if isinstance(result, SetResult) and result.setting == "durability":
+                                durability = result.value
+                            elif isinstance(result, SetResult) and result.setting == "wal":
+                                wal = result.value
+                            elif isinstance(result, SetResult) and result.setting == "reuse_slots":
+                                reuse_slots = result.value
+                            elif isinstance(result, SetResult) and result.setting == "cache_size":
+                                cache_size = result.value
+                            elif isinstance(result, SetResult) and result.setting == "verify_reads":
+                                verify_reads = result.value
+                            print_result(result, max_width=max_width)
+                        except ValueError as e:
+                            print(f"Error: {e}")
+                    print()
+                    continue
                 if isinstance(query, SetQuery):
                     try:
                         setting = query.setting
-                        if setting != "max_width":
-                            print(f"Error: Unknown setting: {setting}")
-                        elif query.value is None:
+                        if query.value is None:
                             max_width = 40
                             print(f"Reset {setting} to default (40)")
                         elif query.value.lower() in ("inf", "infinity"):
@@ -809,18 +874,24 @@ def run_repl(data_dir: Path | None) -> int:
                         continue
 
                     print(f"Executing {script_path}...")
-                    exit_code, new_data_dir = run_file(script_path, data_dir, verbose=True)
+                    # Close first so the script's own storage sees every write
+                    # and owns the write-ahead log while it runs
+                    if storage:
+                        storage.close()
+                        storage = None
+                        registry = None
+                        executor = None
+                    exit_code, new_data_dir = run_file(
+                        script_path, data_dir, verbose=True, durability=durability, wal=wal,
+                        reuse_slots=reuse_slots, read_only=read_only, lock_timeout=lock_timeout,
+                        cache_size=cache_size, verify_reads=verify_reads,
+                    )
                     if exit_code != 0:
                         print("Script execution failed with errors.")
                     else:
                         print("Script execution completed.")
 
                     # Adopt the script's final database state
-                    if storage:
-                        storage.close()
-                        storage = None
-                        registry = None
-                        executor = None
                     data_dir = new_data_dir
                     if data_dir and data_dir.exists():
                         try:
@@ -1032,7 +1103,7 @@ DELETE:
   delete! <type>           Force-delete (bypasses system type protection)
   delete! <type> where ... Force-delete matching records
 
-  Deleted records become tombstones. Use "compact" to reclaim space.""",
+  Deleted records become tombstones. Use "vacuum" or "compact" to reclaim space.""",
 
     "update": """\
 UPDATE:
@@ -1222,6 +1293,7 @@ TYPES:
 
   Special types:
     string                    Built-in (stored as character[], displayed as "Alice")
+    interned string           String stored once per distinct value (tags, codes, levels)
     boolean                   Built-in (stored as bit, displayed as true/false)
 
   Extended numeric types:
@@ -1257,6 +1329,9 @@ ARRAYS:
     .max()                     Maximum numeric value
     .min(.field)               Min by field (composite arrays)
     .max(.field)               Max by field (composite arrays)
+    .popcount()                Number of set flags (bit/boolean arrays)
+    .any()                     True if any flag is set (bit/boolean arrays)
+    .all()                     True if every flag is set (bit/boolean arrays)
 
   Projection methods (SELECT — return a copy, no storage writes):
     .sort()                    Sort elements (ascending)
@@ -1549,7 +1624,7 @@ GRAPH (schema exploration):
   For full documentation, enter graph mode and type "help".""",
 
     "archive": """\
-ARCHIVE, RESTORE & COMPACT:
+ARCHIVE, RESTORE, COMPACT & VACUUM:
   archive                  Archive to <database_name>.ttar (prompts if exists)
   archive > "file.ttar"    Compact and bundle database into a specific file
                            (.ttar extension added automatically if missing)
@@ -1568,6 +1643,14 @@ ARCHIVE, RESTORE & COMPACT:
                            Removes tombstones and unreferenced data
                            Remaps all references to new indices
 
+  vacuum                   Compact every table in place
+  vacuum Person            Compact one table (a type name, or "int32[]")
+                           Rewrites it into a side file swapped in atomically,
+                           and only updates the tables that refer into it
+  set auto_vacuum 30       Vacuum an array table after any write statement
+                           that leaves more than 30% of it dead (see help
+                           settings)
+
   restore auto-detects extensions: "backup" tries backup.ttar, backup.ttar.gz""",
 
     "cyclic": """\
@@ -1595,6 +1678,8 @@ CYCLIC DATA:
 
   Tags and variables declared inside a scope are destroyed when the scope
   exits. Tags cannot be redefined within a scope.
+  A scope block is atomic: if anything in it fails, its writes are undone
+  (see "help transactions").
 
   Alternative: create with null + update:
     $n1 = create Node(value=1, next=null)
@@ -1604,6 +1689,22 @@ CYCLIC DATA:
   The dump command is cycle-aware and automatically emits scope blocks with
   tag syntax when serializing cyclic data, ensuring roundtrip fidelity.""",
 
+    "transactions": """\
+TRANSACTIONS:
+  begin                    Start a transaction
+  commit                   Make the transaction's writes permanent
+  rollback                 Undo every write since begin
+
+  Scope blocks are transactions too: if any statement in a scope fails,
+  or a tag cannot be resolved, all of the block's writes are undone.
+  A scope inside an open transaction rolls back only its own writes.
+
+  Writes are flushed once at commit, so wrapping a bulk load in
+  begin/commit is much faster than the default per-write flushing.
+  Session variables assigned after begin are discarded by rollback.
+  Type definitions are not transactional and survive a rollback.
+  Closing the database with a transaction open rolls it back.""",
+
     "scripts": """\
 EXECUTE & IMPORT:
   execute "file.ttq"       Execute queries from a file
@@ -1628,7 +1729,51 @@ SETTINGS:
   set max_width infinity No truncation (show full values)
   set max_width          Reset to default (40 characters)
 
-  Settings are per-session and do not persist across REPL sessions.""",
+  set durability <mode>  When table writes are flushed to disk:
+                           fsync_every_write  after every write (default)
+                           statement          once at the end of each statement
+                           manual             only on sync or close
+  set durability         Reset to default (fsync_every_write)
+  set wal on|off         Log writes to a write-ahead log (_wal.log) so a crash
+                         recovers to the last completed statement on next open
+  set reuse_slots on|off Let new records fill slots freed by delete instead
+                         of growing the table (default off). References to
+                         a deleted record will then see whatever reuses it.
+  set cache_size <n>     Keep up to n decoded records per table in an LRU
+                         cache, so records reached repeatedly through
+                         references are decoded once (default 0 = off).
+                         'status' shows the cache hit rate.
+  set checksums on|off   Keep a CRC32 of every 4 KB page of each table file
+                         in a .crc sidecar (default off). Saved with the
+                         database, so later sessions keep them up to date.
+  set verify_reads on|off
+                         Check the page checksums of every record read and
+                         fail on a mismatch (a debugging aid; default off)
+  set wide_references on|off
+                         Store references and array offsets as uint64 so a
+                         table can exceed 4 billion records (default off).
+                         Saved with the database; only allowed before any
+                         data is stored.
+  set auto_vacuum <n>    After each write statement, vacuum an array table
+                         once more than n% of its elements are unused. One
+                         table is vacuumed per statement. Composite types are
+                         left alone, so their _index values never change:
+                         vacuum them explicitly. Saved with the database;
+                         'set auto_vacuum off' turns the criterion off.
+  set auto_vacuum_size <bytes>
+                         Also vacuum an array table once more than this many
+                         bytes of it are dead (default off). Saved with the
+                         database. 'status' shows what auto vacuum reclaimed
+                         and the tables still waiting.
+  sync                   Flush all pending writes to disk now
+  verify                 Check every table file against its checksums, in
+                         parallel, and list damaged pages and their records
+
+  With the WAL on, 'statement' durability fsyncs only the log per statement.
+
+  The starting durability can also be chosen with ttq --durability.
+  Unless noted as saved with the database, settings are per-session and do
+  not persist across REPL sessions.""",
 }
 
 _HELP_ALIASES: dict[str, str] = {
@@ -1641,11 +1786,15 @@ _HELP_ALIASES: dict[str, str] = {
     "interface": "definitions",
     "forward": "definitions",
     "scope": "cyclic",
+    "begin": "transactions",
+    "commit": "transactions",
+    "rollback": "transactions",
     "tag": "cyclic",
     "execute": "scripts",
     "import": "scripts",
     "restore": "archive",
     "compact": "archive",
+    "vacuum": "archive",
     "describe": "show",
     "null": "create",
     "use": "database",
@@ -1670,6 +1819,15 @@ _HELP_ALIASES: dict[str, str] = {
     "array": "arrays",
     "set": "settings",
     "max_width": "settings",
+    "durability": "settings",
+    "wal": "settings",
+    "reuse_slots": "settings",
+    "cache_size": "settings",
+    "checksums": "settings",
+    "verify_reads": "settings",
+    "wide_references": "settings",
+    "sync": "settings",
+    "verify": "settings",
     "dict": "dictionaries",
     "dictionary": "dictionaries",
     "dicts": "dictionaries",
@@ -1705,10 +1863,12 @@ TTQ - Typed Tables Query Language
   collect       collect records into variables
   dump          dump database (TTQ, YAML, JSON, XML)
   graph         TTG schema exploration (enter graph mode for full help)
-  archive       archive, restore, compact
+  archive       archive, restore, compact, vacuum
   cyclic        scope blocks, tags for cyclic references
   scripts       execute, import
-  settings      set max_width
+  transactions  begin, commit, rollback, atomic scope blocks
+  settings      set max_width, durability, wal, reuse_slots, cache_size,
+                checksums, verify_reads, wide_references; sync, verify
 
 Type "help <topic>" for details. Example: help dump
 
@@ -2164,7 +2324,18 @@ Type "exit" to return to query mode.
         print(f'\nUnknown graph help topic "{topic}". Type "help" for available topics.\n')
 
 
-def run_file(file_path: Path, data_dir: Path | None, verbose: bool = False) -> tuple[int, Path | None]:
+def run_file(
+    file_path: Path,
+    data_dir: Path | None,
+    verbose: bool = False,
+    durability: str = DEFAULT_DURABILITY,
+    wal: bool = False,
+    reuse_slots: bool = False,
+    read_only: bool = False,
+    lock_timeout: float | None = DEFAULT_LOCK_TIMEOUT,
+    cache_size: int = 0,
+    verify_reads: bool = False,
+) -> tuple[int, Path | None]:
     """Execute queries from a file.
 
     Args:
@@ -2201,12 +2372,18 @@ def run_file(file_path: Path, data_dir: Path | None, verbose: bool = False) -> t
         """Load a database from the given path."""
         metadata_file = path / "_metadata.json"
         is_new = not path.exists() or not metadata_file.exists()
+        if is_new and read_only:
+            raise FileNotFoundError(f"Database not found: {path}")
         if is_new:
             path.mkdir(parents=True, exist_ok=True)
             reg = TypeRegistry()
         else:
             reg = load_registry_from_metadata(path)
-        stor = StorageManager(path, reg)
+        stor = StorageManager(
+            path, reg, durability=durability, wal=wal, reuse_slots=reuse_slots,
+            read_only=read_only, lock_timeout=lock_timeout, cache_size=cache_size,
+            verify_reads=verify_reads,
+        )
         exec = QueryExecutor(stor, reg)
         # Set script context so execute statements resolve relative paths
         exec._script_stack.append(script_dir)
@@ -2389,6 +2566,29 @@ def main(argv: list[str] | None = None) -> int:
         action="store_true",
         help="Print each query before executing (for -f/--file)",
     )
+    arg_parser.add_argument(
+        "--durability",
+        choices=DURABILITY_MODES,
+        default=DEFAULT_DURABILITY,
+        help="When table writes are flushed to disk (default: %(default)s)",
+    )
+    arg_parser.add_argument(
+        "--wal",
+        action="store_true",
+        help="Log table writes to a write-ahead log for crash recovery",
+    )
+    arg_parser.add_argument(
+        "--read-only",
+        action="store_true",
+        help="Open the database without write access (safe alongside a writer process)",
+    )
+    arg_parser.add_argument(
+        "--lock-timeout",
+        type=float,
+        default=DEFAULT_LOCK_TIMEOUT,
+        metavar="SECONDS",
+        help="How long to wait for another process's lock on the database (default: %(default)s)",
+    )
 
     args = arg_parser.parse_args(argv)
 
@@ -2404,7 +2604,10 @@ def main(argv: list[str] | None = None) -> int:
         if not file_path.is_file():
             print(f"Error: File not found: {file_path}", file=sys.stderr)
             return 1
-        exit_code, _ = run_file(file_path, args.data_dir, args.verbose)
+        exit_code, _ = run_file(
+            file_path, args.data_dir, args.verbose, durability=args.durability, wal=args.wal,
+            read_only=args.read_only, lock_timeout=args.lock_timeout,
+        )
         return exit_code
 
     if args.command:
@@ -2417,7 +2620,10 @@ def main(argv: list[str] | None = None) -> int:
         # Execute single command
         try:
             registry = load_registry_from_metadata(args.data_dir)
-            storage = StorageManager(args.data_dir, registry)
+            storage = StorageManager(
+                args.data_dir, registry, durability=args.durability, wal=args.wal,
+                read_only=args.read_only, lock_timeout=args.lock_timeout,
+            )
             parser = QueryParser()
             executor = QueryExecutor(storage, registry)
 
@@ -2449,7 +2655,10 @@ def main(argv: list[str] | None = None) -> int:
         print(f"Error: Data directory not found: {args.data_dir}", file=sys.stderr)
         return 1
 
-    return run_repl(args.data_dir)
+    return run_repl(
+        args.data_dir, durability=args.durability, wal=args.wal,
+        read_only=args.read_only, lock_timeout=args.lock_timeout,
+    )
 
 
 if __name__ == "__main__":
@@ -205,6 +205,20 @@ class Schema:
         """
         return InstanceRef(schema=self, type_name=type_name, index=index)
 
+    def to_numpy(self, type_name: str) -> Any:
+        """Get a type's table as a zero-copy NumPy structured array.
+
+        Requires NumPy. See Table.as_numpy() for details.
+
+        Args:
+            type_name: Name of the type.
+
+        Returns:
+            A read-only structured array with one element per record.
+        """
+        type_def = self.registry.get_or_raise(type_name)
+        return self.storage.get_table(type_def.name).as_numpy()
+
     def close(self) -> None:
         """Close all storage resources."""
         self.storage.close()
@@ -3,11 +3,26 @@
 from __future__ import annotations
 
 import json
+import os
+import shutil
+import struct
+from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Iterator
 
-from typed_tables.array_table import ArrayTable, create_array_table
-from typed_tables.table import Table
+from typed_tables.array_table import (
+    ArrayTable,
+    create_array_table,
+    create_bigint_table,
+    create_bit_table,
+    create_interned_string_table,
+    create_string_table,
+)
+from typed_tables.checksum import CHECKSUM_SUFFIX, VerifyReport, verify_files
+from typed_tables.locking import DEFAULT_LOCK_TIMEOUT, DatabaseLock
+from typed_tables.table import PAGE_SIZE, GrowthPolicy, Table
+from typed_tables.transaction import UndoLog
+from typed_tables.wal import RecoveryReport, WriteAheadLog, recover
 from typed_tables.types import (
     AliasTypeDefinition,
     ArrayTypeDefinition,
@@ -22,6 +37,7 @@ from typed_tables.types import (
     FieldDefinition,
     FractionTypeDefinition,
     InterfaceTypeDefinition,
+    InternedStringTypeDefinition,
     OverflowTypeDefinition,
     PrimitiveType,
     PrimitiveTypeDefinition,
@@ -41,36 +57,267 @@ _BUILTIN_TYPE_NAMES: frozenset[str] = frozenset(
     + ["string", "boolean", "bigint", "biguint", "fraction"]
 )
 
+# Durability modes, from strictest to most relaxed:
+#   fsync-every-write — flush a table's mapping after every mutation
+#   statement         — flush dirty tables once at the end of each statement
+#   manual            — flush only on an explicit sync or on close
+DURABILITY_MODES: tuple[str, ...] = ("fsync-every-write", "statement", "manual")
+DEFAULT_DURABILITY = "fsync-every-write"
+
+
+def normalize_durability(mode: str) -> str:
+    """Validate a durability mode name, accepting underscores for hyphens."""
+    normalized = mode.strip().lower().replace("_", "-")
+    if normalized not in DURABILITY_MODES:
+        raise ValueError(
+            f"Unknown durability mode: {mode} (expected one of {', '.join(DURABILITY_MODES)})"
+        )
+    return normalized
+
+
+# Written while a vacuum rewrites tables into side files (see StorageManager.begin_vacuum)
+VACUUM_MANIFEST = "_vacuum.json"
+_TABLE_SIDECARS = (
+    Table.TOMBSTONE_SUFFIX, Table.FREE_LIST_SUFFIX, CHECKSUM_SUFFIX, ArrayTable.BLOCKS_SUFFIX,
+)
+
+
+def vacuum_side_path(path: Path) -> Path:
+    """Return the side file a vacuum writes the new contents of a table file to."""
+    return path.with_name(f"{path.stem}.vacuum{path.suffix}")
+
+
+def finish_vacuum(data_dir: Path) -> bool:
+    """Complete or abandon an interrupted vacuum in ``data_dir``.
+
+    Once the manifest lists the files to swap, every side file still
+    present replaces its table file; before that, the side files are
+    deleted and the tables are left as they were. Returns whether a
+    vacuum was found.
+    """
+    manifest_path = data_dir / VACUUM_MANIFEST
+    if not manifest_path.exists():
+        return False
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except ValueError:
+        manifest = {}  # written partially: the swap never started
+    if manifest.get("swap"):
+        for rel in manifest["rewritten"] + manifest["remapped"]:
+            path = data_dir / rel
+            side = vacuum_side_path(path)
+            if not side.exists():
+                continue  # swapped already
+            if path.exists():
+                # Readers still mapping the old file reopen the path (Table.refresh)
+                with open(path, "r+b") as f:
+                    f.write(struct.pack("<Q", Table.REPLACED_COUNT))
+            # Sidecars describe one file's contents: the side file's replace the
+            # table's, and a rewritten table's others are stale. Remapped
+            # tables keep their record layout, so only checksums go stale.
+            for suffix in _TABLE_SIDECARS:
+                side_sidecar = side.with_suffix(suffix)
+                if side_sidecar.exists():
+                    os.replace(side_sidecar, path.with_suffix(suffix))
+                elif rel in manifest["rewritten"] or suffix == CHECKSUM_SUFFIX:
+                    path.with_suffix(suffix).unlink(missing_ok=True)
+            os.replace(side, path)
+    else:
+        for side in data_dir.rglob("*.vacuum.*"):
+            side.unlink()
+    manifest_path.unlink()
+    return True
+
+
+@dataclass(frozen=True)
+class AutoVacuumPolicy:
+    """When an array element table is vacuumed automatically after write statements.
+
+    Composite tables are never vacuumed automatically: that renumbers their
+    records, which queries address by ``_index``. A table qualifies when more
+    than ``dead_percent`` percent of its records (or elements) are dead, or
+    more than ``dead_bytes`` bytes of it are. A criterion left None is not
+    checked, so the default policy is off. Tables with less than a page of
+    dead bytes never qualify: rewriting them would not make their files any
+    smaller.
+
+    Attributes:
+        dead_percent: Dead share of a table, 1-100, that triggers a vacuum.
+        dead_bytes: Dead bytes in a table that trigger a vacuum.
+    """
+
+    dead_percent: int | None = None
+    dead_bytes: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.dead_percent is not None and not 0 < self.dead_percent <= 100:
+            raise ValueError(
+                f"auto_vacuum must be a percentage from 1 to 100, got {self.dead_percent}"
+            )
+        if self.dead_bytes is not None and self.dead_bytes <= 0:
+            raise ValueError(
+                f"auto_vacuum_size must be a positive number of bytes, got {self.dead_bytes}"
+            )
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether either criterion is set."""
+        return self.dead_percent is not None or self.dead_bytes is not None
+
+    def exceeded(self, fragmentation: TableFragmentation) -> bool:
+        """Return whether a table's dead records call for a vacuum under this policy."""
+        if fragmentation.dead_bytes < PAGE_SIZE:
+            return False
+        if (self.dead_percent is not None
+                and fragmentation.dead * 100 > fragmentation.records * self.dead_percent):
+            return True
+        return self.dead_bytes is not None and fragmentation.dead_bytes > self.dead_bytes
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the policy's criteria as a JSON-compatible dict."""
+        return {
+            name: getattr(self, name)
+            for name in ("dead_percent", "dead_bytes")
+            if getattr(self, name) is not None
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> AutoVacuumPolicy:
+        """Build a policy from to_dict() output."""
+        return cls(**data)
+
+
+@dataclass
+class TableFragmentation:
+    """Dead records of one table that a vacuum could reclaim."""
+
+    type_name: str  # composite type or array type owning the table
+    table: Table
+    records: int
+    dead: int
+
+    @property
+    def dead_bytes(self) -> int:
+        """Return the bytes held by the table's dead records."""
+        return self.dead * self.table._record_size
+
+
+def _is_bit_type(type_def: TypeDefinition) -> bool:
+    """Return whether a type resolves to the bit primitive (including boolean)."""
+    base = type_def.resolve_base_type()
+    return isinstance(base, PrimitiveTypeDefinition) and base.primitive == PrimitiveType.BIT
+
 
 class StorageManager:
     """Manages all tables for a schema."""
 
     METADATA_FILE = "_metadata.json"
 
-    def __init__(self, data_dir: Path, registry: TypeRegistry) -> None:
+    def __init__(
+        self,
+        data_dir: Path,
+        registry: TypeRegistry,
+        durability: str = DEFAULT_DURABILITY,
+        wal: bool = False,
+        reuse_slots: bool = False,
+        read_only: bool = False,
+        lock_timeout: float | None = DEFAULT_LOCK_TIMEOUT,
+        cache_size: int = 0,
+        verify_reads: bool = False,
+    ) -> None:
         """Initialize the storage manager.
 
+        Any write-ahead log left behind by a crash is replayed before tables
+        are opened, whether or not ``wal`` is enabled for this session.
+        A read-only manager leaves recovery to the writer.
+
         Args:
             data_dir: Directory to store table files.
             registry: Type registry containing all type definitions.
+            durability: When table writes are flushed to disk (see DURABILITY_MODES).
+            wal: Log every table write to a write-ahead log in data_dir.
+            reuse_slots: Let inserts into composite tables fill slots left by
+                deleted records instead of always appending.
+            read_only: Map tables with ACCESS_READ and never write to data_dir,
+                so any number of reader processes can share it with a writer.
+                Call refresh() to see the writer's changes.
+            lock_timeout: Seconds to wait for another process's lock on
+                data_dir (see typed_tables.locking), or None to wait forever.
+            cache_size: Number of decoded records each table keeps in an
+                LRU cache for get() (0 disables caching).
+            verify_reads: Check the page checksums of every record get()
+                decodes, when the database keeps checksums (a debugging aid).
+
+        Raises:
+            LockTimeout: If another writable manager holds data_dir.
         """
         self.data_dir = data_dir
         self.registry = registry
+        self._durability = normalize_durability(durability)
+        self._wal: WriteAheadLog | None = None
+        self._undo: UndoLog | None = None  # set while a transaction is open
+        # Dead element counts of the array tables at begin() and each savepoint
+        self._dead_counts: dict[int, dict[str, int | None]] = {}
+        self._reuse_slots = reuse_slots
+        self._read_only = read_only
+        self._cache_size = cache_size
+        self._verify_reads = verify_reads
+        self._checksums = False  # saved in the metadata file; see set_checksums()
+        self._auto_vacuum = AutoVacuumPolicy()  # saved in the metadata file; see set_auto_vacuum()
+        # Strings are UTF-8 heaps (StringTable) except in databases created
+        # before string heaps, which keep one UTF-32 character per record
+        self._utf8_strings = True
+        # Arrays and sets of bit/boolean pack 8 flags per byte (BitTable), except in
+        # databases created before packed bits, which keep one byte per flag
+        self._packed_bits = True
+        # bigint/biguint values that fit in their (start, length) pair are stored in it
+        # (BigIntTable), except in databases created before inline values
+        self._inline_bigints = True
+        self._growth: dict[str, GrowthPolicy] = {}  # table name → file sizing policy
         self._tables: dict[str, Table] = {}
         self._array_tables: dict[str, ArrayTable] = {}
         self._variant_tables: dict[str, dict[str, Table]] = {}  # enum_name → {variant_name → Table}
 
+        self.recovery_report: RecoveryReport | None = None
+        if read_only:
+            if wal:
+                raise ValueError("A read-only database cannot use a write-ahead log")
+            if not self.data_dir.is_dir():
+                raise FileNotFoundError(f"Data directory not found: {self.data_dir}")
+            self._lock = DatabaseLock(self.data_dir, read_only=True, timeout=lock_timeout)
+            self._load_metadata_settings()
+            return
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        # Only the lock holder may replay the log or touch any file
+        self._lock = DatabaseLock(self.data_dir, timeout=lock_timeout)
+        self.recovery_report = recover(self.data_dir)
+        finish_vacuum(self.data_dir)
+        self._load_metadata_settings()
         self._save_metadata()
+        if wal:
+            self.set_wal(True)
 
     def _save_metadata(self) -> None:
         """Save type metadata to disk."""
+        self._check_writable()
         metadata = {
             "types": self._serialize_type_registry(),
         }
         # Persist type_ids for tagged interface references
         if self.registry._type_ids:
             metadata["type_ids"] = self.registry._type_ids
+        if self._checksums:
+            metadata["checksums"] = True
+        if self._auto_vacuum.enabled:
+            metadata["auto_vacuum"] = self._auto_vacuum.to_dict()
+        if self.registry.wide_references:
+            metadata["wide_references"] = True
+        if self._utf8_strings:
+            metadata["strings"] = "utf-8"
+        if self._packed_bits:
+            metadata["bits"] = "packed"
+        if self._inline_bigints:
+            metadata["bigints"] = "inline"
         metadata_path = self.data_dir / self.METADATA_FILE
         with open(metadata_path, "w") as f:
             json.dump(metadata, f, indent=2)
@@ -79,6 +326,598 @@ class StorageManager:
         """Public method to save type metadata to disk."""
         self._save_metadata()
 
+    def _load_metadata_settings(self) -> None:
+        """Read the storage settings saved in an existing metadata file.
+
+        These are the growth policy saved with each type, the database-wide
+        checksums and wide-reference flags, the auto-vacuum policy and the
+        string, bit array and bigint storage formats.
+        """
+        metadata_path = self.data_dir / self.METADATA_FILE
+        if not metadata_path.exists():
+            return
+        with open(metadata_path) as f:
+            metadata = json.load(f)
+        self._checksums = bool(metadata.get("checksums", False))
+        self._auto_vacuum = AutoVacuumPolicy.from_dict(metadata.get("auto_vacuum", {}))
+        self._utf8_strings = metadata.get("strings") == "utf-8"
+        self._packed_bits = metadata.get("bits") == "packed"
+        self._inline_bigints = metadata.get("bigints") == "inline"
+        if metadata.get("wide_references", False) != self.registry.wide_references:
+            self.registry.set_wide_references(bool(metadata.get("wide_references", False)))
+        for type_name, spec in metadata.get("types", {}).items():
+            if "growth" in spec:
+                self._growth[type_name] = GrowthPolicy.from_dict(spec["growth"])
+
+    # --- Read-only access ---
+
+    @property
+    def read_only(self) -> bool:
+        """Return whether the database was opened read-only."""
+        return self._read_only
+
+    def _check_writable(self) -> None:
+        """Raise PermissionError if the database was opened read-only."""
+        if self._read_only:
+            raise PermissionError(f"Database is open read-only: {self.data_dir}")
+
+    def refresh(self) -> None:
+        """Catch up every open table with writes made by other processes.
+
+        Cheap when nothing changed: one header read per table.
+        """
+        for table in self.iter_tables():
+            table.refresh()
+
+    # --- Growth policies ---
+
+    def growth_policy(self, type_name: str) -> GrowthPolicy:
+        """Return the file sizing policy of a type's table."""
+        return self._growth.get(type_name, GrowthPolicy())
+
+    def set_growth_policy(self, type_name: str, policy: GrowthPolicy | None) -> None:
+        """Set (or with None, reset) how a type's table file is sized.
+
+        The policy is saved with the type in the metadata file. It applies
+        to the next growth of an open table; ``expected_rows`` and
+        ``initial_size`` only take effect when the file is first created.
+        """
+        self._check_writable()
+        self.registry.get_or_raise(type_name)
+        if policy is None or policy == GrowthPolicy():
+            self._growth.pop(type_name, None)
+        else:
+            self._growth[type_name] = policy
+        for table in self.iter_tables():
+            self._configure_table(table)
+        self._save_metadata()
+
+    # --- Durability ---
+
+    @property
+    def durability(self) -> str:
+        """Return the current durability mode."""
+        return self._durability
+
+    def set_durability(self, mode: str) -> str:
+        """Change the durability mode and return its normalized name.
+
+        Switching to a stricter mode flushes any pending writes first.
+        """
+        mode = normalize_durability(mode)
+        self._durability = mode
+        if mode == "fsync-every-write":
+            self.sync()
+        for table in self.iter_tables():
+            self._configure_table(table)
+        return mode
+
+    def _configure_table(self, table: Table) -> Table:
+        """Apply storage-wide settings to a newly opened table."""
+        # Inside a transaction, flushes are batched until commit
+        table.auto_flush = self._durability == "fsync-every-write" and self._undo is None
+        table.journal = self._wal
+        table.undo_log = self._undo
+        table.set_cache_size(self._cache_size)
+        table.verify_reads = self._verify_reads
+        table.set_checksums(self._checksums)
+        if table.file_path.parent == self.data_dir:
+            # Variant tables live in per-enum subdirectories and keep the default
+            table.growth = self.growth_policy(table.file_path.stem)
+        return table
+
+    def iter_tables(self) -> Iterator[Table]:
+        """Iterate over every open table, including array element and variant tables."""
+        yield from self._tables.values()
+        for array_table in self._array_tables.values():
+            yield from array_table.tables()
+        for variant_dict in self._variant_tables.values():
+            yield from variant_dict.values()
+
+    def iter_array_tables(self) -> Iterator[tuple[str, ArrayTable]]:
+        """Iterate over every open array table as ``(type_name, array_table)``."""
+        yield from self._array_tables.items()
+
+    def _flush_tables(self) -> int:
+        """Flush every dirty table. Returns the number of tables flushed."""
+        flushed = 0
+        for table in self.iter_tables():
+            if table.dirty:
+                table.flush()
+                flushed += 1
+        if self._undo is None:
+            # Only once the records pointing into them are on disk, and never
+            # mid-transaction: a block released there is still in use if it rolls back
+            for array_table in self._array_tables.values():
+                array_table.save_blocks()
+        return flushed
+
+    def sync(self) -> int:
+        """Flush all dirty tables to disk. Returns the number of tables flushed.
+
+        With a write-ahead log, pending writes are committed first and the
+        log is truncated once the tables are durable. Inside a transaction
+        the log is left alone, so its writes can still be undone on recovery.
+        """
+        if self._undo is not None:
+            return self._flush_tables()
+        if self._wal is not None:
+            self._wal.commit()
+        flushed = self._flush_tables()
+        if self._wal is not None:
+            self._wal.truncate()
+        return flushed
+
+    def begin_statement(self) -> None:
+        """Mark the start of a statement.
+
+        Takes the database's statement lock: shared for a read-only manager,
+        which then refreshes its tables to the writer's last published
+        state, and exclusive for the writer. Inside a transaction the lock
+        is already held.
+
+        Raises:
+            LockTimeout: If the lock is not granted within the lock timeout.
+        """
+        if self._lock.statement_locked:
+            return
+        self._lock.acquire_statement()
+        if self._read_only:
+            self.refresh()
+
+    def end_statement(self) -> None:
+        """Mark a statement boundary.
+
+        With a write-ahead log the statement's writes are committed to the log
+        (fsynced unless durability is 'manual') and tables are only flushed when
+        the log needs a checkpoint. Without one, 'statement' durability flushes
+        dirty tables here. Inside a transaction this waits for commit().
+        Page checksums of the pages the statement wrote are saved either way.
+        The statement lock is released last, once the statement's writes
+        are published.
+        """
+        if self._undo is not None:
+            return
+        if self._wal is not None:
+            committed = self._wal.commit(fsync=self._durability != "manual")
+            if committed and self._wal.should_checkpoint():
+                self.sync()
+        elif self._durability == "statement":
+            self._flush_tables()
+        if self._checksums:
+            for table in self.iter_tables():
+                table.save_checksums()
+        self._lock.release_statement()
+
+    # --- Slot reuse ---
+
+    @property
+    def reuse_slots(self) -> bool:
+        """Return whether composite inserts reuse deleted slots."""
+        return self._reuse_slots
+
+    def set_reuse_slots(self, enabled: bool) -> None:
+        """Turn deleted-slot reuse on or off for composite tables.
+
+        A reused slot gets a new record at the old index, so any reference
+        still pointing at the deleted record will see the new one.
+        """
+        self._reuse_slots = enabled
+        for table in self._tables.values():
+            table.reuse_slots = enabled and isinstance(
+                table.type_def.resolve_base_type(), CompositeTypeDefinition
+            )
+
+    # --- Record cache ---
+
+    @property
+    def cache_size(self) -> int:
+        """Return the per-table record cache size (0 when caching is off)."""
+        return self._cache_size
+
+    def set_cache_size(self, size: int) -> None:
+        """Set how many decoded records each table caches for get()."""
+        if size < 0:
+            raise ValueError(f"Cache size must not be negative, got {size}")
+        self._cache_size = size
+        for table in self.iter_tables():
+            table.set_cache_size(size)
+
+    def cache_stats(self) -> tuple[int, int]:
+        """Return the (hits, misses) of the record caches of all open tables."""
+        hits = misses = 0
+        for table in self.iter_tables():
+            hits += table.cache_hits
+            misses += table.cache_misses
+        return hits, misses
+
+    # --- Checksums ---
+
+    @property
+    def checksums(self) -> bool:
+        """Return whether the database keeps page checksums of its table files."""
+        return self._checksums
+
+    def set_checksums(self, enabled: bool) -> None:
+        """Turn page checksums on or off for the whole database.
+
+        The setting is saved in the metadata file, so every later session
+        keeps the checksums up to date. Enabling them checksums every
+        existing table file; disabling them removes every sidecar.
+        """
+        self._check_writable()
+        if enabled == self._checksums:
+            return
+        self._checksums = enabled
+        if enabled:
+            self.open_all_tables()
+        for table in self.iter_tables():
+            table.set_checksums(enabled)
+        if not enabled:
+            for path in self.data_dir.rglob(f"*{CHECKSUM_SUFFIX}"):
+                path.unlink()
+        self._save_metadata()
+
+    @property
+    def verify_reads(self) -> bool:
+        """Return whether get() checks the checksums of the records it reads."""
+        return self._verify_reads
+
+    def set_verify_reads(self, enabled: bool) -> None:
+        """Turn checksum checks on every record read on or off."""
+        self._verify_reads = enabled
+        for table in self.iter_tables():
+            table.verify_reads = enabled
+
+    def verify(self, workers: int | None = None) -> VerifyReport:
+        """Check every table file in the database against its page checksums.
+
+        Files are checked in parallel, reading each sequentially. A writable
+        manager first opens every table so that any file without a sidecar
+        (e.g. one restored from an archive) gets one.
+
+        Args:
+            workers: Number of files checked at once (default: chosen by
+                concurrent.futures from the CPU count).
+
+        Raises:
+            ValueError: If the database does not keep checksums.
+        """
+        if not self._checksums:
+            raise ValueError("Checksums are not enabled for this database (use 'set checksums on')")
+        if not self._read_only:
+            self.open_all_tables()
+        return verify_files(sorted(self.data_dir.rglob("*.bin")), workers)
+
+    # --- Auto-vacuum ---
+
+    @property
+    def auto_vacuum(self) -> AutoVacuumPolicy:
+        """Return the policy deciding when tables are vacuumed after write statements."""
+        return self._auto_vacuum
+
+    def set_auto_vacuum(self, policy: AutoVacuumPolicy) -> None:
+        """Set the auto-vacuum policy. It is saved in the metadata file."""
+        self._check_writable()
+        self._auto_vacuum = policy
+        self._save_metadata()
+
+    def fragmentation(self) -> list[TableFragmentation]:
+        """Return the dead records of every open composite table and array element table.
+
+        Array tables whose dead count is unknown (see ArrayTable.dead_count)
+        are left out, as are interned string tables, which never free anything.
+        """
+        result: list[TableFragmentation] = []
+        for type_name, table in self._tables.items():
+            composite = isinstance(self.registry.get(type_name), CompositeTypeDefinition)
+            if composite and table.file_path.exists():
+                result.append(
+                    TableFragmentation(type_name, table, table.count, table.deleted_count)
+                )
+        for type_name, array_table in self._array_tables.items():
+            if isinstance(array_table.array_type, InternedStringTypeDefinition):
+                continue
+            elements = array_table.element_table
+            if array_table.dead_count is not None and elements.file_path.exists():
+                result.append(TableFragmentation(
+                    type_name, elements, elements.count, array_table.dead_count,
+                ))
+        return result
+
+    def auto_vacuum_candidates(self) -> list[TableFragmentation]:
+        """Return the array element tables the auto-vacuum policy says to vacuum now."""
+        policy = self._auto_vacuum
+        return [
+            frag for frag in self.fragmentation()
+            if frag.type_name in self._array_tables and policy.exceeded(frag)
+        ]
+
+    # --- Storage formats ---
+
+    @property
+    def utf8_strings(self) -> bool:
+        """Return whether strings are stored as UTF-8 heaps (False for older databases)."""
+        return self._utf8_strings
+
+    @property
+    def packed_bits(self) -> bool:
+        """Return whether bit and boolean arrays pack 8 flags per byte.
+
+        False for databases created before packed bits.
+        """
+        return self._packed_bits
+
+    @property
+    def inline_bigints(self) -> bool:
+        """Return whether small bigint/biguint values are stored inline.
+
+        False for databases created before inline values.
+        """
+        return self._inline_bigints
+
+    # --- Wide references ---
+
+    @property
+    def wide_references(self) -> bool:
+        """Return whether the database stores references and array offsets as uint64."""
+        return self.registry.wide_references
+
+    def set_wide_references(self, enabled: bool) -> None:
+        """Switch the database to 64-bit (or back to 32-bit) references.
+
+        Wide references let any table hold more than 2**32 records, at the
+        cost of larger references in every record. The mode is saved in the
+        metadata file. It changes the layout of every table file, so it can
+        only be switched before the first record is written; to convert an
+        existing database, dump it and load the dump into a new one.
+
+        Raises:
+            ValueError: If the database already holds table files.
+        """
+        self._check_writable()
+        if enabled == self.registry.wide_references:
+            return
+        if any(self.data_dir.rglob("*.bin")):
+            raise ValueError(
+                "Wide references can only be changed before any data is stored "
+                "(dump the database and load it into a new one to convert it)"
+            )
+        # No table holds data yet, but open ones were sized for the old layout
+        for table in self.iter_tables():
+            table.close()
+        self._tables.clear()
+        self._array_tables.clear()
+        self._variant_tables.clear()
+        self.registry.set_wide_references(enabled)
+        self._save_metadata()
+
+    def open_all_tables(self) -> None:
+        """Open the table of every type that has a table file."""
+        for type_name in self.registry.list_types():
+            type_def = self.registry.get(type_name)
+            if type_def is None:
+                continue
+            if isinstance(type_def, EnumTypeDefinition):
+                for variant in type_def.variants:
+                    if (self.data_dir / type_name / f"{variant.name}.bin").exists():
+                        self.get_variant_table(type_def, variant.name)
+                continue
+            if not (self.data_dir / f"{type_name}.bin").exists():
+                continue
+            base = type_def.resolve_base_type()
+            if isinstance(base, (ArrayTypeDefinition, DictionaryTypeDefinition)):
+                self.get_array_table_for_type(type_def)
+            elif not isinstance(base, InterfaceTypeDefinition):
+                self.get_table(type_name)
+        if (self.data_dir / "_frac_num.bin").exists():
+            self.get_fraction_num_table()
+        if (self.data_dir / "_frac_den.bin").exists():
+            self.get_fraction_den_table()
+
+    # --- Transactions ---
+
+    @property
+    def in_transaction(self) -> bool:
+        """Return whether a transaction is open."""
+        return self._undo is not None
+
+    def begin(self) -> None:
+        """Open a transaction. Table writes are undoable until commit()."""
+        if self._undo is not None:
+            raise ValueError("A transaction is already in progress")
+        # Held until commit or rollback, so readers never see the transaction half done
+        self._lock.acquire_statement()
+        self._undo = UndoLog()
+        self._dead_counts = {0: self._array_dead_counts()}
+        for table in self.iter_tables():
+            self._configure_table(table)
+
+    def savepoint(self) -> int:
+        """Return a marker within the open transaction for rollback_to()."""
+        if self._undo is None:
+            raise ValueError("No transaction in progress")
+        savepoint = self._undo.savepoint()
+        self._dead_counts.setdefault(savepoint, self._array_dead_counts())
+        return savepoint
+
+    def rollback_to(self, savepoint: int) -> int:
+        """Undo writes made after ``savepoint`` and keep the transaction open."""
+        if self._undo is None:
+            raise ValueError("No transaction in progress")
+        undone = self._undo.rollback(savepoint)
+        self._reset_array_blocks(savepoint)
+        return undone
+
+    def _end_transaction(self) -> None:
+        self._undo = None
+        self._dead_counts = {}
+        for table in self.iter_tables():
+            self._configure_table(table)
+        if self._durability == "fsync-every-write" and self._wal is None:
+            self._flush_tables()
+            self._lock.release_statement()
+        else:
+            self.end_statement()
+
+    def commit(self) -> None:
+        """Make the open transaction's writes permanent.
+
+        Dirty tables are flushed once here (or the write-ahead log committed),
+        according to the durability mode.
+        """
+        if self._undo is None:
+            raise ValueError("No transaction in progress")
+        self._end_transaction()
+
+    def rollback(self) -> int:
+        """Discard every write made by the open transaction. Returns the number undone."""
+        if self._undo is None:
+            raise ValueError("No transaction in progress")
+        undone = self._undo.rollback()
+        self._reset_array_blocks(0)
+        self._end_transaction()
+        return undone
+
+    def _array_dead_counts(self) -> dict[str, int | None]:
+        return {name: array_table.dead_count for name, array_table in self._array_tables.items()}
+
+    def _reset_array_blocks(self, savepoint: int) -> None:
+        """Drop the array tables' slack and free blocks after a rollback.
+
+        Their dead counts are restored as well.
+
+        Rolled-back records may point into blocks released or reserved
+        since; the dead elements are the ones there were at the savepoint.
+        """
+        counts = self._dead_counts[savepoint]
+        for marker in [m for m in self._dead_counts if m > savepoint]:
+            del self._dead_counts[marker]
+        for name, array_table in self._array_tables.items():
+            array_table.reset_blocks(counts.get(name))
+
+    def settle_released_blocks(self, written: bool) -> None:
+        """Finish the array moves made while updating one record.
+
+        If the record was written, the blocks its arrays moved out of become
+        reusable; if not (the update failed), it still points at them and
+        they are left alone.
+        """
+        for array_table in self._array_tables.values():
+            if written:
+                array_table.reuse_released()
+            else:
+                array_table.discard_released()
+
+    # --- Vacuum ---
+
+    def begin_vacuum(self) -> None:
+        """Start rewriting tables in place.
+
+        Pending writes are flushed, then a manifest is written so that side
+        files (see vacuum_side_path) left by a crash are deleted on the
+        next open. Finish with swap_vacuum_files() or abort_vacuum().
+        """
+        self._check_writable()
+        if self._undo is not None:
+            raise ValueError("Cannot vacuum inside a transaction")
+        self.sync()
+        (self.data_dir / VACUUM_MANIFEST).write_text(json.dumps({"swap": False}))
+
+    def vacuum_side_table(self, table: Table, copy: bool = False) -> Table:
+        """Open the side file a vacuum writes a table's new contents to.
+
+        It starts empty, or with ``copy`` as a copy of the table file.
+        """
+        side_path = vacuum_side_path(table.file_path)
+        if copy:
+            shutil.copyfile(table.file_path, side_path)
+        side = Table(table.type_def, side_path, growth=table.growth)
+        side.auto_flush = False  # flushed once, on close
+        return side
+
+    def vacuum_side_array_table(self, array_table: ArrayTable) -> ArrayTable:
+        """Open an empty side file for an array table; elements are copied in without gaps."""
+        side = ArrayTable(array_table.array_type, self.vacuum_side_table(array_table.element_table))
+        side.set_dead_count(0)
+        return side
+
+    def swap_vacuum_files(self, rewritten: list[Path], remapped: list[Path]) -> None:
+        """Replace table files with their side files.
+
+        ``rewritten`` tables were compacted, so their sidecars are dropped
+        with their old contents; ``remapped`` tables are copies with the
+        same records, only some references changed. Every open table is
+        closed first. Once the manifest naming the files is on disk the
+        swap is certain to complete, if need be when the database is next
+        opened.
+        """
+        self._close_tables()
+        manifest = {
+            "swap": True,
+            "rewritten": [path.relative_to(self.data_dir).as_posix() for path in rewritten],
+            "remapped": [path.relative_to(self.data_dir).as_posix() for path in remapped],
+        }
+        fd = os.open(self.data_dir / VACUUM_MANIFEST, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, json.dumps(manifest).encode())
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        finish_vacuum(self.data_dir)
+
+    def abort_vacuum(self) -> None:
+        """Delete the side files of a vacuum that is not going ahead."""
+        finish_vacuum(self.data_dir)
+
+    # --- Write-ahead log ---
+
+    @property
+    def wal_enabled(self) -> bool:
+        """Return whether table writes are being logged."""
+        return self._wal is not None
+
+    def set_wal(self, enabled: bool) -> None:
+        """Start or stop logging table writes to the write-ahead log.
+
+        Tables are flushed first so the log always starts (and ends) at a
+        point where the table files are consistent on their own.
+        """
+        if enabled == self.wal_enabled:
+            return
+        self._check_writable()
+        if self._undo is not None:
+            raise ValueError("Cannot change wal inside a transaction")
+        self.sync()
+        if enabled:
+            self._wal = WriteAheadLog(self.data_dir)
+        else:
+            assert self._wal is not None
+            self._wal.close()
+            self._wal = None
+        for table in self.iter_tables():
+            self._configure_table(table)
+
     def _collect_referenced_builtins(self) -> set[str]:
         """Collect built-in type names referenced by any user-defined type."""
         referenced: set[str] = set()
@@ -142,6 +981,8 @@ class StorageManager:
                 continue
 
             result[type_name] = self._serialize_type_def(type_def)
+            if type_name in self._growth:
+                result[type_name]["growth"] = self._growth[type_name].to_dict()
 
         return result
 
@@ -161,6 +1002,8 @@ class StorageManager:
                 "kind": "alias",
                 "base_type": type_def.base_type.name,
             }
+        elif isinstance(type_def, InternedStringTypeDefinition):
+            return {"kind": "interned_string"}
         elif isinstance(type_def, StringTypeDefinition):
             return {"kind": "string"}
         elif isinstance(type_def, BigIntTypeDefinition):
@@ -274,7 +1117,10 @@ class StorageManager:
                 f"Use get_array_table for array types: {type_name}"
             )
 
-        table = Table(type_def, self.data_dir / f"{type_name}.bin")
+        table = self._configure_table(
+            Table(type_def, self.data_dir / f"{type_name}.bin", read_only=self._read_only)
+        )
+        table.reuse_slots = self._reuse_slots and isinstance(base, CompositeTypeDefinition)
         self._tables[type_name] = table
         return table
 
@@ -298,12 +1144,15 @@ class StorageManager:
             type_name = type_def.name
             if type_name in self._array_tables:
                 return self._array_tables[type_name]
-            # Entry indices are uint32 — use uint32 primitive as element type
-            uint32_type = self.registry.get("uint32")
+            # Entry indices are uint32 (uint64 with wide references)
+            index_type = self.registry.get("uint64" if self.registry.wide_references else "uint32")
             synth_array = ArrayTypeDefinition(
-                name=type_def.name, element_type=uint32_type,
+                name=type_def.name, element_type=index_type, wide_references=base.wide_references,
             )
-            array_table = create_array_table(synth_array, self.data_dir, type_name)
+            array_table = create_array_table(
+                synth_array, self.data_dir, type_name, read_only=self._read_only,
+            )
+            self._configure_table(array_table.element_table)
             self._array_tables[type_name] = array_table
             return array_table
 
@@ -317,7 +1166,35 @@ class StorageManager:
             return self._array_tables[type_name]
 
         # Create array table using the resolved array type definition
-        array_table = create_array_table(base, self.data_dir, type_name)
+        if isinstance(base, InternedStringTypeDefinition):
+            # A new kind of heap, so always UTF-8 whatever the database's string layout
+            index_name = "uint64" if self.registry.wide_references else "uint32"
+            index_type = self.registry.get_or_raise(index_name)
+            array_table = create_interned_string_table(
+                base, self.registry.get_or_raise("uint8"), self.registry.get_or_raise("uint64"),
+                index_type, self.data_dir, type_name, read_only=self._read_only,
+            )
+        elif isinstance(base, StringTypeDefinition) and self._utf8_strings:
+            array_table = create_string_table(
+                base, self.registry.get_or_raise("uint8"), self.data_dir, type_name,
+                read_only=self._read_only,
+            )
+        elif isinstance(base, (BigIntTypeDefinition, BigUIntTypeDefinition)):
+            array_table = create_bigint_table(
+                base, self.data_dir, type_name,
+                read_only=self._read_only, inline=self._inline_bigints,
+            )
+        elif self._packed_bits and _is_bit_type(base.element_type):
+            array_table = create_bit_table(
+                base, self.registry.get_or_raise("uint8"), self.data_dir, type_name,
+                read_only=self._read_only,
+            )
+        else:
+            array_table = create_array_table(
+                base, self.data_dir, type_name, read_only=self._read_only,
+            )
+        for table in array_table.tables():
+            self._configure_table(table)
         self._array_tables[type_name] = array_table
         return array_table
 
@@ -370,12 +1247,16 @@ class StorageManager:
         variant_type = CompositeTypeDefinition(
             name=f"_{enum_name}_{variant_name}",
             fields=list(variant.fields),
+            wide_references=enum_def.wide_references,
         )
 
         # Create folder and table
         enum_dir = self.data_dir / enum_name
-        enum_dir.mkdir(exist_ok=True)
-        table = Table(variant_type, enum_dir / f"{variant_name}.bin")
+        if not self._read_only:
+            enum_dir.mkdir(exist_ok=True)
+        table = self._configure_table(
+            Table(variant_type, enum_dir / f"{variant_name}.bin", read_only=self._read_only)
+        )
         self._variant_tables[enum_name][variant_name] = table
         return table
 
@@ -385,8 +1266,11 @@ class StorageManager:
         if key in self._array_tables:
             return self._array_tables[key]
         uint8_type = self.registry.get("uint8")
-        synth = ArrayTypeDefinition(name=key, element_type=uint8_type)
-        table = create_array_table(synth, self.data_dir, key)
+        synth = ArrayTypeDefinition(
+            name=key, element_type=uint8_type, wide_references=self.registry.wide_references,
+        )
+        table = create_array_table(synth, self.data_dir, key, read_only=self._read_only)
+        self._configure_table(table.element_table)
         self._array_tables[key] = table
         return table
 
@@ -396,13 +1280,29 @@ class StorageManager:
         if key in self._array_tables:
             return self._array_tables[key]
         uint8_type = self.registry.get("uint8")
-        synth = ArrayTypeDefinition(name=key, element_type=uint8_type)
-        table = create_array_table(synth, self.data_dir, key)
+        synth = ArrayTypeDefinition(
+            name=key, element_type=uint8_type, wide_references=self.registry.wide_references,
+        )
+        table = create_array_table(synth, self.data_dir, key, read_only=self._read_only)
+        self._configure_table(table.element_table)
         self._array_tables[key] = table
         return table
 
     def close(self) -> None:
-        """Close all tables."""
+        """Close all tables, rolling back any open transaction."""
+        if self._undo is not None:
+            self.rollback()
+        if self._wal is not None:
+            self._wal.commit()
+        self._close_tables()
+        if self._wal is not None:
+            # Tables are flushed on close, so the log is no longer needed
+            self._wal.close()
+            self._wal = None
+        self._lock.close()
+
+    def _close_tables(self) -> None:
+        """Close every open table; they are reopened on next use."""
         for table in self._tables.values():
             table.close()
         for array_table in self._array_tables.values():
@@ -5,108 +5,444 @@ from __future__ import annotations
 import mmap
 import os
 import struct
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
-
-from typed_tables.types import (
-    ArrayTypeDefinition,
-    CompositeTypeDefinition,
-    DictionaryTypeDefinition,
-    EnumTypeDefinition,
-    EnumValue,
-    FractionTypeDefinition,
-    InterfaceTypeDefinition,
-    NULL_REF,
-    PrimitiveType,
-    PrimitiveTypeDefinition,
-    REFERENCE_SIZE,
-    TypeDefinition,
-)
+from typing import TYPE_CHECKING, Any, Iterator
+
+from typed_tables.checksum import PageChecksums
+from typed_tables.codec import ColumnCodec, RecordCodec
+from typed_tables.types import CompositeTypeDefinition, TypeDefinition
+
+if TYPE_CHECKING:
+    from typed_tables.transaction import UndoLog
+    from typed_tables.wal import WriteAheadLog
+
+
+# Table files are sized in whole pages
+PAGE_SIZE = 4096
+
+GROWTH_STRATEGIES = ("double", "chunk")
+
+
+@dataclass(frozen=True)
+class GrowthPolicy:
+    """How a table file is sized when it is created and when it runs out of room.
+
+    Attributes:
+        initial_size: Size in bytes of a newly created file.
+        strategy: "double" multiplies the file size by two on each step;
+            "chunk" adds ``chunk_size`` bytes.
+        chunk_size: Bytes added per step by the "chunk" strategy.
+        max_step: Upper bound on the bytes one "double" step may add, or None.
+        expected_rows: Preallocation hint: a new file gets room for this many
+            records up front, so a bulk load never has to grow it.
+    """
+
+    initial_size: int = PAGE_SIZE
+    strategy: str = "double"
+    chunk_size: int = 1 << 20
+    max_step: int | None = None
+    expected_rows: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.strategy not in GROWTH_STRATEGIES:
+            raise ValueError(
+                f"Invalid growth strategy '{self.strategy}': "
+                f"expected one of {', '.join(GROWTH_STRATEGIES)}"
+            )
+        if (self.initial_size < 8 or self.chunk_size <= 0
+                or (self.max_step is not None and self.max_step <= 0)):
+            raise ValueError("Growth sizes must be positive (initial_size at least 8 bytes)")
+
+    def initial_file_size(self, record_size: int) -> int:
+        """Return the size of a new file for records of ``record_size`` bytes."""
+        size = max(self.initial_size, 8 + record_size)
+        if self.expected_rows:
+            size = max(size, 8 + self.expected_rows * record_size)
+        return -(-size // PAGE_SIZE) * PAGE_SIZE
+
+    def next_size(self, size: int, record_size: int, min_capacity: int) -> int:
+        """Return the file size after growing from ``size`` until ``min_capacity`` records fit."""
+        while True:
+            if self.strategy == "chunk":
+                step = self.chunk_size
+            else:
+                step = size if self.max_step is None else min(size, self.max_step)
+            size += max(step, record_size)
+            if (size - 8) // record_size >= min_capacity:
+                return size
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the policy's non-default settings as a JSON-compatible dict."""
+        default = GrowthPolicy()
+        return {
+            name: getattr(self, name)
+            for name in ("initial_size", "strategy", "chunk_size", "max_step", "expected_rows")
+            if getattr(self, name) != getattr(default, name)
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> GrowthPolicy:
+        """Build a policy from to_dict() output."""
+        return cls(**data)
+
+
+def _preallocate(fd: int, old_size: int, new_size: int) -> None:
+    """Extend an open file to ``new_size`` bytes, reserving disk blocks where supported.
+
+    Reserved blocks mean a full disk is reported here rather than as SIGBUS
+    on a later write through the mapping.
+    """
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, old_size, new_size - old_size)
+            return
+        except OSError:
+            pass  # e.g. unsupported by the filesystem
+    os.ftruncate(fd, new_size)
 
 
 class Table:
     """Manages binary storage for a single type."""
 
-    # Initial file size and growth increment
-    INITIAL_SIZE = 4096
+    # Defaults of GrowthPolicy: initial file size and growth multiplier
+    INITIAL_SIZE = PAGE_SIZE
     GROWTH_FACTOR = 2
 
-    def __init__(self, type_def: TypeDefinition, file_path: Path) -> None:
+    def __init__(
+        self,
+        type_def: TypeDefinition,
+        file_path: Path,
+        growth: GrowthPolicy | None = None,
+        read_only: bool = False,
+    ) -> None:
         self.type_def = type_def
         self.file_path = file_path
+        # Map the file with ACCESS_READ and refuse every write
+        self.read_only = read_only
+        # File sizing; may be replaced before the file is created
+        self.growth = growth if growth is not None else GrowthPolicy()
         self._record_size = type_def.size_bytes
+        # Compiled once and reused for every get/insert/update
+        self._codec = RecordCodec(type_def)
+        self._column_codecs: dict[tuple[str, ...], ColumnCodec] = {}
         self._file: Any = None
         self._mmap: mmap.mmap | None = None
+        self._view: memoryview | None = None  # byte view of _mmap for zero-copy reads
         self._count = 0
         self._capacity = 0  # Number of records that fit in current file
+        # When False, writes only mark the table dirty; flush() persists them
+        self.auto_flush = True
+        self._dirty = False
+        # Set by StorageManager when writes must be logged before they are applied
+        self.journal: WriteAheadLog | None = None
+        # Set by StorageManager while a transaction is open
+        self.undo_log: UndoLog | None = None
+        # When True, insert() fills slots freed by delete() before appending
+        self.reuse_slots = False
+        self._free: list[int] | None = None  # deleted slot indices, loaded lazily
+        self._free_dirty = False
+        self._free_saved: bool | None = None  # whether the sidecar exists; None until checked
+        # Tombstone bitmap: bit i set means record i is deleted; loaded lazily
+        self._tombstones: bytearray | None = None
+        self._deleted_count = 0
+        self._tombstones_dirty = False  # in-memory bitmap differs from the sidecar
+        # Optional LRU of decoded records, most recently used last (see set_cache_size)
+        self._cache: OrderedDict[int, Any] = OrderedDict()
+        self.cache_size = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Page checksums kept in a sidecar while enabled (see set_checksums)
+        self._checksums_enabled = False
+        self._checksums: PageChecksums | None = None
+        # When True, get() checks the pages of each record it decodes
+        self.verify_reads = False
 
         if self.file_path.exists():
             self._open_existing()
         # Otherwise stay lazy — file created on first insert()
 
+    # Header count written to a file just before a rewritten one replaces it,
+    # so readers still mapping it know to reopen the path (see refresh)
+    REPLACED_COUNT = 0xFFFF_FFFF_FFFF_FFFF
+
+    # Sidecar file holding the free list: <Q count> then <Q index> entries
+    FREE_LIST_SUFFIX = ".free"
+
+    # Sidecar file holding the tombstone bitmap: <QQ covered, deleted> then bits
+    TOMBSTONE_SUFFIX = ".del"
+    _TOMBSTONE_HEADER = struct.Struct("<QQ")
+
+    @property
+    def free_list_path(self) -> Path:
+        """Return the path of the free-slot sidecar file."""
+        return self.file_path.with_suffix(self.FREE_LIST_SUFFIX)
+
+    @property
+    def tombstone_path(self) -> Path:
+        """Return the path of the tombstone bitmap sidecar file."""
+        return self.file_path.with_suffix(self.TOMBSTONE_SUFFIX)
+
     def _create_new(self) -> None:
-        """Create a new table file."""
+        """Create a new table file, sized by the growth policy."""
+        self._check_writable()
         self.file_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Create file with initial size
+        size = self.growth.initial_file_size(self._record_size)
         with open(self.file_path, "wb") as f:
-            # Header: 8 bytes for count
-            f.write(struct.pack("<Q", 0))
-            # Pad to initial size
-            remaining = self.INITIAL_SIZE - 8
-            f.write(b"\x00" * remaining)
+            # Header: 8 bytes for count (zero), the rest zero-filled
+            _preallocate(f.fileno(), 0, size)
 
         self._open_file()
         self._count = 0
-        self._capacity = (self.INITIAL_SIZE - 8) // self._record_size
+        self._capacity = (size - 8) // self._record_size
+        if self._checksums_enabled:
+            self._open_checksums()
 
     def _open_existing(self) -> None:
         """Open an existing table file."""
         self._open_file()
         # Read count from header
-        self._mmap.seek(0)  # type: ignore
-        self._count = struct.unpack("<Q", self._mmap.read(8))[0]  # type: ignore
+        self._count = struct.unpack_from("<Q", self._mmap, 0)[0]  # type: ignore
         file_size = self._mmap.size()  # type: ignore
         self._capacity = (file_size - 8) // self._record_size
 
     def _open_file(self) -> None:
         """Open file and create memory map."""
-        self._file = open(self.file_path, "r+b")
-        self._mmap = mmap.mmap(self._file.fileno(), 0)
-
-    def _grow_file(self) -> None:
-        """Grow the file to accommodate more records."""
-        if self._mmap is not None:
-            self._mmap.close()
-        if self._file is not None:
+        if self.read_only:
+            self._file = open(self.file_path, "rb")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._file = open(self.file_path, "r+b")
+            self._mmap = mmap.mmap(self._file.fileno(), 0)
+        self._view = memoryview(self._mmap)
+
+    def _check_writable(self) -> None:
+        """Raise PermissionError if the table was opened read-only."""
+        if self.read_only:
+            raise PermissionError(f"Table is open read-only: {self.type_def.name}")
+
+    def refresh(self) -> None:
+        """Catch up with writes made by another process.
+
+        Meant for read-only tables shared with a writer: picks up a file
+        created since the table was opened, re-reads the header count
+        (remapping if the file grew past the current mapping, reopening it
+        if it was replaced), and drops the cached tombstone bitmap so
+        deletions are seen.
+        """
+        if self._mmap is None:
+            if self.file_path.exists():
+                self._open_existing()
+                if self._checksums_enabled:
+                    self._open_checksums()
+            return
+        count = struct.unpack_from("<Q", self._mmap, 0)[0]
+        if count == self.REPLACED_COUNT:
+            # The writer swapped in a rewritten file (vacuum); map that one
+            self._unmap()
             self._file.close()
+            self._file = None
+            if self._checksums is not None:
+                self._checksums.close()
+                self._checksums = None
+            self._cache.clear()
+            self._tombstones = None
+            self._deleted_count = 0
+            self._open_existing()
+            if self._checksums_enabled:
+                self._open_checksums()
+            return
+        if self._record_offset(count) > len(self._mmap):
+            self._unmap()
+            access = mmap.ACCESS_READ if self.read_only else mmap.ACCESS_WRITE
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=access)
+            self._view = memoryview(self._mmap)
+            self._capacity = (len(self._mmap) - 8) // self._record_size
+        self._count = count
+        # Another process may have changed any record
+        self._cache.clear()
+        if self._checksums_enabled:
+            self._open_checksums()
+        if not self._tombstones_dirty:
+            self._tombstones = None
+            self._deleted_count = 0
+
+    def _unmap(self) -> None:
+        """Drop the current mapping.
+
+        Views returned by get_raw()/iter_raw() keep the old mapping alive;
+        it is unmapped when the last of them is released.
+        """
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass
+            self._mmap = None
 
-        current_size = self.file_path.stat().st_size
-        new_size = current_size * self.GROWTH_FACTOR
-
-        with open(self.file_path, "r+b") as f:
-            f.seek(new_size - 1)
-            f.write(b"\x00")
+    def _grow_file(self, min_capacity: int = 0) -> None:
+        """Grow the file to accommodate more records.
 
-        self._open_file()
+        The growth policy picks the new size (at least ``min_capacity``
+        records). The file is extended through the open descriptor and the
+        mapping resized in place; only when views from get_raw()/iter_raw()/
+        as_numpy() pin the old mapping is a new one created beside it.
+        """
+        self._check_writable()
+        current_size = self._mmap.size()  # type: ignore
+        new_size = self.growth.next_size(current_size, self._record_size, min_capacity)
+        _preallocate(self._file.fileno(), current_size, new_size)
+
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        try:
+            self._mmap.resize(new_size)  # type: ignore
+        except (BufferError, SystemError, OSError):
+            # Exported views prevent resizing (or the platform lacks it)
+            self._unmap()
+            self._mmap = mmap.mmap(self._file.fileno(), 0)
+        self._view = memoryview(self._mmap)
         self._capacity = (new_size - 8) // self._record_size
 
+    def reserve(self, count: int) -> None:
+        """Ensure room for ``count`` more records without further growth."""
+        if self._mmap is None:
+            self._create_new()
+        if self._count + count > self._capacity:
+            self._grow_file(self._count + count)
+
     def _update_count(self) -> None:
         """Update the count in the file header."""
-        self._mmap.seek(0)  # type: ignore
-        self._mmap.write(struct.pack("<Q", self._count))  # type: ignore
+        self._write(0, struct.pack("<Q", self._count))
+
+    def _write(self, offset: int, data: bytes) -> None:
+        """Write bytes into the mapping, logging them to the journal first."""
+        self._check_writable()
+        if self._cache:
+            self._invalidate_cache(offset, len(data))
+        if self._checksums is not None:
+            self._checksums.mark(offset, len(data))
+        if self.undo_log is not None:
+            self.undo_log.log_write(self, offset, data)
+        if self.journal is not None:
+            self.journal.log_write(self, offset, data)
+        self._mmap[offset : offset + len(data)] = data  # type: ignore
+
+    def restore_bytes(self, offset: int, data: bytes) -> None:
+        """Put back bytes saved by an undo log, bypassing the undo log itself."""
+        self._check_writable()
+        if self._cache:
+            self._invalidate_cache(offset, len(data))
+        if self._checksums is not None:
+            self._checksums.mark(offset, len(data))
+        if self.journal is not None:
+            self.journal.log_write(self, offset, data)
+        if self._tombstones is not None:
+            self._invalidate_tombstone_sidecar()
+        self._mmap[offset : offset + len(data)] = data  # type: ignore
+        if self._tombstones is not None and offset + len(data) > 8:
+            # Restored bytes may revive or re-delete records; re-derive their bits
+            first = max(0, (offset - 8) // self._record_size)
+            last = min(self._count, -(-(offset + len(data) - 8) // self._record_size))
+            for index in range(first, last):
+                start = self._record_offset(index)
+                data_at = self._mmap[start : start + self._record_size]  # type: ignore
+                self._set_tombstone(index, data_at == self.DELETED_MARKER * self._record_size)
+        self._written()
+
+    def reload_header(self) -> None:
+        """Re-read the record count from the file header."""
+        if self._mmap is not None:
+            old_count = self._count
+            self._count = struct.unpack_from("<Q", self._mmap, 0)[0]
+            if self._count < old_count:
+                for index in [i for i in self._cache if i >= self._count]:
+                    del self._cache[index]
+            if self._tombstones is not None:
+                # Keep bits past the count clear so appends start out live
+                for index in range(self._count, old_count):
+                    self._set_tombstone(index, False)
+                self._grow_tombstones()
+            self.save_checksums()
+
+    @property
+    def live_bytes(self) -> int:
+        """Return the number of bytes covered by the header and live records."""
+        return self._record_offset(self._count)
+
+    def read_bytes(self, offset: int, length: int) -> bytes:
+        """Read raw bytes from the table file."""
+        return self._mmap[offset : offset + length]  # type: ignore
 
     def _record_offset(self, index: int) -> int:
         """Get byte offset for a record index."""
         return 8 + index * self._record_size  # 8 bytes for header
 
+    def _written(self) -> None:
+        """Record that the mapping was modified, flushing if auto_flush is on."""
+        self._dirty = True
+        if self.auto_flush:
+            # The free list sidecar is left for flush()/close(); a stale one
+            # only leaks slots, it never hands out a live one.
+            self._mmap.flush()  # type: ignore
+            self._dirty = False
+            self.save_checksums(fsync=True)
+
+    def save_checksums(self, fsync: bool = False) -> None:
+        """Recompute the checksums of pages written since the last save and write them out.
+
+        Writes only mark their pages stale, so a statement touching a page
+        many times checksums it once. StorageManager calls this at the end
+        of every statement, before readers sharing the file can see it.
+        """
+        if self._checksums is None:
+            return
+        if self._mmap is not None:
+            self._checksums.update(self._mmap, self.live_bytes)
+        self._checksums.save(fsync=fsync)
+
+    @property
+    def dirty(self) -> bool:
+        """Return whether there are writes not yet flushed to disk."""
+        return self._dirty or self._free_dirty or self._tombstones_dirty
+
+    def flush(self) -> None:
+        """Flush pending writes to disk."""
+        if self.read_only:
+            return
+        if self._mmap is not None and self._dirty:
+            self._mmap.flush()
+        self._dirty = False
+        self._save_free_list()
+        self._save_tombstones()
+        self.save_checksums(fsync=True)
+
     @property
     def count(self) -> int:
         """Return the number of records in the table."""
         return self._count
 
     def insert(self, value: Any) -> int:
-        """Insert a value and return its index."""
+        """Insert a value and return its index.
+
+        With ``reuse_slots`` on, the slot of a deleted record is reused if
+        one is available; otherwise the record is appended.
+        """
+        if self.reuse_slots and self._mmap is not None:
+            index = self._pop_free_slot()
+            if index is not None:
+                data = self._serialize(value)
+                self._set_tombstone(index, False)
+                self._write(self._record_offset(index), data)
+                self._written()
+                return index
+
         if self._mmap is None:
             self._create_new()
         if self._count >= self._capacity:
@@ -116,12 +452,47 @@ class Table:
         offset = self._record_offset(index)
 
         data = self._serialize(value)
-        self._mmap.seek(offset)  # type: ignore
-        self._mmap.write(data)  # type: ignore
+        self._write(offset, data)
 
         self._count += 1
         self._update_count()
-        self._mmap.flush()  # type: ignore
+        self._grow_tombstones()
+        self._written()
+
+        return index
+
+    def insert_many(self, values: list[Any]) -> int:
+        """Insert several values contiguously and return the first index.
+
+        Capacity is reserved once, all records are written with a single
+        copy, and the header count is updated (and flushed) once.
+        """
+        if not values:
+            return self._count
+        return self.insert_raw(self.pack_many(values))
+
+    def pack_many(self, values: list[Any]) -> bytes:
+        """Encode values as consecutive records, ready for insert_raw() or write_raw()."""
+        pack = self._codec.pack
+        return b"".join([pack(value) for value in values])
+
+    def insert_raw(self, data: bytes) -> int:
+        """Append already-encoded records and return the index of the first.
+
+        ``data`` must hold a whole number of records.
+        """
+        count = len(data) // self._record_size
+        if not count:
+            return self._count
+        self.reserve(count)
+
+        index = self._count
+        self._write(self._record_offset(index), data)
+
+        self._count += count
+        self._update_count()
+        self._grow_tombstones()
+        self._written()
 
         return index
 
@@ -130,11 +501,112 @@ class Table:
         if index < 0 or index >= self._count:
             raise IndexError(f"Index {index} out of range [0, {self._count})")
 
+        if self.verify_reads and self._checksums is not None:
+            return self._get_verified(index)
+        if not self.cache_size:
+            return self._codec.unpack_from(self._mmap, self._record_offset(index))
+
+        cache = self._cache
+        value = cache.get(index)
+        if value is None:
+            self.cache_misses += 1
+            value = self._codec.unpack_from(self._mmap, self._record_offset(index))
+            cache[index] = value
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        else:
+            self.cache_hits += 1
+            cache.move_to_end(index)
+        # Composite records are dicts; callers may modify their copy
+        return dict(value) if isinstance(value, dict) else value
+
+    def get_range(self, start: int, count: int) -> list[Any]:
+        """Get the values of records [start, start + count) with one read and one decode pass.
+
+        Bypasses the record cache; deleted records decode like any other.
+        """
+        view = self.get_raw_range(start, count)
+        if self.verify_reads and self._checksums is not None and count:
+            self._checksums.check(self._mmap, self._record_offset(start), len(view))
+        return self._codec.unpack_many(view)
+
+    def _get_verified(self, index: int) -> Any:
+        """Decode a record after checking the checksums of its pages."""
         offset = self._record_offset(index)
-        self._mmap.seek(offset)  # type: ignore
-        data = self._mmap.read(self._record_size)  # type: ignore
+        self._checksums.check(self._mmap, offset, self._record_size)  # type: ignore[union-attr]
+        return self._codec.unpack_from(self._mmap, offset)
+
+    # --- Record cache ---
+
+    def set_cache_size(self, size: int) -> None:
+        """Cache up to ``size`` decoded records for get(), evicting the least recently used.
+
+        0 turns the cache off and empties it. The hit/miss counters are kept.
+        """
+        if size < 0:
+            raise ValueError(f"Cache size must not be negative, got {size}")
+        self.cache_size = size
+        while len(self._cache) > size:
+            self._cache.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        """Forget every cached record."""
+        self._cache.clear()
+
+    def _invalidate_cache(self, offset: int, length: int) -> None:
+        """Drop cached records overlapping the byte range [offset, offset + length)."""
+        if offset < 8:
+            if offset + length <= 8:
+                return  # header only
+            offset, length = 8, length - (8 - offset)
+        size = self._record_size
+        first = (offset - 8) // size
+        last = (offset + length - 9) // size  # inclusive
+        cache = self._cache
+        if last - first >= len(cache):
+            for index in [i for i in cache if first <= i <= last]:
+                del cache[index]
+        else:
+            for index in range(first, last + 1):
+                cache.pop(index, None)
+
+    def get_raw(self, index: int) -> memoryview:
+        """Return a record's bytes as a view of the mapping, without copying.
+
+        The view reflects later writes to the record and stays readable
+        until released, even if the table grows or is closed meanwhile.
+        Deleted records read as all 0xFF bytes.
+        """
+        if index < 0 or index >= self._count:
+            raise IndexError(f"Index {index} out of range [0, {self._count})")
 
-        return self._deserialize(data)
+        offset = self._record_offset(index)
+        return self._view[offset : offset + self._record_size]  # type: ignore
+
+    def get_raw_range(self, start: int, count: int) -> memoryview:
+        """Return the bytes of records [start, start + count) as one view of the mapping."""
+        if start < 0 or count < 0 or start + count > self._count:
+            raise IndexError(f"Range [{start}, {start + count}) out of range [0, {self._count})")
+        end = self._record_offset(start + count)
+        return self._view[self._record_offset(start) : end]  # type: ignore
+
+    def write_raw(self, index: int, data: bytes) -> None:
+        """Overwrite existing records, starting at ``index``, with already-encoded bytes."""
+        count = len(data) // self._record_size
+        if index < 0 or index + count > self._count:
+            raise IndexError(f"Range [{index}, {index + count}) out of range [0, {self._count})")
+        self._write(self._record_offset(index), data)
+        self._written()
+
+    def iter_raw(self, start: int = 0, stop: int | None = None) -> Iterator[memoryview]:
+        """Yield a zero-copy view of each record in [start, stop), deleted or not."""
+        stop = self._count if stop is None else min(stop, self._count)
+        if start >= stop:
+            return
+        size = self._record_size
+        view = self._view[self._record_offset(start) : self._record_offset(stop)]  # type: ignore
+        for offset in range(0, len(view), size):
+            yield view[offset : offset + size]
 
     def update(self, index: int, value: Any) -> None:
         """Update a value at the given index."""
@@ -143,9 +615,9 @@ class Table:
 
         offset = self._record_offset(index)
         data = self._serialize(value)
-        self._mmap.seek(offset)  # type: ignore
-        self._mmap.write(data)  # type: ignore
-        self._mmap.flush()  # type: ignore
+        self._set_tombstone(index, False)
+        self._write(offset, data)
+        self._written()
 
     # Deletion marker: all 0xFF bytes (distinguishable from valid data with index 0)
     DELETED_MARKER = b"\xff"
@@ -160,298 +632,361 @@ class Table:
             raise IndexError(f"Index {index} out of range [0, {self._count})")
 
         offset = self._record_offset(index)
+        if self.reuse_slots:
+            # Loaded before the tombstone is set, so a list rebuilt by scan
+            # does not already hold this slot
+            free = self._load_free_list()
+            if not self.is_deleted(index):
+                free.append(index)
+                self._free_dirty = True
+        elif self._free is not None or self._free_list_saved():
+            # A free list that misses this slot would only leak it, but
+            # dropping it lets the next session rebuild a complete one.
+            self._discard_free_list()
         # Mark record as deleted with 0xFF bytes
-        self._mmap.seek(offset)  # type: ignore
-        self._mmap.write(self.DELETED_MARKER * self._record_size)  # type: ignore
-        self._mmap.flush()  # type: ignore
+        self._set_tombstone(index, True)
+        self._write(offset, self.DELETED_MARKER * self._record_size)
+        self._written()
 
     def is_deleted(self, index: int) -> bool:
         """Check if a record at the given index has been deleted."""
         if index < 0 or index >= self._count:
             raise IndexError(f"Index {index} out of range [0, {self._count})")
 
-        offset = self._record_offset(index)
-        self._mmap.seek(offset)  # type: ignore
-        data = self._mmap.read(self._record_size)  # type: ignore
-        return data == self.DELETED_MARKER * self._record_size
+        return bool(self._load_tombstones()[index >> 3] & (1 << (index & 7)))
 
-    def _serialize(self, value: Any) -> bytes:
-        """Serialize a value to bytes."""
-        if isinstance(self.type_def, PrimitiveTypeDefinition):
-            return self._serialize_primitive(value, self.type_def.primitive)
-        elif isinstance(self.type_def, ArrayTypeDefinition):
-            # For array tables, value should be (start_index, length)
-            start_index, length = value
-            return struct.pack("<II", start_index, length)
-        elif isinstance(self.type_def, EnumTypeDefinition):
-            return self._serialize_enum_value(value, self.type_def)
-        elif isinstance(self.type_def, CompositeTypeDefinition):
-            return self._serialize_composite(value, self.type_def)
-        else:
-            # Handle alias by resolving to base
-            base = self.type_def.resolve_base_type()
-            if isinstance(base, PrimitiveTypeDefinition):
-                return self._serialize_primitive(value, base.primitive)
-            if isinstance(base, EnumTypeDefinition):
-                return self._serialize_enum_value(value, base)
-            raise TypeError(f"Cannot serialize type: {self.type_def.name}")
-
-    def _serialize_primitive(self, value: Any, primitive: PrimitiveType) -> bytes:
-        """Serialize a primitive value."""
-        format_map = {
-            PrimitiveType.BIT: "<?",
-            PrimitiveType.CHARACTER: "<I",  # Unicode code point
-            PrimitiveType.UINT8: "<B",
-            PrimitiveType.INT8: "<b",
-            PrimitiveType.UINT16: "<H",
-            PrimitiveType.INT16: "<h",
-            PrimitiveType.UINT32: "<I",
-            PrimitiveType.INT32: "<i",
-            PrimitiveType.UINT64: "<Q",
-            PrimitiveType.INT64: "<q",
-            PrimitiveType.FLOAT16: "<e",
-            PrimitiveType.FLOAT32: "<f",
-            PrimitiveType.FLOAT64: "<d",
-        }
+    @property
+    def deleted_count(self) -> int:
+        """Return the number of deleted records."""
+        if self._mmap is None:
+            return 0
+        self._load_tombstones()
+        return self._deleted_count
 
-        if primitive == PrimitiveType.CHARACTER:
-            # Convert character to code point
-            if isinstance(value, str):
-                value = ord(value[0]) if value else 0
-            return struct.pack("<I", value)
-        elif primitive in (PrimitiveType.UINT128, PrimitiveType.INT128):
-            # Handle 128-bit integers
-            if isinstance(value, str):
-                # Parse UUID-like strings
-                value = int(value.replace("-", ""), 16)
-            # Pack as two 64-bit values (little-endian)
-            low = value & ((1 << 64) - 1)
-            high = (value >> 64) & ((1 << 64) - 1)
-            return struct.pack("<QQ", low, high)
+    @property
+    def live_count(self) -> int:
+        """Return the number of records that have not been deleted."""
+        return self._count - self.deleted_count
+
+    def iter_live(self, start: int = 0, stop: int | None = None) -> Iterator[int]:
+        """Yield the indices of live records in [start, stop), skipping dead ranges."""
+        stop = self._count if stop is None else min(stop, self._count)
+        if start >= stop:
+            return
+        if self.deleted_count == 0:
+            yield from range(start, stop)
+            return
+        bitmap = self._tombstones
+        assert bitmap is not None
+        index = start
+        while index < stop:
+            bits = bitmap[index >> 3]
+            if index & 7 == 0:
+                if bits == 0xFF:
+                    index += 8
+                    continue
+                if bits == 0:
+                    yield from range(index, min(index + 8, stop))
+                    index += 8
+                    continue
+            if not bits & (1 << (index & 7)):
+                yield index
+            index += 1
+
+    def iter_records(self, start: int = 0, stop: int | None = None) -> Iterator[tuple[int, Any]]:
+        """Yield (index, value) for each live record, reading each record once."""
+        unpack_from = self._codec.unpack_from
+        for index in self.iter_live(start, stop):
+            yield index, unpack_from(self._mmap, self._record_offset(index))
+
+    # --- Column scans ---
+
+    def scan_fields(self, field_names: list[str]) -> Iterator[tuple[int, tuple[Any, ...]]]:
+        """Yield (index, values) for each live record, decoding only the named fields.
+
+        Values are in ``field_names`` order and match what get() returns for
+        those fields (None for null). Only composite tables can be scanned.
+        """
+        if not isinstance(self.type_def, CompositeTypeDefinition):
+            raise TypeError(f"Cannot scan fields of non-composite type: {self.type_def.name}")
+        key = tuple(field_names)
+        column = self._column_codecs.get(key)
+        if column is None:
+            column = ColumnCodec(self.type_def, list(field_names))
+            self._column_codecs[key] = column
+        if self._count == 0 or self._view is None:
+            return
+
+        decode = column.decode
+        rows = column.struct.iter_unpack(self._view[8 : self.live_bytes])
+        if self.deleted_count == 0:
+            for index, slots in enumerate(rows):
+                yield index, decode(slots)
         else:
-            return struct.pack(format_map[primitive], value)
+            bitmap = self._tombstones
+            assert bitmap is not None
+            for index, slots in enumerate(rows):
+                if not bitmap[index >> 3] & (1 << (index & 7)):
+                    yield index, decode(slots)
 
-    def _serialize_composite(self, value: Any, type_def: CompositeTypeDefinition) -> bytes:
-        """Serialize a composite value.
+    def scan_field(self, field_name: str) -> Iterator[tuple[int, Any]]:
+        """Yield (index, value) of one field for each live record."""
+        for index, (value,) in self.scan_fields([field_name]):
+            yield index, value
 
-        Record layout: [null_bitmap] [field0_data] [field1_data] ...
+    # --- NumPy views (optional dependency) ---
 
-        - Primitive/alias-to-primitive fields: actual value bytes (inline)
-        - Array fields: (start_index, length) tuple (8 bytes)
-        - Composite ref fields: uint32 index (4 bytes)
-        """
-        if isinstance(value, (list, tuple)):
-            value = {field.name: value[i] for i, field in enumerate(type_def.fields)}
-        elif not isinstance(value, dict):
-            raise TypeError(f"Expected dict or tuple for composite type, got {type(value)}")
-
-        # Build null bitmap
-        bitmap_size = type_def.null_bitmap_size
-        bitmap = bytearray(bitmap_size)
-        for i, field in enumerate(type_def.fields):
-            if value.get(field.name) is None:
-                bitmap[i // 8] |= 1 << (i % 8)
-
-        parts = [bytes(bitmap)]
-
-        for i, field in enumerate(type_def.fields):
-            field_value = value.get(field.name)
-            ref_size = field.type_def.reference_size
-            if field_value is None:
-                # Null field: write zeroed bytes
-                parts.append(b"\x00" * ref_size)
-            else:
-                parts.append(self._serialize_field_data(field_value, field.type_def))
+    def as_numpy(self) -> Any:
+        """Return all records as a read-only NumPy structured array over the mapping.
 
-        return b"".join(parts)
+        No data is copied: the array reflects later in-place writes, and keeps
+        the current mapping alive if the table grows. Deleted records are
+        included (as all 0xFF bytes); combine with live_mask() to skip them.
+        See typed_tables.numpy_support.record_dtype() for the layout.
 
-    def _serialize_field_data(self, value: Any, type_def: TypeDefinition) -> bytes:
-        """Serialize field data within a composite record.
-
-        - Array fields: (start_index, length) as 8 bytes
-        - Composite ref fields: uint32 index as 4 bytes
-        - Enum fields: discriminant + payload inline
-        - Primitive/alias-to-primitive fields: actual value bytes (inline)
+        Raises:
+            ImportError: If NumPy is not installed.
         """
-        base = type_def.resolve_base_type()
-        if isinstance(base, EnumTypeDefinition):
-            return self._serialize_enum_value(value, base)
-        elif isinstance(base, FractionTypeDefinition):
-            # Fraction: (num_start, num_len, den_start, den_len) = 16 bytes
-            return struct.pack("<IIII", value[0], value[1], value[2], value[3])
-        elif isinstance(base, InterfaceTypeDefinition):
-            # Tagged reference: (type_id, index) → uint16 + uint32 = 6 bytes
-            type_id, index = value
-            return struct.pack("<HI", type_id, index)
-        elif isinstance(base, DictionaryTypeDefinition):
-            # Dict stores (start_index, length) same as array
-            return struct.pack("<II", value[0], value[1])
-        elif isinstance(base, ArrayTypeDefinition):
-            return struct.pack("<II", value[0], value[1])
-        elif isinstance(base, CompositeTypeDefinition):
-            return struct.pack("<I", value)
-        elif isinstance(base, PrimitiveTypeDefinition):
-            return self._serialize_primitive(value, base.primitive)
-        else:
-            raise TypeError(f"Cannot serialize field type: {type_def.name}")
-
-    def _pack_discriminant(self, disc: int, disc_size: int) -> bytes:
-        """Pack a discriminant value into bytes."""
-        if disc_size == 1:
-            return struct.pack("<B", disc)
-        elif disc_size == 2:
-            return struct.pack("<H", disc)
-        else:
-            return struct.pack("<I", disc)
-
-    def _unpack_discriminant(self, data: bytes, disc_size: int) -> int:
-        """Unpack a discriminant value from bytes."""
-        if disc_size == 1:
-            return struct.unpack("<B", data[:1])[0]
-        elif disc_size == 2:
-            return struct.unpack("<H", data[:2])[0]
-        else:
-            return struct.unpack("<I", data[:4])[0]
+        from typed_tables.numpy_support import record_dtype, require_numpy
+
+        np = require_numpy()
+        dtype = record_dtype(self.type_def)
+        if self._count == 0 or self._view is None:
+            return np.zeros(0, dtype=dtype)
+        # Export from a slice so the array pins the mapping, not self._view,
+        # which growth and close() release
+        records = np.frombuffer(self._view[8 : self.live_bytes], dtype=dtype)
+        records.flags.writeable = False
+        return records
+
+    def live_mask(self) -> Any:
+        """Return a NumPy boolean array that is True for each record not deleted.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        from typed_tables.numpy_support import require_numpy
 
-    def _serialize_enum_value(self, value: Any, enum_def: EnumTypeDefinition) -> bytes:
-        """Serialize an enum value.
+        np = require_numpy()
+        if self.deleted_count == 0:
+            return np.ones(self._count, dtype=bool)
+        bits = np.unpackbits(
+            np.frombuffer(self._tombstones, dtype=np.uint8), count=self._count, bitorder="little",
+        )
+        return bits == 0
 
-        C-style: discriminant only.
-        Swift-style: value is (discriminant, variant_table_index) tuple.
-        """
-        disc_size = enum_def.discriminant_size
+    # --- Checksums ---
 
-        if enum_def.has_associated_values:
-            # Swift-style: value is (discriminant, variant_table_index) tuple
-            disc, index = value
-            data = self._pack_discriminant(disc, disc_size)
-            return data + struct.pack("<I", index)
-        else:
-            # C-style: discriminant only
-            data = self._pack_discriminant(value.discriminant, disc_size)
-            return data
+    @property
+    def checksums_enabled(self) -> bool:
+        """Return whether the table keeps page checksums."""
+        return self._checksums_enabled
 
-    def _deserialize(self, data: bytes) -> Any:
-        """Deserialize bytes to a value."""
-        if isinstance(self.type_def, PrimitiveTypeDefinition):
-            return self._deserialize_primitive(data, self.type_def.primitive)
-        elif isinstance(self.type_def, ArrayTypeDefinition):
-            start_index, length = struct.unpack("<II", data)
-            return (start_index, length)
-        elif isinstance(self.type_def, EnumTypeDefinition):
-            return self._deserialize_enum_value(data, self.type_def)
-        elif isinstance(self.type_def, CompositeTypeDefinition):
-            return self._deserialize_composite(data, self.type_def)
-        else:
-            base = self.type_def.resolve_base_type()
-            if isinstance(base, PrimitiveTypeDefinition):
-                return self._deserialize_primitive(data, base.primitive)
-            if isinstance(base, EnumTypeDefinition):
-                return self._deserialize_enum_value(data, base)
-            raise TypeError(f"Cannot deserialize type: {self.type_def.name}")
-
-    def _deserialize_primitive(self, data: bytes, primitive: PrimitiveType) -> Any:
-        """Deserialize a primitive value."""
-        format_map = {
-            PrimitiveType.BIT: "<?",
-            PrimitiveType.CHARACTER: "<I",
-            PrimitiveType.UINT8: "<B",
-            PrimitiveType.INT8: "<b",
-            PrimitiveType.UINT16: "<H",
-            PrimitiveType.INT16: "<h",
-            PrimitiveType.UINT32: "<I",
-            PrimitiveType.INT32: "<i",
-            PrimitiveType.UINT64: "<Q",
-            PrimitiveType.INT64: "<q",
-            PrimitiveType.FLOAT16: "<e",
-            PrimitiveType.FLOAT32: "<f",
-            PrimitiveType.FLOAT64: "<d",
-        }
+    def set_checksums(self, enabled: bool) -> None:
+        """Start or stop keeping page checksums in the table's sidecar.
 
-        if primitive == PrimitiveType.CHARACTER:
-            code_point = struct.unpack("<I", data)[0]
-            return chr(code_point) if code_point else "\x00"
-        elif primitive in (PrimitiveType.UINT128, PrimitiveType.INT128):
-            low, high = struct.unpack("<QQ", data)
-            return (high << 64) | low
-        else:
-            return struct.unpack(format_map[primitive], data)[0]
-
-    def _deserialize_composite(
-        self, data: bytes, type_def: CompositeTypeDefinition
-    ) -> dict[str, Any]:
-        """Deserialize a composite record.
-
-        Returns a dict of field values/references:
-        - Primitive fields: actual deserialized value
-        - Array fields: (start_index, length) tuple
-        - Composite ref fields: uint32 index
-        - Null fields: None
+        Enabling loads the sidecar, building it from the file if it is
+        missing (or, read-only, leaves the table unchecked). Disabling a
+        writable table removes the sidecar. See typed_tables.checksum.
+        """
+        if enabled == self._checksums_enabled:
+            return
+        self._checksums_enabled = enabled
+        if enabled:
+            if self._mmap is not None:
+                self._open_checksums()
+        elif self._checksums is not None:
+            if not self.read_only:
+                self._checksums.remove()
+            self._checksums = None
+
+    def _open_checksums(self) -> None:
+        """Load the checksum sidecar of an open file, rebuilding it if needed."""
+        checksums = PageChecksums(self.file_path, self._record_size, read_only=self.read_only)
+        if not checksums.load():
+            if self.read_only:
+                self._checksums = None
+                return
+            checksums.rebuild(self._mmap, self.live_bytes)
+        self._checksums = checksums
+
+    # --- Tombstones ---
+
+    def _load_tombstones(self) -> bytearray:
+        """Return the tombstone bitmap, reading the sidecar or rebuilding it by scan.
+
+        A sidecar may cover fewer records than the table: records appended
+        since it was saved are live, because any later change to a record's
+        deleted state removes the sidecar until it is saved again.
         """
-        result: dict[str, Any] = {}
-        bitmap_size = type_def.null_bitmap_size
-        bitmap = data[:bitmap_size]
-        offset = bitmap_size
-
-        for i, field in enumerate(type_def.fields):
-            field_ref_size = field.type_def.reference_size
-            field_data = data[offset : offset + field_ref_size]
-
-            # Check null bitmap
-            is_null = bool(bitmap[i // 8] & (1 << (i % 8)))
-            if is_null:
-                result[field.name] = None
-                offset += field_ref_size
-                continue
-
-            field_base = field.type_def.resolve_base_type()
-            if isinstance(field_base, EnumTypeDefinition):
-                result[field.name] = self._deserialize_enum_value(field_data, field_base)
-            elif isinstance(field_base, FractionTypeDefinition):
-                result[field.name] = struct.unpack("<IIII", field_data)
-            elif isinstance(field_base, InterfaceTypeDefinition):
-                type_id, index = struct.unpack("<HI", field_data)
-                result[field.name] = (type_id, index)
-            elif isinstance(field_base, DictionaryTypeDefinition):
-                result[field.name] = struct.unpack("<II", field_data)
-            elif isinstance(field_base, ArrayTypeDefinition):
-                result[field.name] = struct.unpack("<II", field_data)
-            elif isinstance(field_base, CompositeTypeDefinition):
-                result[field.name] = struct.unpack("<I", field_data)[0]
-            elif isinstance(field_base, PrimitiveTypeDefinition):
-                result[field.name] = self._deserialize_primitive(field_data, field_base.primitive)
+        if self._tombstones is not None:
+            return self._tombstones
+        bitmap: bytearray | None = None
+        path = self.tombstone_path
+        if path.exists():
+            data = path.read_bytes()
+            header = self._TOMBSTONE_HEADER
+            if len(data) >= header.size:
+                covered, deleted = header.unpack_from(data, 0)
+                if covered <= self._count and len(data) == header.size + ((covered + 7) >> 3):
+                    bitmap = bytearray(data[header.size :])
+                    self._deleted_count = deleted
+        if bitmap is None:
+            bitmap = self._scan_tombstones()
+            # Save the rebuilt bitmap for the next session (writers only)
+            self._tombstones_dirty = not self.read_only
+        self._tombstones = bitmap
+        self._grow_tombstones()
+        return bitmap
+
+    def _scan_tombstones(self) -> bytearray:
+        """Build the tombstone bitmap by comparing every record with the marker."""
+        bitmap = bytearray((self._count + 7) >> 3)
+        marker = self.DELETED_MARKER * self._record_size
+        size = self._record_size
+        mm = self._mmap
+        deleted = 0
+        offset = 8
+        for index in range(self._count):
+            if mm[offset : offset + size] == marker:  # type: ignore
+                bitmap[index >> 3] |= 1 << (index & 7)
+                deleted += 1
+            offset += size
+        self._deleted_count = deleted
+        return bitmap
+
+    def _grow_tombstones(self) -> None:
+        """Extend a loaded bitmap to cover every record."""
+        bitmap = self._tombstones
+        if bitmap is not None:
+            needed = (self._count + 7) >> 3
+            if len(bitmap) < needed:
+                bitmap.extend(bytes(needed - len(bitmap)))
+
+    def _set_tombstone(self, index: int, deleted: bool) -> None:
+        """Set or clear a record's deleted bit, invalidating the sidecar on change."""
+        if self._tombstones is None and not deleted:
+            # Nothing loaded yet; a rebuild from the records will see the change
+            if self.tombstone_path.exists():
+                self._load_tombstones()
             else:
-                raise TypeError(f"Cannot deserialize field type: {field.type_def.name}")
-            offset += field_ref_size
-
-        return result
+                return
+        bitmap = self._load_tombstones()
+        mask = 1 << (index & 7)
+        if bool(bitmap[index >> 3] & mask) == deleted:
+            return
+        self._invalidate_tombstone_sidecar()
+        if deleted:
+            bitmap[index >> 3] |= mask
+            self._deleted_count += 1
+        else:
+            bitmap[index >> 3] &= ~mask
+            self._deleted_count -= 1
 
-    def _deserialize_enum_value(self, data: bytes, enum_def: EnumTypeDefinition) -> Any:
-        """Deserialize an enum value from bytes.
+    def _invalidate_tombstone_sidecar(self) -> None:
+        """Remove the sidecar before a record's deleted state changes on disk.
 
-        C-style: returns EnumValue directly.
-        Swift-style: returns (discriminant, variant_table_index) tuple.
+        Callers run this ahead of the record write, so a crash in between
+        leaves no sidecar and the next open rebuilds the bitmap by scan.
         """
-        disc_size = enum_def.discriminant_size
-        disc = self._unpack_discriminant(data, disc_size)
+        self._check_writable()
+        if not self._tombstones_dirty:
+            self.tombstone_path.unlink(missing_ok=True)
+            self._tombstones_dirty = True
+
+    def _save_tombstones(self) -> None:
+        """Write the tombstone sidecar if the bitmap changed."""
+        if self._tombstones is None or not self._tombstones_dirty:
+            return
+        covered = self._count
+        bits = self._tombstones[: (covered + 7) >> 3]
+        header = self._TOMBSTONE_HEADER.pack(covered, self._deleted_count)
+        self.tombstone_path.write_bytes(header + bits)
+        self._tombstones_dirty = False
+
+    # --- Free slots ---
+
+    def _load_free_list(self) -> list[int]:
+        """Return the free list, reading the sidecar or rebuilding it by scan."""
+        if self._free is not None:
+            return self._free
+        path = self.free_list_path
+        free: list[int] | None = None
+        if self._free_list_saved():
+            data = path.read_bytes()
+            if len(data) >= 8:
+                (n,) = struct.unpack_from("<Q", data, 0)
+                if len(data) == 8 + 8 * n:
+                    free = list(struct.unpack_from(f"<{n}Q", data, 8))
+        if free is None:
+            free = [i for i in range(self._count) if self.is_deleted(i)]
+            self._free_dirty = True
+        self._free = free
+        return free
+
+    def _pop_free_slot(self) -> int | None:
+        """Take a reusable slot from the free list, or None if there is none.
+
+        Entries are checked before use, so a stale sidecar (e.g. one not
+        saved before a crash, or a rolled-back delete) never overwrites a
+        live record.
+        """
+        free = self._load_free_list()
+        while free:
+            index = free.pop()
+            self._free_dirty = True
+            if index < self._count and self.is_deleted(index):
+                return index
+        return None
 
-        if enum_def.has_associated_values:
-            # Swift-style: read uint32 variant table index
-            index = struct.unpack("<I", data[disc_size:disc_size + REFERENCE_SIZE])[0]
-            return (disc, index)
-        else:
-            # C-style: return EnumValue directly
-            variant = enum_def.get_variant_by_discriminant(disc)
-            if variant is None:
-                return EnumValue(variant_name="?", discriminant=disc)
-            return EnumValue(variant_name=variant.name, discriminant=disc)
+    @property
+    def free_slot_count(self) -> int:
+        """Return the number of deleted slots available for reuse."""
+        return len(self._load_free_list()) if self._mmap is not None else 0
+
+    def _save_free_list(self) -> None:
+        """Write the free list sidecar if it changed."""
+        if self._free is None or not self._free_dirty:
+            return
+        free = self._free
+        self.free_list_path.write_bytes(struct.pack(f"<Q{len(free)}Q", len(free), *free))
+        self._free_dirty = False
+        self._free_saved = True
+
+    def _discard_free_list(self) -> None:
+        """Forget the free list and remove its sidecar."""
+        self._free = None
+        self._free_dirty = False
+        self._free_saved = False
+        self.free_list_path.unlink(missing_ok=True)
+
+    def _free_list_saved(self) -> bool:
+        """Return whether the free list sidecar exists, checking the disk once."""
+        if self._free_saved is None:
+            self._free_saved = self.free_list_path.exists()
+        return self._free_saved
+
+    def _serialize(self, value: Any) -> bytes:
+        """Serialize a value to bytes."""
+        return self._codec.pack(value)
+
+    def _deserialize(self, data: bytes) -> Any:
+        """Deserialize bytes to a value."""
+        return self._codec.unpack(data)
 
     def close(self) -> None:
         """Close the table file."""
-        if self._mmap is not None:
+        if self._mmap is not None and self.read_only:
+            self._unmap()
+        elif self._mmap is not None:
             self._mmap.flush()
-            self._mmap.close()
-            self._mmap = None
+            self._dirty = False
+            self._save_free_list()
+            self._save_tombstones()
+            self.save_checksums()
+            self._unmap()
+        if self._checksums is not None:
+            self._checksums.close()
         if self._file is not None:
             self._file.close()
             self._file = None
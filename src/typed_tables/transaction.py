@@ -0,0 +1,56 @@
+"""In-memory undo log for transactions.
+
+While a transaction is open, every byte range a Table writes is preceded by
+a copy of the bytes it overwrites. Rolling back restores those images newest
+first and re-reads each touched table's header count, so records appended
+inside the transaction disappear and updated or deleted records come back.
+
+Savepoints are positions in the log; rolling back to one undoes only the
+writes made after it. Nested scope blocks use them to discard their own
+work without abandoning the enclosing transaction.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typed_tables.table import Table
+
+
+class UndoLog:
+    """Before-images of every table write made since a transaction began."""
+
+    def __init__(self) -> None:
+        self._entries: list[tuple[Table, int, bytes]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def log_write(self, table: Table, offset: int, data: bytes) -> None:
+        """Record the bytes a pending write to ``table`` will overwrite.
+
+        Only the part of the range that overlaps live records or the header
+        needs saving; space past the header count is unreachable once the
+        count is restored.
+        """
+        live_end = table.live_bytes
+        if offset < live_end:
+            before = table.read_bytes(offset, min(len(data), live_end - offset))
+            self._entries.append((table, offset, before))
+
+    def savepoint(self) -> int:
+        """Return a marker that rollback() can return to."""
+        return len(self._entries)
+
+    def rollback(self, savepoint: int = 0) -> int:
+        """Undo every write made after ``savepoint``. Returns the number undone."""
+        undone = self._entries[savepoint:]
+        del self._entries[savepoint:]
+        touched: dict[int, Table] = {}
+        for table, offset, before in reversed(undone):
+            table.restore_bytes(offset, before)
+            touched[id(table)] = table
+        for table in touched.values():
+            table.reload_header()
+        return len(undone)
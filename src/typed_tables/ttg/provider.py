@@ -431,6 +431,7 @@ class DatabaseProvider:
         return CompositeTypeDefinition(
             name=f"_{enum_def.name}_{variant.name}",
             fields=list(variant.fields),
+            wide_references=enum_def.wide_references,
         )
 
     def _follow_all_variants(
@@ -81,11 +81,19 @@ def type_range(prim: PrimitiveType) -> tuple[int | float, int | float]:
 # Size of a reference (index) to an entry in a table
 REFERENCE_SIZE = 4  # uint32 index
 
+# Size of a reference in a database with wide references (see
+# TypeRegistry.set_wide_references): uint64 index
+WIDE_REFERENCE_SIZE = 8
+
 # Size of a polymorphic (interface) reference: uint16 type_id + uint32 index
 INTERFACE_REFERENCE_SIZE = 6
 
-# Sentinel value: field points to no entry in the referenced table
-NULL_REF = 0xFFFFFFFF
+# Sentinel value: field points to no entry in the referenced table. It is
+# the largest uint64, which no table index reaches even with wide references.
+NULL_REF = 0xFFFFFFFFFFFFFFFF
+
+# How NULL_REF is stored in a uint32 index (see codec); never a valid index
+NULL_REF_32 = 0xFFFFFFFF
 
 # Sentinel for null array references: (start=NULL_REF, length=0)
 NULL_ARRAY_REF = (NULL_REF, 0)
@@ -97,21 +105,31 @@ class TypeDefinition:
 
     name: str
 
+    # Set on every type of a registry in wide-reference mode: table indexes
+    # (references, array start/length pairs) are stored as uint64. Types
+    # built outside the registry copy it from the types they derive from.
+    wide_references: bool = field(default=False, kw_only=True, repr=False, compare=False)
+
     @property
     def size_bytes(self) -> int:
         """Return the size in bytes for storing a value of this type."""
         raise NotImplementedError
 
+    @property
+    def index_size(self) -> int:
+        """Return the size of one table index: 4 bytes, or 8 with wide references."""
+        return WIDE_REFERENCE_SIZE if self.wide_references else REFERENCE_SIZE
+
     @property
     def reference_size(self) -> int:
         """Return the size in bytes for storing a reference to this type.
 
         When a composite type has a field of this type, it stores a reference
         (index) to the value in the field type's table, not the value itself.
-        For arrays, this is (start_index, length) = 8 bytes.
-        For all other types, this is a uint32 index = 4 bytes.
+        For arrays, this is (start_index, length) = 2 indexes.
+        For all other types, this is one index (see index_size).
         """
-        return REFERENCE_SIZE
+        return self.index_size
 
     @property
     def is_array(self) -> bool:
@@ -222,18 +240,15 @@ class ArrayTypeDefinition(TypeDefinition):
 
     element_type: TypeDefinition
 
-    # Array header is fixed: uint32 start_index + uint32 length = 8 bytes
-    HEADER_SIZE: int = 8
-
     @property
     def size_bytes(self) -> int:
         """Return the size of the array header (not the contents)."""
-        return self.HEADER_SIZE
+        return 2 * self.index_size
 
     @property
     def reference_size(self) -> int:
-        """Arrays store (start_index, length) inline = 8 bytes."""
-        return self.HEADER_SIZE
+        """Arrays store (start_index, length) inline: 8 bytes, 16 with wide references."""
+        return 2 * self.index_size
 
     @property
     def is_array(self) -> bool:
@@ -247,6 +262,17 @@ class StringTypeDefinition(ArrayTypeDefinition):
     pass
 
 
+@dataclass
+class InternedStringTypeDefinition(StringTypeDefinition):
+    """Built-in ``interned string`` type — a string stored once per distinct value.
+
+    Fields of this type share one entry in their heap per distinct value,
+    so equal values always have equal (start_index, length) references.
+    """
+
+    pass
+
+
 def is_string_type(type_def: TypeDefinition) -> bool:
     """Check if a type resolves to the built-in string type."""
     return isinstance(type_def.resolve_base_type(), StringTypeDefinition)
@@ -290,17 +316,18 @@ class BigUInt(int):
 
 @dataclass
 class FractionTypeDefinition(TypeDefinition):
-    """Built-in fraction type — exact rational, stored as numerator + denominator bytes."""
+    """Built-in fraction type — exact rational, stored as numerator + denominator bytes.
 
-    INLINE_SIZE: int = 16  # 4x uint32: num_start, num_len, den_start, den_len
+    A field holds (num_start, num_len, den_start, den_len): four indexes.
+    """
 
     @property
     def size_bytes(self) -> int:
-        return self.INLINE_SIZE
+        return 4 * self.index_size
 
     @property
     def reference_size(self) -> int:
-        return self.INLINE_SIZE
+        return 4 * self.index_size
 
 
 def is_fraction_type(type_def: TypeDefinition) -> bool:
@@ -328,16 +355,14 @@ class DictionaryTypeDefinition(TypeDefinition):
     value_type: TypeDefinition
     entry_type: CompositeTypeDefinition  # synthetic, e.g. Dict_string_int32
 
-    HEADER_SIZE: int = 8  # same as ArrayTypeDefinition
-
     @property
     def size_bytes(self) -> int:
-        return self.HEADER_SIZE
+        return 2 * self.index_size
 
     @property
     def reference_size(self) -> int:
-        """Dicts store (start_index, length) inline = 8 bytes."""
-        return self.HEADER_SIZE
+        """Dicts store (start_index, length) inline, like arrays."""
+        return 2 * self.index_size
 
     @property
     def is_array(self) -> bool:
@@ -398,6 +423,7 @@ class CompositeTypeDefinition(TypeDefinition):
     Primitive fields are stored inline (actual value bytes).
     Array fields store (start_index, length) = 8 bytes.
     Composite ref fields store a uint32 index = 4 bytes.
+    Wide references store uint64 indexes, doubling both.
     """
 
     fields: list[FieldDefinition] = field(default_factory=list)
@@ -466,7 +492,7 @@ class InterfaceTypeDefinition(TypeDefinition):
     @property
     def reference_size(self) -> int:
         """Interface refs use tagged references: uint16 type_id + uint32 index = 6 bytes."""
-        return INTERFACE_REFERENCE_SIZE
+        return INTERFACE_REFERENCE_SIZE - REFERENCE_SIZE + self.index_size
 
     @property
     def is_interface(self) -> bool:
@@ -533,7 +559,7 @@ class EnumTypeDefinition(TypeDefinition):
     @property
     def size_bytes(self) -> int:
         if self.has_associated_values:
-            return self.discriminant_size + REFERENCE_SIZE  # disc + uint32 variant table index
+            return self.discriminant_size + self.index_size  # disc + uint32 variant table index
         return self.discriminant_size  # C-style: discriminant only
 
     @property
@@ -602,23 +628,49 @@ class TypeRegistry:
         self._type_ids: dict[str, int] = {}
         self._next_type_id: int = 1  # 0 reserved for "no type"
         self._interface_descendant_cache: dict[str, set[str]] | None = None
+        self._wide_references = False
         self._register_primitives()
 
     def _register_primitives(self) -> None:
         """Register all primitive types."""
         for pt in PrimitiveType:
-            self._types[pt.value] = PrimitiveTypeDefinition(name=pt.value, primitive=pt)
+            self._store(PrimitiveTypeDefinition(name=pt.value, primitive=pt))
         # Register built-in string type (stored as character[], displayed as string)
         char_prim = self._types["character"]
-        self._types["string"] = StringTypeDefinition(name="string", element_type=char_prim)
+        self._store(StringTypeDefinition(name="string", element_type=char_prim))
         # Register built-in boolean type (stored as bit, displayed as true/false)
-        self._types["boolean"] = BooleanTypeDefinition(name="boolean", primitive=PrimitiveType.BIT)
+        self._store(BooleanTypeDefinition(name="boolean", primitive=PrimitiveType.BIT))
         # Register built-in bigint/biguint types (stored as uint8[], arbitrary precision)
         uint8_prim = self._types["uint8"]
-        self._types["bigint"] = BigIntTypeDefinition(name="bigint", element_type=uint8_prim)
-        self._types["biguint"] = BigUIntTypeDefinition(name="biguint", element_type=uint8_prim)
+        self._store(BigIntTypeDefinition(name="bigint", element_type=uint8_prim))
+        self._store(BigUIntTypeDefinition(name="biguint", element_type=uint8_prim))
         # Register built-in fraction type (exact rational, stored as numerator + denominator bytes)
-        self._types["fraction"] = FractionTypeDefinition(name="fraction")
+        self._store(FractionTypeDefinition(name="fraction"))
+
+    def _store(self, type_def: TypeDefinition) -> None:
+        """Add a type definition under its name, in the registry's reference mode."""
+        if self._wide_references:
+            type_def.wide_references = True
+        self._types[type_def.name] = type_def
+
+    @property
+    def wide_references(self) -> bool:
+        """Return whether references and array offsets are stored as uint64."""
+        return self._wide_references
+
+    def set_wide_references(self, enabled: bool) -> None:
+        """Switch every type of the registry to 64-bit (or back to 32-bit) indexes.
+
+        Wide references lift the 4-billion-record limit of uint32 table
+        indexes: composite and variant references, array, set, dict, bigint
+        and fraction (start_index, length) pairs and interface references
+        all store uint64 indexes, and record sizes grow to match. The mode
+        changes the layout of every table, so a database can only switch
+        while it holds no table files (see StorageManager.set_wide_references).
+        """
+        self._wide_references = enabled
+        for type_def in self._types.values():
+            type_def.wide_references = enabled
 
     def _invalidate_caches(self) -> None:
         """Invalidate lazily-computed caches (e.g. after type registration)."""
@@ -628,7 +680,7 @@ class TypeRegistry:
         """Register a type definition."""
         if type_def.name in self._types:
             raise ValueError(f"Type '{type_def.name}' is already defined")
-        self._types[type_def.name] = type_def
+        self._store(type_def)
         self._invalidate_caches()
 
     def get(self, name: str) -> TypeDefinition | None:
@@ -651,7 +703,21 @@ class TypeRegistry:
                 raise TypeError(f"Type '{name}' exists but is not an overflow type")
             return existing
         td = OverflowTypeDefinition(name=name, base_type=base_type, overflow=overflow)
-        self._types[name] = td
+        self._store(td)
+        return td
+
+    def get_or_create_interned_type(self, base_type: TypeDefinition) -> InternedStringTypeDefinition:
+        """Get or create the interned variant of a string type."""
+        if not isinstance(base_type.resolve_base_type(), StringTypeDefinition):
+            raise TypeError(f"Only strings can be interned, not '{base_type.name}'")
+        name = "interned string"
+        existing = self._types.get(name)
+        if existing is not None:
+            if not isinstance(existing, InternedStringTypeDefinition):
+                raise TypeError(f"Type '{name}' exists but is not an interned string type")
+            return existing
+        td = InternedStringTypeDefinition(name=name, element_type=self.get_or_raise("character"))
+        self._store(td)
         return td
 
     def get_array_type(self, element_type_name: str) -> ArrayTypeDefinition:
@@ -665,7 +731,7 @@ class TypeRegistry:
 
         element_type = self.get_or_raise(element_type_name)
         array_type = ArrayTypeDefinition(name=array_name, element_type=element_type)
-        self._types[array_name] = array_type
+        self._store(array_type)
         self._invalidate_caches()
         return array_type
 
@@ -679,7 +745,7 @@ class TypeRegistry:
             return existing
 
         set_type = SetTypeDefinition(name=set_name, element_type=element_type)
-        self._types[set_name] = set_type
+        self._store(set_type)
         self._invalidate_caches()
         return set_type
 
@@ -711,7 +777,7 @@ class TypeRegistry:
                     FieldDefinition(name="value", type_def=value_type),
                 ],
             )
-            self._types[entry_name] = entry_type
+            self._store(entry_type)
 
         dict_type = DictionaryTypeDefinition(
             name=dict_name,
@@ -719,7 +785,7 @@ class TypeRegistry:
             value_type=value_type,
             entry_type=entry_type,
         )
-        self._types[dict_name] = dict_type
+        self._store(dict_type)
         self._invalidate_caches()
         return dict_type
 
@@ -735,7 +801,7 @@ class TypeRegistry:
                 return existing
             raise ValueError(f"Type '{name}' is already defined")
         stub = EnumTypeDefinition(name=name, variants=[])
-        self._types[name] = stub
+        self._store(stub)
         self._invalidate_caches()
         return stub
 
@@ -756,7 +822,7 @@ class TypeRegistry:
                 return existing
             raise ValueError(f"Type '{name}' is already defined")
         stub = CompositeTypeDefinition(name=name, fields=[])
-        self._types[name] = stub
+        self._store(stub)
         self._invalidate_caches()
         return stub
 
@@ -777,7 +843,7 @@ class TypeRegistry:
                 return existing
             raise ValueError(f"Type '{name}' is already defined")
         stub = InterfaceTypeDefinition(name=name, fields=[])
-        self._types[name] = stub
+        self._store(stub)
         self._invalidate_caches()
         return stub
 
@@ -0,0 +1,267 @@
+"""Write-ahead log for table files.
+
+Every byte range a Table writes is appended to a single log file in the
+database directory before it reaches the memory map. Each entry carries the
+range's new contents (redo image) and, for ranges that overwrite live data,
+its previous contents (undo image). A COMMIT marker closes each unit of work
+(normally one top-level statement).
+
+On open, recovery re-applies the redo images of every committed unit and
+rolls back the trailing uncommitted unit with its undo images, so header
+counts, records and array ranges always reflect a statement boundary.
+
+The kernel may write a changed page of a mapping back to its file at any
+time, so an undo image must reach the disk before the bytes it restores
+are overwritten. The log is therefore fsynced before a unit first
+overwrites a byte range that was live when the unit began. Later writes to
+a range already covered, and writes past the live data (appended records,
+invisible until the header count changes), go without an fsync; the
+header count itself is covered by the unit's first insert into the table.
+
+Log layout::
+
+    magic (8 bytes)
+    record*  where record = kind:u8  length:u32  crc32:u32  payload[length]
+
+    WRITE payload  = path_len:u16  path  offset:u64  before_len:u32  before  after
+    COMMIT payload = (empty)
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from typed_tables.checksum import rebuild_checksum_file
+from typed_tables.table import Table
+
+
+WAL_FILE = "_wal.log"
+WAL_MAGIC = b"TTWAL001"
+
+_RECORD_HEADER = struct.Struct("<BII")  # kind, payload length, crc32
+_WRITE_HEADER = struct.Struct("<QI")  # offset, before_len
+
+KIND_WRITE = 1
+KIND_COMMIT = 2
+
+
+@dataclass
+class WalWrite:
+    """A logged byte-range write to one table file."""
+
+    path: str  # relative to the database directory
+    offset: int
+    before: bytes
+    after: bytes
+
+
+@dataclass
+class RecoveryReport:
+    """Summary of a WAL replay."""
+
+    committed_units: int = 0
+    redone_writes: int = 0
+    undone_writes: int = 0
+
+
+def _encode_write(path: str, offset: int, before: bytes, after: bytes) -> bytes:
+    path_bytes = path.encode("utf-8")
+    return b"".join([
+        struct.pack("<H", len(path_bytes)),
+        path_bytes,
+        _WRITE_HEADER.pack(offset, len(before)),
+        before,
+        after,
+    ])
+
+
+def _decode_write(payload: bytes) -> WalWrite:
+    (path_len,) = struct.unpack_from("<H", payload, 0)
+    pos = 2
+    path = payload[pos : pos + path_len].decode("utf-8")
+    pos += path_len
+    offset, before_len = _WRITE_HEADER.unpack_from(payload, pos)
+    pos += _WRITE_HEADER.size
+    before = payload[pos : pos + before_len]
+    after = payload[pos + before_len :]
+    return WalWrite(path=path, offset=offset, before=before, after=after)
+
+
+def _iter_records(data: bytes) -> Iterator[tuple[int, bytes]]:
+    """Yield (kind, payload) for each intact record, stopping at a torn tail."""
+    if not data.startswith(WAL_MAGIC):
+        return
+    pos = len(WAL_MAGIC)
+    while pos + _RECORD_HEADER.size <= len(data):
+        kind, length, crc = _RECORD_HEADER.unpack_from(data, pos)
+        start = pos + _RECORD_HEADER.size
+        payload = data[start : start + length]
+        if len(payload) != length or zlib.crc32(payload) != crc:
+            return
+        yield kind, payload
+        pos = start + length
+
+
+def _apply(data_dir: Path, path: str, offset: int, data: bytes) -> None:
+    """Write ``data`` at ``offset`` in a table file, extending it if needed."""
+    if not data:
+        return
+    file_path = data_dir / path
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    mode = "r+b" if file_path.exists() else "w+b"
+    with open(file_path, mode) as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() < offset + len(data):
+            f.truncate(offset + len(data))
+        f.seek(offset)
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def recover(data_dir: Path) -> RecoveryReport | None:
+    """Replay the WAL in ``data_dir`` if one exists, then remove it.
+
+    Returns a report of the work done, or None if there was no log.
+    """
+    wal_path = data_dir / WAL_FILE
+    if not wal_path.exists():
+        return None
+
+    report = RecoveryReport()
+    pending: list[WalWrite] = []
+    touched: set[str] = set()
+    for kind, payload in _iter_records(wal_path.read_bytes()):
+        if kind == KIND_WRITE:
+            write = _decode_write(payload)
+            pending.append(write)
+            touched.add(write.path)
+        elif kind == KIND_COMMIT:
+            for w in pending:
+                _apply(data_dir, w.path, w.offset, w.after)
+            report.committed_units += 1
+            report.redone_writes += len(pending)
+            pending = []
+
+    # Roll back the unit that never committed, newest write first
+    for w in reversed(pending):
+        if w.before:
+            _apply(data_dir, w.path, w.offset, w.before)
+            report.undone_writes += 1
+
+    # Tombstone bitmaps may no longer match the replayed records; they are
+    # rebuilt from the table files on next use. Page checksums are
+    # recomputed now, as the replayed bytes are known to be good.
+    for path in touched:
+        (data_dir / path).with_suffix(Table.TOMBSTONE_SUFFIX).unlink(missing_ok=True)
+        rebuild_checksum_file(data_dir / path)
+
+    wal_path.unlink()
+    return report
+
+
+class WriteAheadLog:
+    """Append-only redo/undo log shared by all tables of a database."""
+
+    # Checkpoint (flush tables and truncate the log) once it grows past this size
+    CHECKPOINT_BYTES = 16 * 1024 * 1024
+
+    def __init__(self, data_dir: Path) -> None:
+        self.data_dir = data_dir
+        self.path = data_dir / WAL_FILE
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        os.write(self._fd, WAL_MAGIC)
+        self._size = len(WAL_MAGIC)
+        self._uncommitted = 0  # writes logged since the last commit
+        self._synced = True  # every appended record has been fsynced
+        # Per file in the current unit: live bytes when the unit first wrote
+        # to it, and offset → length of the ranges with an undo image on disk
+        self._unit_live: dict[str, int] = {}
+        self._covered: dict[str, dict[int, int]] = {}
+
+    @property
+    def size(self) -> int:
+        """Return the current log size in bytes."""
+        return self._size
+
+    @property
+    def has_uncommitted(self) -> bool:
+        """Return whether writes have been logged since the last commit."""
+        return self._uncommitted > 0
+
+    def _append(self, kind: int, payload: bytes) -> None:
+        record = _RECORD_HEADER.pack(kind, len(payload), zlib.crc32(payload)) + payload
+        os.write(self._fd, record)
+        self._size += len(record)
+        self._synced = False
+
+    def _sync(self) -> None:
+        if not self._synced:
+            os.fsync(self._fd)
+            self._synced = True
+
+    def _end_unit(self) -> None:
+        self._uncommitted = 0
+        self._unit_live.clear()
+        self._covered.clear()
+
+    def log_write(self, table: Table, offset: int, data: bytes) -> None:
+        """Log a pending write to ``table`` before it is applied to the mapping.
+
+        The undo image covers only the part of the range that overlaps live
+        records or the header; appended space past the header count is
+        invisible until the count itself is rewritten. If the write is the
+        unit's first to bytes that were live when the unit began, the log
+        is fsynced before this returns.
+        """
+        live_end = table.live_bytes
+        if offset < live_end:
+            before = table.read_bytes(offset, min(len(data), live_end - offset))
+        else:
+            before = b""
+        rel_path = table.file_path.relative_to(self.data_dir).as_posix()
+        self._append(KIND_WRITE, _encode_write(rel_path, offset, before, bytes(data)))
+        self._uncommitted += 1
+        unit_live = self._unit_live.setdefault(rel_path, live_end)
+        needed = min(len(before), unit_live - offset)
+        if needed > 0:
+            covered = self._covered.setdefault(rel_path, {})
+            if covered.get(offset, 0) < needed:
+                self._sync()
+                covered[offset] = needed
+
+    def commit(self, fsync: bool = True) -> bool:
+        """Close the current unit of work. Returns False if there was nothing to commit."""
+        if not self._uncommitted:
+            return False
+        self._append(KIND_COMMIT, b"")
+        self._end_unit()
+        if fsync:
+            self._sync()
+        return True
+
+    def should_checkpoint(self) -> bool:
+        """Return whether the log has grown enough to be worth truncating."""
+        return self._size >= self.CHECKPOINT_BYTES
+
+    def truncate(self) -> None:
+        """Discard all committed entries. Tables must already be flushed."""
+        os.ftruncate(self._fd, len(WAL_MAGIC))
+        os.lseek(self._fd, len(WAL_MAGIC), os.SEEK_SET)
+        os.fsync(self._fd)
+        self._size = len(WAL_MAGIC)
+        self._synced = True
+        self._end_unit()
+
+    def close(self, remove: bool = True) -> None:
+        """Close the log, deleting the file if ``remove`` is set."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        if remove and self.path.exists():
+            self.path.unlink()
@@ -0,0 +1,16 @@
+"""Shared fixtures for the test suite."""
+
+import pytest
+
+from typed_tables.dump import load_registry_from_metadata
+from typed_tables.query_executor import QueryExecutor
+from typed_tables.storage import StorageManager
+
+
+@pytest.fixture
+def reopen():
+    """Return a function that opens a database directory again as (storage, executor)."""
+    def _reopen(path, **kwargs):
+        storage = StorageManager(path, load_registry_from_metadata(path), **kwargs)
+        return storage, QueryExecutor(storage, storage.registry)
+    return _reopen
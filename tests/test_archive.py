@@ -358,8 +358,9 @@ class TestArchiveExecution:
         assert ttar.exists()
         assert ttar.stat().st_size > 5  # Not the dummy data
 
-    def test_archive_no_filename_derives_from_db(self, executor, db_dir):
+    def test_archive_no_filename_derives_from_db(self, executor, db_dir, tmp_path, monkeypatch):
         """Archive without filename uses <database_name>.ttar."""
+        monkeypatch.chdir(tmp_path)
         _run(executor, """
             type Item { value: uint8 }
             create Item(value=1)
@@ -0,0 +1,208 @@
+"""Tests for array block allocation: slack after moved arrays and reuse of released blocks."""
+
+import pytest
+
+from typed_tables.dump import load_registry_from_metadata
+from typed_tables.parsing.query_parser import QueryParser
+from typed_tables.query_executor import QueryExecutor
+from typed_tables.storage import StorageManager
+from typed_tables.types import TypeRegistry
+
+
+def _run(executor, text):
+    """Parse and execute a TTQ program, returning the last result."""
+    parser = QueryParser()
+    result = None
+    for stmt in parser.parse_program(text):
+        result = executor.execute(stmt)
+    return result
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Create a database of two P records, each with a one-element array."""
+    registry = TypeRegistry()
+    storage = StorageManager(tmp_path / "db", registry)
+    executor = QueryExecutor(storage, registry)
+    _run(executor, "type P { x: int32, tags: int32[], name: string, label: interned string }")
+    _run(executor, "create P(x=1, tags=[0], name=\"a\"); create P(x=2, tags=[0], name=\"b\")")
+    yield storage, executor
+    storage.close()
+
+
+def ref(storage, x, field):
+    """Return the stored (start, length) of a field of the P with the given x."""
+    return storage.get_table("P").get(x - 1)[field]
+
+
+def rows(executor, fields):
+    """Return the given fields of every P."""
+    return _run(executor, f"from P select {fields}").rows
+
+
+class TestArrayBlocks:
+    def test_interleaved_appends_fill_slack(self, db):
+        """Arrays growing side by side move rarely, thanks to slack."""
+        storage, executor = db
+        for i in range(1, 200):
+            _run(executor, f"update P set tags.append({i}) where x=1")
+            _run(executor, f"update P set tags.append({i}) where x=2")
+        expected = list(range(200))
+        assert rows(executor, "tags") == [{"tags": expected}, {"tags": expected}]
+        # Each array moves O(log n) times; without slack every append copies it
+        assert storage.get_array_table("int32[]").count < 4 * 2 * 200
+
+    def test_moved_array_reserves_power_of_two(self, db):
+        """A moved array gets a power-of-two block and grows into it in place."""
+        storage, executor = db
+        _run(executor, "update P set tags.append(1, 2, 3, 4) where x=1")
+        start, length = ref(storage, 1, "tags")
+        assert (start, length) == (2, 5)
+        assert storage.get_array_table("int32[]").count == 2 + 8
+        _run(executor, "update P set tags.append(5, 6, 7) where x=1")
+        assert ref(storage, 1, "tags") == (2, 8)
+        assert storage.get_array_table("int32[]").count == 2 + 8
+
+    def test_released_block_reused(self, db):
+        """A block released by a move is reused by a new array that fits."""
+        storage, executor = db
+        _run(executor, "update P set tags.prepend(-3, -2, -1) where x=1")
+        _run(executor, "create P(x=3, tags=[7])")
+        assert ref(storage, 3, "tags") == (0, 1)
+        assert rows(executor, "tags") == [{"tags": [-3, -2, -1, 0]}, {"tags": [0]}, {"tags": [7]}]
+
+    def test_delete_from_end_leaves_slack(self, db):
+        """Deleting from the end leaves room to append in place."""
+        storage, executor = db
+        _run(executor, "update P set tags.append(1, 2, 3) where x=1")
+        start, _ = ref(storage, 1, "tags")
+        count = storage.get_array_table("int32[]").count
+        _run(executor, "update P set tags.delete(3) where x=1")
+        _run(executor, "update P set tags.delete(2) where x=1")
+        _run(executor, "update P set tags.append(9, 9) where x=1")
+        assert ref(storage, 1, "tags") == (start, 4)
+        assert storage.get_array_table("int32[]").count == count
+
+    def test_failed_update_keeps_old_block(self, db):
+        """A failed update leaves the array's block in use."""
+        storage, executor = db
+        result = _run(executor, "update P set tags.prepend(5), nosuch=1 where x=1")
+        assert "Unknown field" in result.message
+        _run(executor, "create P(x=3, tags=[7])")
+        assert rows(executor, "tags")[0] == {"tags": [0]}
+        assert ref(storage, 3, "tags") != (0, 1)
+
+    def test_rollback_forgets_blocks(self, db):
+        """Blocks released in a rolled-back transaction are not reused."""
+        storage, executor = db
+        _run(executor, "begin")
+        _run(executor, "update P set tags.prepend(5) where x=1")
+        _run(executor, "rollback")
+        _run(executor, "create P(x=3, tags=[7, 8])")
+        assert rows(executor, "tags") == [{"tags": [0]}, {"tags": [0]}, {"tags": [7, 8]}]
+
+    def test_strings(self, db):
+        """Strings get slack like other arrays."""
+        storage, executor = db
+        for _ in range(100):
+            _run(executor, 'update P set name.append("é") where x=1')
+            _run(executor, 'update P set name.prepend("ü") where x=2')
+        assert rows(executor, "name") == [{"name": "a" + "é" * 100}, {"name": "ü" * 100 + "b"}]
+        assert storage.get_array_table("string").count < 4 * 2 * 200
+
+    def test_interned_strings_never_move(self, db):
+        """Changing an interned value never moves the shared value."""
+        storage, executor = db
+        _run(executor, 'update P set label="shared" where x < 3')
+        _run(executor, 'update P set label.prepend("un") where x=1')
+        _run(executor, 'create P(x=3, label="shared")')
+        labels = [row["label"] for row in rows(executor, "label")]
+        assert labels == ["unshared", "shared", "shared"]
+        assert ref(storage, 2, "label") == ref(storage, 3, "label")
+
+
+def dead(storage, type_name="int32[]"):
+    """Return the dead element count of an array table."""
+    return storage.get_array_table(type_name).dead_count
+
+
+class TestDeadElements:
+    def test_moves_and_slack_counted(self, db):
+        """A move counts the old elements and the new block's slack as dead."""
+        storage, executor = db
+        assert dead(storage) == 0
+        _run(executor, "update P set tags.append(1) where x=1")
+        # The old element plus the unused half of the new block
+        assert ref(storage, 1, "tags") == (2, 2)
+        assert dead(storage) == 1 + 2
+
+    def test_replaced_and_deleted_records_counted(self, db):
+        """Replaced arrays and deleted records' arrays are dead."""
+        storage, executor = db
+        _run(executor, "update P set tags=[1, 2, 3] where x=1")
+        assert dead(storage) == 1
+        _run(executor, "delete P where x=1")
+        assert dead(storage) == 1 + 3
+        assert dead(storage, "string") == 1
+
+    def test_reuse_reduces_count(self, db):
+        """Reusing a released block makes its elements live again."""
+        storage, executor = db
+        _run(executor, "update P set tags=[1, 2, 3] where x=1")
+        _run(executor, "create P(x=3, tags=[7])")
+        assert ref(storage, 3, "tags") == (0, 1)
+        assert dead(storage) == 0
+
+    def test_failed_update_counts_nothing(self, db):
+        """A failed update leaves only what it wrote dead."""
+        storage, executor = db
+        _run(executor, "update P set tags.prepend(5), nosuch=1 where x=1")
+        assert rows(executor, "tags")[0] == {"tags": [0]}
+        # Anything written for the update is dead; the old block stays live
+        assert dead(storage) == storage.get_array_table("int32[]").count - 2
+
+    def test_rollback_restores_count(self, db):
+        """Rollback restores the dead count."""
+        storage, executor = db
+        _run(executor, "begin")
+        _run(executor, "update P set tags=[1, 2, 3] where x=1")
+        assert dead(storage) == 1
+        _run(executor, "rollback")
+        assert dead(storage) == 0
+
+    def test_persisted_across_reopen(self, tmp_path):
+        """Dead counts and released blocks are saved with the table."""
+        data_dir = tmp_path / "db"
+        storage = StorageManager(data_dir, TypeRegistry())
+        executor = QueryExecutor(storage, storage.registry)
+        _run(executor, "type P { x: int32, tags: int32[] }")
+        _run(executor, "create P(x=1, tags=[1, 2]); update P set tags=[3] where x=1")
+        storage.close()
+        assert (data_dir / "int32[].blocks").exists()
+
+        storage = StorageManager(data_dir, load_registry_from_metadata(data_dir))
+        assert dead(storage) == 2
+        _run(QueryExecutor(storage, storage.registry), "create P(x=2, tags=[4, 5])")
+        assert storage.get_table("P").get(1)["tags"] == (0, 2)
+        assert dead(storage) == 0
+        storage.close()
+
+    def test_unknown_count_recounted(self, tmp_path):
+        """count_dead_elements recounts tables whose blocks file is missing."""
+        data_dir = tmp_path / "db"
+        storage = StorageManager(data_dir, TypeRegistry())
+        executor = QueryExecutor(storage, storage.registry)
+        _run(executor, "type P { x: int32, tags: int32[], names: string[] }")
+        _run(executor, 'create P(x=1, tags=[1, 2], names=["ab", "c"]); create P(x=2, tags=[3])')
+        _run(executor, "update P set tags.append(4) where x=1; delete P where x=2")
+        storage.close()
+        (data_dir / "int32[].blocks").unlink()
+        (data_dir / "string.blocks").unlink()
+
+        storage = StorageManager(data_dir, load_registry_from_metadata(data_dir))
+        executor = QueryExecutor(storage, storage.registry)
+        assert dead(storage) is None
+        executor.count_dead_elements()
+        assert dead(storage) == storage.get_array_table("int32[]").count - 3
+        assert dead(storage, "string") == 0
+        storage.close()
@@ -545,6 +545,140 @@ class TestByteEncoding:
         assert int(result.rows[0]["big"]) == val
 
 
+# --- Inline storage ---
+
+class TestInlineStorage:
+    def test_small_values_stay_in_record(self, executor):
+        """Values that fit in 63 bits are stored in the record, not the heap."""
+        run(executor, 'type Data { big: bigint, pos: biguint }')
+        for val in [0, 1, -1, 2**62 - 1, -(2**62)]:
+            run(executor, f'create Data(big={val}, pos={abs(val)})')
+        run(executor, f'create Data(big=0, pos={2**63 - 1})')
+        assert executor.storage.get_array_table("bigint").count == 0
+        assert executor.storage.get_array_table("biguint").count == 0
+        result = run(executor, 'from Data select big, pos')
+        assert [r["big"] for r in result.rows] == [0, 1, -1, 2**62 - 1, -(2**62), 0]
+        assert result.rows[-1]["pos"] == 2**63 - 1
+        assert isinstance(result.rows[2]["big"], BigInt)
+
+    def test_large_values_use_heap(self, executor):
+        """Values too wide to store inline go to the heap."""
+        run(executor, 'type Data { big: bigint, pos: biguint }')
+        run(executor, f'create Data(big={2**62}, pos={2**63})')
+        run(executor, f'create Data(big={-(2**62) - 1}, pos=5)')
+        assert executor.storage.get_array_table("bigint").count == 16
+        assert executor.storage.get_array_table("biguint").count == 8
+        result = run(executor, 'from Data select big, pos')
+        assert result.rows == [
+            {"big": 2**62, "pos": 2**63},
+            {"big": -(2**62) - 1, "pos": 5},
+        ]
+
+    def test_update_between_inline_and_heap(self, executor):
+        """Updates move a value between the record and the heap."""
+        run(executor, 'type Data { big: bigint }')
+        run(executor, f'create Data(big={10**30})')
+        run(executor, 'update Data set big=7')
+        assert run(executor, 'from Data select big').rows == [{"big": 7}]
+        run(executor, f'update Data set big={-(10**30)}')
+        assert run(executor, 'from Data select big').rows == [{"big": -(10**30)}]
+        run(executor, 'update Data set big=-7')
+        assert run(executor, 'from Data select big where big < 0').rows == [{"big": -7}]
+
+    def test_vacuum_keeps_inline_values(self, executor):
+        """Inline values are never taken for heap offsets, even when their low bits match one."""
+        run(executor, 'type Data { x: uint8, big: bigint }')
+        run(executor, f'create Data(x=0, big={10**30})')
+        run(executor, f'create Data(x=1, big={10**40})')
+        run(executor, 'create Data(x=2, big=13)')  # 13 is the offset of the second heap value
+        run(executor, 'delete Data where x=0')
+        run(executor, 'vacuum')
+        assert run(executor, 'from Data select big').rows == [{"big": 10**40}, {"big": 13}]
+        assert executor.storage.get_array_table("bigint").count == 17
+
+    def test_wide_references(self, executor):
+        """With wide references, values up to 127 bits are stored inline."""
+        run(executor, 'set wide_references on')
+        run(executor, 'type Data { big: bigint }')
+        run(executor, f'create Data(big={2**126 - 1})')
+        run(executor, f'create Data(big={-(2**126)})')
+        assert executor.storage.get_array_table("bigint").count == 0
+        assert run(executor, 'from Data select big').rows == [
+            {"big": 2**126 - 1}, {"big": -(2**126)},
+        ]
+
+    def test_old_databases_keep_heap(self, executor):
+        """Databases from before inline values keep every value in the heap."""
+        import json
+        from typed_tables.dump import load_registry_from_metadata
+        run(executor, 'type Data { big: bigint }')
+        data_dir = executor.storage.data_dir
+        executor.storage.close()
+        metadata_path = data_dir / "_metadata.json"
+        metadata = json.loads(metadata_path.read_text())
+        del metadata["bigints"]  # as written before inline values
+        metadata_path.write_text(json.dumps(metadata))
+
+        registry2 = load_registry_from_metadata(data_dir)
+        storage2 = StorageManager(data_dir=data_dir, registry=registry2)
+        exec2 = QueryExecutor(registry=registry2, storage=storage2)
+        try:
+            assert not storage2.inline_bigints
+            run_exec(exec2, 'create Data(big=-5)')
+            assert storage2.get_array_table("bigint").count == 1
+            assert run_exec(exec2, 'from Data select big').rows == [{"big": -5}]
+        finally:
+            storage2.close()
+        assert "bigints" not in json.loads(metadata_path.read_text())
+
+    def test_heap_layout_readers(self, executor):
+        """Raw element-list readers see an inline value as the bytes it would have in the heap."""
+        run(executor, 'type Acct { id: uint32, bal: bigint }')
+        run(executor, 'create Acct(id=1, bal=5)')
+        run(executor, 'create Acct(id=2, bal=-300)')
+        table = executor.storage.get_array_table("bigint")
+        refs = [executor.storage.get_table("Acct").get(i)["bal"] for i in range(2)]
+        assert [table.get(*ref) for ref in refs] == [[5], [212, 254]]
+        assert table.get_bytes(*refs[1]) == (-300).to_bytes(2, "little", signed=True)
+
+    def test_dump_tool(self, executor, capsys):
+        """The dump tool reads inline values, as text and as JSON."""
+        from typed_tables.dump import main as dump_main
+        run(executor, 'type Acct { id: uint32, bal: bigint }')
+        run(executor, 'create Acct(id=1, bal=5)')
+        data_dir = str(executor.storage.data_dir)
+        executor.storage.close()
+        assert dump_main([data_dir, "Acct"]) == 0
+        assert "bal: [5]" in capsys.readouterr().out
+        assert dump_main([data_dir, "Acct", "-j"]) == 0
+        assert '"bal": [\n        5\n      ]' in capsys.readouterr().out
+
+    def test_instance_ref(self, tmp_path):
+        """InstanceRef.load() reads inline values."""
+        from typed_tables.schema import Schema
+        with Schema.parse("type Acct { id: uint32, bal: bigint }", tmp_path) as schema:
+            run(QueryExecutor(schema.storage, schema.registry), 'create Acct(id=1, bal=5)')
+            assert schema.get_instance("Acct", 0).load() == {"id": 1, "bal": [5]}
+
+    def test_ttg_provider(self, executor):
+        """The graph provider walks records holding inline values."""
+        from typed_tables.ttg.provider import DatabaseProvider
+        from typed_tables.ttg.ttgc_parser import TTGCParser
+        run(executor, 'type Acct { name: string, bal: bigint }')
+        run(executor, 'create Acct(name="a", bal=5)')
+        parser = TTGCParser()
+        parser.build()
+        config = parser.parse("""
+            selector { accts: Acct }
+            axis { balance: accts.bal }
+            identity { default: name }
+        """)
+        provider = DatabaseProvider(executor.storage, executor.registry, config)
+        assert provider.get_nodes_for_selector("accts") == {"a"}
+        assert provider.get_all_edges_for_axis("balance") == []
+
+
+
 # --- Mixed type fields ---
 
 class TestMixedFields:
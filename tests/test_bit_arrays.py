@@ -0,0 +1,277 @@
+"""Tests for packed bit and boolean arrays."""
+
+import json
+
+import pytest
+
+from typed_tables.array_table import BitTable
+from typed_tables.dump import load_registry_from_metadata
+from typed_tables.parsing.query_parser import QueryParser
+from typed_tables.query_executor import QueryExecutor
+from typed_tables.storage import StorageManager
+from typed_tables.types import TypeRegistry
+
+
+def _run(executor, text):
+    """Parse and execute a TTQ program, returning the last result."""
+    parser = QueryParser()
+    result = None
+    for stmt in parser.parse_program(text):
+        result = executor.execute(stmt)
+    return result
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Create a database with a P type holding a bit[] and a boolean[]."""
+    registry = TypeRegistry()
+    storage = StorageManager(tmp_path / "db", registry)
+    executor = QueryExecutor(storage, registry)
+    _run(executor, "type P { x: int32, flags: bit[], ok: boolean[] }")
+    yield storage, executor
+    storage.close()
+
+
+def flags(executor, x=1):
+    """Return the flags of the P record with the given x."""
+    return _run(executor, f"from P select flags where x={x}").rows[0]["flags"]
+
+
+BITS = "[1, 0, 1, 1, 0, 0, 0, 1, 1, 0]"
+VALUES = [True, False, True, True, False, False, False, True, True, False]
+
+
+class TestPackedStorage:
+    def test_eight_flags_per_byte(self, db):
+        """bit[] packs eight flags per byte and reads them back unchanged."""
+        storage, executor = db
+        _run(executor, f"create P(x=1, flags={BITS}, ok=[true, false])")
+        table = storage.get_array_table("bit[]")
+        assert isinstance(table, BitTable)
+        assert storage.get_table("P").get(0)["flags"] == (0, 2)
+        assert table.element_count(0, 2) == 10
+        assert _run(executor, "from P select flags, ok").rows == [
+            {"flags": VALUES, "ok": [True, False]},
+        ]
+
+    def test_byte_boundaries(self, db):
+        """Arrays of 0 to 17 flags take a byte per started eight."""
+        storage, executor = db
+        for n in range(18):
+            _run(executor, f"create P(x={n}, flags=[{', '.join(['1'] * n)}])")
+        for n in range(18):
+            assert flags(executor, n) == [True] * n
+            start, length = storage.get_table("P").get(n)["flags"]
+            assert length == (n // 8 + 1 if n else 0)
+
+    def test_sets_are_packed(self, tmp_path):
+        """Boolean sets use the packed table too."""
+        storage = StorageManager(tmp_path / "db", TypeRegistry())
+        executor = QueryExecutor(storage, storage.registry)
+        _run(executor, "type S { seen: {boolean} }")
+        _run(executor, "create S(seen={true, false})")
+        assert isinstance(storage.get_array_table("{boolean}"), BitTable)
+        assert _run(executor, "from S select seen").rows == [{"seen": [True, False]}]
+        storage.close()
+
+    def test_reopen(self, tmp_path):
+        """The packed format is recorded in the metadata and kept on reopen."""
+        data_dir = tmp_path / "db"
+        storage = StorageManager(data_dir, TypeRegistry())
+        executor = QueryExecutor(storage, storage.registry)
+        _run(executor, f"type P {{ flags: bit[] }}\ncreate P(flags={BITS})")
+        storage.close()
+        assert json.loads((data_dir / "_metadata.json").read_text())["bits"] == "packed"
+
+        storage = StorageManager(data_dir, load_registry_from_metadata(data_dir))
+        executor = QueryExecutor(storage, storage.registry)
+        assert storage.packed_bits
+        assert _run(executor, "from P select flags").rows == [{"flags": VALUES}]
+        storage.close()
+
+
+class TestMutations:
+    def test_append_in_place(self, db):
+        """Appending to the last array fills its final byte and grows in place."""
+        storage, executor = db
+        _run(executor, f"create P(x=1, flags={BITS})")
+        _run(executor, "update P set flags.append(1, 1, 1, 1, 1, 1, 1)")
+        assert flags(executor) == VALUES + [True] * 7
+        assert storage.get_table("P").get(0)["flags"] == (0, 3)
+        assert storage.get_array_table("bit[]").count == 3
+
+    def test_append_moves_when_followed(self, db):
+        """Appending to an array with another after it moves it."""
+        storage, executor = db
+        _run(executor, "create P(x=1, flags=[1])")
+        _run(executor, "create P(x=2, flags=[0])")
+        _run(executor, "update P set flags.append(0, 0, 0, 0, 0, 0, 0, 1) where x=1")
+        assert flags(executor, 1) == [True] + [False] * 7 + [True]
+        assert flags(executor, 2) == [False]
+
+    def test_prepend_and_insert(self, db):
+        """Prepending and inserting shift the following flags."""
+        _, executor = db
+        _run(executor, f"create P(x=1, flags={BITS})")
+        _run(executor, "update P set flags.prepend(0)")
+        _run(executor, "update P set flags.insert(3, 1)")
+        expected = [False] + VALUES
+        expected.insert(3, True)
+        assert flags(executor) == expected
+
+    def test_delete(self, db):
+        """Deleting flags by index and by value repacks the rest."""
+        _, executor = db
+        _run(executor, f"create P(x=1, flags={BITS})")
+        _run(executor, "update P set flags.delete(9)")
+        assert flags(executor) == VALUES[:9]
+        _run(executor, "update P set flags.delete(8)")
+        assert flags(executor) == VALUES[:8]
+        _run(executor, "update P set flags.delete(0)")
+        assert flags(executor) == VALUES[1:8]
+        _run(executor, "update P set flags.removeAll(true)")
+        assert flags(executor) == [False] * 4
+        _run(executor, "update P set flags.removeAll(false)")
+        assert flags(executor) == []
+
+    def test_reorder(self, db):
+        """reverse, swap and sort work on packed flags."""
+        _, executor = db
+        _run(executor, f"create P(x=1, flags={BITS})")
+        _run(executor, "update P set flags.reverse()")
+        assert flags(executor) == VALUES[::-1]
+        _run(executor, "update P set flags.swap(0, 1)")
+        expected = VALUES[::-1]
+        expected[0], expected[1] = expected[1], expected[0]
+        assert flags(executor) == expected
+        _run(executor, "update P set flags.sort()")
+        assert flags(executor) == sorted(VALUES)
+
+    def test_assign(self, db):
+        """Assigning a new list replaces the flags."""
+        _, executor = db
+        _run(executor, f"create P(x=1, flags={BITS})")
+        _run(executor, "update P set flags=[true, true]")
+        assert flags(executor) == [True, True]
+        _run(executor, "update P set flags=[]")
+        assert flags(executor) == []
+
+
+class TestFlagMethods:
+    def test_select(self, db):
+        """popcount, any and all can be selected."""
+        _, executor = db
+        _run(executor, f"create P(x=1, flags={BITS}, ok=[true, true])")
+        _run(executor, "create P(x=2, flags=[], ok=[false])")
+        rows = _run(executor, "from P select x, flags.popcount(), flags.any(), ok.all()").rows
+        assert rows == [
+            {"x": 1, "flags.popcount()": 5, "flags.any()": True, "ok.all()": True},
+            {"x": 2, "flags.popcount()": 0, "flags.any()": False, "ok.all()": False},
+        ]
+
+    def test_where(self, db):
+        """popcount and all can be used in a where clause."""
+        _, executor = db
+        _run(executor, f"create P(x=1, flags={BITS})")
+        _run(executor, "create P(x=2, flags=[0, 0])")
+        assert _run(executor, "from P select x where flags.popcount() > 3").rows == [{"x": 1}]
+        assert _run(executor, "from P select x where flags.all()").rows == []
+
+    def test_non_bit_array(self, tmp_path):
+        """The flag methods reject other array types."""
+        storage = StorageManager(tmp_path / "db", TypeRegistry())
+        executor = QueryExecutor(storage, storage.registry)
+        _run(executor, "type Q { nums: uint8[] }\ncreate Q(nums=[1, 2])")
+        with pytest.raises(RuntimeError, match="bit or boolean array"):
+            _run(executor, "from Q select nums.popcount()")
+        storage.close()
+
+    def test_select_uses_bit_table(self, db, monkeypatch):
+        """Selected flag methods are answered by BitTable from the stored refs."""
+        _, executor = db
+        _run(executor, f"create P(x=1, flags={BITS})")
+        _run(executor, "create P(x=2)")
+        calls = []
+        popcount = BitTable.popcount
+        monkeypatch.setattr(BitTable, "popcount", lambda self, *ref: calls.append(ref) or popcount(self, *ref))
+        result = _run(executor, "from P select x, flags.popcount(), flags.all()")
+        assert result.rows == [
+            {"x": 1, "flags.popcount()": 5, "flags.all()": False},
+            {"x": 2, "flags.popcount()": 0, "flags.all()": True},
+        ]
+        assert calls == [(0, 2), (0, 2), (0, 0), (0, 0)]
+
+    def test_zero_one_integers(self, tmp_path):
+        """Integer arrays of 0s and 1s are not flags."""
+        storage = StorageManager(tmp_path / "db", TypeRegistry())
+        executor = QueryExecutor(storage, storage.registry)
+        _run(executor, "type Q { nums: uint8[] }\ncreate Q(nums=[1, 0, 1])")
+        for query in ("from Q select nums.popcount()", "from Q select nums where nums.any()"):
+            with pytest.raises(RuntimeError, match="bit or boolean array"):
+                _run(executor, query)
+        storage.close()
+
+    def test_table_api(self, db):
+        """BitTable answers popcount, any and all directly."""
+        storage, executor = db
+        _run(executor, f"create P(x=1, flags={BITS})")
+        table = storage.get_array_table("bit[]")
+        ref = storage.get_table("P").get(0)["flags"]
+        assert table.popcount(*ref) == 5
+        assert table.any(*ref)
+        assert not table.all(*ref)
+
+    def test_table_get_numpy(self, db):
+        """BitTable.get_numpy unpacks the flags into a NumPy array."""
+        pytest.importorskip("numpy")
+        storage, executor = db
+        _run(executor, f"create P(x=1, flags={BITS})")
+        table = storage.get_array_table("bit[]")
+        ref = storage.get_table("P").get(0)["flags"]
+        assert table.get_numpy(*ref).tolist() == VALUES
+        assert table.get_numpy(0, 0).tolist() == []
+
+
+class TestVacuum:
+    def test_vacuum_and_compact(self, db, tmp_path):
+        """vacuum and compact keep packed flags intact."""
+        storage, executor = db
+        _run(executor, f"create P(x=1, flags={BITS})")
+        _run(executor, "create P(x=2, flags=[1, 1, 1])")
+        _run(executor, "delete P where x=1")
+        _run(executor, "vacuum")
+        assert flags(executor, 2) == [True] * 3
+        assert storage.get_array_table("bit[]").count == 1
+
+        out = tmp_path / "compacted"
+        _run(executor, f'compact > "{out}"')
+        compacted = StorageManager(out, load_registry_from_metadata(out))
+        compacted_executor = QueryExecutor(compacted, compacted.registry)
+        assert _run(compacted_executor, "from P select flags").rows == [{"flags": [True] * 3}]
+        compacted.close()
+
+
+class TestLegacyBits:
+    def test_old_databases_keep_byte_flags(self, tmp_path):
+        """Databases from before packed bits keep a byte per flag."""
+        data_dir = tmp_path / "db"
+        storage = StorageManager(data_dir, TypeRegistry())
+        _run(QueryExecutor(storage, storage.registry), "type P { flags: bit[] }")
+        storage.close()
+        metadata_path = data_dir / "_metadata.json"
+        metadata = json.loads(metadata_path.read_text())
+        del metadata["bits"]  # as written before packed bits
+        metadata_path.write_text(json.dumps(metadata))
+
+        storage = StorageManager(data_dir, load_registry_from_metadata(data_dir))
+        executor = QueryExecutor(storage, storage.registry)
+        assert not storage.packed_bits
+        _run(executor, f"create P(flags={BITS})")
+        table = storage.get_array_table("bit[]")
+        assert not isinstance(table, BitTable)
+        assert table.count == 10
+        assert _run(executor, "from P select flags, flags.popcount()").rows == [
+            {"flags": VALUES, "flags.popcount()": 5},
+        ]
+        storage.close()
+        assert "bits" not in json.loads(metadata_path.read_text())
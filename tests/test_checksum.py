@@ -0,0 +1,190 @@
+"""Tests for page checksums and the verify command."""
+
+import shutil
+import struct
+import zlib
+
+import pytest
+
+from typed_tables import checksum
+from typed_tables.checksum import (
+    CHECKSUM_PAGE_SIZE, ChecksumError, checksum_path, page_records, verify_file,
+)
+from typed_tables.parsing.query_parser import QueryParser
+from typed_tables.query_executor import QueryExecutor, SetResult, VerifyResult
+from typed_tables.storage import StorageManager
+from typed_tables.types import TypeRegistry
+
+
+def _run(executor, text):
+    """Parse and execute a TTQ program, returning the last result."""
+    parser = QueryParser()
+    result = None
+    for stmt in parser.parse_program(text):
+        result = executor.execute(stmt)
+    return result
+
+
+def corrupt(path, offset):
+    """Flip the low bit of the byte at ``offset`` in a file."""
+    with open(path, "r+b") as f:
+        f.seek(offset)
+        byte = f.read(1)
+        f.seek(offset)
+        f.write(bytes([byte[0] ^ 0x01]))
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Create a checksummed database of 1000 P records."""
+    data_dir = tmp_path / "db"
+    registry = TypeRegistry()
+    storage = StorageManager(data_dir, registry)
+    executor = QueryExecutor(storage, registry)
+    _run(executor, "type P { x: int32, name: string }")
+    _run(executor, "set checksums on")
+    creates = "; ".join(f'create P(x={i}, name="p{i}")' for i in range(1000))
+    _run(executor, "scope { " + creates + " }")
+    yield data_dir, storage, executor
+    storage.close()
+
+
+class TestChecksums:
+    def test_sidecars_follow_writes(self, db):
+        """Sidecars match the tables after updates and deletes."""
+        data_dir, storage, executor = db
+        _run(executor, "update P set x=-1 where x < 10")
+        _run(executor, "delete P where x=500")
+        result = _run(executor, "verify")
+        assert isinstance(result, VerifyResult)
+        assert result.problem_count == 0
+        assert result.table_count == 2  # P and its string table
+        assert checksum_path(data_dir / "P.bin").exists()
+        assert checksum_path(data_dir / "string.bin").exists()
+
+    def test_checksummed_once_per_statement(self, db, monkeypatch):
+        """Test a statement's writes are checksummed and saved when it ends, not one by one."""
+        data_dir, storage, executor = db
+        _run(executor, "set durability statement")
+        pages = []
+        crc32 = zlib.crc32
+        monkeypatch.setattr(
+            checksum.zlib, "crc32", lambda data: pages.append(len(data)) or crc32(data),
+        )
+        _run(executor, "update P set x=-1 where x < 10")  # ten writes to page 0
+        assert pages == [CHECKSUM_PAGE_SIZE]
+        assert not verify_file(data_dir / "P.bin").bad_pages
+
+    def test_corruption_reported_with_records(self, db):
+        """verify names the damaged page and the records on it."""
+        data_dir, storage, executor = db
+        record_size = storage.get_table("P").type_def.size_bytes
+        offset = 8 + 700 * record_size
+        corrupt(data_dir / "P.bin", offset)
+        result = _run(executor, "verify")
+        page = offset // CHECKSUM_PAGE_SIZE
+        first, last = page_records(page, record_size)
+        assert result.rows == [
+            {
+                "table": "P", "page": page, "records": f"{first}-{last}",
+                "problem": "checksum mismatch",
+            },
+        ]
+        assert first <= 700 <= last
+
+    def test_verify_reads(self, db):
+        """With verify_reads on, reading a damaged page raises ChecksumError."""
+        data_dir, storage, executor = db
+        table = storage.get_table("P")
+        corrupt(data_dir / "P.bin", 8 + 3 * table.type_def.size_bytes)
+        assert table.get(3) is not None  # unchecked by default
+        _run(executor, "set verify_reads on")
+        with pytest.raises(ChecksumError, match="page 0"):
+            table.get(3)
+        with pytest.raises(ChecksumError, match="page 0"):
+            table.get_range(0, 10)
+        assert table.get(999)["x"] == 999  # other pages are fine
+
+    def test_rollback_keeps_checksums(self, db):
+        """Rolled-back writes leave the sidecars matching the tables."""
+        _, _, executor = db
+        _run(executor, "begin")
+        _run(executor, 'create P(x=5000, name="new")')
+        _run(executor, "update P set x=7 where x < 100")
+        _run(executor, "rollback")
+        assert _run(executor, "verify").problem_count == 0
+
+    def test_persisted_with_database(self, db, reopen):
+        """The checksums setting is saved with the database."""
+        data_dir, storage, _ = db
+        storage.close()
+        storage, executor = reopen(data_dir)
+        assert storage.checksums
+        _run(executor, 'create P(x=1000, name="later")')
+        assert _run(executor, "verify").problem_count == 0
+        storage.close()
+
+    def test_missing_sidecar_rebuilt(self, db, reopen):
+        """A missing sidecar is rebuilt when the table is opened."""
+        data_dir, storage, _ = db
+        storage.close()
+        checksum_path(data_dir / "P.bin").unlink()
+        storage, executor = reopen(data_dir)
+        assert _run(executor, "verify").problem_count == 0
+        assert checksum_path(data_dir / "P.bin").exists()
+        storage.close()
+
+    def test_reader_reports_missing_sidecar(self, db, reopen):
+        """A read-only database reports a missing sidecar instead of building one."""
+        data_dir, storage, executor = db
+        checksum_path(data_dir / "string.bin").unlink()
+        reader, reader_executor = reopen(data_dir, read_only=True)
+        assert _run(reader_executor, "verify").rows == [
+            {"table": "string", "page": None, "records": None, "problem": "no checksums"},
+        ]
+        reader.close()
+
+    def test_turn_off(self, db, reopen):
+        """set checksums off removes the sidecars."""
+        data_dir, storage, executor = db
+        result = _run(executor, "set checksums off")
+        assert isinstance(result, SetResult)
+        assert result.value is False
+        assert not list(data_dir.glob("*.crc"))
+        with pytest.raises(ValueError, match="not enabled"):
+            _run(executor, "verify")
+        storage.close()
+        storage, _ = reopen(data_dir)
+        assert not storage.checksums
+        storage.close()
+
+    def test_wal_recovery_rebuilds_sidecars(self, tmp_path, reopen):
+        """Sidecars match the tables after WAL recovery."""
+        data_dir = tmp_path / "db"
+        registry = TypeRegistry()
+        storage = StorageManager(data_dir, registry, durability="manual", wal=True)
+        executor = QueryExecutor(storage, registry)
+        _run(executor, "type P { x: int32 }")
+        _run(executor, "set checksums on")
+        _run(executor, "create P(x=1); create P(x=2)")
+        copy = tmp_path / "crashed"
+        shutil.copytree(data_dir, copy)
+        storage.close()
+        with open(copy / "P.bin", "r+b") as f:
+            f.write(struct.pack("<Q", 0))  # the header never reached disk
+
+        recovered, executor = reopen(copy)
+        assert recovered.recovery_report.committed_units > 0
+        assert recovered.get_table("P").count == 2
+        assert _run(executor, "verify").problem_count == 0
+        recovered.close()
+
+    def test_truncated_file(self, db):
+        """Pages missing from a truncated file are reported bad."""
+        data_dir, storage, _ = db
+        storage.close()
+        path = data_dir / "P.bin"
+        with open(path, "r+b") as f:
+            f.truncate(CHECKSUM_PAGE_SIZE)
+        checked = verify_file(path)
+        assert checked.bad_pages == list(range(1, checked.pages))
@@ -0,0 +1,138 @@
+"""Tests for precompiled record codecs."""
+
+import struct
+
+import pytest
+
+from typed_tables.codec import ColumnCodec, RecordCodec
+from typed_tables.table import Table
+from typed_tables.types import (
+    CompositeTypeDefinition,
+    EnumTypeDefinition,
+    EnumValue,
+    EnumVariantDefinition,
+    FieldDefinition,
+    TypeRegistry,
+)
+
+
+@pytest.fixture
+def registry():
+    """Create a registry with the built-in types."""
+    return TypeRegistry()
+
+
+@pytest.fixture
+def color_enum():
+    """Create a C-style enum with two variants."""
+    return EnumTypeDefinition(
+        name="Color",
+        variants=[
+            EnumVariantDefinition(name="red", discriminant=0),
+            EnumVariantDefinition(name="green", discriminant=1),
+        ],
+    )
+
+
+@pytest.fixture
+def record_type(registry, color_enum):
+    """Create a composite covering every kind of fixed-size field."""
+    return CompositeTypeDefinition(
+        name="Record",
+        fields=[
+            FieldDefinition(name="id", type_def=registry.get("int32")),
+            FieldDefinition(name="score", type_def=registry.get("float64")),
+            FieldDefinition(name="initial", type_def=registry.get("character")),
+            FieldDefinition(name="uuid", type_def=registry.get("uint128")),
+            FieldDefinition(name="name", type_def=registry.get("string")),
+            FieldDefinition(name="color", type_def=color_enum),
+            FieldDefinition(name="flag", type_def=registry.get("boolean")),
+        ],
+    )
+
+
+class TestRecordCodec:
+    """RecordCodec packs and unpacks whole records in one struct call."""
+
+    def test_size_matches_type_definition(self, record_type):
+        """Codec size equals the type's record size."""
+        codec = RecordCodec(record_type)
+        assert codec.size == record_type.size_bytes
+
+    def test_composite_round_trip(self, record_type):
+        """Every field survives a pack/unpack round trip."""
+        codec = RecordCodec(record_type)
+        value = {
+            "id": -7,
+            "score": 2.5,
+            "initial": "Z",
+            "uuid": (1 << 100) + 5,
+            "name": (10, 3),
+            "color": EnumValue(variant_name="green", discriminant=1),
+            "flag": True,
+        }
+        assert codec.unpack(codec.pack(value)) == value
+
+    def test_null_fields_round_trip(self, record_type):
+        """Null fields pack to the record size and unpack as None."""
+        codec = RecordCodec(record_type)
+        value = {f.name: None for f in record_type.fields}
+        value["id"] = 1
+        data = codec.pack(value)
+        assert len(data) == record_type.size_bytes
+        assert codec.unpack(data) == value
+
+    def test_tuple_input(self, record_type):
+        """Values can be given as a tuple in field order."""
+        codec = RecordCodec(record_type)
+        decoded = codec.unpack(codec.pack((1, 0.0, "a", 0, (0, 0), None, False)))
+        assert decoded["id"] == 1
+        assert decoded["color"] is None
+
+    def test_unpack_from_offset(self, registry):
+        """unpack_from reads a record at an offset into a buffer."""
+        codec = RecordCodec(registry.get("uint16"))
+        buf = b"\x00" * 3 + struct.pack("<H", 513)
+        assert codec.unpack_from(buf, 3) == 513
+
+    def test_unpack_many(self, registry, record_type):
+        """unpack_many decodes a run of records in one call."""
+        codec = RecordCodec(registry.get("character"))
+        assert codec.unpack_many(b"".join(codec.pack(c) for c in "héllo")) == list("héllo")
+        codec = RecordCodec(record_type)
+        data = codec.pack({"id": 1, "name": (0, 2)}) + codec.pack({"id": 2, "flag": False})
+        first, second = data[: codec.size], data[codec.size :]
+        assert codec.unpack_many(data) == [codec.unpack(first), codec.unpack(second)]
+        assert codec.unpack_many(b"") == []
+
+    def test_unsupported_type_raises_on_use(self, registry):
+        """Types without a codec fail when packed, not when compiled."""
+        codec = RecordCodec(registry.get("fraction"))
+        with pytest.raises(TypeError):
+            codec.pack(1)
+
+    def test_table_uses_codec(self, tmp_path, record_type):
+        """Table inserts and reads go through the record codec."""
+        with Table(record_type, tmp_path / "Record.bin") as table:
+            table.insert({"id": 3, "color": EnumValue(variant_name="red", discriminant=0)})
+            record = table.get(0)
+            assert record["id"] == 3
+            assert record["color"].variant_name == "red"
+            assert record["name"] is None
+
+
+class TestColumnCodec:
+    """ColumnCodec unpacks only the selected fields of a record."""
+
+    def test_selected_fields(self, record_type):
+        """Only the selected fields are decoded, in the order given."""
+        record = RecordCodec(record_type)
+        data = record.pack({"id": 4, "score": 0.5, "initial": "Q", "flag": True})
+        column = ColumnCodec(record_type, ["flag", "id", "initial", "uuid"])
+        assert column.struct.size == record.size
+        assert column.decode(column.struct.unpack(data)) == (True, 4, "Q", None)
+
+    def test_duplicate_field_rejected(self, record_type):
+        """Selecting a field twice is rejected."""
+        with pytest.raises(ValueError):
+            ColumnCodec(record_type, ["id", "id"])
@@ -0,0 +1,135 @@
+"""Tests for columnar field scans and the executor paths that use them."""
+
+import pytest
+
+from typed_tables.parsing.query_parser import QueryParser
+from typed_tables.query_executor import QueryExecutor
+from typed_tables.storage import StorageManager
+from typed_tables.types import TypeRegistry
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Create a database of three live P records and one deleted one."""
+    registry = TypeRegistry()
+    storage = StorageManager(tmp_path / "db", registry)
+    executor = QueryExecutor(storage, registry)
+    _run(executor, """
+        type P { name: string, age: uint8, score: float64, active: boolean, initial: character }
+        create P(name="a", age=10, score=1.5, active=true, initial="A")
+        create P(name="b", age=20, score=2.5, active=false, initial="B")
+        create P(name="c", age=30, active=true, initial="C")
+        create P(name="d", age=40, score=4.0, active=true, initial="D")
+        delete P where age=40
+    """)
+    yield storage, executor
+    storage.close()
+
+
+def _run(executor, text):
+    """Parse and execute a TTQ program, returning the last result."""
+    parser = QueryParser()
+    result = None
+    for stmt in parser.parse_program(text):
+        result = executor.execute(stmt)
+    return result
+
+
+class TestTableScan:
+    def test_scan_field(self, db):
+        """scan_field yields the index and value of each live record."""
+        storage, _ = db
+        table = storage.get_table("P")
+        assert list(table.scan_field("age")) == [(0, 10), (1, 20), (2, 30)]
+        assert list(table.scan_field("score")) == [(0, 1.5), (1, 2.5), (2, None)]
+
+    def test_scan_fields_matches_get(self, db):
+        """scan_fields agrees with decoding whole records."""
+        storage, _ = db
+        table = storage.get_table("P")
+        names = ["initial", "active", "name", "age"]
+        for index, values in table.scan_fields(names):
+            record = table.get(index)
+            assert values == tuple(record[n] for n in names)
+
+    def test_scan_unknown_field(self, db):
+        """Scanning a field the type lacks raises KeyError."""
+        storage, _ = db
+        with pytest.raises(KeyError):
+            list(storage.get_table("P").scan_field("nope"))
+
+
+class TestColumnarSelect:
+    def test_aggregates(self, db):
+        """Aggregates over fixed-size fields are computed from column scans."""
+        _, executor = db
+        query = "from P select count(), sum(age), average(age), min(score), max(score)"
+        result = _run(executor, query)
+        assert result.rows == [{
+            "count(*)": 3,
+            "sum(age)": 60,
+            "average(age)": 20,
+            "min(score)": 1.5,
+            "max(score)": 2.5,
+        }]
+
+    def test_aggregates_with_where(self, db):
+        """Aggregates honour a where clause on scanned fields."""
+        _, executor = db
+        result = _run(executor, "from P select count(), sum(age) where active=true and age > 5")
+        assert result.rows == [{"count(*)": 2, "sum(age)": 40}]
+
+    def test_boolean_sum(self, db):
+        """Summing a boolean field counts the true values."""
+        _, executor = db
+        assert _run(executor, "from P select sum(active)").rows == [{"sum(active)": 2}]
+
+    def test_where_prefilter_returns_full_rows(self, db):
+        """Rows passing a scanned where clause are returned whole."""
+        _, executor = db
+        result = _run(executor, "from P select name, age where age >= 20")
+        assert result.rows == [{"name": "b", "age": 20}, {"name": "c", "age": 30}]
+
+    def test_where_on_string_falls_back(self, db):
+        """A where clause on a string field uses the record path."""
+        _, executor = db
+        result = _run(executor, 'from P select age where name starts with "b" or age = 10')
+        assert sorted(r["age"] for r in result.rows) == [10, 20]
+
+    def test_where_on_index(self, db):
+        """A where clause on _index selects by position."""
+        _, executor = db
+        result = _run(executor, "from P select name where _index = 2")
+        assert result.rows == [{"name": "c"}]
+
+    @pytest.mark.parametrize("where", ["n > 0", "flag = true", "ratio > 0.0", 'c = "x"', "_index >= 0"])
+    def test_where_rows_match_full_scan(self, tmp_path, where):
+        """A scanned where clause returns rows resolved like a full scan."""
+        registry = TypeRegistry()
+        storage = StorageManager(tmp_path / "kinds", registry)
+        executor = QueryExecutor(storage, registry)
+        _run(executor, """
+            enum Color { red, green }
+            enum Shape { none, circle(r: float32) }
+            type Q { n: uint8 }
+            create Q(n=9)
+            type K {
+                n: int32, flag: boolean, ratio: float64, c: character, name: string,
+                tags: string[], nums: uint8[], keys: {string}, ids: {uint8},
+                d: {string: uint8}, color: Color, shape: Shape, frac: fraction,
+                big: bigint, q: Q
+            }
+            create K(n=1, flag=true, ratio=0.5, c="x", name="one", tags=["a", "b"],
+                nums=[1, 2], keys={"k"}, ids={3, 4}, d={"x": 1}, color=.green,
+                shape=.circle(r=1.0), frac=fraction(1, 3), big=bigint(7), q=Q(0))
+            create K(n=2, flag=true, ratio=1.5, c="x", name="two", tags=[], nums=[],
+                keys={}, ids={}, d={}, color=.red, shape=.none, frac=fraction(2),
+                big=bigint(8), q=Q(0))
+        """)
+        expected = _run(executor, "from K select *")
+        result = _run(executor, f"from K select * where {where}")
+        assert result.columns == expected.columns
+        assert result.rows == expected.rows
+        assert result.rows[0]["d"] == {"x": 1}
+        assert sorted(result.rows[0]["ids"]) == [3, 4]
+        storage.close()
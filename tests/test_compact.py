@@ -204,6 +204,47 @@ class TestCompactExecution:
         assert arr_table.count == 5
         storage2.close()
 
+    def test_compact_remaps_string_array_elements(self, executor, db_dir):
+        """Strings inside string arrays and sets move with the compacted string table."""
+        _run(executor, """
+            type Doc { title: string, tags: string[], keys: {string} }
+            create Doc(title="gone", tags=["x", "y"], keys={"k"})
+            create Doc(title="kept", tags=["z", ""], keys={"a", "b"})
+            delete Doc where title="gone"
+        """)
+        out = db_dir / "compacted"
+        _run(executor, f'compact > "{out}"')
+
+        reg2 = load_registry_from_metadata(out)
+        storage2 = StorageManager(out, reg2)
+        exec2 = QueryExecutor(storage2, reg2)
+        res = exec2.execute(QueryParser().parse("from Doc select title, tags, keys"))
+        assert res.rows == [{"title": "kept", "tags": ["z", ""], "keys": ["a", "b"]}]
+        assert storage2.get_array_table("string").count == len("keptzab")
+        storage2.close()
+
+    def test_compact_inline_composite_arrays(self, executor, db_dir):
+        """Composite arrays store whole records inline; their refs are remapped inside them."""
+        _run(executor, """
+            type P { x: int32, name: string }
+            type Q { ps: P[] }
+            create P(x=1, name="gone")
+            create Q(ps=[P(x=2, name="two"), P(x=3, name="three")])
+            delete P where x=1
+        """)
+        out = db_dir / "compacted"
+        _run(executor, f'compact > "{out}"')
+
+        reg2 = load_registry_from_metadata(out)
+        storage2 = StorageManager(out, reg2)
+        exec2 = QueryExecutor(storage2, reg2)
+        res = exec2.execute(QueryParser().parse("from Q select ps"))
+        ps = res.rows[0]["ps"]
+        assert [p["x"] for p in ps] == [2, 3]
+        heap = storage2.get_array_table("string")
+        assert [heap.get_string(*p["name"]) for p in ps] == ["two", "three"]
+        storage2.close()
+
     def test_compact_compacts_variants(self, executor, db_dir):
         """Orphaned variant records removed, enum values preserved."""
         _run(executor, """
@@ -0,0 +1,181 @@
+"""Tests for interned strings."""
+
+import pytest
+
+from typed_tables.array_table import InternedStringTable
+from typed_tables.parsing.query_parser import QueryParser, RestoreQuery
+from typed_tables.query_executor import QueryExecutor, execute_restore
+from typed_tables.storage import StorageManager
+from typed_tables.types import InternedStringTypeDefinition, TypeRegistry
+
+
+def _run(executor, text):
+    """Parse and execute a TTQ program, returning the last result."""
+    parser = QueryParser()
+    result = None
+    for stmt in parser.parse_program(text):
+        result = executor.execute(stmt)
+    return result
+
+
+LEVELS = ["info", "warn", "info", "error", "warn", "info"]
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Create a database of six Log records sharing four interned values."""
+    data_dir = tmp_path / "db"
+    registry = TypeRegistry()
+    storage = StorageManager(data_dir, registry)
+    executor = QueryExecutor(storage, registry)
+    _run(executor, "type Log { level: interned string, msg: string, tags: [interned string] }")
+    for i, level in enumerate(LEVELS):
+        _run(executor, f'create Log(level="{level}", msg="m{i}", tags=["{level}", "x"])')
+    yield data_dir, storage, executor
+    storage.close()
+
+
+def heap(storage):
+    """Return the interned string table."""
+    return storage.get_array_table("interned string")
+
+
+def messages(executor, where):
+    """Return the msg of every Log matching a where clause."""
+    return [row["msg"] for row in _run(executor, f"from Log select msg where {where}").rows]
+
+
+class TestInternedStrings:
+    def test_each_value_stored_once(self, db):
+        """Equal values share one copy in the heap."""
+        _, storage, executor = db
+        table = storage.get_table("Log")
+        levels = [table.get(i)["level"] for i in range(len(LEVELS))]
+        assert levels[0] == levels[2] == levels[5]
+        assert levels[1] == levels[4]
+        assert isinstance(heap(storage), InternedStringTable)
+        assert heap(storage).value_count() == 4  # info, warn, x, error
+        elements = heap(storage).element_table
+        assert bytes(elements.get_raw_range(0, heap(storage).count)) == b"infoxwarnerror"
+        assert [row["level"] for row in _run(executor, "from Log select level").rows] == LEVELS
+        assert _run(executor, "from Log select tags").rows[3] == {"tags": ["error", "x"]}
+
+    def test_only_strings(self, db):
+        """The interned modifier is rejected on non-string fields."""
+        _, _, executor = db
+        result = _run(executor, "type T { n: interned int32 }")
+        assert result.message == (
+            "Interned modifier only allowed on string fields, not 'int32' field 'n'"
+        )
+
+    @pytest.mark.parametrize(
+        "where, expected",
+        [
+            ('level = "info"', ["m0", "m2", "m5"]),
+            ('level != "info" and msg != "m1"', ["m3", "m4"]),
+            ('level = "debug"', []),
+            ('level = "warn" or level = "error"', ["m1", "m3", "m4"]),
+            ("level = null", []),
+        ],
+    )
+    def test_where_compares_references(self, db, where, expected):
+        """Where clauses on interned fields match by value."""
+        _, _, executor = db
+        assert messages(executor, where) == expected
+
+    def test_group_by(self, db):
+        """Records group by their interned value."""
+        _, _, executor = db
+        rows = _run(executor, "from Log select level, count() group by level").rows
+        assert rows == [
+            {"level": "info", "count(*)": 3},
+            {"level": "warn", "count(*)": 2},
+            {"level": "error", "count(*)": 1},
+        ]
+
+    def test_mutations_do_not_touch_shared_values(self, db):
+        """Changing one record's value leaves the others sharing it alone."""
+        _, _, executor = db
+        _run(executor, 'update Log set level.append("!") where msg="m0"')
+        _run(executor, 'update Log set level.uppercase() where msg="m1"')
+        _run(executor, 'update Log set level.delete(0) where msg="m2"')
+        levels = [row["level"] for row in _run(executor, "from Log select level").rows]
+        assert levels == ["info!", "WARN", "nfo", "error", "warn", "info"]
+        _run(executor, 'update Log set level="error" where msg="m5"')
+        assert messages(executor, 'level="error"') == ["m3", "m5"]
+
+    def test_rollback_drops_new_values(self, db):
+        """Values added by a rolled-back transaction are forgotten."""
+        _, storage, executor = db
+        _run(executor, "begin")
+        _run(executor, 'create Log(level="debug", msg="tx")')
+        _run(executor, "rollback")
+        assert heap(storage).value_count() == 4
+        assert messages(executor, 'level="debug"') == []
+        _run(executor, 'create Log(level="trace", msg="after")')
+        _run(executor, 'create Log(level="debug", msg="again")')
+        assert messages(executor, 'level="debug"') == ["again"]
+
+    def test_index_persists(self, db, reopen):
+        """The value index survives reopening the database."""
+        data_dir, storage, _ = db
+        storage.close()
+        storage, executor = reopen(data_dir)
+        assert isinstance(storage.registry.get("interned string"), InternedStringTypeDefinition)
+        _run(executor, 'create Log(level="warn", msg="later")')
+        assert heap(storage).value_count() == 4
+        assert messages(executor, 'level="warn"') == ["m1", "m4", "later"]
+        storage.close()
+
+    def test_dump_round_trip(self, db, tmp_path):
+        """A dump recreates interned fields and their values."""
+        _, _, executor = db
+        script = _run(executor, "dump").script
+        assert "type Log { level: interned string, msg: string, tags: [interned string] }" in script
+        storage = StorageManager(tmp_path / "copy", TypeRegistry())
+        copy = QueryExecutor(storage, storage.registry)
+        _run(copy, script)
+        assert heap(storage).value_count() == 4
+        assert [row["level"] for row in _run(copy, "from Log select level").rows] == LEVELS
+        storage.close()
+
+    def test_archive_restore(self, db, tmp_path, reopen):
+        """A restored archive keeps only the values still in use."""
+        _, _, executor = db
+        _run(executor, 'delete Log where level = "error"')
+        ttar = tmp_path / "logs.ttar"
+        _run(executor, f'archive > "{ttar}"')
+        out = tmp_path / "restored"
+        execute_restore(RestoreQuery(archive_file=str(ttar), output_path=str(out)))
+        storage, executor = reopen(out)
+        assert heap(storage).value_count() == 3
+        assert messages(executor, 'level = "info"') == ["m0", "m2", "m5"]
+        _run(executor, 'create Log(level="info", msg="new")')
+        assert heap(storage).value_count() == 3
+        storage.close()
+
+    def test_index_grows_and_is_probed_on_disk(self, db, monkeypatch, reopen):
+        """The index doubles as values arrive and a reopened table finds them without loading it."""
+        data_dir, storage, _ = db
+        table = heap(storage)
+        refs = {f"v{i}": table.insert(f"v{i}") for i in range(500)}
+        slots = table.index_table.count
+        assert slots >= 2 * InternedStringTable.INITIAL_SLOTS and slots & (slots - 1) == 0
+        assert table.value_count() == 504
+        storage.close()
+        storage, _ = reopen(data_dir)
+        table = heap(storage)
+        monkeypatch.setattr(table.index_table, "get_range", None)  # no full scan
+        assert all(table.lookup(value) == ref for value, ref in refs.items())
+        assert table.lookup("missing") is None
+        storage.close()
+
+    def test_decoded_cache_is_bounded(self, db, monkeypatch):
+        """Decoded strings are kept in an LRU of DECODED_CACHE_SIZE entries."""
+        _, storage, _ = db
+        monkeypatch.setattr(InternedStringTable, "DECODED_CACHE_SIZE", 8)
+        table = heap(storage)
+        refs = [table.insert(f"s{i}") for i in range(20)]
+        assert [table.get_string(*ref) for ref in refs] == [f"s{i}" for i in range(20)]
+        assert len(table._decoded) == 8
+        assert table.get_string(*refs[-1]) is table.get_string(*refs[-1])
@@ -0,0 +1,162 @@
+"""Tests for inter-process locking of database directories."""
+
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from typed_tables.dump import load_registry_from_metadata
+from typed_tables.locking import LOCK_FILE, WRITER_LOCK_FILE, LockTimeout
+from typed_tables.parsing.query_parser import QueryParser
+from typed_tables.query_executor import QueryExecutor
+from typed_tables.storage import StorageManager
+from typed_tables.types import TypeRegistry
+
+pytest.importorskip("fcntl")
+
+
+@pytest.fixture
+def writer(tmp_path):
+    """Create a database holding one P record, open for writing."""
+    data_dir = tmp_path / "db"
+    storage = StorageManager(data_dir, TypeRegistry(), lock_timeout=0.1)
+    executor = QueryExecutor(storage, storage.registry)
+    _run(executor, "type P { x: int32 }")
+    _run(executor, "create P(x=1)")
+    yield data_dir, storage, executor
+    storage.close()
+
+
+def _run(executor, text):
+    """Parse and execute a TTQ program, returning the last result."""
+    parser = QueryParser()
+    result = None
+    for stmt in parser.parse_program(text):
+        result = executor.execute(stmt)
+    return result
+
+
+def open_reader(data_dir, timeout=0.1):
+    """Open the database read-only with a short lock timeout."""
+    return StorageManager(
+        data_dir, load_registry_from_metadata(data_dir), read_only=True, lock_timeout=timeout,
+    )
+
+
+class TestWriterLock:
+    def test_lock_files_created(self, writer):
+        """Opening a database creates its lock files."""
+        data_dir, _, _ = writer
+        assert (data_dir / LOCK_FILE).exists()
+        assert (data_dir / WRITER_LOCK_FILE).exists()
+
+    def test_second_writer_times_out(self, writer):
+        """A second writer gives up after the lock timeout."""
+        data_dir, storage, _ = writer
+        with pytest.raises(LockTimeout, match="another writer"):
+            StorageManager(data_dir, storage.registry, lock_timeout=0.05)
+
+    def test_writer_lock_released_on_close(self, writer):
+        """Closing the writer lets another open the database."""
+        data_dir, storage, _ = writer
+        storage.close()
+        second = StorageManager(data_dir, storage.registry, lock_timeout=0.05)
+        assert second.get_table("P").count == 1
+        second.close()
+
+    def test_writer_in_another_process(self, tmp_path):
+        """The writer lock holds across processes."""
+        data_dir = tmp_path / "db"
+        StorageManager(data_dir, TypeRegistry()).close()
+        holder = subprocess.Popen(
+            [sys.executable, "-c", (
+                "import sys\n"
+                "from pathlib import Path\n"
+                "from typed_tables.storage import StorageManager\n"
+                "from typed_tables.types import TypeRegistry\n"
+                f"s = StorageManager(Path({str(data_dir)!r}), TypeRegistry())\n"
+                "print('locked', flush=True)\n"
+                "sys.stdin.read()\n"
+            )],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+        )
+        try:
+            assert holder.stdout.readline().strip() == "locked"
+            with pytest.raises(LockTimeout):
+                StorageManager(data_dir, TypeRegistry(), lock_timeout=0.05)
+        finally:
+            holder.communicate("")
+        StorageManager(data_dir, TypeRegistry(), lock_timeout=1).close()
+
+
+class TestStatementLock:
+    def test_readers_share(self, writer):
+        """Readers hold the statement lock together."""
+        data_dir, _, _ = writer
+        first = open_reader(data_dir)
+        second = open_reader(data_dir)
+        first.begin_statement()
+        second.begin_statement()
+        assert second.get_table("P").count == 1
+        first.end_statement()
+        second.end_statement()
+        first.close()
+        second.close()
+
+    def test_writer_waits_for_reader(self, writer):
+        """A write statement waits for readers to finish theirs."""
+        data_dir, _, executor = writer
+        reader = open_reader(data_dir)
+        reader.begin_statement()
+        with pytest.raises(LockTimeout, match="readers"):
+            _run(executor, "create P(x=2)")
+        reader.end_statement()
+        _run(executor, "create P(x=3)")
+        reader.close()
+
+    def test_reader_waits_for_transaction(self, writer):
+        """Readers wait until an open transaction ends."""
+        data_dir, _, executor = writer
+        reader = open_reader(data_dir)
+        reader_executor = QueryExecutor(reader, reader.registry)
+        _run(executor, "begin")
+        _run(executor, "create P(x=2)")
+        with pytest.raises(LockTimeout, match="writer"):
+            _run(reader_executor, "from P select x")
+        _run(executor, "commit")
+        assert [row["x"] for row in _run(reader_executor, "from P select x").rows] == [1, 2]
+        reader.close()
+
+    def test_reader_sees_committed_rollback(self, writer):
+        """Readers never see writes that were rolled back."""
+        data_dir, _, executor = writer
+        reader = open_reader(data_dir)
+        reader_executor = QueryExecutor(reader, reader.registry)
+        _run(executor, "begin")
+        _run(executor, "create P(x=2)")
+        _run(executor, "rollback")
+        assert [row["x"] for row in _run(reader_executor, "from P select x").rows] == [1]
+        reader.close()
+
+    def test_lock_released_after_failed_statement(self, writer):
+        """A failed statement still releases the statement lock."""
+        data_dir, _, executor = writer
+        with pytest.raises(ValueError):
+            _run(executor, "commit")
+        reader = open_reader(data_dir)
+        assert _run(QueryExecutor(reader, reader.registry), "from P select x").rows == [{"x": 1}]
+        reader.close()
+
+    def test_timeout_none_waits(self, writer):
+        """A timeout of None waits for the lock indefinitely."""
+        data_dir, storage, _ = writer
+        reader = open_reader(data_dir, timeout=None)
+        storage._lock.acquire_statement()
+        start = time.monotonic()
+        threading.Timer(0.1, storage._lock.release_statement).start()
+        reader.begin_statement()
+        assert time.monotonic() - start >= 0.05
+        reader.end_statement()
+        reader.close()
@@ -0,0 +1,168 @@
+"""Tests for NumPy views of tables and the vectorized executor paths."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from typed_tables import numpy_support  # noqa: E402
+from typed_tables.parsing.query_parser import QueryParser  # noqa: E402
+from typed_tables.query_executor import QueryExecutor  # noqa: E402
+from typed_tables.schema import Schema  # noqa: E402
+from typed_tables.storage import StorageManager  # noqa: E402
+from typed_tables.types import TypeRegistry  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Create a database of three live P records and one deleted one."""
+    registry = TypeRegistry()
+    storage = StorageManager(tmp_path / "db", registry)
+    executor = QueryExecutor(storage, registry)
+    _run(executor, """
+        type P { name: string, age: uint8, score: float32, big: int64, active: boolean }
+        create P(name="a", age=10, score=1.5, big=9223372036854775807, active=true)
+        create P(name="b", age=20, score=0.1, big=9223372036854775807, active=false)
+        create P(name="c", age=30, big=-5, active=true)
+        create P(name="d", age=40, score=4.0, big=1, active=true)
+        delete P where age=40
+    """)
+    yield storage, executor
+    storage.close()
+
+
+def _run(executor, text):
+    """Parse and execute a TTQ program, returning the last result."""
+    parser = QueryParser()
+    result = None
+    for stmt in parser.parse_program(text):
+        result = executor.execute(stmt)
+    return result
+
+
+QUERIES = [
+    "from P select count(), sum(age), average(age), min(score), max(score)",
+    "from P select sum(big), min(big), max(big), average(big)",
+    "from P select sum(active), min(active), count(score)",
+    "from P select count(), sum(score) where active=true and age > 5",
+    "from P select count() where score = 0.1",
+    "from P select count() where score = null",
+    "from P select count() where score != null or _index = 0",
+    "from P select count() where not age > 15",
+    "from P select sum(age) where age > 300",
+    "from P select name where age >= 20",
+    "from P select name where not score < 2",
+    "from P select name where age = 10 or big < 0",
+]
+
+
+class TestAsNumpy:
+    def test_record_dtype_layout(self, db):
+        """The record dtype mirrors the table's record layout."""
+        storage, _ = db
+        table = storage.get_table("P")
+        records = table.as_numpy()
+        assert records.dtype.itemsize == table.type_def.size_bytes
+        assert records.dtype.names == ("_nulls", "name", "age", "score", "big", "active")
+        assert records.dtype["name"].names == ("start", "length")
+        assert len(records) == 4
+        assert records["age"][:3].tolist() == [10, 20, 30]
+        assert records["active"][:3].tolist() == [True, False, True]
+
+    def test_zero_copy_and_read_only(self, db):
+        """The array views the mapping without copying and cannot be written."""
+        storage, _ = db
+        table = storage.get_table("P")
+        records = table.as_numpy()
+        table.update(0, dict(table.get(0), age=99))
+        assert records["age"][0] == 99
+        with pytest.raises(ValueError):
+            records["age"][0] = 1
+
+    def test_array_survives_growth_and_close(self, db):
+        """A live array does not block growing or closing the table."""
+        storage, _ = db
+        table = storage.get_table("P")
+        records = table.as_numpy()
+        capacity = table._capacity
+        row = table.get(0)
+        for _ in range(capacity + 1):
+            table.insert(row)
+        assert table._capacity > capacity
+        assert records["age"][:3].tolist() == [10, 20, 30]
+        assert len(table.as_numpy()) == capacity + 5
+        storage.close()
+        assert records["age"][:3].tolist() == [10, 20, 30]
+
+    def test_live_and_null_masks(self, db):
+        """Masks mark deleted records and null fields."""
+        storage, _ = db
+        table = storage.get_table("P")
+        records = table.as_numpy()
+        assert table.live_mask().tolist() == [True, True, True, False]
+        nulls = numpy_support.null_mask(records, table.type_def, "score")
+        assert nulls[:3].tolist() == [False, False, True]
+
+    def test_empty_table(self, tmp_path):
+        """A table with no file gives an empty array with the record dtype."""
+        schema = Schema.parse("type Q { x: int32 }", tmp_path / "db")
+        records = schema.to_numpy("Q")
+        assert len(records) == 0
+        assert records.dtype.names == ("_nulls", "x")
+        schema.close()
+
+    def test_schema_to_numpy(self, tmp_path):
+        """Schema.to_numpy returns a type's records."""
+        schema = Schema.parse("type Q { x: int32, y: float64 }", tmp_path / "db")
+        schema.create_instance("Q", {"x": 1, "y": 2.5})
+        schema.create_instance("Q", {"x": -3, "y": 0.5})
+        records = schema.to_numpy("Q")
+        assert records["x"].tolist() == [1, -3]
+        assert records["y"].sum() == 3.0
+        schema.close()
+
+    def test_missing_numpy(self, monkeypatch, db):
+        """as_numpy explains that NumPy is needed when it is missing."""
+        storage, _ = db
+        monkeypatch.setattr(numpy_support, "np", None)
+        with pytest.raises(ImportError, match="NumPy is required"):
+            storage.get_table("P").as_numpy()
+
+
+class TestVectorizedSelect:
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_matches_python_path(self, db, monkeypatch, query):
+        """Vectorized results equal those of the record-by-record path."""
+        _, executor = db
+        vectorized = _run(executor, query).rows
+        monkeypatch.setattr(numpy_support, "HAS_NUMPY", False)
+        assert vectorized == _run(executor, query).rows
+
+    def test_int64_sum_does_not_overflow(self, db):
+        """Sums of int64 fields are exact."""
+        _, executor = db
+        result = _run(executor, "from P select sum(big)")
+        assert result.rows == [{"sum(big)": 2 * 9223372036854775807 - 5}]
+
+    def test_float32_equality_uses_decoded_precision(self, db):
+        """float32 fields compare as the values they decode to."""
+        _, executor = db
+        assert _run(executor, "from P select count() where score = 1.5").rows == [{"count(*)": 1}]
+        assert _run(executor, "from P select count() where score = 0.1").rows == [{"count(*)": 0}]
+
+    def test_all_rows_filtered(self, db):
+        """Aggregates over no rows give a zero count and null extremes."""
+        _, executor = db
+        result = _run(executor, "from P select count(), min(age) where age > 100")
+        assert result.rows == [{"count(*)": 0, "min(age)": None}]
+
+    def test_skips_python_scan(self, db, monkeypatch):
+        """Supported selects never fall back to the Python column scan."""
+        _, executor = db
+
+        def fail(*args):
+            raise AssertionError("python scan used")
+
+        monkeypatch.setattr(QueryExecutor, "_scan_columns", fail)
+        assert _run(executor, "from P select max(age) where active=true").rows == [{"max(age)": 30}]
+        result = _run(executor, "from P select name where age < 25")
+        assert result.rows == [{"name": "a"}, {"name": "b"}]
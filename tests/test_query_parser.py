@@ -25,6 +25,7 @@ from typed_tables.parsing.query_parser import (
     FunctionCall,
     CompositeRef,
     InlineInstance,
+    InternedTypeSpec,
     MethodCall,
     NullValue,
     QueryParser,
@@ -32,10 +33,12 @@ from typed_tables.parsing.query_parser import (
     SelectQuery,
     ShowTypesQuery,
     SortKeyExpr,
+    SyncQuery,
     TagReference,
     UnaryExpr,
     UpdateQuery,
     UseQuery,
+    VacuumQuery,
     VariableAssignmentQuery,
     VariableReference,
 )
@@ -1275,6 +1278,61 @@ class TestQueryParser:
         assert len(query.fields) == 0
 
 
+class TestContextualKeywords:
+    """Tests for statement words and modifiers used as names."""
+
+    WORDS = ["sync", "verify", "vacuum", "begin", "commit", "rollback", "interned"]
+
+    @pytest.mark.parametrize("word", WORDS)
+    def test_field_name(self, word):
+        """Test that a keyword can name a field in every statement that names fields."""
+        parser = QueryParser()
+        type_query, create, select, update = parser.parse_program(
+            f"type T {{ {word}: int32, other: string }}\n"
+            f"create T({word}=1, other=\"x\")\n"
+            f"from T select {word}, other where {word} = 1 sort by {word}\n"
+            f"update T set {word}=2 where {word} = 1"
+        )
+        assert type_query.fields[0].name == word
+        assert create.fields[0].name == word
+        assert select.fields[0].name == word
+        assert select.where.field == word
+        assert select.sort_by == [word]
+        assert update.fields[0].name == word
+
+    @pytest.mark.parametrize("word", WORDS)
+    def test_type_name(self, word):
+        """Test that a keyword can name a type."""
+        parser = QueryParser()
+        type_query, select = parser.parse_program(f"type {word} {{ x: int32 }}\nfrom {word} select x")
+        assert type_query.name == word
+        assert select.table == word
+
+    def test_statements_still_parse(self):
+        """Test that the keywords keep their meaning where a statement or modifier is expected."""
+        parser = QueryParser()
+        queries = parser.parse_program(
+            "sync; vacuum; vacuum \"begin\"; begin; commit; rollback\n"
+            "type T { interned: interned string }"
+        )
+        assert isinstance(queries[0], SyncQuery)
+        assert isinstance(queries[1], VacuumQuery) and queries[1].type_name is None
+        assert queries[2].type_name == "begin"
+        assert [query.action for query in queries[3:6]] == ["begin", "commit", "rollback"]
+        field = queries[6].fields[0]
+        assert field.name == "interned"
+        assert isinstance(field.type_name, InternedTypeSpec)
+
+
+    @pytest.mark.parametrize("statement", ["vacuum", "dump", "dump json", "use", "drop", "drop!", "set x"])
+    @pytest.mark.parametrize("word", ["sync", "verify", "vacuum", "begin", "commit", "rollback"])
+    def test_statement_after_optional_operand(self, statement, word):
+        """Test that a keyword after a statement's optional operand starts the next statement."""
+        parser = QueryParser()
+        queries = parser.parse_program(f"{statement}\n{word}")
+        assert queries == [parser.parse(statement), parser.parse(word)]
+
+
 class TestMethodCallParsing:
     """Tests for array method call parsing."""
 
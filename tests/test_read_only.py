@@ -0,0 +1,136 @@
+"""Tests for read-only databases shared with a writer."""
+
+import pytest
+
+from typed_tables.dump import load_registry_from_metadata
+from typed_tables.parsing.query_parser import QueryParser
+from typed_tables.query_executor import QueryExecutor
+from typed_tables.repl import main
+from typed_tables.storage import StorageManager
+from typed_tables.types import TypeRegistry
+
+
+@pytest.fixture
+def shared(tmp_path):
+    """Create a database with a writer and a read-only reader open on it."""
+    data_dir = tmp_path / "db"
+    registry = TypeRegistry()
+    writer = QueryExecutor(StorageManager(data_dir, registry), registry)
+    _run(writer, """
+        type P { x: int32, name: string }
+        type Q { y: uint8 }
+        create P(x=1, name="one")
+        create P(x=2, name="two")
+    """)
+
+    storage = StorageManager(data_dir, load_registry_from_metadata(data_dir), read_only=True)
+    reader = QueryExecutor(storage, storage.registry)
+    yield data_dir, writer, reader
+    reader.storage.close()
+    writer.storage.close()
+
+
+def _run(executor, text):
+    """Parse and execute a TTQ program, returning the last result."""
+    parser = QueryParser()
+    result = None
+    for stmt in parser.parse_program(text):
+        result = executor.execute(stmt)
+    return result
+
+
+def _xs(reader):
+    """Return the x of every P the reader sees."""
+    return [row["x"] for row in _run(reader, "from P select x").rows]
+
+
+class TestReadOnly:
+    def test_reads(self, shared):
+        """A read-only database answers queries."""
+        _, _, reader = shared
+        assert _run(reader, "from P select x, name").rows == [
+            {"x": 1, "name": "one"}, {"x": 2, "name": "two"},
+        ]
+
+    def test_no_files_touched(self, shared):
+        """Reading changes no file in the database directory."""
+        data_dir, _, reader = shared
+        before = {p.name: p.stat().st_mtime_ns for p in data_dir.iterdir()}
+        _run(reader, "from P select *")
+        _run(reader, "from P select count() where x > 1")
+        reader.storage.close()
+        after = {p.name: p.stat().st_mtime_ns for p in data_dir.iterdir()}
+        assert after == before
+
+    @pytest.mark.parametrize("text", [
+        'create P(x=3, name="three")',
+        "update P set x=5 where x=1",
+        "delete P where x=1",
+        "type R { z: int8 }",
+    ])
+    def test_writes_rejected(self, shared, text):
+        """Write statements fail with PermissionError and change nothing."""
+        _, _, reader = shared
+        with pytest.raises(PermissionError, match="read-only"):
+            _run(reader, text)
+        assert _xs(reader) == [1, 2]
+
+    def test_table_write_rejected(self, shared):
+        """Writes through the table API fail too."""
+        _, _, reader = shared
+        table = reader.storage.get_table("P")
+        with pytest.raises(PermissionError):
+            table.delete(0)
+        with pytest.raises(PermissionError):
+            reader.storage.get_table("Q").insert({"y": 1})
+        assert not table.is_deleted(0)
+
+    def test_sees_writer_appends_and_growth(self, shared):
+        """The reader sees records appended after its files grew."""
+        _, writer, reader = shared
+        assert _xs(reader) == [1, 2]
+        for i in range(3, 1000):
+            _run(writer, f'create P(x={i}, name="n")')
+        assert _xs(reader) == list(range(1, 1000))
+
+    def test_sees_writer_deletes(self, shared):
+        """The reader sees records the writer deleted."""
+        _, writer, reader = shared
+        assert _xs(reader) == [1, 2]
+        _run(writer, "delete P where x=1")
+        assert _xs(reader) == [2]
+
+    def test_sees_table_created_later(self, shared):
+        """The reader picks up a table file created after it opened."""
+        _, writer, reader = shared
+        assert _run(reader, "from Q select y").rows == []
+        _run(writer, "create Q(y=7)")
+        assert _run(reader, "from Q select y").rows == [{"y": 7}]
+
+    def test_missing_directory(self, tmp_path):
+        """Opening a missing directory read-only fails without creating it."""
+        with pytest.raises(FileNotFoundError):
+            StorageManager(tmp_path / "nope", TypeRegistry(), read_only=True)
+        assert not (tmp_path / "nope").exists()
+
+    def test_wal_rejected(self, shared):
+        """A read-only database cannot have a write-ahead log."""
+        data_dir, _, _ = shared
+        with pytest.raises(ValueError, match="write-ahead log"):
+            StorageManager(data_dir, TypeRegistry(), wal=True, read_only=True)
+
+
+class TestReadOnlyCommandLine:
+    def test_command(self, shared, capsys):
+        """--read-only runs a query from the command line."""
+        data_dir, _, _ = shared
+        assert main([str(data_dir), "--read-only", "-c", "from P select x"]) == 0
+        out = capsys.readouterr()
+        assert out.err == ""
+        assert "2" in out.out
+
+    def test_command_write_fails(self, shared, capsys):
+        """--read-only reports a write statement as an error."""
+        data_dir, _, _ = shared
+        assert main([str(data_dir), "--read-only", "-c", "delete P where x=1"]) == 1
+        assert "read-only" in capsys.readouterr().err
@@ -4,8 +4,8 @@ import pytest
 import tempfile
 from pathlib import Path
 
-from typed_tables.parsing.query_parser import QueryParser, SetQuery
-from typed_tables.query_executor import QueryExecutor, SetResult
+from typed_tables.parsing.query_parser import QueryParser, SetQuery, SyncQuery
+from typed_tables.query_executor import QueryExecutor, SetResult, SyncResult
 from typed_tables.repl import format_value, print_result
 from typed_tables.query_executor import QueryResult
 from typed_tables.storage import StorageManager
@@ -187,3 +187,137 @@ class TestPrintResultMaxWidth:
         lines = captured.out.strip().split("\n")
         value_line = lines[2]
         assert "x" * 100 in value_line
+
+
+# --- Durability ---
+
+
+class TestDurabilityParsing:
+    def setup_method(self):
+        self.parser = QueryParser()
+
+    def test_set_durability_identifier(self):
+        """A durability mode can be given as a bare word."""
+        result = self.parser.parse("set durability statement")
+        assert isinstance(result, SetQuery)
+        assert result.setting == "durability"
+        assert result.value == "statement"
+
+    def test_set_durability_string(self):
+        """A durability mode can be given as a string."""
+        result = self.parser.parse('set durability "fsync-every-write"')
+        assert isinstance(result, SetQuery)
+        assert result.value == "fsync-every-write"
+
+    def test_sync(self):
+        """Parser produces SyncQuery."""
+        assert isinstance(self.parser.parse("sync"), SyncQuery)
+
+
+class TestDurabilityExecution:
+    def setup_method(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.registry = TypeRegistry()
+        self.storage = StorageManager(Path(self.tmpdir), self.registry)
+        self.executor = QueryExecutor(self.storage, self.registry)
+        self.parser = QueryParser()
+
+    def teardown_method(self):
+        self.storage.close()
+
+    def run(self, text):
+        """Parse and execute a TTQ program, returning the last result."""
+        result = None
+        for stmt in self.parser.parse_program(text):
+            result = self.executor.execute(stmt)
+        return result
+
+    def test_default_is_fsync_every_write(self):
+        """Writes are flushed immediately by default."""
+        assert self.storage.durability == "fsync-every-write"
+        self.run("type P { x: int32 }; create P(x=1)")
+        assert not self.storage.get_table("P").dirty
+
+    def test_set_durability_underscore_alias(self):
+        """Underscores are accepted in place of hyphens."""
+        result = self.run("set durability fsync_every_write")
+        assert isinstance(result, SetResult)
+        assert result.value == "fsync-every-write"
+
+    def test_set_durability_invalid(self):
+        """An unknown mode is rejected."""
+        with pytest.raises(ValueError, match="Unknown durability mode"):
+            self.run("set durability sometimes")
+
+    def test_statement_mode_flushes_at_statement_end(self):
+        """Statement mode flushes once the statement ends."""
+        self.run("set durability statement")
+        self.run("type P { x: int32 }")
+        self.run("scope { create P(x=1); create P(x=2) }")
+        table = self.storage.get_table("P")
+        assert table.count == 2
+        assert not table.dirty
+
+    def test_manual_mode_defers_until_sync(self):
+        """Manual mode leaves tables dirty until sync."""
+        self.run("set durability manual")
+        self.run("type P { x: int32, name: string }")
+        self.run('create P(x=1, name="hello")')
+        table = self.storage.get_table("P")
+        assert table.dirty
+        result = self.run("sync")
+        assert isinstance(result, SyncResult)
+        assert result.table_count == 2  # P and its string table
+        assert not table.dirty
+
+    def test_manual_mode_data_survives_close(self):
+        """Manual mode still flushes on close."""
+        self.run("set durability manual")
+        self.run("type P { x: int32 }; create P(x=7)")
+        self.storage.close()
+        storage = StorageManager(Path(self.tmpdir), self.registry)
+        assert storage.get_table("P").get(0)["x"] == 7
+        storage.close()
+
+    def test_switching_to_strict_mode_flushes(self):
+        """Switching back to fsync-every-write flushes pending writes."""
+        self.run("set durability manual")
+        self.run("type P { x: int32 }; create P(x=1)")
+        assert self.storage.get_table("P").dirty
+        self.run("set durability")
+        assert self.storage.durability == "fsync-every-write"
+        assert not self.storage.get_table("P").dirty
+
+    def test_reuse_slots(self):
+        """set reuse_slots toggles deleted-slot reuse on composite tables."""
+        result = self.run("set reuse_slots on")
+        assert isinstance(result, SetResult)
+        assert result.value is True
+        self.run("type P { x: int32 }")
+        self.run("create P(x=1); create P(x=2); delete P where x=1")
+        self.run("create P(x=3)")
+        table = self.storage.get_table("P")
+        assert table.count == 2
+        assert table.get(0)["x"] == 3
+        self.run("set reuse_slots off")
+        assert not table.reuse_slots
+
+    def test_cache_size(self):
+        """set cache_size turns on the record cache of every table."""
+        self.run("type P { x: int32, next: P }")
+        self.run("scope { create P(tag(A), x=1, next=A) }")
+        table = self.storage.get_table("P")
+        result = self.run("set cache_size 100")
+        assert isinstance(result, SetResult)
+        assert result.value == 100
+        assert table.cache_size == 100
+        self.run("from P select next.next.next.x")
+        assert table.cache_hits > 0
+        assert self.storage.cache_stats() == (table.cache_hits, table.cache_misses)
+        self.run("set cache_size")
+        assert table.cache_size == 0
+
+    def test_cache_size_invalid(self):
+        """set cache_size rejects a value that is not a number."""
+        with pytest.raises(ValueError, match="Invalid value for cache_size"):
+            self.run("set cache_size lots")
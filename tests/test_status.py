@@ -12,7 +12,7 @@ from typed_tables.dump import load_registry_from_metadata
 from typed_tables.parsing.query_parser import QueryParser
 from typed_tables.query_executor import QueryExecutor, QueryResult
 from typed_tables.repl import _analyze_table_file, _format_size, print_status
-from typed_tables.storage import StorageManager
+from typed_tables.storage import AutoVacuumPolicy, StorageManager
 from typed_tables.types import TypeRegistry
 
 
@@ -212,6 +212,45 @@ class TestStatusWithDeletions:
         assert dead_size_col != "0 B"
 
 
+class TestStatusAutoVacuum:
+    def test_not_shown_when_off(self, capsys, db_dir, executor):
+        """Status has no auto vacuum line while the policy is off."""
+        _run(executor, 'type Item { value: uint8 }', 'create Item(value=1)')
+        print_status(db_dir, executor)
+        assert "Auto vacuum" not in capsys.readouterr().out
+
+    def test_policy_and_savings_shown(self, capsys, db_dir, executor):
+        """Status shows the policy and what auto vacuum has reclaimed this session."""
+        _run(executor,
+             'type Item { value: uint64, pads: uint128[] }',
+             'set auto_vacuum 50',
+             'set auto_vacuum_size 1048576',
+             *(f'create Item(value={i}, pads=[0, 0])' for i in range(400)),
+             'delete Item where value < 300')
+
+        print_status(db_dir, executor)
+        out = capsys.readouterr().out
+        assert (
+            "Auto vacuum: over 50% dead or over 1 MB dead; "
+            "1 table vacuumed this session, 12 KB reclaimed"
+        ) in out
+        assert "Over threshold" not in out
+
+    def test_tables_over_threshold_listed(self, capsys, db_dir, executor):
+        """Status lists the tables the policy would vacuum next."""
+        _run(executor,
+             'type Item { value: uint64, pads: uint128[] }',
+             *(f'create Item(value={i}, pads=[0, 0])' for i in range(400)),
+             'delete Item where value < 300')
+        # Set afterwards: nothing has run yet
+        executor.storage.set_auto_vacuum(AutoVacuumPolicy(dead_percent=50))
+
+        print_status(db_dir, executor)
+        out = capsys.readouterr().out
+        assert "0 tables vacuumed this session, 0 B reclaimed" in out
+        assert "Over threshold: uint128[]" in out
+
+
 class TestSavingsCalculation:
     def test_savings_zero_when_table_fits_in_initial_size(self, db_dir, executor):
         """If live data fits in initial 4096-byte file, savings = 0 even with deletions."""
@@ -315,3 +354,27 @@ class TestAnalyzeTableFile:
         assert result["_deleted_raw"] == 0
         assert result["_file_size_raw"] > 0
         assert result["_dead_size_raw"] == 0
+
+    def test_array_dead_elements(self, db_dir, executor):
+        """_analyze_table_file reports elements no array refers to as deleted."""
+        _run(executor,
+             'type Item { values: uint8[] }',
+             'create Item(values=[1, 2, 3])',
+             'create Item(values=[4])',
+             'update Item set values=[5] where values.length() = 3')
+
+        bin_path = db_dir / "uint8[].bin"
+        result = _analyze_table_file(bin_path, db_dir, executor)
+        assert result["kind"] == "Array"
+        assert result["_records_raw"] == 5
+        assert result["_deleted_raw"] == 3
+        assert result["_live_raw"] == 2
+
+        # Without the block sidecar the count is recounted from the records
+        executor.storage.close()
+        (db_dir / "uint8[].blocks").unlink()
+        storage = StorageManager(db_dir, load_registry_from_metadata(db_dir))
+        executor = QueryExecutor(storage, storage.registry)
+        result = _analyze_table_file(bin_path, db_dir, executor)
+        assert result["_deleted_raw"] == 3
+        storage.close()
@@ -1,13 +1,21 @@
 """Tests for storage and schema functionality."""
 
+import struct
 import tempfile
 from pathlib import Path
 
 import pytest
 
 from typed_tables import Schema
-from typed_tables.table import Table
-from typed_tables.types import PrimitiveType, PrimitiveTypeDefinition
+from typed_tables.storage import StorageManager
+from typed_tables.table import GrowthPolicy, Table
+from typed_tables.types import (
+    CompositeTypeDefinition,
+    FieldDefinition,
+    PrimitiveType,
+    PrimitiveTypeDefinition,
+    TypeRegistry,
+)
 
 
 class TestTable:
@@ -109,6 +117,357 @@ class TestTable:
             assert table.count == 2000
             assert table.get(1999) == 1999
 
+    def test_insert_many(self, tmp_path):
+        """Test bulk insertion returns the first index and persists all values."""
+        type_def = PrimitiveTypeDefinition(name="uint32", primitive=PrimitiveType.UINT32)
+        file_path = tmp_path / "uint32.bin"
+
+        with Table(type_def, file_path) as table:
+            table.insert(7)
+            first = table.insert_many(list(range(5000)))
+            assert first == 1
+            assert table.count == 5001
+            assert table.get(1) == 0
+            assert table.get(5000) == 4999
+
+        with Table(type_def, file_path) as table:
+            assert table.count == 5001
+            assert table.get(4000) == 3999
+
+    def test_insert_many_empty(self, tmp_path):
+        """Test bulk insertion of nothing leaves the table untouched."""
+        type_def = PrimitiveTypeDefinition(name="uint32", primitive=PrimitiveType.UINT32)
+
+        with Table(type_def, tmp_path / "uint32.bin") as table:
+            assert table.insert_many([]) == 0
+            assert not (tmp_path / "uint32.bin").exists()
+
+    def test_insert_many_is_all_or_nothing(self, tmp_path):
+        """Test a value that fails to serialize leaves no partial records."""
+        type_def = PrimitiveTypeDefinition(name="uint8", primitive=PrimitiveType.UINT8)
+
+        with Table(type_def, tmp_path / "uint8.bin") as table:
+            with pytest.raises(Exception):
+                table.insert_many([1, 2, 300])
+            assert table.count == 0
+
+    def _point_type(self):
+        """Return a composite with a single int32 field."""
+        int_def = PrimitiveTypeDefinition(name="int32", primitive=PrimitiveType.INT32)
+        return CompositeTypeDefinition(name="Point", fields=[FieldDefinition(name="x", type_def=int_def)])
+
+    def test_reuse_slots_fills_deleted_slots(self, tmp_path):
+        """Test inserts reuse deleted slots when reuse_slots is on."""
+        with Table(self._point_type(), tmp_path / "Point.bin") as table:
+            table.reuse_slots = True
+            for i in range(4):
+                table.insert({"x": i})
+            table.delete(1)
+            table.delete(2)
+            assert table.free_slot_count == 2
+            assert table.insert({"x": 10}) == 2
+            assert table.insert({"x": 11}) == 1
+            assert table.insert({"x": 12}) == 4
+            assert table.count == 5
+            assert table.get(1) == {"x": 11}
+
+    def test_reuse_slots_off_appends(self, tmp_path):
+        """Test deleted slots are left alone by default."""
+        with Table(self._point_type(), tmp_path / "Point.bin") as table:
+            table.insert({"x": 0})
+            table.delete(0)
+            assert table.insert({"x": 1}) == 1
+
+    def test_free_list_persists(self, tmp_path):
+        """Test the free list is saved in a sidecar and reloaded."""
+        file_path = tmp_path / "Point.bin"
+        with Table(self._point_type(), file_path) as table:
+            table.reuse_slots = True
+            for i in range(3):
+                table.insert({"x": i})
+            table.delete(0)
+        assert (tmp_path / "Point.free").exists()
+
+        with Table(self._point_type(), file_path) as table:
+            table.reuse_slots = True
+            assert table.insert({"x": 9}) == 0
+
+    def test_free_list_rebuilt_when_missing(self, tmp_path):
+        """Test slots deleted while reuse was off are found by a scan."""
+        file_path = tmp_path / "Point.bin"
+        with Table(self._point_type(), file_path) as table:
+            for i in range(3):
+                table.insert({"x": i})
+            table.delete(1)
+        assert not (tmp_path / "Point.free").exists()
+
+        with Table(self._point_type(), file_path) as table:
+            table.reuse_slots = True
+            assert table.insert({"x": 9}) == 1
+
+    def test_rebuilt_free_list_lists_slot_once(self, tmp_path):
+        """Test a delete that triggers the rebuild scan adds its slot once."""
+        file_path = tmp_path / "Point.bin"
+        with Table(self._point_type(), file_path) as table:
+            for i in range(3):
+                table.insert({"x": i})
+            table.delete(0)
+
+        with Table(self._point_type(), file_path) as table:
+            table.reuse_slots = True
+            table.delete(1)
+            table.delete(1)
+            assert table.free_slot_count == 2
+
+    def test_delete_checks_free_sidecar_once(self, tmp_path, monkeypatch):
+        """Test deletes without slot reuse do not stat the free list each time."""
+        with Table(self._point_type(), tmp_path / "Point.bin") as table:
+            for i in range(4):
+                table.insert({"x": i})
+            checks = []
+            exists = Path.exists
+            monkeypatch.setattr(Path, "exists", lambda p: checks.append(p.suffix) or exists(p))
+            for i in range(4):
+                table.delete(i)
+            assert checks.count(Table.FREE_LIST_SUFFIX) == 1
+
+    def test_stale_free_list_never_reuses_live_slot(self, tmp_path):
+        """Test free list entries for live records are skipped."""
+        file_path = tmp_path / "Point.bin"
+        with Table(self._point_type(), file_path) as table:
+            for i in range(3):
+                table.insert({"x": i})
+        (tmp_path / "Point.free").write_bytes(struct.pack("<QQ", 1, 1))
+
+        with Table(self._point_type(), file_path) as table:
+            table.reuse_slots = True
+            assert table.insert({"x": 9}) == 3
+            assert table.get(1) == {"x": 1}
+
+    def test_tombstone_bitmap(self, tmp_path):
+        """Test deletions are tracked in a bitmap with O(1) live counts."""
+        with Table(self._point_type(), tmp_path / "Point.bin") as table:
+            for i in range(20):
+                table.insert({"x": i})
+            for i in range(3, 15):
+                table.delete(i)
+            assert table.deleted_count == 12
+            assert table.live_count == 8
+            assert table.is_deleted(3)
+            assert not table.is_deleted(15)
+            assert list(table.iter_live()) == [0, 1, 2, 15, 16, 17, 18, 19]
+            assert list(table.iter_live(1, 16)) == [1, 2, 15]
+            assert [r["x"] for _, r in table.iter_records()] == [0, 1, 2, 15, 16, 17, 18, 19]
+
+    def test_tombstone_sidecar_persists(self, tmp_path):
+        """Test the bitmap is saved on close and trusted on reopen."""
+        file_path = tmp_path / "Point.bin"
+        with Table(self._point_type(), file_path) as table:
+            for i in range(10):
+                table.insert({"x": i})
+            table.delete(4)
+        assert (tmp_path / "Point.del").exists()
+
+        with Table(self._point_type(), file_path) as table:
+            table.insert({"x": 10})  # appended after the sidecar was saved
+            assert table.deleted_count == 1
+            assert list(table.iter_live(3, 11)) == [3, 5, 6, 7, 8, 9, 10]
+
+    def test_tombstone_sidecar_removed_before_change(self, tmp_path):
+        """Test a change drops the sidecar until the next flush, forcing a rebuild after a crash."""
+        file_path = tmp_path / "Point.bin"
+        with Table(self._point_type(), file_path) as table:
+            for i in range(4):
+                table.insert({"x": i})
+            table.delete(0)
+        with Table(self._point_type(), file_path) as table:
+            table.delete(1)
+            assert not (tmp_path / "Point.del").exists()
+            table.flush()
+            assert (tmp_path / "Point.del").exists()
+
+        (tmp_path / "Point.del").unlink()
+        with Table(self._point_type(), file_path) as table:
+            assert list(table.iter_live()) == [2, 3]
+
+    def test_update_clears_tombstone(self, tmp_path):
+        """Test writing a record over a deleted slot makes it live again."""
+        with Table(self._point_type(), tmp_path / "Point.bin") as table:
+            table.insert({"x": 1})
+            table.delete(0)
+            table.update(0, {"x": 2})
+            assert not table.is_deleted(0)
+            assert table.live_count == 1
+    def test_get_raw_is_zero_copy_view(self, tmp_path):
+        """Test get_raw returns a memoryview the codec can decode in place."""
+        with Table(self._point_type(), tmp_path / "Point.bin") as table:
+            table.insert({"x": 5})
+            raw = table.get_raw(0)
+            assert isinstance(raw, memoryview)
+            assert len(raw) == table._record_size
+            assert table._codec.unpack(raw) == {"x": 5}
+            table.update(0, {"x": 6})
+            assert table._codec.unpack(raw) == {"x": 6}
+            raw.release()
+            with pytest.raises(IndexError):
+                table.get_raw(1)
+
+    def test_iter_raw(self, tmp_path):
+        """Test iter_raw yields one view per record, including deleted ones."""
+        with Table(self._point_type(), tmp_path / "Point.bin") as table:
+            for i in range(5):
+                table.insert({"x": i})
+            table.delete(2)
+            views = list(table.iter_raw(1, 4))
+            assert len(views) == 3
+            assert bytes(views[1]) == b"\xff" * table._record_size
+            assert table._codec.unpack(views[2]) == {"x": 3}
+
+    def test_get_range(self, tmp_path):
+        """Test get_range decodes a run of records with one read."""
+        with Table(self._point_type(), tmp_path / "Point.bin") as table:
+            for i in range(5):
+                table.insert({"x": i})
+            assert table.get_range(1, 3) == [table.get(i) for i in range(1, 4)]
+            assert table.get_range(5, 0) == []
+            with pytest.raises(IndexError):
+                table.get_range(3, 3)
+
+    def test_interleaved_reads(self, tmp_path):
+        """Test two scans over one table don't disturb each other."""
+        with Table(self._point_type(), tmp_path / "Point.bin") as table:
+            for i in range(100):
+                table.insert({"x": i})
+            a = table.iter_records()
+            b = table.iter_records(50)
+            pairs = [(next(a)[1]["x"], next(b)[1]["x"]) for _ in range(50)]
+            assert pairs == [(i, i + 50) for i in range(50)]
+
+    def test_view_survives_growth(self, tmp_path):
+        """Test an outstanding view does not block growing the file."""
+        with Table(self._point_type(), tmp_path / "Point.bin") as table:
+            table.insert({"x": 1})
+            raw = table.get_raw(0)
+            for i in range(5000):
+                table.insert({"x": i})
+            assert table._codec.unpack(raw) == {"x": 1}
+            assert table.get(5000) == {"x": 4999}
+
+    def test_record_cache(self, tmp_path):
+        """Test get() serves repeated reads from the LRU cache."""
+        with Table(self._point_type(), tmp_path / "Point.bin") as table:
+            for i in range(3):
+                table.insert({"x": i})
+            table.set_cache_size(2)
+            assert table.get(0) == {"x": 0}
+            assert table.get(0) == {"x": 0}
+            assert (table.cache_hits, table.cache_misses) == (1, 1)
+            table.get(1)
+            table.get(2)  # evicts 0, the least recently used
+            table.get(0)
+            assert (table.cache_hits, table.cache_misses) == (1, 4)
+
+    def test_record_cache_returns_copies(self, tmp_path):
+        """Test modifying a returned record does not change the cached one."""
+        with Table(self._point_type(), tmp_path / "Point.bin") as table:
+            table.insert({"x": 1})
+            table.set_cache_size(10)
+            table.get(0)["x"] = 99
+            assert table.get(0) == {"x": 1}
+
+    def test_record_cache_invalidated_by_writes(self, tmp_path):
+        """Test update, delete and slot reuse drop stale cache entries."""
+        with Table(self._point_type(), tmp_path / "Point.bin") as table:
+            table.reuse_slots = True
+            for i in range(3):
+                table.insert({"x": i})
+            table.set_cache_size(10)
+            for i in range(3):
+                table.get(i)
+            table.update(1, {"x": 10})
+            assert table.get(1) == {"x": 10}
+            assert table.get(0) == {"x": 0}
+            table.delete(2)
+            assert table.get(2) is not None and table.is_deleted(2)
+            table.insert({"x": 20})
+            assert table.get(2) == {"x": 20}
+
+    def test_record_cache_invalidated_by_rollback(self, tmp_path):
+        """Test rolling back a transaction drops records it changed from the cache."""
+        registry = TypeRegistry()
+        registry.register(self._point_type())
+        storage = StorageManager(tmp_path / "db", registry, cache_size=10)
+        table = storage.get_table("Point")
+        table.insert({"x": 1})
+        storage.begin()
+        table.update(0, {"x": 2})
+        assert table.get(0) == {"x": 2}
+        storage.rollback()
+        assert table.get(0) == {"x": 1}
+        storage.close()
+
+    def test_growth_resizes_mapping_in_place(self, tmp_path):
+        """Test growing without outstanding views keeps the same mapping object."""
+        with Table(self._point_type(), tmp_path / "Point.bin") as table:
+            table.insert({"x": 0})
+            mapping = table._mmap
+            for i in range(1, 3000):
+                table.insert({"x": i})
+            assert table._mmap is mapping
+            assert (tmp_path / "Point.bin").stat().st_size == 16384
+            assert [v["x"] for _, v in table.iter_records()] == list(range(3000))
+
+    def test_growth_policy_chunk(self, tmp_path):
+        """Test the chunk strategy grows by a fixed number of bytes."""
+        policy = GrowthPolicy(strategy="chunk", chunk_size=8192)
+        with Table(self._point_type(), tmp_path / "Point.bin", growth=policy) as table:
+            for i in range(2000):
+                table.insert({"x": i})
+            assert (tmp_path / "Point.bin").stat().st_size == 4096 + 8192
+            assert table.get(1999) == {"x": 1999}
+
+    def test_growth_policy_max_step(self):
+        """Test doubling adds at most max_step bytes per step."""
+        policy = GrowthPolicy(max_step=10000)
+        assert policy.next_size(4096, 5, 0) == 8192
+        assert policy.next_size(8192, 5, 0) == 16384
+        assert policy.next_size(16384, 5, 0) == 26384
+        assert policy.next_size(16384, 5, 10000) == 56384
+
+    def test_growth_policy_expected_rows(self, tmp_path):
+        """Test the preallocation hint sizes a new file for all expected rows."""
+        policy = GrowthPolicy(expected_rows=10000)
+        with Table(self._point_type(), tmp_path / "Point.bin", growth=policy) as table:
+            table.insert({"x": 0})
+            size = (tmp_path / "Point.bin").stat().st_size
+            assert size % 4096 == 0
+            assert (size - 8) // table._record_size >= 10000
+            for i in range(1, 10000):
+                table.insert({"x": i})
+            assert (tmp_path / "Point.bin").stat().st_size == size
+
+    def test_growth_policy_invalid(self):
+        """Test invalid growth settings are rejected."""
+        with pytest.raises(ValueError, match="Invalid growth strategy"):
+            GrowthPolicy(strategy="triple")
+        with pytest.raises(ValueError):
+            GrowthPolicy(chunk_size=0)
+
+    def test_growth_policy_saved_in_metadata(self, tmp_path):
+        """Test StorageManager persists growth policies with the type metadata."""
+        registry = TypeRegistry()
+        registry.register(self._point_type())
+        storage = StorageManager(tmp_path / "db", registry)
+        policy = GrowthPolicy(strategy="chunk", chunk_size=65536, expected_rows=500)
+        storage.set_growth_policy("Point", policy)
+        assert storage.get_table("Point").growth == policy
+        storage.close()
+
+        reopened = StorageManager(tmp_path / "db", registry)
+        assert reopened.growth_policy("Point") == policy
+        reopened.set_growth_policy("Point", None)
+        assert reopened.get_table("Point").growth == GrowthPolicy()
+        reopened.close()
 
 class TestSchema:
     """Tests for the Schema class."""
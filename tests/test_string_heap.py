@@ -0,0 +1,118 @@
+"""Tests for UTF-8 string heaps."""
+
+import json
+
+import pytest
+
+from typed_tables.array_table import StringTable
+from typed_tables.dump import load_registry_from_metadata
+from typed_tables.parsing.query_parser import QueryParser
+from typed_tables.query_executor import QueryExecutor
+from typed_tables.storage import StorageManager
+from typed_tables.types import TypeRegistry
+
+
+def _run(executor, text):
+    """Parse and execute a TTQ program, returning the last result."""
+    parser = QueryParser()
+    result = None
+    for stmt in parser.parse_program(text):
+        result = executor.execute(stmt)
+    return result
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Create a database with a type holding a string and a string array."""
+    registry = TypeRegistry()
+    storage = StorageManager(tmp_path / "db", registry)
+    executor = QueryExecutor(storage, registry)
+    _run(executor, "type P { x: int32, name: string, tags: string[] }")
+    yield storage, executor
+    storage.close()
+
+
+def names(executor):
+    """Return the name of every P."""
+    return [row["name"] for row in _run(executor, "from P select name").rows]
+
+
+class TestStringHeap:
+    def test_stored_as_utf8(self, db):
+        """Strings are stored in the heap as UTF-8 bytes."""
+        storage, executor = db
+        _run(executor, 'create P(x=1, name="héllo")')
+        heap = storage.get_array_table("string")
+        assert isinstance(heap, StringTable)
+        assert heap.element_table.type_def.size_bytes == 1
+        assert bytes(heap.element_table.get_raw_range(0, heap.count)) == "héllo".encode()
+        assert storage.get_table("P").get(0)["name"] == (0, 6)
+        assert names(executor) == ["héllo"]
+
+    def test_string_arrays(self, db):
+        """Arrays of strings round-trip non-ASCII values."""
+        _, executor = db
+        _run(executor, 'create P(x=1, name="a", tags=["π", "日本", ""])')
+        assert _run(executor, "from P select tags").rows == [{"tags": ["π", "日本", ""]}]
+
+    @pytest.mark.parametrize(
+        "mutation, expected",
+        [
+            ('name.append("ü")', "grüße!ü"),
+            ('name.prepend("¡")', "¡grüße!"),
+            ("name.delete(0)", "rüße!"),
+            ("name.delete(5)", "grüße"),
+            ("name.delete(2, 3)", "gre!"),
+            ("name.swap(0, 3)", "ßrüge!"),
+            ("name.reverse()", "!eßürg"),
+            ("name.uppercase()", "GRÜSSE!"),
+            ('name.replace("ü", "u")', "gruße!"),
+            ('name.insert(2, "ö")', "gröüße!"),
+        ],
+    )
+    def test_mutations(self, db, mutation, expected):
+        """String methods work on characters, not bytes."""
+        _, executor = db
+        _run(executor, 'create P(x=1, name="grüße!")')
+        _run(executor, 'create P(x=2, name="other")')  # the first string no longer ends the heap
+        _run(executor, f"update P set {mutation} where x=1")
+        assert names(executor) == [expected, "other"]
+
+    def test_delete_out_of_range_counts_characters(self, db):
+        """Range errors count characters, not bytes."""
+        _, executor = db
+        _run(executor, 'create P(x=1, name="ßß")')
+        result = _run(executor, "update P set name.delete(2) where x=1")
+        assert "out of range for array of length 2" in result.message
+
+    def test_append_at_end_of_heap_extends_in_place(self, db):
+        """Appending to the last string in the heap grows it in place."""
+        storage, executor = db
+        _run(executor, 'create P(x=1, name="ab")')
+        _run(executor, 'update P set name.append("ç") where x=1')
+        assert storage.get_table("P").get(0)["name"] == (0, 4)
+        assert names(executor) == ["abç"]
+
+
+class TestLegacyStrings:
+    def test_old_databases_keep_utf32(self, tmp_path):
+        """Databases from before string heaps keep UTF-32 strings."""
+        data_dir = tmp_path / "db"
+        storage = StorageManager(data_dir, TypeRegistry())
+        _run(QueryExecutor(storage, storage.registry), "type P { name: string }")
+        storage.close()
+        metadata_path = data_dir / "_metadata.json"
+        metadata = json.loads(metadata_path.read_text())
+        del metadata["strings"]  # as written before string heaps
+        metadata_path.write_text(json.dumps(metadata))
+
+        storage = StorageManager(data_dir, load_registry_from_metadata(data_dir))
+        executor = QueryExecutor(storage, storage.registry)
+        assert not storage.utf8_strings
+        _run(executor, 'create P(name="héllo")')
+        heap = storage.get_array_table("string")
+        assert not isinstance(heap, StringTable)
+        assert heap.element_table.type_def.size_bytes == 4
+        assert _run(executor, "from P select name").rows == [{"name": "héllo"}]
+        storage.close()
+        assert "strings" not in json.loads(metadata_path.read_text())
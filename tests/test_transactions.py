@@ -0,0 +1,206 @@
+"""Tests for transactions: begin/commit/rollback and atomic scope blocks."""
+
+import shutil
+
+import pytest
+
+from typed_tables.dump import load_registry_from_metadata
+from typed_tables.parsing.query_parser import QueryParser, TransactionQuery
+from typed_tables.query_executor import QueryExecutor, ScopeResult, TransactionResult
+from typed_tables.storage import StorageManager
+from typed_tables.types import TypeRegistry
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Create a database with a self-referencing Node type."""
+    registry = TypeRegistry()
+    storage = StorageManager(tmp_path / "db", registry)
+    executor = QueryExecutor(storage, registry)
+    _run(executor, "type Node { value: uint8, name: string, next: Node }")
+    yield storage, executor
+    storage.close()
+
+
+def _run(executor, text):
+    """Parse and execute a TTQ program, returning the last result."""
+    parser = QueryParser()
+    result = None
+    for stmt in parser.parse_program(text):
+        result = executor.execute(stmt)
+    return result
+
+
+def _values(executor):
+    """Return the sorted values of every Node."""
+    return sorted(row["value"] for row in _run(executor, "from Node select value").rows)
+
+
+class TestTransactionParsing:
+    @pytest.mark.parametrize("text", ["begin", "commit", "rollback", "BEGIN"])
+    def test_parse(self, text):
+        """Parser produces TransactionQuery for each keyword, in any case."""
+        query = QueryParser().parse(text)
+        assert isinstance(query, TransactionQuery)
+        assert query.action == text.lower()
+
+
+class TestExplicitTransactions:
+    def test_commit(self, db):
+        """Writes made between begin and commit are kept."""
+        storage, executor = db
+        assert isinstance(_run(executor, "begin"), TransactionResult)
+        assert storage.in_transaction
+        _run(executor, 'create Node(value=1, name="a", next=null)')
+        _run(executor, 'create Node(value=2, name="b", next=null)')
+        result = _run(executor, "commit")
+        assert result.action == "commit"
+        assert not storage.in_transaction
+        assert _values(executor) == [1, 2]
+
+    def test_rollback_inserts(self, db):
+        """Records created in a rolled-back transaction disappear."""
+        storage, executor = db
+        _run(executor, 'create Node(value=1, name="keep", next=null)')
+        _run(executor, "begin")
+        _run(executor, 'create Node(value=2, name="gone", next=null)')
+        _run(executor, 'create Node(value=3, name="gone too", next=null)')
+        _run(executor, "rollback")
+        assert _values(executor) == [1]
+        assert storage.get_table("Node").count == 1
+        assert _run(executor, "from Node select name").rows[0]["name"] == "keep"
+
+    def test_rollback_update_and_delete(self, db):
+        """Rollback restores updated and deleted records."""
+        _, executor = db
+        _run(executor, 'create Node(value=1, name="a", next=null)')
+        _run(executor, 'create Node(value=2, name="b", next=null)')
+        _run(executor, "begin")
+        _run(executor, "update Node set value=9 where value=1")
+        _run(executor, "delete Node where value=2")
+        assert _values(executor) == [9]
+        _run(executor, "rollback")
+        assert _values(executor) == [1, 2]
+
+    def test_rollback_restores_variables(self, db):
+        """Rollback puts variables back as they were at begin."""
+        _, executor = db
+        _run(executor, '$a = create Node(value=1, name="a", next=null)')
+        _run(executor, "begin")
+        _run(executor, '$a = create Node(value=2, name="b", next=null)')
+        _run(executor, '$b = create Node(value=3, name="c", next=null)')
+        _run(executor, "rollback")
+        assert executor.variables["a"] == ("Node", 0)
+        assert "b" not in executor.variables
+
+    def test_commit_without_begin(self, db):
+        """commit outside a transaction is an error."""
+        _, executor = db
+        with pytest.raises(ValueError, match="No transaction"):
+            _run(executor, "commit")
+
+    def test_nested_begin(self, db):
+        """begin inside a transaction is an error."""
+        _, executor = db
+        _run(executor, "begin")
+        with pytest.raises(ValueError, match="already in progress"):
+            _run(executor, "begin")
+        _run(executor, "rollback")
+
+    def test_flushes_batched_until_commit(self, db):
+        """Tables are flushed once, at commit."""
+        storage, executor = db
+        _run(executor, "begin")
+        _run(executor, 'create Node(value=1, name="a", next=null)')
+        assert storage.get_table("Node").dirty
+        _run(executor, "commit")
+        assert not storage.get_table("Node").dirty
+
+    def test_close_rolls_back(self, tmp_path):
+        """Closing with a transaction open discards its writes."""
+        registry = TypeRegistry()
+        storage = StorageManager(tmp_path / "db", registry)
+        executor = QueryExecutor(storage, registry)
+        parser = QueryParser()
+        for text in ["type P { x: int32 }", "create P(x=1)", "begin", "create P(x=2)"]:
+            executor.execute(parser.parse(text))
+        storage.close()
+
+        reopened = StorageManager(tmp_path / "db", load_registry_from_metadata(tmp_path / "db"))
+        assert reopened.get_table("P").count == 1
+        reopened.close()
+
+    def test_wal_crash_mid_transaction(self, tmp_path):
+        """Recovery undoes a transaction that never committed."""
+        registry = TypeRegistry()
+        data_dir = tmp_path / "db"
+        storage = StorageManager(data_dir, registry, wal=True)
+        executor = QueryExecutor(storage, registry)
+        parser = QueryParser()
+        for text in ["type P { x: int32 }", "create P(x=1)", "begin", "create P(x=2)", "create P(x=3)"]:
+            executor.execute(parser.parse(text))
+
+        copy = tmp_path / "crashed"
+        shutil.copytree(data_dir, copy)
+        storage.close()
+
+        recovered = StorageManager(copy, load_registry_from_metadata(copy))
+        assert recovered.get_table("P").count == 1
+        recovered.close()
+
+
+class TestAtomicScopes:
+    def test_successful_scope_commits(self, db):
+        """A scope block that succeeds keeps its writes."""
+        storage, executor = db
+        result = _run(executor, """scope {
+            create Node(tag(A), value=1, name="a", next=B);
+            create Node(tag(B), value=2, name="b", next=A);
+        }""")
+        assert isinstance(result, ScopeResult)
+        assert "rolled back" not in result.message
+        assert not storage.in_transaction
+        assert _values(executor) == [1, 2]
+
+    def test_failed_scope_rolls_back(self, db):
+        """A scope block with an error is rolled back as a whole."""
+        storage, executor = db
+        _run(executor, 'create Node(value=1, name="keep", next=null)')
+        result = _run(executor, """scope {
+            create Node(value=2, name="x", next=null);
+            create Node(value=3, name="y", next=MISSING);
+        }""")
+        assert "rolled back" in result.message
+        assert "Undefined tag: MISSING" in result.message
+        assert not storage.in_transaction
+        assert _values(executor) == [1]
+
+    def test_scope_exception_rolls_back(self, db):
+        """A scope block that raises is rolled back."""
+        storage, executor = db
+        with pytest.raises(ValueError):
+            _run(executor, """scope {
+                create Node(value=2, name="x", next=null);
+                begin;
+            }""")
+        assert not storage.in_transaction
+        assert _values(executor) == []
+
+    def test_scope_in_transaction_uses_savepoint(self, db):
+        """A failed scope inside a transaction only undoes its own writes."""
+        storage, executor = db
+        _run(executor, "begin")
+        _run(executor, 'create Node(value=1, name="a", next=null)')
+        _run(executor, """scope {
+            create Node(value=2, name="x", next=MISSING);
+        }""")
+        assert storage.in_transaction
+        _run(executor, "commit")
+        assert _values(executor) == [1]
+
+    def test_commit_inside_scope_rejected(self, db):
+        """commit is not allowed inside a scope block."""
+        storage, executor = db
+        with pytest.raises(ValueError, match="inside a scope block"):
+            _run(executor, "scope { commit }")
+        assert not storage.in_transaction
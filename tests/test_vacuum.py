@@ -0,0 +1,337 @@
+"""Tests for the vacuum command (in-place compaction)."""
+
+import json
+
+import pytest
+
+from typed_tables import storage as storage_module
+from typed_tables.parsing.query_parser import QueryParser, VacuumQuery
+from typed_tables.query_executor import QueryExecutor, VacuumResult
+from typed_tables.storage import VACUUM_MANIFEST, AutoVacuumPolicy, StorageManager
+from typed_tables.types import TypeRegistry
+
+SCHEMA = """
+alias Tags = int32[]
+interface I { a: int32 }
+type P from I {
+    x: int32, tags: Tags, name: string, names: string[], d: {string: int32}, f: fraction, next: P
+}
+enum Shape { circle(r: float64, p: P), none }
+type Q { n: int32, s: Shape, i: I, ps: P[] }
+"""
+
+
+def _run(executor, text):
+    """Parse and execute a TTQ program, returning the last result."""
+    parser = QueryParser()
+    result = None
+    for stmt in parser.parse_program(text):
+        result = executor.execute(stmt)
+    return result
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Create a database whose P and Q records leave every kind of table with something dead."""
+    data_dir = tmp_path / "db"
+    registry = TypeRegistry()
+    storage = StorageManager(data_dir, registry)
+    executor = QueryExecutor(storage, registry)
+    _run(executor, SCHEMA)
+    for i in range(6):
+        _run(
+            executor,
+            f'create P(a={i}, x={i}, tags=[{i}], name="n{i}", names=["a{i}", "b"], '
+            f'd={{"k{i}": {i}}}, f=fraction(1, {i + 2}))',
+        )
+    _run(executor, "update P set next=P(5) where x < 5")
+    for i in (1, 2, 4, 5):
+        _run(
+            executor,
+            f"create Q(n={i}, s=.circle(r={i}.0, p=P(x={i + 10})), i=P({i}), ps=[P(x={i + 20})])",
+        )
+    _run(executor, "delete P where x = 0 or x = 3")
+    _run(executor, 'update P set tags.prepend(9), name="longer", names=["c"] where x = 1')
+    _run(executor, "delete Q where n = 2")
+    yield data_dir, storage, executor
+    storage.close()
+
+
+def snapshot(executor):
+    """Return everything the db fixture's queries can see, to compare across a vacuum."""
+    return (
+        _run(executor, "from P select x, tags, name, names, d, f, next.x, a").rows,
+        _run(executor, "from Q select n, s.r, s.p.x, i.a, ps").rows,
+    )
+
+
+class TestVacuumParsing:
+    @pytest.mark.parametrize(
+        "text, type_name",
+        [("vacuum", None), ("vacuum Person", "Person"), ('vacuum "int32[]"', "int32[]")],
+    )
+    def test_parse(self, text, type_name):
+        """vacuum parses with and without a type name."""
+        query = QueryParser().parse(text)
+        assert isinstance(query, VacuumQuery)
+        assert query.type_name == type_name
+
+
+class TestVacuum:
+    def test_composite(self, db):
+        """Vacuuming a composite table drops dead records and remaps references to it."""
+        data_dir, storage, executor = db
+        expected = snapshot(executor)
+        result = _run(executor, "vacuum P")
+        assert isinstance(result, VacuumResult)
+        assert (result.table_count, result.records_before, result.records_after) == (1, 10, 8)
+        # Q holds the only references into P: s.p lives in the variant table
+        assert result.remapped_count == 2
+        assert snapshot(executor) == expected
+        assert storage.get_table("P").deleted_count == 0
+        assert not (data_dir / "P.del").exists()
+        assert not list(data_dir.rglob("*.vacuum.*"))
+        assert not (data_dir / VACUUM_MANIFEST).exists()
+
+    def test_array_table(self, db):
+        """Vacuuming an array table drops dead elements and remaps the records using it."""
+        data_dir, storage, executor = db
+        expected = snapshot(executor)
+        result = _run(executor, "vacuum Tags")
+        assert (result.table_count, result.remapped_count) == (1, 1)
+        assert storage.get_array_table("Tags").count == 5
+        assert storage.get_array_table("Tags").dead_count == 0
+        assert snapshot(executor) == expected
+
+    def test_string_heap(self, db):
+        """Vacuuming the string heap remaps every field that points into it."""
+        _, storage, executor = db
+        expected = snapshot(executor)
+        before = storage.get_array_table("string").count
+        result = _run(executor, "vacuum string")
+        # P's names, string[] elements and dict entry keys all point into the heap
+        assert result.remapped_count == 3
+        assert storage.get_array_table("string").count < before
+        assert snapshot(executor) == expected
+
+    @pytest.mark.parametrize(
+        "type_name", ["Shape", "fraction", "Q", '"{string: int32}"', '"string[]"'],
+    )
+    def test_other_tables(self, db, type_name):
+        """Vacuuming any other table leaves the data unchanged."""
+        _, _, executor = db
+        expected = snapshot(executor)
+        assert _run(executor, f"vacuum {type_name}").table_count >= 1
+        assert snapshot(executor) == expected
+
+    def test_everything(self, db, reopen):
+        """A bare vacuum compacts every table, and the result survives a reopen."""
+        data_dir, storage, executor = db
+        expected = snapshot(executor)
+        result = _run(executor, "vacuum")
+        # The dict entry table has nothing dead but its keys move with the string heap
+        assert (result.table_count, result.remapped_count) == (10, 1)
+        assert result.records_after < result.records_before
+        assert snapshot(executor) == expected
+        storage.close()
+        storage, executor = reopen(data_dir)
+        assert snapshot(executor) == expected
+        _run(executor, 'create P(x=7, tags=[7], name="seven")')
+        assert _run(executor, "from P select name where x = 7").rows == [{"name": "seven"}]
+        storage.close()
+
+    def test_clean_tables_untouched(self, db):
+        """Tables with nothing dead keep their files."""
+        data_dir, _, executor = db
+        _run(executor, "vacuum")
+        inodes = {path: path.stat().st_ino for path in data_dir.rglob("*.bin")}
+        result = _run(executor, "vacuum")
+        assert (result.table_count, result.remapped_count) == (0, 0)
+        assert {path: path.stat().st_ino for path in data_dir.rglob("*.bin")} == inodes
+        assert _run(executor, "vacuum P").table_count == 0
+
+    def test_variables_follow_records(self, db):
+        """Variables holding records see them at their new indexes."""
+        _, _, executor = db
+        _run(executor, "$p = collect P where x = 4 or x = 5")
+        _run(executor, "vacuum P")
+        assert _run(executor, "from $p select x").rows == [{"x": 4}, {"x": 5}]
+
+    def test_errors(self, db):
+        """vacuum reports unknown and unvacuumable types and refuses to run in a transaction."""
+        _, _, executor = db
+        assert _run(executor, "vacuum Nope").message == "Unknown type: Nope"
+        _run(executor, "type R { s: interned string }")
+        _run(executor, 'create R(s="a")')
+        assert "nothing to vacuum" in _run(executor, 'vacuum "interned string"').message
+        _run(executor, "begin")
+        with pytest.raises(ValueError, match="inside a transaction"):
+            _run(executor, "vacuum P")
+        _run(executor, "rollback")
+
+
+class TestVacuumRecovery:
+    def test_unfinished_vacuum_discarded(self, db, reopen):
+        """Side files of a vacuum that never wrote its manifest are discarded on open."""
+        data_dir, storage, executor = db
+        expected = snapshot(executor)
+        storage.begin_vacuum()
+        side = storage.vacuum_side_table(storage.get_table("P"))
+        side.reserve(1)
+        side.close()
+        storage.close()
+        storage, executor = reopen(data_dir)
+        assert not (data_dir / "P.vacuum.bin").exists()
+        assert not (data_dir / VACUUM_MANIFEST).exists()
+        assert snapshot(executor) == expected
+        storage.close()
+
+    def test_swap_completed_on_open(self, db, monkeypatch, reopen):
+        """A vacuum that crashed after writing its manifest is finished on open."""
+        data_dir, storage, executor = db
+        expected = snapshot(executor)
+        monkeypatch.setattr(storage_module, "finish_vacuum", lambda data_dir: False)
+        _run(executor, "vacuum P")  # "crashes" once the manifest is written
+        assert json.loads((data_dir / VACUUM_MANIFEST).read_text())["swap"]
+        assert (data_dir / "P.vacuum.bin").exists()
+        storage.close()
+        monkeypatch.undo()
+        storage, executor = reopen(data_dir)
+        assert not (data_dir / VACUUM_MANIFEST).exists()
+        assert storage.get_table("P").count == 8
+        assert snapshot(executor) == expected
+        storage.close()
+
+    def test_reader_sees_swapped_file(self, db, reopen):
+        """A read-only database picks up the files a writer's vacuum swapped in."""
+        data_dir, storage, executor = db
+        reader, reader_executor = reopen(data_dir, read_only=True)
+        expected = snapshot(reader_executor)
+        _run(executor, "vacuum")
+        assert snapshot(reader_executor) == expected
+        assert reader.get_table("P").deleted_count == 0
+        reader.close()
+
+
+@pytest.fixture
+def wide(tmp_path):
+    """A database of 512 P records of 29 bytes each (16 KB) with four int32s apiece in int32[]."""
+    data_dir = tmp_path / "db"
+    storage = StorageManager(data_dir, TypeRegistry())
+    executor = QueryExecutor(storage, storage.registry)
+    _run(executor, "type P { x: int32, pad: uint128, tags: int32[] }")
+    storage.get_table("P").reserve(512)
+    for i in range(512):
+        _run(executor, f"create P(x={i}, tags=[{i}, {i}, {i}, {i}])")
+    yield data_dir, storage, executor
+    storage.close()
+
+
+class TestAutoVacuum:
+    def test_settings_saved_with_database(self, wide, reopen):
+        """The auto vacuum settings are saved with the database."""
+        data_dir, storage, executor = wide
+        assert _run(executor, "set auto_vacuum 30").message == "Set auto_vacuum to 30% dead"
+        _run(executor, "set auto_vacuum_size 65536")
+        assert storage.auto_vacuum == AutoVacuumPolicy(dead_percent=30, dead_bytes=65536)
+        metadata = json.loads((data_dir / "_metadata.json").read_text())
+        assert metadata["auto_vacuum"] == {"dead_percent": 30, "dead_bytes": 65536}
+        storage.close()
+        storage, executor = reopen(data_dir)
+        assert storage.auto_vacuum.dead_percent == 30
+        _run(executor, "set auto_vacuum off")
+        _run(executor, "set auto_vacuum_size")
+        assert not storage.auto_vacuum.enabled
+        storage.close()
+
+    @pytest.mark.parametrize(
+        "setting, value",
+        [("auto_vacuum", "101"), ("auto_vacuum", "x"), ("auto_vacuum_size", "y")],
+    )
+    def test_invalid_settings(self, wide, setting, value):
+        """Out-of-range and non-numeric auto vacuum settings are rejected."""
+        _, _, executor = wide
+        with pytest.raises(ValueError):
+            _run(executor, f"set {setting} {value}")
+
+    def test_off_by_default(self, wide):
+        """Auto vacuum does nothing until it is turned on."""
+        _, storage, executor = wide
+        _run(executor, "delete P where x < 400")
+        assert storage.get_table("P").deleted_count == 400
+
+    def test_vacuums_table_over_threshold(self, wide):
+        """Test an array table is vacuumed once its dead share passes the threshold."""
+        _, storage, executor = wide
+        _run(executor, "set auto_vacuum 60")
+        _run(executor, "delete P where x < 256")  # 50% of the elements dead
+        assert storage.get_array_table("int32[]").dead_count == 1024
+        _run(executor, "delete P where x < 320")
+        assert storage.get_array_table("int32[]").dead_count == 0
+        assert storage.get_array_table("int32[]").count == 768
+        assert _run(executor, "from P select x, tags where x = 320").rows == [
+            {"x": 320, "tags": [320, 320, 320, 320]},
+        ]
+
+    def test_composite_indexes_kept(self, wide):
+        """Test composite tables are never vacuumed automatically, so _index values hold."""
+        _, storage, executor = wide
+        _run(executor, "set auto_vacuum 10")
+        _run(executor, "delete P where x < 400")
+        assert storage.get_table("P").deleted_count == 400
+        rows = _run(executor, "from P select _index, x where x = 400").rows
+        assert rows == [{"_index": 400, "x": 400}]
+        assert storage.auto_vacuum_candidates() == []
+
+    def test_one_table_per_statement(self, wide):
+        """Test each statement vacuums only the array table with the most dead bytes."""
+        _, storage, executor = wide
+        _run(executor, "type R { y: int32, ns: int64[] }")
+        for i in range(512):
+            _run(executor, f"create R(y={i}, ns=[{i}, {i}])")
+        _run(executor, "set auto_vacuum 50")
+        _run(executor, "begin")
+        _run(executor, "delete P where x < 384")  # 6144 dead bytes of int32[]
+        _run(executor, "delete R where y < 448")  # 7168 dead bytes of int64[]
+        _run(executor, "commit")
+        _run(executor, "create P(x=1000)")
+        assert storage.get_array_table("int64[]").dead_count == 0
+        assert storage.get_array_table("int32[]").dead_count == 1536
+        # Next statement: the other table's turn
+        _run(executor, "create P(x=1001)")
+        assert storage.get_array_table("int32[]").dead_count == 0
+        assert storage.get_array_table("int32[]").count == 512
+
+    def test_dead_bytes_criterion(self, wide):
+        """Test the dead bytes threshold triggers a vacuum on its own."""
+        _, storage, executor = wide
+        _run(executor, "set auto_vacuum_size 4096")
+        _run(executor, "delete P where x < 256")  # 4096 dead bytes
+        assert storage.get_array_table("int32[]").dead_count == 1024
+        _run(executor, "delete P where x < 260")  # 4160 dead bytes
+        assert storage.get_array_table("int32[]").dead_count == 0
+
+    def test_not_inside_transaction(self, wide):
+        """Test auto vacuum waits for the transaction to end."""
+        _, storage, executor = wide
+        _run(executor, "set auto_vacuum 10")
+        _run(executor, "begin")
+        _run(executor, "delete P where x < 300")
+        assert storage.get_array_table("int32[]").dead_count == 1200
+        _run(executor, "commit")
+        _run(executor, "create P(x=600)")
+        assert storage.get_array_table("int32[]").dead_count == 0
+
+    def test_stats(self, tmp_path):
+        """The executor records how many auto vacuums ran and what they reclaimed."""
+        storage = StorageManager(tmp_path / "db", TypeRegistry())
+        executor = QueryExecutor(storage, storage.registry)
+        _run(executor, "type P { x: int32, tags: int32[] }\nset auto_vacuum 50")
+        for i in range(512):
+            _run(executor, f"create P(x={i}, tags=[{i}, {i}, {i}, {i}])")
+        _run(executor, "delete P where x < 400")
+        stats = executor.auto_vacuum_stats
+        assert (stats.runs, stats.last_table) == (1, "int32[]")
+        assert stats.bytes_reclaimed == 16384 - 4096
+        assert executor.auto_vacuum() is None
+        storage.close()
@@ -0,0 +1,160 @@
+"""Tests for the write-ahead log and crash recovery."""
+
+import os
+import shutil
+import struct
+
+import pytest
+
+from typed_tables.parsing.query_parser import QueryParser
+from typed_tables.query_executor import QueryExecutor, SetResult
+from typed_tables.storage import StorageManager
+from typed_tables.types import TypeRegistry
+from typed_tables.wal import WAL_FILE, recover
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Create a database logging to a WAL, with tables flushed only on sync."""
+    data_dir = tmp_path / "db"
+    registry = TypeRegistry()
+    storage = StorageManager(data_dir, registry, durability="manual", wal=True)
+    yield data_dir, storage, QueryExecutor(storage, registry)
+    storage.close()
+
+
+def _run(executor, text):
+    """Parse and execute a TTQ program, returning the last result."""
+    parser = QueryParser()
+    result = None
+    for stmt in parser.parse_program(text):
+        result = executor.execute(stmt)
+    return result
+
+
+def crash_copy(data_dir, tmp_path):
+    """Copy the database as it is on disk right now, as if the process died."""
+    copy = tmp_path / "crashed"
+    shutil.copytree(data_dir, copy)
+    return copy
+
+
+class TestWriteAheadLog:
+    def test_wal_file_created_and_removed_on_close(self, tmp_path):
+        """The log file exists while the database is open and is removed on close."""
+        data_dir = tmp_path / "db"
+        storage = StorageManager(data_dir, TypeRegistry(), wal=True)
+        assert (data_dir / WAL_FILE).exists()
+        storage.close()
+        assert not (data_dir / WAL_FILE).exists()
+
+    def test_set_wal_command(self, tmp_path):
+        """set wal turns the log on and off."""
+        registry = TypeRegistry()
+        storage = StorageManager(tmp_path / "db", registry)
+        executor = QueryExecutor(storage, registry)
+        result = executor.execute(QueryParser().parse("set wal on"))
+        assert isinstance(result, SetResult)
+        assert result.value is True
+        assert storage.wal_enabled
+        executor.execute(QueryParser().parse("set wal off"))
+        assert not storage.wal_enabled
+        assert not (tmp_path / "db" / WAL_FILE).exists()
+        storage.close()
+
+    def test_set_wal_invalid_value(self, tmp_path):
+        """set wal only accepts on or off."""
+        registry = TypeRegistry()
+        storage = StorageManager(tmp_path / "db", registry)
+        executor = QueryExecutor(storage, registry)
+        with pytest.raises(ValueError, match="expected on or off"):
+            executor.execute(QueryParser().parse("set wal maybe"))
+        storage.close()
+
+    def test_recover_without_log_is_noop(self, tmp_path):
+        """Recovery does nothing when there is no log."""
+        assert recover(tmp_path) is None
+
+    def test_committed_statements_replayed(self, db, tmp_path, reopen):
+        """Committed statements are replayed over table files that missed them."""
+        data_dir, storage, executor = db
+        _run(executor, 'type P { x: int32, name: string }')
+        _run(executor, 'create P(x=1, name="one")')
+        _run(executor, 'create P(x=2, name="two")')
+
+        copy = crash_copy(data_dir, tmp_path)
+        # Simulate the header count never reaching disk
+        with open(copy / "P.bin", "r+b") as f:
+            f.write(struct.pack("<Q", 0))
+
+        recovered, _ = reopen(copy)
+        assert recovered.recovery_report.committed_units == 2
+        assert not (copy / WAL_FILE).exists()
+        table = recovered.get_table("P")
+        assert table.count == 2
+        assert table.get(1)["x"] == 2
+        recovered.close()
+
+    def test_uncommitted_writes_rolled_back(self, db, tmp_path, reopen):
+        """Writes from a statement that never committed are undone."""
+        data_dir, storage, executor = db
+        _run(executor, 'type P { x: int32 }')
+        _run(executor, 'create P(x=1)')
+
+        # A statement that dies halfway: writes applied, never committed
+        table = storage.get_table("P")
+        table.update(0, {"x": 99})
+        table.insert({"x": 2})
+
+        copy = crash_copy(data_dir, tmp_path)
+        recovered, _ = reopen(copy)
+        assert recovered.recovery_report.undone_writes >= 2
+        table = recovered.get_table("P")
+        assert table.count == 1
+        assert table.get(0)["x"] == 1
+        recovered.close()
+
+    def test_torn_tail_ignored(self, db, tmp_path, reopen):
+        """A partial record at the end of the log is ignored."""
+        data_dir, storage, executor = db
+        _run(executor, 'type P { x: int32 }')
+        _run(executor, 'create P(x=1)')
+
+        copy = crash_copy(data_dir, tmp_path)
+        with open(copy / WAL_FILE, "ab") as f:
+            f.write(b"\x01\xff\xff")  # partial record header
+
+        recovered, _ = reopen(copy)
+        assert recovered.get_table("P").count == 1
+        recovered.close()
+
+    def test_sync_truncates_log(self, db):
+        """sync flushes the tables and empties the log."""
+        data_dir, storage, executor = db
+        _run(executor, 'type P { x: int32 }')
+        _run(executor, 'create P(x=1)')
+        assert (data_dir / WAL_FILE).stat().st_size > 8
+        _run(executor, 'sync')
+        assert (data_dir / WAL_FILE).stat().st_size == 8
+
+    def test_undo_images_synced_before_overwrites(self, db, monkeypatch):
+        """The log is fsynced before a unit first overwrites bytes that were live when it began."""
+        _, storage, executor = db
+        _run(executor, 'type P { x: int32 }')
+        _run(executor, 'create P(x=1)')
+        _run(executor, 'create P(x=2)')
+        table = storage.get_table("P")
+        syncs = []
+        monkeypatch.setattr(os, "fsync", syncs.append)
+
+        table.update(0, {"x": 9})
+        assert len(syncs) == 1
+        table.update(0, {"x": 10})  # undo image already on disk
+        table.insert({"x": 3})  # the header count is overwritten
+        assert len(syncs) == 2
+        table.insert({"x": 4})
+        table.update(2, {"x": 5})  # appended in this unit
+        assert len(syncs) == 2
+        storage.end_statement()
+        table.update(2, {"x": 6})
+        assert len(syncs) == 3
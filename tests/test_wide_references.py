@@ -0,0 +1,177 @@
+"""Tests for databases with 64-bit references (wide_references)."""
+
+import struct
+
+import pytest
+
+from typed_tables.codec import field_codec
+from typed_tables.parsing.query_parser import QueryParser, RestoreQuery
+from typed_tables.query_executor import QueryExecutor, SetResult, execute_restore
+from typed_tables.storage import StorageManager
+from typed_tables.types import NULL_REF, NULL_REF_32, TypeRegistry
+
+SCHEMA = """
+type P { x: int32, name: string, next: P, d: {string: int32}, f: fraction, b: bigint }
+enum Shape { circle(r: float64), none }
+interface I { a: int32 }
+type Q from I { s: Shape }
+type H { i: I }
+"""
+
+DATA = """
+scope {
+    create P(tag(A), x=1, name="hi", next=A, d={"k": 3}, f=fraction(1, 3), b=12345678901234567890)
+}
+create Q(a=5, s=.circle(r=2.0))
+create Q(a=6, s=.none)
+"""
+
+
+def _run(executor, text):
+    """Parse and execute a TTQ program, returning the last result."""
+    parser = QueryParser()
+    result = None
+    for stmt in parser.parse_program(text):
+        result = executor.execute(stmt)
+    return result
+
+
+@pytest.fixture
+def wide_db(tmp_path):
+    """Create a wide-reference database holding every kind of reference."""
+    data_dir = tmp_path / "db"
+    registry = TypeRegistry()
+    storage = StorageManager(data_dir, registry)
+    executor = QueryExecutor(storage, registry)
+    result = _run(executor, "set wide_references on")
+    assert isinstance(result, SetResult) and result.value is True
+    _run(executor, SCHEMA)
+    _run(executor, DATA)
+    yield data_dir, storage, executor
+    storage.close()
+
+
+def _check_data(executor):
+    """Check that the records created by DATA read back unchanged."""
+    (p,) = _run(executor, "from P select x, name, d, f, b").rows
+    assert p == {"x": 1, "name": "hi", "d": {"k": 3}, "f": p["f"], "b": 12345678901234567890}
+    assert (p["f"].numerator, p["f"].denominator) == (1, 3)
+    assert _run(executor, "from P select next.next.x").rows == [{"next.next.x": 1}]
+    rows = _run(executor, "from Q select s").rows
+    shapes = [(row["s"].variant_name, row["s"].fields) for row in rows]
+    assert shapes == [("circle", {"r": 2.0}), ("none", {})]
+
+
+class TestWideReferences:
+    def test_layout(self, wide_db):
+        """References and array offsets are 8 bytes wide; primitives keep their size."""
+        _, storage, _ = wide_db
+        registry = storage.registry
+        fields = {f.name: f.type_def for f in registry.get("P").fields}
+        assert fields["next"].reference_size == 8
+        assert fields["name"].reference_size == 16
+        assert fields["d"].reference_size == 16
+        assert fields["f"].reference_size == 32
+        assert registry.get("I").reference_size == 10
+        assert registry.get("Shape").size_bytes == 9
+        assert field_codec(registry.get_or_create_set_type(registry.get("string"))).fmt == "QQ"
+        assert field_codec(registry.get("I")).fmt == "HQ"
+        assert storage.get_array_table_for_type(fields["d"]).element_table.type_def.name == "uint64"
+        # Primitives keep their size
+        assert registry.get("int32").size_bytes == 4
+
+    def test_synthetic_types_are_wide(self, wide_db):
+        """Types the storage builds for variants, fractions, dicts and interned strings are wide."""
+        _, storage, executor = wide_db
+        registry = storage.registry
+        _run(executor, "type T { s: interned string }")
+        _run(executor, 'create T(s="x")')
+        assert storage.get_variant_table(registry.get("Shape"), "circle").type_def.wide_references
+        assert storage.get_fraction_num_table().array_type.wide_references
+        dict_table = storage.get_array_table_for_type(registry.get("{string: int32}"))
+        assert dict_table.array_type.wide_references
+        index = storage.get_array_table("interned string").index_table
+        assert index.type_def.wide_references
+        assert index.type_def.size_bytes == 1 + 8 + 8 + 8
+
+    def test_null_variant_reference(self, wide_db):
+        """A bare variant stores all-ones in the full index width, so 0xFFFFFFFF stays valid."""
+        _, storage, executor = wide_db
+        assert bytes(storage.get_table("Q").get_raw(1))[-8:] == b"\xff" * 8
+        assert storage.get_table("Q").get(1)["s"][1] == NULL_REF
+        assert field_codec(storage.registry.get("Shape")).encode is None
+
+    def test_narrow_null_variant_reference(self, tmp_path):
+        """Without wide references a bare variant still stores NULL_REF_32 in its uint32."""
+        storage = StorageManager(tmp_path / "db", TypeRegistry())
+        executor = QueryExecutor(storage, storage.registry)
+        _run(executor, "enum Shape { circle(r: float64), none }\ntype Q { s: Shape }")
+        _run(executor, "create Q(s=.none)")
+        assert bytes(storage.get_table("Q").get_raw(0))[-4:] == struct.pack("<I", NULL_REF_32)
+        assert storage.get_table("Q").get(0)["s"] == (1, NULL_REF)
+        assert _run(executor, "from Q select s").rows[0]["s"].variant_name == "none"
+        storage.close()
+
+    def test_round_trip(self, wide_db, reopen):
+        """A wide database reads back the same after reopening."""
+        data_dir, storage, executor = wide_db
+        _check_data(executor)
+        storage.close()
+        storage, executor = reopen(data_dir)
+        assert storage.wide_references
+        _check_data(executor)
+        _run(executor, 'create P(x=2, name="later")')
+        assert _run(executor, "from P select name where x=2").rows == [{"name": "later"}]
+        storage.close()
+
+    def test_switch_refused_once_data_exists(self, wide_db):
+        """The setting cannot change once data is stored."""
+        _, storage, executor = wide_db
+        with pytest.raises(ValueError, match="before any data is stored"):
+            _run(executor, "set wide_references off")
+        assert storage.wide_references
+
+    def test_narrow_by_default(self, tmp_path):
+        """New databases use 4-byte references."""
+        storage = StorageManager(tmp_path / "db", TypeRegistry())
+        executor = QueryExecutor(storage, storage.registry)
+        _run(executor, "type P { next: P }")
+        assert storage.registry.get("P").size_bytes == 1 + 4
+        storage.close()
+
+    def test_compact_keeps_mode(self, wide_db, tmp_path, reopen):
+        """A compacted copy keeps wide references."""
+        _, _, executor = wide_db
+        out = tmp_path / "compacted"
+        _run(executor, f'compact > "{out}"')
+        storage, executor = reopen(out)
+        assert storage.wide_references
+        _check_data(executor)
+        storage.close()
+
+    def test_archive_restore(self, wide_db, tmp_path, reopen):
+        """Archives record wide references and restore them."""
+        _, _, executor = wide_db
+        ttar = tmp_path / "wide.ttar"
+        _run(executor, f'archive > "{ttar}"')
+        with open(ttar, "rb") as f:
+            assert f.read(4) == b"TTAR"
+            assert struct.unpack("<H", f.read(2))[0] == 2
+        out = tmp_path / "restored"
+        execute_restore(RestoreQuery(archive_file=str(ttar), output_path=str(out)))
+        storage, executor = reopen(out)
+        assert storage.wide_references
+        _check_data(executor)
+        storage.close()
+
+    def test_dump_reloads_wide(self, wide_db, tmp_path):
+        """A dump sets wide references before recreating the data."""
+        _, _, executor = wide_db
+        script = _run(executor, "dump").script
+        assert script.splitlines()[1] == "set wide_references on"
+        storage = StorageManager(tmp_path / "copy", TypeRegistry())
+        copy = QueryExecutor(storage, storage.registry)
+        _run(copy, script)
+        assert storage.wide_references
+        _check_data(copy)
+        storage.close()